@@ -1,33 +1,68 @@
-from .control import (
-    AsyncControlClient,
-    ControlClient,
-    ControlMethodUnavailableError,
-    ControlResourceMethods,
-)
-from .data import AsyncDataClient, DataClient, UNSET
-from ..models.data.exceptions import (
-    BadRequestError,
-    DooverAPIError,
-    ForbiddenError,
-    HTTPError,
-    NotFoundError,
-    TokenRefreshError,
-    UnauthorizedError,
-)
-
-__all__ = [
-    "AsyncControlClient",
-    "AsyncDataClient",
-    "ControlClient",
-    "ControlMethodUnavailableError",
-    "ControlResourceMethods",
-    "DataClient",
-    "UNSET",
-    "BadRequestError",
-    "DooverAPIError",
-    "ForbiddenError",
-    "HTTPError",
-    "NotFoundError",
-    "TokenRefreshError",
-    "UnauthorizedError",
-]
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .control import (
+        AsyncControlClient as AsyncControlClient,
+        ControlClient as ControlClient,
+        ControlMethodUnavailableError as ControlMethodUnavailableError,
+        ControlResourceMethods as ControlResourceMethods,
+    )
+    from ._pool import (
+        ConnectionPool as ConnectionPool,
+        shared_pool as shared_pool,
+    )
+    from .data import (
+        AsyncDataClient as AsyncDataClient,
+        DataClient as DataClient,
+        UNSET as UNSET,
+    )
+    from ..models.data.exceptions import (
+        BadRequestError as BadRequestError,
+        DooverAPIError as DooverAPIError,
+        ForbiddenError as ForbiddenError,
+        HTTPError as HTTPError,
+        NotFoundError as NotFoundError,
+        TokenRefreshError as TokenRefreshError,
+        UnauthorizedError as UnauthorizedError,
+    )
+
+# The control client pulls in the generated control models and clients, which data-only
+# users (processors, device apps) never need, so every export is imported on first use.
+_LAZY_ATTRS = {
+    "AsyncControlClient": (".control", "AsyncControlClient"),
+    "ControlClient": (".control", "ControlClient"),
+    "ControlMethodUnavailableError": (".control", "ControlMethodUnavailableError"),
+    "ControlResourceMethods": (".control", "ControlResourceMethods"),
+    "ConnectionPool": ("._pool", "ConnectionPool"),
+    "shared_pool": ("._pool", "shared_pool"),
+    "AsyncDataClient": (".data", "AsyncDataClient"),
+    "DataClient": (".data", "DataClient"),
+    "UNSET": (".data", "UNSET"),
+    "BadRequestError": ("..models.data.exceptions", "BadRequestError"),
+    "DooverAPIError": ("..models.data.exceptions", "DooverAPIError"),
+    "ForbiddenError": ("..models.data.exceptions", "ForbiddenError"),
+    "HTTPError": ("..models.data.exceptions", "HTTPError"),
+    "NotFoundError": ("..models.data.exceptions", "NotFoundError"),
+    "TokenRefreshError": ("..models.data.exceptions", "TokenRefreshError"),
+    "UnauthorizedError": ("..models.data.exceptions", "UnauthorizedError"),
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    try:
+        module_path, attr_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    from importlib import import_module
+
+    module = import_module(module_path, __name__)
+    value = getattr(module, attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
@@ -0,0 +1,175 @@
+"""Connection pools shared between API clients.
+
+Every client normally opens its own connections. A data client, a control client and
+their auth clients talking to the same hosts each pay for their own DNS lookups and
+TLS handshakes, and a session that is closed after each processor invocation throws
+its connections away. Give them one :class:`ConnectionPool` and they share keep-alive
+connections, a DNS cache and the TLS setup instead. Closing a client then leaves the
+pool's connections open for the next one.
+
+The async clients draw on an ``aiohttp`` connector per event loop, and the sync clients
+on one ``httpx`` transport. Neither library is imported until a client asks for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import aiohttp
+    import httpx
+
+DEFAULT_LIMIT = 100
+DEFAULT_LIMIT_PER_HOST = 20
+DEFAULT_KEEPALIVE = 60.0
+DEFAULT_DNS_TTL = 300.0
+
+
+class _SharedTransport:
+    """An ``httpx`` transport that outlives the clients using it.
+
+    ``httpx.Client.close()`` closes its transport, so each client gets this wrapper,
+    and only :meth:`ConnectionPool.close` closes the pool underneath.
+    """
+
+    def __init__(self, transport: "httpx.HTTPTransport"):
+        self._transport = transport
+
+    def handle_request(self, request: "httpx.Request") -> "httpx.Response":
+        return self._transport.handle_request(request)
+
+    def close(self) -> None:
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+class ConnectionPool:
+    """Keep-alive connections, a DNS cache and TLS setup shared by API clients.
+
+    Pass one to any client as ``pool=``, or use :func:`shared_pool` for one per process.
+
+    Parameters
+    ----------
+    limit
+        Open connections at once, across every host.
+    limit_per_host
+        Open connections at once to any one host (``0`` for no limit). Async
+        clients only; ``httpx`` limits connections across all hosts.
+    keepalive
+        Seconds an idle connection is kept open for reuse.
+    dns_ttl
+        Seconds a DNS lookup is reused for (async clients; ``httpx`` has no DNS
+        cache of its own).
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = DEFAULT_LIMIT,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        keepalive: float = DEFAULT_KEEPALIVE,
+        dns_ttl: float = DEFAULT_DNS_TTL,
+    ):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        if limit_per_host < 0:
+            raise ValueError("limit_per_host must not be negative")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive = keepalive
+        self.dns_ttl = dns_ttl
+
+        self._lock = threading.Lock()
+        # aiohttp connectors belong to the loop they were made on
+        self._connectors: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, aiohttp.TCPConnector
+        ] = weakref.WeakKeyDictionary()
+        self._transport: httpx.HTTPTransport | None = None
+
+    # ── aiohttp ────────────────────────────────────────────────────────────
+
+    def connector(self) -> "aiohttp.TCPConnector":
+        """The connector for the running event loop, made on first use."""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            connector = self._connectors.get(loop)
+            if connector is None or connector.closed:
+                connector = self._connectors[loop] = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive,
+                    ttl_dns_cache=self.dns_ttl or None,
+                    use_dns_cache=self.dns_ttl > 0,
+                )
+            return connector
+
+    def session(self, **kwargs: Any) -> "aiohttp.ClientSession":
+        """An ``aiohttp.ClientSession`` whose ``close()`` leaves the pool open."""
+        import aiohttp
+
+        return aiohttp.ClientSession(
+            connector=self.connector(), connector_owner=False, **kwargs
+        )
+
+    # ── httpx ──────────────────────────────────────────────────────────────
+
+    def transport(self) -> "httpx.BaseTransport":
+        """The ``httpx`` transport for sync clients, made on first use."""
+        import httpx
+
+        with self._lock:
+            if self._transport is None:
+                self._transport = httpx.HTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=self.limit,
+                        max_keepalive_connections=self.limit,
+                        keepalive_expiry=self.keepalive,
+                    ),
+                )
+            return _SharedTransport(self._transport)  # type: ignore[return-value]
+
+    def client(self, **kwargs: Any) -> "httpx.Client":
+        """An ``httpx.Client`` whose ``close()`` leaves the pool open."""
+        import httpx
+
+        return httpx.Client(transport=self.transport(), **kwargs)
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────
+
+    def close(self) -> None:
+        """Close the sync connections (async ones close with :meth:`aclose`)."""
+        with self._lock:
+            transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.close()
+
+    async def aclose(self) -> None:
+        """Close the connections for the running event loop, and the sync ones."""
+        with self._lock:
+            connector = self._connectors.pop(asyncio.get_running_loop(), None)
+        if connector is not None:
+            await connector.close()
+        self.close()
+
+
+_shared: ConnectionPool | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool() -> ConnectionPool:
+    """The process-wide :class:`ConnectionPool`, made with defaults on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ConnectionPool()
+        return _shared
@@ -1,31 +1,79 @@
-from ._config import AuthProfile, ConfigManager
-from ._data_async import AsyncDataServiceAuthClient
-from ._data_sync import DataServiceAuthClient
-from ._doover2_async import AsyncDoover2AuthClient
-from ._doover2_sync import Doover2AuthClient
-from ._trusted_publisher import (
-    DEFAULT_DOOVER_OIDC_AUDIENCE,
-    AsyncTrustedPublisherAuthClient,
-    TrustedPublisherAuthClient,
-    async_fetch_github_actions_oidc_token,
-    fetch_github_actions_oidc_token,
-)
-
-__all__ = [
-    "AsyncDataServiceAuthClient",
-    "AsyncDoover2AuthClient",
-    "AsyncTrustedPublisherAuthClient",
-    "AuthProfile",
-    "ConfigManager",
-    "DataServiceAuthClient",
-    "Doover2AuthClient",
-    "DEFAULT_DOOVER_OIDC_AUDIENCE",
-    "TrustedPublisherAuthClient",
-    "async_fetch_github_actions_oidc_token",
-    "fetch_github_actions_oidc_token",
-]
-
-from ._utils import (
-    token_needs_refresh as token_needs_refresh,
-    decode_jwt_exp as decode_jwt_exp,
-)
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._config import (
+        AuthProfile as AuthProfile,
+        ConfigManager as ConfigManager,
+    )
+    from ._data_async import (
+        AsyncDataServiceAuthClient as AsyncDataServiceAuthClient,
+    )
+    from ._data_sync import (
+        DataServiceAuthClient as DataServiceAuthClient,
+    )
+    from ._doover2_async import (
+        AsyncDoover2AuthClient as AsyncDoover2AuthClient,
+    )
+    from ._doover2_sync import (
+        Doover2AuthClient as Doover2AuthClient,
+    )
+    from ._trusted_publisher import (
+        DEFAULT_DOOVER_OIDC_AUDIENCE as DEFAULT_DOOVER_OIDC_AUDIENCE,
+        AsyncTrustedPublisherAuthClient as AsyncTrustedPublisherAuthClient,
+        TrustedPublisherAuthClient as TrustedPublisherAuthClient,
+        async_fetch_github_actions_oidc_token as async_fetch_github_actions_oidc_token,
+        fetch_github_actions_oidc_token as fetch_github_actions_oidc_token,
+    )
+    from ._utils import (
+        token_needs_refresh as token_needs_refresh,
+        decode_jwt_exp as decode_jwt_exp,
+    )
+
+# Sync clients need httpx and async ones aiohttp; load only the ones that are used.
+_LAZY_ATTRS = {
+    "AuthProfile": ("._config", "AuthProfile"),
+    "ConfigManager": ("._config", "ConfigManager"),
+    "AsyncDataServiceAuthClient": ("._data_async", "AsyncDataServiceAuthClient"),
+    "DataServiceAuthClient": ("._data_sync", "DataServiceAuthClient"),
+    "AsyncDoover2AuthClient": ("._doover2_async", "AsyncDoover2AuthClient"),
+    "Doover2AuthClient": ("._doover2_sync", "Doover2AuthClient"),
+    "DEFAULT_DOOVER_OIDC_AUDIENCE": (
+        "._trusted_publisher",
+        "DEFAULT_DOOVER_OIDC_AUDIENCE",
+    ),
+    "AsyncTrustedPublisherAuthClient": (
+        "._trusted_publisher",
+        "AsyncTrustedPublisherAuthClient",
+    ),
+    "TrustedPublisherAuthClient": ("._trusted_publisher", "TrustedPublisherAuthClient"),
+    "async_fetch_github_actions_oidc_token": (
+        "._trusted_publisher",
+        "async_fetch_github_actions_oidc_token",
+    ),
+    "fetch_github_actions_oidc_token": (
+        "._trusted_publisher",
+        "fetch_github_actions_oidc_token",
+    ),
+    "token_needs_refresh": ("._utils", "token_needs_refresh"),
+    "decode_jwt_exp": ("._utils", "decode_jwt_exp"),
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    try:
+        module_path, attr_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    from importlib import import_module
+
+    module = import_module(module_path, __name__)
+    value = getattr(module, attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
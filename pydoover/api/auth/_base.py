@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
 import aiohttp
 
 from ._utils import decode_jwt_exp_datetime, token_needs_refresh
 
+if TYPE_CHECKING:
+    import httpx
+
+    from .._pool import ConnectionPool
+
+log = logging.getLogger(__name__)
+
 DEFAULT_CONTROL_BASE_URL = "https://api.doover.com"
 DEFAULT_DATA_BASE_URL = "https://data.doover.com/api"
 DEFAULT_AUTH_SERVER_URL = "https://auth.doover.com"
@@ -125,6 +135,9 @@ class SyncAuthBase:
         self.token_expires: datetime | None = _normalise_datetime(token_expires)
         if self._token and self.token_expires is None:
             self.token_expires = decode_jwt_exp_datetime(self._token)
+        # set by a client created with ``pool=``, to share its connections
+        self.pool: ConnectionPool | None = None
+        self._refresh_lock = threading.Lock()
 
     @property
     def token(self) -> str | None:
@@ -159,7 +172,18 @@ class SyncAuthBase:
 
     def ensure_token(self) -> None:
         if token_needs_refresh(self._token, self.token_expires):
-            self.refresh_access_token()
+            with self._refresh_lock:
+                # another thread may have refreshed it while this one waited
+                if token_needs_refresh(self._token, self.token_expires):
+                    self.refresh_access_token()
+
+    def _post(self, url: str, **kwargs: Any) -> httpx.Response:
+        if self.pool is None:
+            import httpx
+
+            return httpx.post(url, **kwargs)
+        with self.pool.client() as client:
+            return client.post(url, **kwargs)
 
     def refresh_access_token(self) -> None:
         raise NotImplementedError
@@ -168,22 +192,41 @@ class SyncAuthBase:
         return None
 
 
+def _log_background_refresh(task: asyncio.Task) -> None:
+    # nobody may await a background refresh; the next request retries it
+    if not task.cancelled() and task.exception() is not None:
+        log.warning("Background token refresh failed: %s", task.exception())
+
+
 class AsyncAuthBase:
+    """Shared token handling for the async auth clients.
+
+    Concurrent requests that find the token expired share one refresh rather than
+    each starting their own. With ``refresh_ahead`` set, a request made within that
+    many seconds of expiry starts a refresh in the background and carries on with the
+    current token, so requests only wait on a refresh once the token has lapsed.
+    """
+
     def __init__(
         self,
         *,
         token: str | None = None,
         token_expires: datetime | float | int | None = None,
         timeout: float = 60.0,
+        refresh_ahead: float | None = None,
     ):
         self.timeout = timeout
+        self.refresh_ahead = refresh_ahead
         # Treat an empty token the same as no token at all, so the refresh
         # path (client credentials / refresh token) still engages.
         self._token: str | None = token or None
         self.token_expires: datetime | None = _normalise_datetime(token_expires)
         if self._token and self.token_expires is None:
             self.token_expires = decode_jwt_exp_datetime(self._token)
+        # set by a client created with ``pool=``, to share its connections
+        self.pool: ConnectionPool | None = None
         self._session: aiohttp.ClientSession | None = None
+        self._refresh_task: asyncio.Task | None = None
 
     @property
     def token(self) -> str | None:
@@ -218,17 +261,39 @@ class AsyncAuthBase:
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if not self._session or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            if self.pool is not None:
+                self._session = self.pool.session()
+            else:
+                self._session = aiohttp.ClientSession()
         return self._session
 
     async def ensure_token(self) -> None:
         if token_needs_refresh(self._token, self.token_expires):
-            await self.refresh_access_token()
+            # shielded, so one caller's cancellation doesn't fail the others
+            await asyncio.shield(self._start_refresh())
+        elif self.refresh_ahead is not None and token_needs_refresh(
+            self._token, self.token_expires, self.refresh_ahead
+        ):
+            self._start_refresh(background=True)
+
+    def _start_refresh(self, background: bool = False) -> asyncio.Task:
+        """Return the refresh in flight, or start one."""
+        task = self._refresh_task
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._refresh_task = loop.create_task(self.refresh_access_token())
+            if background:
+                task.add_done_callback(_log_background_refresh)
+        return task
 
     async def refresh_access_token(self) -> None:
         raise NotImplementedError
 
     async def close(self) -> None:
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
         if self._session and not self._session.closed:
             await self._session.close()
         self._session = None
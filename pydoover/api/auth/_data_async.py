@@ -21,11 +21,13 @@ class AsyncDataServiceAuthClient(AsyncAuthBase):
         client_id: str | None = None,
         client_secret: str | None = None,
         timeout: float = 60.0,
+        refresh_ahead: float | None = None,
     ):
         super().__init__(
             token=token,
             token_expires=token_expires,
             timeout=timeout,
+            refresh_ahead=refresh_ahead,
         )
         self.data_base_url = data_base_url.rstrip("/")
         self.client_id = client_id
@@ -3,8 +3,6 @@ from __future__ import annotations
 import logging
 from base64 import b64encode
 
-import httpx
-
 from ...models.data.exceptions import TokenRefreshError
 from ._base import DEFAULT_DATA_BASE_URL, SyncAuthBase
 
@@ -40,7 +38,7 @@ class DataServiceAuthClient(SyncAuthBase):
         credentials = b64encode(
             f"{self.client_id}:{self.client_secret}".encode()
         ).decode()
-        resp = httpx.post(
+        resp = self._post(
             f"{self.data_base_url}/oauth2/token",
             data={"grant_type": "client_credentials", "scope": ""},
             headers={
@@ -30,11 +30,13 @@ class AsyncDoover2AuthClient(AsyncAuthBase):
         auth_server_url: str | None = DEFAULT_AUTH_SERVER_URL,
         auth_server_client_id: str | None = None,
         timeout: float = 60.0,
+        refresh_ahead: float | None = None,
     ):
         super().__init__(
             token=token,
             token_expires=token_expires,
             timeout=timeout,
+            refresh_ahead=refresh_ahead,
         )
         self.refresh_token = refresh_token
         self.refresh_token_id = refresh_token_id
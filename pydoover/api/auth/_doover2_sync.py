@@ -2,8 +2,6 @@ from __future__ import annotations
 
 import logging
 
-import httpx
-
 from ...models.data.exceptions import TokenRefreshError
 from ._base import (
     DEFAULT_AUTH_SERVER_URL,
@@ -81,7 +79,7 @@ class Doover2AuthClient(SyncAuthBase):
                 "Token expired and Doover 2 refresh configuration is incomplete."
             )
 
-        resp = httpx.post(
+        resp = self._post(
             f"{self.auth_server_url}/oauth2/token",
             params={
                 "grant_type": "refresh_token",
@@ -147,7 +147,7 @@ class TrustedPublisherAuthClient(SyncAuthBase):
 
     def refresh_access_token(self) -> None:
         oidc_token = self._get_oidc_token()
-        resp = httpx.post(
+        resp = self._post(
             f"{self.control_base_url}{MINT_TOKEN_PATH}",
             json={"provider": self.provider, "token": oidc_token},
             timeout=self.timeout,
@@ -173,8 +173,9 @@ class AsyncTrustedPublisherAuthClient(AsyncAuthBase):
         audience: str = DEFAULT_DOOVER_OIDC_AUDIENCE,
         control_base_url: str | None = DEFAULT_CONTROL_BASE_URL,
         timeout: float = 60.0,
+        refresh_ahead: float | None = None,
     ):
-        super().__init__(token=None, timeout=timeout)
+        super().__init__(token=None, timeout=timeout, refresh_ahead=refresh_ahead)
         self.provider = provider
         self.audience = audience
         self._oidc_token = oidc_token
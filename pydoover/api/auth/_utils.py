@@ -35,12 +35,16 @@ def decode_jwt_exp_datetime(token: str) -> datetime | None:
     return datetime.fromtimestamp(exp, tz=timezone.utc)
 
 
-def token_needs_refresh(token: str | None, expires_at: datetime | float | None) -> bool:
-    """Return True if the token is missing or expired (or about to expire)."""
+def token_needs_refresh(
+    token: str | None,
+    expires_at: datetime | float | None,
+    buffer: float = _EXPIRY_BUFFER_SECS,
+) -> bool:
+    """Return True if the token is missing or expires within ``buffer`` seconds."""
     if not token:  # None or empty string
         return True
     if expires_at is None:
         return False  # No expiry info — assume valid
     if isinstance(expires_at, datetime):
         expires_at = expires_at.timestamp()
-    return time.time() >= (expires_at - _EXPIRY_BUFFER_SECS)
+    return time.time() >= (expires_at - buffer)
@@ -66,14 +66,18 @@ class AsyncControlClient(AsyncControlClientGroups, BaseControlClient):
         if self._session and not self._session.closed:
             await self._session.close()
             await asyncio.sleep(0.05)
-        self._session = aiohttp.ClientSession(
-            headers={"User-Agent": self._user_agent},
-        )
+        if self.pool is not None:
+            self._session = self.pool.session(headers={"User-Agent": self._user_agent})
+        else:
+            self._session = aiohttp.ClientSession(
+                headers={"User-Agent": self._user_agent},
+            )
 
     async def close(self) -> None:
         if self._session:
             await self._session.close()
-            await asyncio.sleep(0.05)
+            if self.pool is None:
+                await asyncio.sleep(0.05)
             self._session = None
         if self._owns_auth:
             await self.auth.close()
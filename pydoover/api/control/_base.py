@@ -5,7 +5,16 @@ import platform
 from collections.abc import Collection
 from dataclasses import dataclass
 from functools import cached_property
-from typing import Any, Callable, Generic, Protocol, TypeVar, cast, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Protocol,
+    TypeVar,
+    cast,
+    overload,
+)
 from urllib.parse import urlencode
 
 from ..auth import (
@@ -32,6 +41,9 @@ _python_version = platform.python_version()
 TControlModel = TypeVar("TControlModel", bound=control_models.ControlModel)
 TValue = TypeVar("TValue")
 
+if TYPE_CHECKING:
+    from .._pool import ConnectionPool
+
 
 class ControlMethodUnavailableError(AttributeError):
     pass
@@ -320,9 +332,13 @@ class BaseControlClient:
         max_retries: int = 3,
         retry_delay: float = 1.0,
         timeout: float = 60.0,
+        pool: ConnectionPool | None = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.auth = auth
+        self.pool = pool
+        if pool is not None and owns_auth:
+            auth.pool = pool
         self.organisation_id = int(organisation_id) if organisation_id else None
         self.max_retries = max_retries
         self.retry_delay = retry_delay
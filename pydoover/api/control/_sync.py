@@ -46,11 +46,15 @@ class ControlClient(ControlClientGroups, BaseControlClient):
         )
         super().__init__(resolved_base_url, auth=auth, owns_auth=owns_auth, **kwargs)
         self.auth = auth
-        self._session = httpx.Client(
-            timeout=self.timeout,
-            follow_redirects=True,
-            headers={"User-Agent": self._user_agent},
-        )
+        session_kwargs = {
+            "timeout": self.timeout,
+            "follow_redirects": True,
+            "headers": {"User-Agent": self._user_agent},
+        }
+        if self.pool is not None:
+            self._session = self.pool.client(**session_kwargs)
+        else:
+            self._session = httpx.Client(**session_kwargs)
         _attach_sync_groups(self)
 
     def close(self) -> None:
@@ -1,9 +1,63 @@
-from ._async import AsyncDataClient as AsyncDataClient
-from ._sync import DataClient as DataClient
-from ._base import UNSET as UNSET
-from ._iterators import (
-    AsyncMessageIterator as AsyncMessageIterator,
-    AsyncMultiAgentMessageIterator as AsyncMultiAgentMessageIterator,
-    MessageIterator as MessageIterator,
-    MultiAgentMessageIterator as MultiAgentMessageIterator,
-)
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._async import (
+        AsyncDataClient as AsyncDataClient,
+    )
+    from ._sync import (
+        DataClient as DataClient,
+    )
+    from ._base import (
+        UNSET as UNSET,
+    )
+    from ._cache import (
+        MessageCache as MessageCache,
+    )
+    from ._responses import (
+        ResponseCache as ResponseCache,
+        ResponseCacheStats as ResponseCacheStats,
+    )
+    from ._iterators import (
+        AsyncMessageIterator as AsyncMessageIterator,
+        AsyncMessageScan as AsyncMessageScan,
+        AsyncMultiAgentMessageIterator as AsyncMultiAgentMessageIterator,
+        MessageIterator as MessageIterator,
+        MessageScan as MessageScan,
+        MultiAgentMessageIterator as MultiAgentMessageIterator,
+    )
+
+# The sync client needs httpx and the async one aiohttp; load only the one that is used.
+_LAZY_ATTRS = {
+    "AsyncDataClient": ("._async", "AsyncDataClient"),
+    "DataClient": ("._sync", "DataClient"),
+    "UNSET": ("._base", "UNSET"),
+    "MessageCache": ("._cache", "MessageCache"),
+    "ResponseCache": ("._responses", "ResponseCache"),
+    "ResponseCacheStats": ("._responses", "ResponseCacheStats"),
+    "AsyncMessageIterator": ("._iterators", "AsyncMessageIterator"),
+    "AsyncMessageScan": ("._iterators", "AsyncMessageScan"),
+    "AsyncMultiAgentMessageIterator": ("._iterators", "AsyncMultiAgentMessageIterator"),
+    "MessageIterator": ("._iterators", "MessageIterator"),
+    "MessageScan": ("._iterators", "MessageScan"),
+    "MultiAgentMessageIterator": ("._iterators", "MultiAgentMessageIterator"),
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    try:
+        module_path, attr_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    from importlib import import_module
+
+    module = import_module(module_path, __name__)
+    value = getattr(module, attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
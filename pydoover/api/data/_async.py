@@ -11,11 +11,12 @@ Usage::
 import asyncio
 import json
 import logging
+from collections.abc import AsyncIterable, Iterable
 from typing import Any
 
 import aiohttp
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from .._json import dumps as _json_dumps, loads as _json_loads
 from .._compress import MIN_COMPRESS_SIZE, compress_body
@@ -32,7 +33,14 @@ from ._base import (
     build_async_auth,
 )
 
-from ._iterators import AsyncMessageIterator, AsyncMultiAgentMessageIterator
+from ._cache import merge_fetched
+from ._bulk import bulk_mutate_async
+from ._columns import ColumnBuilder
+from ._iterators import (
+    AsyncMessageIterator,
+    AsyncMessageScan,
+    AsyncMultiAgentMessageIterator,
+)
 from ...models.data import (
     Aggregate,
     AgentNotificationResponse,
@@ -41,12 +49,15 @@ from ...models.data import (
     BatchMessageResponse,
     BatchMutationItem,
     BatchMutationResponse,
+    BulkMutationResponse,
+    MAX_BATCH_MUTATIONS,
     Channel,
     File,
     Message,
     MessageLogEntry,
     ProcessorTokenResponse,
     SubscriptionInfo,
+    TimeseriesColumns,
     TimeseriesResponse,
     ConfirmedDeviceToken,
     RotatedDeviceToken,
@@ -91,18 +102,23 @@ class AsyncDataClient(BaseClient):
             await self._session.close()
             await asyncio.sleep(0.05)
 
-        self._session = aiohttp.ClientSession(
-            headers={"User-Agent": self._user_agent},
-        )
+        if self.pool is not None:
+            self._session = self.pool.session(headers={"User-Agent": self._user_agent})
+        else:
+            self._session = aiohttp.ClientSession(
+                headers={"User-Agent": self._user_agent},
+            )
 
     async def close(self):
         """Close the underlying aiohttp sessions."""
         if self._session:
             await self._session.close()
-            await asyncio.sleep(0.05)  # let SSL cleanup finish
+            if self.pool is None:
+                await asyncio.sleep(0.05)  # let SSL cleanup finish
             self._session = None
         if self._owns_auth:
             await self.auth.close()
+        self._close_cache()
 
     async def __aenter__(self):
         await self.setup()
@@ -127,6 +143,36 @@ class AsyncDataClient(BaseClient):
         files: list[File] | None = None,
         params: dict[str, Any] | None = None,
         organisation_id: int | None = None,
+    ) -> Any:
+        responses = self.response_cache
+        if responses is None:
+            return await self._send(method, path, data, files, params, organisation_id)
+        if method != "GET":
+            try:
+                return await self._send(
+                    method, path, data, files, params, organisation_id
+                )
+            finally:
+                responses.invalidate(path, data)
+
+        body = await responses.fetch_async(
+            self._response_key(path, params, organisation_id),
+            path,
+            lambda: self._send(
+                method, path, data, files, params, organisation_id, decode=False
+            ),
+        )
+        return _json_loads(body) if body else None
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        data: dict | None = None,
+        files: list[File] | None = None,
+        params: dict[str, Any] | None = None,
+        organisation_id: int | None = None,
+        decode: bool = True,
     ) -> Any:
         self._ensure_session()
         assert self._session is not None
@@ -200,6 +246,8 @@ class AsyncDataClient(BaseClient):
                         text = await resp.text()
                         _raise_for_status(status, text, url)
 
+                    if not decode:
+                        return await resp.read()
                     if resp.content_length == 0:
                         return None
                     return await resp.json(loads=_json_loads)
@@ -365,11 +413,15 @@ class AsyncDataClient(BaseClient):
         field_names: list[str] | None = None,
         organisation_id: int | None = None,
         page_size: int = 50,
+        prefetch: int = 1,
     ) -> AsyncMessageIterator:
         """Return an async paginating iterator over channel messages.
 
         Use as ``async for msg in client.iter_messages(...)`` or call
         ``await .collect()`` to load all matching messages into a list.
+
+        Up to ``prefetch`` pages are fetched ahead while the current page is consumed
+        (0 fetches each page on demand).
         """
         return AsyncMessageIterator(
             self,
@@ -380,8 +432,95 @@ class AsyncDataClient(BaseClient):
             field_names=field_names,
             organisation_id=organisation_id,
             page_size=page_size,
+            prefetch=prefetch,
+        )
+
+    def scan_messages(
+        self,
+        agent_id: int,
+        channel_name: str,
+        after: int | datetime,
+        before: int | datetime | None = None,
+        shards: int = 8,
+        concurrency: int = 4,
+        ordered: bool = True,
+        field_names: list[str] | None = None,
+        page_size: int = 50,
+        organisation_id: int | None = None,
+        buffer_pages: int | None = 8,
+    ) -> AsyncMessageScan:
+        """Return an iterator that scans a time range with concurrent requests.
+
+        The range ``(after, before)`` (``before`` defaults to now) is split into
+        ``shards`` time slices, paged through ``concurrency`` at a time. Messages come
+        newest first, as from :meth:`iter_messages`, or as pages arrive with
+        ``ordered=False``. When ordered, each slice holds at most ``buffer_pages``
+        pages ahead of the consumer (``None`` for no limit). Use as
+        ``async for msg in client.scan_messages(...)`` or call ``await .collect()``.
+        See :class:`AsyncMessageScan`.
+        """
+        return AsyncMessageScan(
+            self,
+            agent_id,
+            channel_name,
+            after=after,
+            before=before,
+            shards=shards,
+            concurrency=concurrency,
+            ordered=ordered,
+            field_names=field_names,
+            organisation_id=organisation_id,
+            page_size=page_size,
+            buffer_pages=buffer_pages,
         )
 
+    async def cached_messages(
+        self,
+        agent_id: int,
+        channel_name: str,
+        after: int | datetime | None = None,
+        before: int | datetime | None = None,
+        organisation_id: int | None = None,
+        page_size: int = 200,
+    ) -> list[Message]:
+        """Messages with ``after < id < before``, newest first, read through the cache.
+
+        Only the parts of the range that the client's :class:`MessageCache` hasn't
+        fetched before go to the server (usually just the messages since the last
+        call); the rest is read from disk. Needs a client created with ``cache=``.
+        Leaving out ``after`` syncs the channel's whole history on the first call.
+        """
+        cache = self._require_cache()
+        # SQLite calls block, so they run on a worker thread
+        gaps = await asyncio.to_thread(
+            cache.missing, agent_id, channel_name, after, before
+        )
+        cached = await asyncio.to_thread(
+            cache.query, agent_id, channel_name, after, before
+        )
+        fetched = []
+        for gap_after, gap_before, settled in gaps:
+            messages = await AsyncMessageIterator(
+                self,
+                agent_id,
+                channel_name,
+                after=gap_after,
+                before=gap_before,
+                organisation_id=organisation_id,
+                page_size=page_size,
+            ).collect()
+            await asyncio.to_thread(
+                cache.store,
+                agent_id,
+                channel_name,
+                messages,
+                gap_after,
+                gap_before,
+                settled,
+            )
+            fetched.append((gap_after, gap_before, messages))
+        return merge_fetched(cached, fetched)
+
     async def fetch_message(
         self,
         agent_id: int,
@@ -523,6 +662,58 @@ class AsyncDataClient(BaseClient):
         )
         return TimeseriesResponse.from_dict(data)
 
+    async def fetch_timeseries_columns(
+        self,
+        agent_id: int,
+        channel_name: str,
+        field_names: list[str] | None = None,
+        before: int | datetime | None = None,
+        after: int | datetime | None = None,
+        downsample: timedelta | float | None = None,
+        aggregate: str = "mean",
+        page_size: int | None = None,
+        organisation_id: int | None = None,
+    ) -> TimeseriesColumns:
+        """Fetch a timeseries as per-field arrays, following every page.
+
+        Each page is folded into contiguous arrays of timestamps, values and null masks
+        as it arrives (NumPy arrays if NumPy is installed, :class:`array.array`
+        otherwise), rather than a :class:`DataPoint` per point.
+
+        Parameters
+        ----------
+        field_names
+            Fields to fetch. The server only returns these, and each gets a column even
+            if it has no points. If None, every field the points carry gets a column.
+        downsample
+            Bucket width (a timedelta or seconds). Points are folded into buckets as
+            each page arrives, so only one value per bucket is ever held.
+        aggregate
+            How each bucket's values are combined: ``"mean"``, ``"min"``, ``"max"``,
+            ``"first"`` or ``"last"``. Values that aren't numbers only count toward
+            ``"first"`` and ``"last"``.
+        page_size
+            Points per request; the server's default if None.
+        """
+        builder = ColumnBuilder(field_names, downsample, aggregate)
+        cursor = _to_snowflake(before)
+        after = _to_snowflake(after)
+        while True:
+            data = await self._request(
+                "GET",
+                f"/agents/{agent_id}/channels/{channel_name}/messages/timeseries",
+                params={
+                    "field_name": field_names,
+                    "before": cursor,
+                    "after": after,
+                    "limit": page_size,
+                },
+                organisation_id=organisation_id,
+            )
+            cursor = builder.add_page(data, cursor)
+            if cursor is None:
+                return builder.finish()
+
     # ── Aggregates ─────────────────────────────────────────────────────────
 
     async def fetch_channel_aggregate(
@@ -638,11 +829,15 @@ class AsyncDataClient(BaseClient):
         field_names: list[str] | None = None,
         organisation_id: int | None = None,
         page_size: int = 50,
+        prefetch: int = 1,
     ) -> AsyncMultiAgentMessageIterator:
         """Return an async paginating iterator over multi-agent channel messages.
 
         Use as ``async for msg in client.iter_multi_agent_messages(...)`` or call
         ``await .collect()`` to load all matching messages into a list.
+
+        Up to ``prefetch`` pages are fetched ahead while the current page is consumed
+        (0 fetches each page on demand).
         """
         return AsyncMultiAgentMessageIterator(
             self,
@@ -654,6 +849,7 @@ class AsyncDataClient(BaseClient):
             field_names=field_names,
             organisation_id=organisation_id,
             page_size=page_size,
+            prefetch=prefetch,
         )
 
     async def fetch_multi_agent_aggregates(
@@ -744,6 +940,132 @@ class AsyncDataClient(BaseClient):
         )
         return BatchMutationResponse.from_dict(data)
 
+    # Bulk mutations split any number of items into batches, keep ``concurrency``
+    # batches in flight on tasks, and resend only the items a batch reports as
+    # failed, backing off between attempts. A batch the server refuses outright (4xx)
+    # marks all of its items failed; one lost to a 5xx, timeout or dropped connection is
+    # resent the same way. Only failures are kept, so memory stays flat however
+    # many items the iterable or async iterable yields.
+
+    async def bulk_create_messages(
+        self,
+        items: Iterable[BatchMutationItem] | AsyncIterable[BatchMutationItem],
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float | None = None,
+        chunk_size: int = MAX_BATCH_MUTATIONS,
+        organisation_id: int | None = None,
+    ) -> BulkMutationResponse:
+        """Create any number of messages through :meth:`batch_create_messages`.
+
+        Parameters
+        ----------
+        items
+            The messages to create, read lazily one batch at a time.
+        concurrency
+            Batches in flight at once.
+        max_attempts
+            Tries per item, including the first, before it's reported as failed.
+        retry_delay
+            Seconds before the first retry of a batch's failures, doubling after
+            each. Defaults to the client's ``retry_delay``.
+        chunk_size
+            Items per request, up to ``MAX_BATCH_MUTATIONS``.
+
+        Give items a ``message_id`` if they may be retried: without one, a retry
+        after a lost response creates a duplicate message.
+        """
+        return await self._bulk_mutate(
+            lambda chunk: self.batch_create_messages(chunk, organisation_id),
+            items,
+            concurrency,
+            max_attempts,
+            retry_delay,
+            chunk_size,
+        )
+
+    async def bulk_update_messages(
+        self,
+        items: Iterable[BatchMutationItem] | AsyncIterable[BatchMutationItem],
+        replace_data: bool = False,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float | None = None,
+        chunk_size: int = MAX_BATCH_MUTATIONS,
+        organisation_id: int | None = None,
+    ) -> BulkMutationResponse:
+        """Update any number of messages through :meth:`batch_update_messages`.
+
+        See :meth:`bulk_create_messages` for the other parameters.
+        """
+        return await self._bulk_mutate(
+            lambda chunk: self.batch_update_messages(
+                chunk, replace_data, organisation_id
+            ),
+            items,
+            concurrency,
+            max_attempts,
+            retry_delay,
+            chunk_size,
+        )
+
+    async def bulk_delete_messages(
+        self,
+        items: Iterable[BatchMutationItem] | AsyncIterable[BatchMutationItem],
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float | None = None,
+        chunk_size: int = MAX_BATCH_MUTATIONS,
+        organisation_id: int | None = None,
+    ) -> BulkMutationResponse:
+        """Delete any number of messages through :meth:`batch_delete_messages`.
+
+        See :meth:`bulk_create_messages` for the parameters.
+        """
+        return await self._bulk_mutate(
+            lambda chunk: self.batch_delete_messages(chunk, organisation_id),
+            items,
+            concurrency,
+            max_attempts,
+            retry_delay,
+            chunk_size,
+        )
+
+    async def bulk_update_aggregates(
+        self,
+        items: Iterable[BatchMutationItem] | AsyncIterable[BatchMutationItem],
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float | None = None,
+        chunk_size: int = MAX_BATCH_MUTATIONS,
+        organisation_id: int | None = None,
+    ) -> BulkMutationResponse:
+        """Patch any number of aggregates through :meth:`batch_update_aggregates`.
+
+        See :meth:`bulk_create_messages` for the parameters.
+        """
+        return await self._bulk_mutate(
+            lambda chunk: self.batch_update_aggregates(chunk, organisation_id),
+            items,
+            concurrency,
+            max_attempts,
+            retry_delay,
+            chunk_size,
+        )
+
+    async def _bulk_mutate(
+        self, send, items, concurrency, max_attempts, retry_delay, chunk_size
+    ) -> BulkMutationResponse:
+        return await bulk_mutate_async(
+            send,
+            items,
+            chunk_size=chunk_size,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            retry_delay=self.retry_delay if retry_delay is None else retry_delay,
+            transient=(aiohttp.ClientError, asyncio.TimeoutError),
+        )
+
     # ── Alarms ─────────────────────────────────────────────────────────────
 
     async def list_alarms(
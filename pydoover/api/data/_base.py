@@ -1,22 +1,17 @@
 import inspect
 import json
 import logging
+import os
 import platform
 from collections.abc import Sequence
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urlencode
 
-from ..auth import (
-    AsyncDataServiceAuthClient,
-    AsyncDoover2AuthClient,
-    AuthProfile,
-    DataServiceAuthClient,
-    Doover2AuthClient,
-)
 from ..auth._base import (
     DEFAULT_DATA_BASE_URL,
     AsyncAuthClient,
+    AuthProfile,
     SyncAuthClient,
     _normalise_datetime,
 )
@@ -32,6 +27,11 @@ from ...models.data.exceptions import (
     UnauthorizedError,
 )
 
+if TYPE_CHECKING:
+    from .._pool import ConnectionPool
+    from ._cache import MessageCache
+    from ._responses import ResponseCache
+
 log = logging.getLogger(__name__)
 
 _python_version = platform.python_version()
@@ -114,6 +114,9 @@ class BaseClient:
         timeout: float = 60.0,
         compress: str | None = "gzip",
         compress_level: int | None = None,
+        cache: "MessageCache | str | os.PathLike | None" = None,
+        response_cache: "ResponseCache | None" = None,
+        pool: "ConnectionPool | None" = None,
     ):
         if compress is not None and compress not in SUPPORTED_ENCODINGS:
             raise ValueError(
@@ -122,6 +125,9 @@ class BaseClient:
             )
         self.base_url = base_url.rstrip("/")
         self.auth = auth
+        self.pool = pool
+        if pool is not None and owns_auth:
+            auth.pool = pool
         self.agent_id: int | None = int(agent_id) if agent_id else None
         self.organisation_id: int | None = (
             int(organisation_id) if organisation_id else None
@@ -132,6 +138,35 @@ class BaseClient:
         self._owns_auth = owns_auth
         self.compress = compress
         self.compress_level = compress_level
+        # a path is opened here and closed with the client; a cache object is shared
+        self._owns_cache = isinstance(cache, (str, os.PathLike))
+        if self._owns_cache:
+            from ._cache import MessageCache
+
+            cache = MessageCache(cache)
+        self.cache: "MessageCache | None" = cache
+        self.response_cache = response_cache
+
+    def _require_cache(self) -> "MessageCache":
+        if self.cache is None:
+            raise RuntimeError(
+                "this client has no message cache; pass cache=MessageCache(...) or a "
+                "file path when creating it."
+            )
+        return self.cache
+
+    def _close_cache(self):
+        if self._owns_cache and self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def _response_key(
+        self, path: str, params: dict[str, Any] | None, organisation_id: int | None
+    ) -> tuple[str, int | None]:
+        url = self._build_url(path)
+        if params:
+            url += self._build_query(params)
+        return url, organisation_id or self.organisation_id
 
     def _resolve_agent_id(self, agent_id: int | None) -> int:
         """Return the given *agent_id*, falling back to ``self.agent_id``."""
@@ -292,6 +327,10 @@ def build_sync_auth(
     auth_server_url: str | None = None,
     auth_server_client_id: str | None = None,
 ) -> tuple[SyncAuthClient, str, bool]:
+    # imported here so async-only users (processors) never load httpx
+    from ..auth._data_sync import DataServiceAuthClient
+    from ..auth._doover2_sync import Doover2AuthClient
+
     _validate_profile_input(profile)
     raw_inputs = {
         "profile": profile,
@@ -437,6 +476,9 @@ def build_async_auth(
     auth_server_url: str | None = None,
     auth_server_client_id: str | None = None,
 ) -> tuple[AsyncAuthClient, str, bool]:
+    from ..auth._data_async import AsyncDataServiceAuthClient
+    from ..auth._doover2_async import AsyncDoover2AuthClient
+
     _validate_profile_input(profile)
     raw_inputs = {
         "profile": profile,
@@ -0,0 +1,271 @@
+"""Bulk mutations built on the batch endpoints.
+
+The batch endpoints take at most ``MAX_BATCH_MUTATIONS`` items and can partially
+succeed. The bulk helpers take any number of items from an iterable (or an async
+iterable) and split them into batches. They keep ``concurrency`` batches in flight and
+resend only the failed items of each batch, backing off between attempts.
+
+Items are pulled from the input one batch at a time as workers free up, so at most
+``concurrency`` batches are held at once, and only failures are kept for the result.
+
+A batch the server refuses outright (a 4xx other than 401) fails its items. One lost to
+a server error, connection error or timeout (after the client's own retries) is resent
+like a partial failure, then fails its items if the last attempt is lost too. Either
+way the other batches carry on; only an authentication error stops the run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from ...models.data import (
+    MAX_BATCH_MUTATIONS,
+    BatchMutationItem,
+    BatchMutationResponse,
+    BulkMutationFailure,
+    BulkMutationResponse,
+    HTTPError,
+)
+
+DEFAULT_BULK_CONCURRENCY = 4
+DEFAULT_BULK_ATTEMPTS = 3
+
+
+def _check_bulk_args(chunk_size: int, concurrency: int, max_attempts: int):
+    if not 1 <= chunk_size <= MAX_BATCH_MUTATIONS:
+        raise ValueError(f"chunk_size must be between 1 and {MAX_BATCH_MUTATIONS}")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be at least 1")
+
+
+def _chunks(items: Iterable[BatchMutationItem], size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _chunks_async(
+    items: Iterable[BatchMutationItem] | AsyncIterable[BatchMutationItem], size: int
+):
+    if not isinstance(items, AsyncIterable):
+        for chunk in _chunks(items, size):
+            yield chunk
+        return
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _Tally:
+    """Running totals for a bulk mutation; only failures are kept item by item."""
+
+    def __init__(self):
+        self.response = BulkMutationResponse()
+
+    def sent(self, chunk: list[BatchMutationItem], attempt: int):
+        self.response.requests += 1
+        if attempt == 1:
+            self.response.count += len(chunk)
+        else:
+            self.response.retried += len(chunk)
+
+    def settle(
+        self,
+        pending: list[BatchMutationItem],
+        response: BatchMutationResponse,
+        attempt: int,
+        final: bool,
+    ) -> list[BatchMutationItem]:
+        """Count a batch's successes and return the items to retry."""
+        failed = [
+            (item, result)
+            for item, result in zip(pending, response.items)
+            if not result.success
+        ]
+        # items the response doesn't mention can't be assumed written
+        failed.extend((item, None) for item in pending[len(response.items) :])
+        self.response.succeeded += len(pending) - len(failed)
+        if not final:
+            return [item for item, _ in failed]
+        for item, result in failed:
+            error = result.error if result is not None else "no result returned"
+            self.fail(item, error, attempt)
+        return []
+
+    def fail(self, item: BatchMutationItem, error: str | None, attempt: int):
+        self.response.failures.append(BulkMutationFailure(item, error, attempt))
+
+
+def _refused(error: Exception) -> bool:
+    # a batch the server rejected outright; bad credentials would fail every batch
+    return (
+        isinstance(error, HTTPError)
+        and 400 <= error.status < 500
+        and error.status != 401
+    )
+
+
+def _lost(error: Exception, transient: tuple[type[BaseException], ...]) -> bool:
+    # a 5xx is raised once the client's own retries run out, and is as temporary as
+    # a dropped connection
+    return isinstance(error, transient) or (
+        isinstance(error, HTTPError) and error.status >= 500
+    )
+
+
+def _describe(error: BaseException) -> str:
+    # timeouts often have no message of their own
+    return str(error) or type(error).__name__
+
+
+def _backoff(retry_delay: float, attempt: int) -> float:
+    return retry_delay * 2 ** (attempt - 1)
+
+
+async def bulk_mutate_async(
+    send: Callable[[list[BatchMutationItem]], Awaitable[BatchMutationResponse]],
+    items: Iterable[BatchMutationItem] | AsyncIterable[BatchMutationItem],
+    *,
+    chunk_size: int = MAX_BATCH_MUTATIONS,
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    max_attempts: int = DEFAULT_BULK_ATTEMPTS,
+    retry_delay: float = 1.0,
+    transient: tuple[type[BaseException], ...] = (),
+) -> BulkMutationResponse:
+    """Send ``items`` through ``send`` a batch at a time (see the module docstring).
+
+    ``transient`` lists the connection and timeout errors ``send`` raises once it has
+    given up on a batch; they are retried like a 5xx.
+    """
+    _check_bulk_args(chunk_size, concurrency, max_attempts)
+    chunks = _chunks_async(items, chunk_size)
+    pull = asyncio.Lock()
+    tally = _Tally()
+
+    async def write(chunk: list[BatchMutationItem]):
+        pending = chunk
+        for attempt in range(1, max_attempts + 1):
+            if attempt > 1:
+                await asyncio.sleep(_backoff(retry_delay, attempt - 1))
+            tally.sent(pending, attempt)
+            try:
+                response = await send(pending)
+            except Exception as e:
+                if _refused(e):
+                    # the whole batch was refused, after the client's own retries
+                    for item in pending:
+                        tally.fail(item, str(e), attempt)
+                    return
+                if not _lost(e, transient):
+                    raise
+                if attempt < max_attempts:
+                    continue
+                for item in pending:
+                    tally.fail(item, _describe(e), attempt)
+                return
+            pending = tally.settle(pending, response, attempt, attempt == max_attempts)
+            if not pending:
+                return
+
+    async def worker():
+        while True:
+            async with pull:
+                chunk = await anext(chunks, None)
+            if chunk is None:
+                return
+            await write(chunk)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+    finally:
+        await chunks.aclose()
+    return tally.response
+
+
+def bulk_mutate(
+    send: Callable[[list[BatchMutationItem]], BatchMutationResponse],
+    items: Iterable[BatchMutationItem],
+    *,
+    chunk_size: int = MAX_BATCH_MUTATIONS,
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    max_attempts: int = DEFAULT_BULK_ATTEMPTS,
+    retry_delay: float = 1.0,
+    transient: tuple[type[BaseException], ...] = (),
+) -> BulkMutationResponse:
+    """Send ``items`` through ``send`` a batch at a time, on worker threads."""
+    _check_bulk_args(chunk_size, concurrency, max_attempts)
+    chunks = _chunks(items, chunk_size)
+    pull = threading.Lock()
+    record = threading.Lock()
+    stop = threading.Event()
+    tally = _Tally()
+
+    def write(chunk: list[BatchMutationItem]):
+        pending = chunk
+        for attempt in range(1, max_attempts + 1):
+            if attempt > 1:
+                if stop.wait(_backoff(retry_delay, attempt - 1)):
+                    return
+            with record:
+                tally.sent(pending, attempt)
+            try:
+                response = send(pending)
+            except Exception as e:
+                if _refused(e):
+                    with record:
+                        for item in pending:
+                            tally.fail(item, str(e), attempt)
+                    return
+                if not _lost(e, transient):
+                    raise
+                if attempt < max_attempts:
+                    continue
+                with record:
+                    for item in pending:
+                        tally.fail(item, _describe(e), attempt)
+                return
+            with record:
+                pending = tally.settle(
+                    pending, response, attempt, attempt == max_attempts
+                )
+            if not pending:
+                return
+
+    def worker():
+        try:
+            while not stop.is_set():
+                with pull:
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                write(chunk)
+        except BaseException:
+            stop.set()
+            raise
+
+    with ThreadPoolExecutor(concurrency, thread_name_prefix="pydoover-bulk") as pool:
+        futures = [pool.submit(worker) for _ in range(concurrency)]
+    for future in futures:
+        future.result()
+    return tally.response
@@ -0,0 +1,453 @@
+"""A local SQLite cache of channel messages for the data API clients.
+
+Reports, processors and CLI tools tend to read the same channel history on every run.
+With a :class:`MessageCache` attached to a client, ``cached_messages()`` remembers which
+ranges of snowflake IDs it has already fetched for each (agent, channel). A later query
+only goes to the server for the parts of its range that aren't covered yet: usually
+just the messages since the last call. A fully covered range is answered from disk.
+
+Coverage is tracked as half-open ID ranges ``(lo, hi]``: every message with
+``lo < id <= hi`` is in the cache. Messages newer than ``settle`` seconds are always
+re-fetched and never counted as covered, so a message that reaches the server a
+little late isn't missed.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from contextlib import contextmanager
+from datetime import datetime
+
+from .._json import dumps as _json_dumps, loads as _json_loads
+from ._base import _to_snowflake
+from ...models.data import Attachment, ChannelID, Message
+from ...utils import clock
+from ...utils.snowflake import DOOVER_EPOCH
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_SETTLE = 30.0
+
+# Trim to this fraction of ``max_bytes`` when over, so every write doesn't evict.
+_LOW_WATER = 0.9
+
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    agent_id INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    attachments BLOB,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (agent_id, channel, id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS coverage (
+    agent_id INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    lo INTEGER NOT NULL,
+    hi INTEGER NOT NULL,
+    PRIMARY KEY (agent_id, channel, lo)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS channels (
+    agent_id INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (agent_id, channel)
+) WITHOUT ROWID;
+"""
+
+
+def _now_snowflake() -> int:
+    return int(clock.time() * 1000 - DOOVER_EPOCH) << 22
+
+
+class MessageCache:
+    """Messages stored per (agent, channel) in a SQLite database.
+
+    Pass one to a data client as ``cache=`` (or just the path) and read through
+    ``client.cached_messages()``. One cache file can be shared by several clients and
+    processes.
+
+    Parameters
+    ----------
+    path
+        The database file, created (with its directory) if it doesn't exist.
+        ``":memory:"`` gives a cache that lasts only as long as this object.
+    max_bytes
+        Upper bound on the stored message payloads. When a sync takes the cache past
+        it, the least recently used channels are dropped first. If the channel just
+        synced is too big on its own, its oldest messages are dropped instead.
+    settle
+        Seconds behind now before a message counts as settled. Newer messages are
+        fetched again on every query rather than recorded as covered.
+
+    The cache assumes a channel's history only grows. A message edited or deleted on
+    the server after it was cached keeps its cached form until :meth:`invalidate` is
+    called for its channel. Attachment URLs may also expire while cached.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike = ":memory:",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        settle: float = DEFAULT_SETTLE,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if settle < 0:
+            raise ValueError("settle must not be negative")
+        self.path = os.path.expanduser(os.fspath(path))
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.settle = settle
+        self._lock = threading.RLock()
+        # the async client runs cache calls on worker threads, one at a time
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._setup()
+
+    def _setup(self):
+        conn = self._conn
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+        if version not in (0, _SCHEMA_VERSION):
+            # it's only a cache: start again rather than migrate
+            conn.executescript(
+                "DROP TABLE IF EXISTS messages; DROP TABLE IF EXISTS coverage; "
+                "DROP TABLE IF EXISTS channels;"
+            )
+        conn.executescript(_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"<MessageCache path={self.path!r} bytes={self.size}>"
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # ── Planning ───────────────────────────────────────────────────────────
+
+    def missing(
+        self,
+        agent_id: int,
+        channel_name: str,
+        after: int | datetime | None = None,
+        before: int | datetime | None = None,
+    ) -> list[tuple[int, int, bool]]:
+        """The parts of a range that have to be fetched, oldest first.
+
+        ``after`` and ``before`` are exclusive bounds, as for ``list_messages``. Each
+        entry is ``(after, before, settled)`` with exclusive bounds too. When
+        ``settled`` is true, the range should be passed to :meth:`store` as covered
+        once it has been fetched.
+        """
+        lo = _to_snowflake(after) or 0
+        now = _now_snowflake()
+        hi = min(_to_snowflake(before) - 1, now) if before is not None else now
+        settled_hi = min(hi, now - (int(self.settle * 1000) << 22))
+        if hi <= lo:
+            return []
+
+        gaps = []
+        if settled_hi > lo:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT lo, hi FROM coverage WHERE agent_id = ? AND channel = ? "
+                    "AND hi > ? AND lo < ? ORDER BY lo",
+                    (int(agent_id), channel_name, lo, settled_hi),
+                ).fetchall()
+            cursor = lo
+            for covered_lo, covered_hi in rows:
+                if covered_lo > cursor:
+                    gaps.append((cursor, covered_lo + 1, True))
+                cursor = max(cursor, covered_hi)
+            if cursor < settled_hi:
+                gaps.append((cursor, settled_hi + 1, True))
+        if hi > max(settled_hi, lo):
+            gaps.append((max(settled_hi, lo), hi + 1, False))
+        return gaps
+
+    # ── Reads and writes ───────────────────────────────────────────────────
+
+    def store(
+        self,
+        agent_id: int,
+        channel_name: str,
+        messages: Iterable[Message],
+        after: int,
+        before: int,
+        covered: bool = True,
+    ):
+        """Save ``messages``: everything the server has with ``after < id < before``.
+
+        They replace whatever was cached in that range, and the range is marked as
+        covered unless ``covered`` is false (see :meth:`missing`). Evicts older data if
+        this takes the cache over ``max_bytes``.
+        """
+        agent_id = int(agent_id)
+        after, before = int(after), int(before)
+        rows = []
+        for message in messages:
+            data = Message.data.raw(message)
+            if data is None:
+                data = _json_dumps(message.data)
+            attachments = (
+                _json_dumps([a.to_dict() for a in message.attachments])
+                if message.attachments
+                else None
+            )
+            size = len(data) + (len(attachments) if attachments else 0)
+            rows.append(
+                (
+                    agent_id,
+                    channel_name,
+                    message.id,
+                    message.author_id,
+                    data,
+                    attachments,
+                    size,
+                )
+            )
+
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM messages WHERE agent_id = ? AND channel = ? "
+                "AND id > ? AND id < ?",
+                (agent_id, channel_name, after, before),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            if covered:
+                self._cover(conn, agent_id, channel_name, after, before - 1)
+            (total,) = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM messages "
+                "WHERE agent_id = ? AND channel = ?",
+                (agent_id, channel_name),
+            ).fetchone()
+            conn.execute(
+                "INSERT INTO channels VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (agent_id, channel) "
+                "DO UPDATE SET bytes = excluded.bytes, last_used = excluded.last_used",
+                (agent_id, channel_name, total, clock.time()),
+            )
+            self._evict(conn, agent_id, channel_name)
+
+    @staticmethod
+    def _cover(conn, agent_id: int, channel_name: str, lo: int, hi: int):
+        if hi <= lo:
+            return
+        # merge with every range that overlaps or touches (lo, hi]
+        key = (agent_id, channel_name)
+        rows = conn.execute(
+            "SELECT lo, hi FROM coverage WHERE agent_id = ? AND channel = ? "
+            "AND hi >= ? AND lo <= ?",
+            (*key, lo, hi),
+        ).fetchall()
+        for covered_lo, covered_hi in rows:
+            lo, hi = min(lo, covered_lo), max(hi, covered_hi)
+        conn.execute(
+            "DELETE FROM coverage WHERE agent_id = ? AND channel = ? "
+            "AND lo >= ? AND hi <= ?",
+            (*key, lo, hi),
+        )
+        conn.execute("INSERT INTO coverage VALUES (?, ?, ?, ?)", (*key, lo, hi))
+
+    def query(
+        self,
+        agent_id: int,
+        channel_name: str,
+        after: int | datetime | None = None,
+        before: int | datetime | None = None,
+    ) -> list[Message]:
+        """The cached messages with ``after < id < before``, newest first.
+
+        This only reads what's stored; use :meth:`missing` to find out if it's all
+        there. Payloads are decoded when they are first read.
+        """
+        agent_id = int(agent_id)
+        lo = _to_snowflake(after) or 0
+        hi = _to_snowflake(before)
+        sql = (
+            "SELECT id, author_id, data, attachments FROM messages "
+            "WHERE agent_id = ? AND channel = ? AND id > ?"
+        )
+        args: tuple = (agent_id, channel_name, lo)
+        if hi is not None:
+            sql += " AND id < ?"
+            args += (hi,)
+        sql += " ORDER BY id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+            self._conn.execute(
+                "UPDATE channels SET last_used = ? WHERE agent_id = ? AND channel = ?",
+                (clock.time(), agent_id, channel_name),
+            )
+
+        channel = ChannelID(agent_id, channel_name)
+        return [
+            Message(
+                id,
+                author_id,
+                channel,
+                data,
+                [Attachment.from_dict(a) for a in _json_loads(attachments)]
+                if attachments
+                else [],
+            )
+            for id, author_id, data, attachments in rows
+        ]
+
+    # ── Housekeeping ───────────────────────────────────────────────────────
+
+    @property
+    def size(self) -> int:
+        """Bytes of message payload currently stored."""
+        with self._lock:
+            (total,) = self._conn.execute(
+                "SELECT COALESCE(SUM(bytes), 0) FROM channels"
+            ).fetchone()
+        return total
+
+    def coverage(self, agent_id: int, channel_name: str) -> list[tuple[int, int]]:
+        """The covered ``(lo, hi]`` ID ranges for a channel, oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT lo, hi FROM coverage WHERE agent_id = ? AND channel = ? "
+                "ORDER BY lo",
+                (int(agent_id), channel_name),
+            ).fetchall()
+
+    def invalidate(self, agent_id: int, channel_name: str | None = None):
+        """Forget one channel of an agent, or all of them if ``channel_name`` is None."""
+        where = "agent_id = ?"
+        args: tuple = (int(agent_id),)
+        if channel_name is not None:
+            where += " AND channel = ?"
+            args += (channel_name,)
+        with self._transaction() as conn:
+            for table in ("messages", "coverage", "channels"):
+                conn.execute(f"DELETE FROM {table} WHERE {where}", args)
+
+    def clear(self):
+        """Forget everything."""
+        with self._transaction() as conn:
+            for table in ("messages", "coverage", "channels"):
+                conn.execute(f"DELETE FROM {table}")
+        with self._lock:
+            self._conn.execute("PRAGMA incremental_vacuum")
+
+    def _evict(self, conn, agent_id: int, channel_name: str):
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(bytes), 0) FROM channels"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * _LOW_WATER)
+
+        # least recently used first, and the channel just written to last of all
+        channels = conn.execute(
+            "SELECT agent_id, channel, bytes FROM channels "
+            "ORDER BY (agent_id = ? AND channel = ?), last_used",
+            (agent_id, channel_name),
+        ).fetchall()
+        for key_agent, key_channel, size in channels[:-1]:
+            if total <= target:
+                return
+            key = (key_agent, key_channel)
+            for table in ("messages", "coverage", "channels"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE agent_id = ? AND channel = ?", key
+                )
+            total -= size
+        if total <= target:
+            return
+
+        # the current channel alone is too big: drop its oldest messages
+        key = (agent_id, channel_name)
+        excess = total - target
+        freed = 0
+        cutoff = None
+        oldest = conn.execute(
+            "SELECT id, size FROM messages WHERE agent_id = ? AND channel = ? "
+            "ORDER BY id",
+            key,
+        )
+        for message_id, size in oldest:
+            freed += size
+            cutoff = message_id
+            if freed >= excess:
+                break
+        oldest.close()
+        if cutoff is None:
+            return
+        conn.execute(
+            "DELETE FROM messages WHERE agent_id = ? AND channel = ? AND id <= ?",
+            (*key, cutoff),
+        )
+        conn.execute(
+            "DELETE FROM coverage WHERE agent_id = ? AND channel = ? AND hi <= ?",
+            (*key, cutoff),
+        )
+        conn.execute(
+            "UPDATE coverage SET lo = ? WHERE agent_id = ? AND channel = ? AND lo < ?",
+            (cutoff, *key, cutoff),
+        )
+        conn.execute(
+            "UPDATE channels SET bytes = bytes - ? WHERE agent_id = ? AND channel = ?",
+            (freed, *key),
+        )
+
+
+def merge_fetched(
+    cached: list[Message], fetched: list[tuple[int, int, list[Message]]]
+) -> list[Message]:
+    """``cached`` with each fetched ``(after, before, messages)`` range swapped in.
+
+    The clients build their result this way rather than reading it back after storing,
+    which could miss messages that the store evicted straight away.
+    """
+    if not fetched:
+        return cached
+    merged = [
+        m
+        for m in cached
+        if not any(after < m.id < before for after, before, _ in fetched)
+    ]
+    for _, _, messages in fetched:
+        merged.extend(messages)
+    merged.sort(key=lambda m: m.id, reverse=True)
+    return merged
@@ -0,0 +1,328 @@
+"""Columnar assembly of timeseries pages.
+
+``fetch_timeseries`` builds a :class:`DataPoint` per point, which costs well over a
+hundred bytes each and leaves callers to reshape the points into arrays. The columnar
+fetch feeds each raw page straight into per-field arrays (8 bytes per value) as it
+arrives, or into time buckets when downsampling, so the page can be dropped before
+the next one is requested.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from datetime import timedelta
+from itertools import islice
+from typing import Any
+
+from ...models.data import TimeseriesColumn, TimeseriesColumns
+from ...utils.snowflake import DOOVER_EPOCH
+
+AGGREGATES = ("mean", "min", "max", "first", "last")
+
+# the field a scalar ``value`` belongs to when no field names were requested
+VALUE_FIELD = "value"
+
+_NUMPY = None
+
+
+def _numpy():
+    """NumPy if it's installed, else None. Imported on first use, not with the client."""
+    global _NUMPY
+    if _NUMPY is None:
+        try:
+            import numpy
+        except ImportError:
+            _NUMPY = False
+        else:
+            _NUMPY = numpy
+    return _NUMPY or None
+
+
+def _to_interval(downsample: timedelta | float | None) -> int | None:
+    if downsample is None:
+        return None
+    if isinstance(downsample, timedelta):
+        seconds = downsample.total_seconds()
+    else:
+        seconds = float(downsample)
+    interval = int(round(seconds * 1000))
+    if interval < 1:
+        raise ValueError("downsample must be at least 1 millisecond")
+    return interval
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+def _timestamp(message_id: int) -> int:
+    return (message_id >> 22) + DOOVER_EPOCH
+
+
+class _RawColumn:
+    """Every point of one field, in the order they arrived."""
+
+    __slots__ = ("ids", "values", "objects", "mask")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.values = array("d")
+        # set once a value that isn't a number turns up; replaces ``values``
+        self.objects: list | None = None
+        self.mask = array("B")
+
+    def add(self, message_id: int, value: Any):
+        self.ids.append(message_id)
+        if value is None:
+            self.mask.append(1)
+            if self.objects is None:
+                self.values.append(math.nan)
+            else:
+                self.objects.append(None)
+            return
+
+        self.mask.append(0)
+        if self.objects is None:
+            if _is_number(value):
+                self.values.append(value)
+                return
+            self.objects = [
+                None if masked else v for v, masked in zip(self.values, self.mask)
+            ]
+            self.values = None
+        self.objects.append(value)
+
+    def extend(self, ids: list[int], values: list[Any]):
+        if self.objects is None:
+            try:
+                numbers = array("d", values)
+            except (TypeError, OverflowError):
+                pass  # a null or a value that isn't a number; take them one by one
+            else:
+                self.ids.extend(array("q", ids))
+                self.values.extend(numbers)
+                self.mask.frombytes(bytes(len(numbers)))
+                return
+        for message_id, value in zip(ids, values):
+            self.add(message_id, value)
+
+    def finish(self, name: str) -> TimeseriesColumn:
+        ids, mask = self.ids, self.mask
+        values = self.values if self.objects is None else self.objects
+        if all(a >= b for a, b in zip(ids, islice(ids, 1, None))):
+            # pages arrive newest first, so this is the usual case
+            ids.reverse()
+            mask.reverse()
+            values.reverse()
+        elif not all(a <= b for a, b in zip(ids, islice(ids, 1, None))):
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+            ids = array("q", [ids[i] for i in order])
+            mask = array("B", [mask[i] for i in order])
+            values = (
+                array("d", [values[i] for i in order])
+                if self.objects is None
+                else [values[i] for i in order]
+            )
+        return _column(name, None, values, mask, ids)
+
+
+_EMPTY = object()
+
+
+class _Buckets:
+    """One field folded into fixed-width time buckets as the points arrive."""
+
+    __slots__ = ("interval", "aggregate", "buckets")
+
+    def __init__(self, interval: int, aggregate: str):
+        self.interval = interval
+        self.aggregate = aggregate
+        # bucket index -> aggregate state, or None for a bucket with no usable value
+        self.buckets: dict[int, Any] = {}
+
+    def add(self, message_id: int, value: Any):
+        key = _timestamp(message_id) // self.interval
+        state = self.buckets.get(key, _EMPTY)
+        aggregate = self.aggregate
+        if value is None or (
+            aggregate in ("mean", "min", "max") and not _is_number(value)
+        ):
+            if state is _EMPTY:
+                self.buckets[key] = None
+            return
+
+        if state is _EMPTY or state is None:
+            if aggregate == "mean":
+                state = [value, 1]
+            elif aggregate in ("first", "last"):
+                state = (message_id, value)
+            else:
+                state = value
+        elif aggregate == "mean":
+            state[0] += value
+            state[1] += 1
+        elif aggregate == "min":
+            state = min(state, value)
+        elif aggregate == "max":
+            state = max(state, value)
+        elif aggregate == "first":
+            if message_id < state[0]:
+                state = (message_id, value)
+        elif message_id > state[0]:
+            state = (message_id, value)
+        self.buckets[key] = state
+
+    def finish(self, name: str) -> TimeseriesColumn:
+        keys = sorted(self.buckets)
+        timestamps = array("q", [k * self.interval for k in keys])
+        mask = array("B")
+        values = []
+        for key in keys:
+            state = self.buckets[key]
+            if state is None:
+                mask.append(1)
+                values.append(None)
+                continue
+            mask.append(0)
+            if self.aggregate == "mean":
+                values.append(state[0] / state[1])
+            elif self.aggregate in ("first", "last"):
+                values.append(state[1])
+            else:
+                values.append(state)
+
+        if all(_is_number(v) for v, masked in zip(values, mask) if not masked):
+            values = array("d", [math.nan if v is None else v for v in values])
+        return _column(name, timestamps, values, mask, None)
+
+
+def _column(name, timestamps, values, mask, ids) -> TimeseriesColumn:
+    """Wrap the arrays, as NumPy arrays if it's installed.
+
+    Raw columns pass their message ids and no timestamps, which are worked out from
+    the ids here.
+    """
+    np = _numpy()
+    if np is None:
+        if timestamps is None:
+            timestamps = array("q", [(i >> 22) + DOOVER_EPOCH for i in ids])
+    else:
+        if ids is not None:
+            ids = np.frombuffer(ids, dtype=np.int64)
+        if timestamps is None:
+            timestamps = (ids >> 22) + DOOVER_EPOCH
+        else:
+            timestamps = np.frombuffer(timestamps, dtype=np.int64)
+        mask = np.frombuffer(mask, dtype=np.uint8).view(np.bool_)
+        if isinstance(values, array):
+            values = np.frombuffer(values, dtype=np.float64)
+        else:
+            values = np.array(values, dtype=object)
+    return TimeseriesColumn(name, timestamps, values, mask, ids)
+
+
+class ColumnBuilder:
+    """Accumulates raw timeseries pages into :class:`TimeseriesColumns`.
+
+    ``field_names`` fixes the columns up front; a field a point has no value for is a
+    masked entry. Without it, the columns are whatever fields the points carry.
+    """
+
+    def __init__(
+        self,
+        field_names: list[str] | None = None,
+        downsample: timedelta | float | None = None,
+        aggregate: str = "mean",
+    ):
+        if aggregate not in AGGREGATES:
+            raise ValueError(
+                f"aggregate must be one of {', '.join(AGGREGATES)}, not {aggregate!r}"
+            )
+        self.field_names = list(field_names) if field_names is not None else None
+        self.interval = _to_interval(downsample)
+        self.aggregate = aggregate
+        self.columns: dict[str, _RawColumn | _Buckets] = {}
+        for name in self.field_names or ():
+            self.columns[name] = self._new_column()
+        self.count = 0
+        self.pages = 0
+
+    def _new_column(self) -> _RawColumn | _Buckets:
+        if self.interval is None:
+            return _RawColumn()
+        return _Buckets(self.interval, self.aggregate)
+
+    def _column(self, name: str) -> _RawColumn | _Buckets:
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = self._new_column()
+        return column
+
+    def add_page(self, data: dict[str, Any], cursor: int | None) -> int | None:
+        """Fold in one page and return the cursor for the next, or None at the end.
+
+        The page's ``next`` is passed back as ``before``, like the message listings'
+        cursors, so this also stops if the server hands back the cursor it was given.
+        """
+        results = data.get("results") or []
+        self.pages += 1
+        self.count += len(results)
+        fields = self.field_names
+        if (
+            fields is not None
+            and len(fields) == 1
+            and self.interval is None
+            and not any("field_name" in point for point in results)
+        ):
+            # the usual single-field fetch: take the page in one go
+            self.columns[fields[0]].extend(
+                [int(point["message_id"]) for point in results],
+                [point.get("value") for point in results],
+            )
+        else:
+            for point in results:
+                self._add_point(point)
+
+        following = data.get("next")
+        if not results or following is None:
+            return None
+        following = int(following)
+        if following == cursor:
+            return None
+        return following
+
+    def _add_point(self, point: dict[str, Any]):
+        message_id = int(point["message_id"])
+        value = point.get("value")
+        name = point.get("field_name")
+        if name is not None:
+            self._column(name).add(message_id, value)
+            return
+
+        fields = self.field_names
+        if fields is not None and len(fields) == 1:
+            self.columns[fields[0]].add(message_id, value)
+        elif isinstance(value, dict):
+            if fields is None:
+                for key, item in value.items():
+                    self._column(key).add(message_id, item)
+            else:
+                for key in fields:
+                    self.columns[key].add(message_id, value.get(key))
+        elif fields is None:
+            self._column(VALUE_FIELD).add(message_id, value)
+        else:
+            raise ValueError(
+                "a timeseries point holds a single value without naming its field, "
+                f"so it can't be split across {fields!r}; fetch one field at a time"
+            )
+
+    def finish(self) -> TimeseriesColumns:
+        return TimeseriesColumns(
+            {name: column.finish(name) for name, column in self.columns.items()},
+            count=self.count,
+            pages=self.pages,
+            interval=self.interval,
+            aggregate=self.aggregate if self.interval is not None else None,
+        )
@@ -1,8 +1,21 @@
-"""Paginating iterators for message listing."""
+"""Paginating iterators for message listing.
+
+Each page's cursor comes from the page before it, so pages are fetched one after another,
+but they don't have to wait for the consumer: up to ``prefetch`` pages are read ahead (on
+a task for the async iterators, a background thread for the sync ones) while the current
+page is being processed, overlapping network latency with the caller's work.
+"""
 
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+import contextlib
+import queue
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
 from ._base import _to_snowflake
@@ -13,12 +26,239 @@ if TYPE_CHECKING:
     from ._sync import DataClient
 
 DEFAULT_PAGE_SIZE = 50
+DEFAULT_PREFETCH = 1
+DEFAULT_SCAN_SHARDS = 8
+DEFAULT_SCAN_CONCURRENCY = 4
+DEFAULT_SCAN_BUFFER_PAGES = 8
 
 # 2 days in milliseconds, shifted into snowflake space (millis << 22).
 _TWO_DAYS_SNOWFLAKE = 2 * 24 * 60 * 60 * 1000 << 22
 
 
-class AsyncMessageIterator:
+def _check_prefetch(prefetch: int) -> int:
+    if prefetch < 0:
+        raise ValueError("prefetch must be 0 (fetch on demand) or more")
+    return prefetch
+
+
+# The producers only hold a weak reference to their iterator between pages, so an
+# iterator that's abandoned part way through is still collected, and its __del__ stops
+# the producer.
+
+
+async def _produce_pages_async(ref, pages: asyncio.Queue, slots: asyncio.Semaphore):
+    try:
+        while True:
+            await slots.acquire()
+            iterator = ref()
+            if iterator is None or iterator._exhausted:
+                break
+            page = await iterator._next_page()
+            del iterator
+            if page:
+                pages.put_nowait(page)
+            else:
+                slots.release()
+    except Exception as e:
+        pages.put_nowait(e)
+    else:
+        pages.put_nowait(None)
+
+
+def _produce_pages(
+    ref, pages: queue.SimpleQueue, slots: threading.Semaphore, stop: threading.Event
+):
+    try:
+        while True:
+            slots.acquire()
+            if stop.is_set():
+                return
+            iterator = ref()
+            if iterator is None or iterator._exhausted:
+                break
+            page = iterator._next_page()
+            del iterator
+            if page:
+                pages.put(page)
+            else:
+                slots.release()
+    except Exception as e:
+        pages.put(e)
+    else:
+        pages.put(None)
+
+
+class _AsyncPageIterator:
+    """Buffering and read-ahead shared by the async iterators.
+
+    Subclasses implement :meth:`_next_page`, which fetches a page, advances the cursor
+    and sets ``_exhausted`` once there are no more pages.
+    """
+
+    def __init__(self, prefetch: int):
+        self._prefetch = _check_prefetch(prefetch)
+        self._buffer: deque[Message] = deque()
+        self._exhausted = False
+        self._finished = False
+        self._pages: asyncio.Queue | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._producer: asyncio.Task | None = None
+
+    async def _next_page(self) -> list[Message]:
+        raise NotImplementedError
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Message:
+        while not self._buffer:
+            if self._finished:
+                raise StopAsyncIteration
+            page = await self._read_page()
+            if page is None:
+                self._finished = True
+            else:
+                self._buffer.extend(page)
+        return self._buffer.popleft()
+
+    async def _read_page(self) -> list[Message] | None:
+        if self._prefetch == 0:
+            return None if self._exhausted else await self._next_page()
+
+        if self._producer is None:
+            self._pages = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self._prefetch)
+            self._producer = asyncio.create_task(
+                _produce_pages_async(weakref.ref(self), self._pages, self._slots)
+            )
+
+        page = await self._pages.get()
+        if isinstance(page, Exception):
+            self._finished = True
+            raise page
+        if page is not None:
+            self._slots.release()
+        return page
+
+    async def collect(self) -> list[Message]:
+        """Consume the iterator and return all messages as a list."""
+        results = []
+        async for message in self:
+            results.append(message)
+        return results
+
+    async def aclose(self):
+        """Stop reading ahead. Only needed when abandoning an iterator part way through."""
+        self._finished = True
+        self._buffer.clear()
+        producer = self._producer
+        if producer is not None and not producer.done():
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def __del__(self):
+        producer = getattr(self, "_producer", None)
+        if (
+            producer is not None
+            and not producer.done()
+            and not producer.get_loop().is_closed()
+        ):
+            producer.cancel()
+
+
+class _PageIterator:
+    """Buffering and read-ahead shared by the sync iterators.
+
+    Subclasses implement :meth:`_next_page`, as for :class:`_AsyncPageIterator`. Pages
+    are read ahead on a daemon thread, which uses the client concurrently with the
+    caller (``httpx.Client`` is thread-safe).
+    """
+
+    def __init__(self, prefetch: int):
+        self._prefetch = _check_prefetch(prefetch)
+        self._buffer: deque[Message] = deque()
+        self._exhausted = False
+        self._finished = False
+        self._pages: queue.SimpleQueue | None = None
+        self._slots: threading.Semaphore | None = None
+        self._stop = threading.Event()
+        self._producer: threading.Thread | None = None
+
+    def _next_page(self) -> list[Message]:
+        raise NotImplementedError
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Message:
+        while not self._buffer:
+            if self._finished:
+                raise StopIteration
+            page = self._read_page()
+            if page is None:
+                self._finished = True
+            else:
+                self._buffer.extend(page)
+        return self._buffer.popleft()
+
+    def _read_page(self) -> list[Message] | None:
+        if self._prefetch == 0:
+            return None if self._exhausted else self._next_page()
+
+        if self._producer is None:
+            self._pages = queue.SimpleQueue()
+            self._slots = threading.Semaphore(self._prefetch)
+            self._producer = threading.Thread(
+                target=_produce_pages,
+                args=(weakref.ref(self), self._pages, self._slots, self._stop),
+                name="pydoover-page-prefetch",
+                daemon=True,
+            )
+            self._producer.start()
+
+        page = self._pages.get()
+        if isinstance(page, Exception):
+            self._finished = True
+            raise page
+        if page is not None:
+            self._slots.release()
+        return page
+
+    def collect(self) -> list[Message]:
+        """Consume the iterator and return all messages as a list."""
+        return list(self)
+
+    def close(self):
+        """Stop reading ahead. Only needed when abandoning an iterator part way through.
+
+        A page already being fetched is discarded when it arrives.
+        """
+        self._finished = True
+        self._buffer.clear()
+        self._stop.set()
+        if self._slots is not None:
+            # wake the producer if it's waiting for the consumer to catch up
+            self._slots.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, "_producer", None) is not None:
+            self.close()
+
+
+class AsyncMessageIterator(_AsyncPageIterator):
     """Async iterator that paginates through channel messages.
 
     Usage::
@@ -28,6 +268,11 @@ class AsyncMessageIterator:
 
         # Or load all into memory:
         messages = await client.iter_messages(123, "my_channel").collect()
+
+    The next ``prefetch`` pages are fetched on a background task while the current one
+    is consumed; pass ``prefetch=0`` to fetch each page only when it's needed. If you
+    stop iterating early, ``await iterator.aclose()`` (or ``async with``) stops the
+    read-ahead straight away rather than when the iterator is garbage collected.
     """
 
     def __init__(
@@ -41,7 +286,9 @@ class AsyncMessageIterator:
         field_names: list[str] | None = None,
         organisation_id: int | None = None,
         page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: int = DEFAULT_PREFETCH,
     ):
+        super().__init__(prefetch)
         self._client = client
         self._channel_name = channel_name
         self._agent_id = agent_id
@@ -50,22 +297,8 @@ class AsyncMessageIterator:
         self._field_names = field_names
         self._organisation_id = organisation_id
         self._page_size = page_size
-        self._buffer: list[Message] = []
-        self._exhausted = False
 
-    def __aiter__(self):
-        return self
-
-    async def __anext__(self) -> Message:
-        if not self._buffer:
-            if self._exhausted:
-                raise StopAsyncIteration
-            await self._fetch_page()
-            if not self._buffer:
-                raise StopAsyncIteration
-        return self._buffer.pop(0)
-
-    async def _fetch_page(self):
+    async def _next_page(self) -> list[Message]:
         page = await self._client.list_messages(
             agent_id=self._agent_id,
             channel_name=self._channel_name,
@@ -86,17 +319,13 @@ class AsyncMessageIterator:
                 page = [m for m in page if m.id < self._before]
             if page:
                 self._before = page[-1].id
-                self._buffer = page
-
-    async def collect(self) -> list[Message]:
-        """Consume the iterator and return all messages as a list."""
-        results = []
-        async for message in self:
-            results.append(message)
-        return results
+            else:
+                # nothing older than the cursor, so paging further would repeat
+                self._exhausted = True
+        return page
 
 
-class AsyncMultiAgentMessageIterator:
+class AsyncMultiAgentMessageIterator(_AsyncPageIterator):
     """Async iterator that paginates through multi-agent channel messages.
 
     The multi-agent endpoint requires ``before`` and ``after`` to be at most
@@ -110,6 +339,8 @@ class AsyncMultiAgentMessageIterator:
 
         # Or load all into memory:
         messages = await client.iter_multi_agent_messages("my_channel", agent_ids=[1, 2]).collect()
+
+    Pages are read ahead as for :class:`AsyncMessageIterator`.
     """
 
     def __init__(
@@ -124,7 +355,9 @@ class AsyncMultiAgentMessageIterator:
         field_names: list[str] | None = None,
         organisation_id: int | None = None,
         page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: int = DEFAULT_PREFETCH,
     ):
+        super().__init__(prefetch)
         self._client = client
         self._channel_name = channel_name
         self._agent_ids = agent_ids
@@ -134,8 +367,6 @@ class AsyncMultiAgentMessageIterator:
         self._field_names = field_names
         self._organisation_id = organisation_id
         self._page_size = page_size
-        self._buffer: list[Message] = []
-        self._exhausted = False
         # Current window upper bound — capped to _before or after + 2 days.
         self._window_before = self._next_window_before(self._after)
 
@@ -146,18 +377,6 @@ class AsyncMultiAgentMessageIterator:
         window_end = after + _TWO_DAYS_SNOWFLAKE
         return min(window_end, self._before)
 
-    def __aiter__(self):
-        return self
-
-    async def __anext__(self) -> Message:
-        if not self._buffer:
-            if self._exhausted:
-                raise StopAsyncIteration
-            await self._fetch_page()
-            if not self._buffer:
-                raise StopAsyncIteration
-        return self._buffer.pop(0)
-
     def _advance_window(self) -> bool:
         """Move to the next 2-day window. Return True if a new window is available."""
         if self._window_before is not None and self._window_before < self._before:
@@ -166,7 +385,7 @@ class AsyncMultiAgentMessageIterator:
             return True
         return False
 
-    async def _fetch_page(self):
+    async def _next_page(self) -> list[Message]:
         while True:
             batch = await self._client.fetch_multi_agent_messages(
                 self._channel_name,
@@ -183,23 +402,17 @@ class AsyncMultiAgentMessageIterator:
                 results = [m for m in results if m.id > self._after]
             if results:
                 self._after = results[-1].id
-                self._buffer = results
-                if len(batch.results) >= self._page_size:
-                    return
+                # A short page ends the window; the next page starts in the next one.
+                if len(batch.results) < self._page_size and not self._advance_window():
+                    self._exhausted = True
+                return results
             # Current window exhausted — try the next one.
             if not self._advance_window():
                 self._exhausted = True
-                return
-
-    async def collect(self) -> list[Message]:
-        """Consume the iterator and return all messages as a list."""
-        results = []
-        async for message in self:
-            results.append(message)
-        return results
+                return []
 
 
-class MessageIterator:
+class MessageIterator(_PageIterator):
     """Sync iterator that paginates through channel messages.
 
     Usage::
@@ -209,6 +422,11 @@ class MessageIterator:
 
         # Or load all into memory:
         messages = client.iter_messages(123, "my_channel").collect()
+
+    The next ``prefetch`` pages are fetched on a background thread while the current
+    one is consumed; pass ``prefetch=0`` to fetch each page only when it's needed. If
+    you stop iterating early, ``iterator.close()`` (or ``with``) stops the read-ahead
+    straight away rather than when the iterator is garbage collected.
     """
 
     def __init__(
@@ -222,7 +440,9 @@ class MessageIterator:
         field_names: list[str] | None = None,
         organisation_id: int | None = None,
         page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: int = DEFAULT_PREFETCH,
     ):
+        super().__init__(prefetch)
         self._client = client
         self._channel_name = channel_name
         self._agent_id = agent_id
@@ -231,22 +451,8 @@ class MessageIterator:
         self._field_names = field_names
         self._organisation_id = organisation_id
         self._page_size = page_size
-        self._buffer: list[Message] = []
-        self._exhausted = False
-
-    def __iter__(self):
-        return self
-
-    def __next__(self) -> Message:
-        if not self._buffer:
-            if self._exhausted:
-                raise StopIteration
-            self._fetch_page()
-            if not self._buffer:
-                raise StopIteration
-        return self._buffer.pop(0)
 
-    def _fetch_page(self):
+    def _next_page(self) -> list[Message]:
         page = self._client.list_messages(
             agent_id=self._agent_id,
             channel_name=self._channel_name,
@@ -265,14 +471,12 @@ class MessageIterator:
                 page = [m for m in page if m.id < self._before]
             if page:
                 self._before = page[-1].id
-                self._buffer = page
-
-    def collect(self) -> list[Message]:
-        """Consume the iterator and return all messages as a list."""
-        return list(self)
+            else:
+                self._exhausted = True
+        return page
 
 
-class MultiAgentMessageIterator:
+class MultiAgentMessageIterator(_PageIterator):
     """Sync iterator that paginates through multi-agent channel messages.
 
     The multi-agent endpoint requires ``before`` and ``after`` to be at most
@@ -286,6 +490,8 @@ class MultiAgentMessageIterator:
 
         # Or load all into memory:
         messages = client.iter_multi_agent_messages("my_channel", agent_ids=[1, 2]).collect()
+
+    Pages are read ahead as for :class:`MessageIterator`.
     """
 
     def __init__(
@@ -300,7 +506,9 @@ class MultiAgentMessageIterator:
         field_names: list[str] | None = None,
         organisation_id: int | None = None,
         page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: int = DEFAULT_PREFETCH,
     ):
+        super().__init__(prefetch)
         self._client = client
         self._channel_name = channel_name
         self._agent_ids = agent_ids
@@ -310,8 +518,6 @@ class MultiAgentMessageIterator:
         self._field_names = field_names
         self._organisation_id = organisation_id
         self._page_size = page_size
-        self._buffer: list[Message] = []
-        self._exhausted = False
         self._window_before = self._next_window_before(self._after)
 
     def _next_window_before(self, after: int | None) -> int | None:
@@ -320,18 +526,6 @@ class MultiAgentMessageIterator:
         window_end = after + _TWO_DAYS_SNOWFLAKE
         return min(window_end, self._before)
 
-    def __iter__(self):
-        return self
-
-    def __next__(self) -> Message:
-        if not self._buffer:
-            if self._exhausted:
-                raise StopIteration
-            self._fetch_page()
-            if not self._buffer:
-                raise StopIteration
-        return self._buffer.pop(0)
-
     def _advance_window(self) -> bool:
         if self._window_before is not None and self._window_before < self._before:
             self._after = self._window_before
@@ -339,7 +533,7 @@ class MultiAgentMessageIterator:
             return True
         return False
 
-    def _fetch_page(self):
+    def _next_page(self) -> list[Message]:
         while True:
             batch = self._client.fetch_multi_agent_messages(
                 self._channel_name,
@@ -356,13 +550,357 @@ class MultiAgentMessageIterator:
                 results = [m for m in results if m.id > self._after]
             if results:
                 self._after = results[-1].id
-                self._buffer = results
-                if len(batch.results) >= self._page_size:
-                    return
+                if len(batch.results) < self._page_size and not self._advance_window():
+                    self._exhausted = True
+                return results
             if not self._advance_window():
                 self._exhausted = True
+                return []
+
+
+# ── Sharded range scans ─────────────────────────────────────────────────
+
+
+def _shard_ranges(after: int, before: int, shards: int) -> list[tuple[int, int]]:
+    """Split the snowflake range ``(after, before)`` into up to ``shards`` time slices.
+
+    Returns ``(after, before)`` bounds for each slice, newest first, in the same
+    exclusive form the list endpoints take. Interior boundaries fall on millisecond
+    starts; each slice begins one below its boundary so an ID exactly on it isn't
+    skipped. Ranges too short to split give fewer slices, and an empty range none.
+    """
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    lo_ms, hi_ms = after >> 22, before >> 22
+    bounds = [after + 1]
+    for i in range(1, shards):
+        boundary = (lo_ms + (hi_ms - lo_ms) * i // shards) << 22
+        if bounds[-1] < boundary < before:
+            bounds.append(boundary)
+    if before <= bounds[-1]:
+        return []
+    bounds.append(before)
+    ranges = [(bounds[i] - 1, bounds[i + 1]) for i in range(len(bounds) - 1)]
+    return ranges[::-1]
+
+
+def _scan_bounds(
+    after: int | datetime, before: int | datetime | None, shards: int
+) -> list[tuple[int, int]]:
+    if after is None:
+        raise ValueError("a scan needs a start (after)")
+    if before is None:
+        before = datetime.now(timezone.utc)
+    return _shard_ranges(_to_snowflake(after), _to_snowflake(before), shards)
+
+
+def _check_concurrency(concurrency: int) -> int:
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    return concurrency
+
+
+async def _scan_shard_async(
+    shard: AsyncMessageIterator, pages: asyncio.Queue, slots: asyncio.Semaphore
+):
+    # Shards take slots in order, so the oldest unfinished shard always has one and
+    # an ordered consumer blocked on it can't be starved by later shards.
+    async with slots:
+        try:
+            while not shard._exhausted:
+                page = await shard._next_page()
+                if page:
+                    await pages.put(page)
+        except Exception as e:
+            await pages.put(e)
+        else:
+            await pages.put(None)
+
+
+def _put_unless_stopped(pages: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _scan_shard(shard: MessageIterator, pages: queue.Queue, stop: threading.Event):
+    try:
+        while not shard._exhausted and not stop.is_set():
+            page = shard._next_page()
+            if page and not _put_unless_stopped(pages, page, stop):
                 return
+    except Exception as e:
+        _put_unless_stopped(pages, e, stop)
+    else:
+        _put_unless_stopped(pages, None, stop)
+
+
+class _ShardedScan:
+    """State shared by the sync and async sharded scans."""
+
+    def __init__(
+        self,
+        after: int | datetime,
+        before: int | datetime | None,
+        shards: int,
+        concurrency: int,
+        ordered: bool,
+        buffer_pages: int | None,
+    ):
+        self._ranges = _scan_bounds(after, before, shards)
+        self._concurrency = _check_concurrency(concurrency)
+        self._ordered = ordered
+        if buffer_pages is not None and buffer_pages < 1:
+            raise ValueError("buffer_pages must be at least 1 (or None for no limit)")
+        self._buffer_pages = buffer_pages
+        self._buffer: deque[Message] = deque()
+        self._started = False
+        self._finished = not self._ranges
+        # ordered: the shard being drained; unordered: shards still running
+        self._current = 0
+        self._remaining = len(self._ranges)
+        self._queues: list = []
+
+    def _queue_sizes(self) -> tuple[int, int]:
+        """Max sizes for a slice's queue when ordered, and the shared one when not."""
+        return self._buffer_pages or 0, 2 * self._concurrency
+
+    def _handle(self, item) -> list[Message]:
+        """Account for one item from a shard queue, returning the messages to yield."""
+        if isinstance(item, Exception):
+            self._finished = True
+            self._stop_shards()
+            raise item
+        if item is not None:
+            return item
+        # a shard finished
+        if self._ordered:
+            self._current += 1
+            self._finished = self._current == len(self._ranges)
+        else:
+            self._remaining -= 1
+            self._finished = self._remaining == 0
+        return []
+
+    def _stop_shards(self):
+        raise NotImplementedError
+
+
+class AsyncMessageScan(_ShardedScan):
+    """Scan a channel's history between two points in time with concurrent requests.
+
+    The range is split into ``shards`` time slices by snowflake ID, and up to
+    ``concurrency`` slices are paged through at once, so a long export is bound by
+    how many requests the server handles in parallel rather than by round trips.
+
+    With ``ordered=True`` (the default), messages are yielded newest first, exactly as
+    :meth:`AsyncDataClient.iter_messages` would yield them. The slices don't overlap,
+    so the merge is a concatenation, and pages of later slices are held in memory until
+    it's their turn. ``buffer_pages`` (8 by default; ``None`` for no limit) caps how
+    many each slice holds; a slice that reaches it stops fetching, which bounds memory
+    for a slow consumer at the cost of parallelism. With ``ordered=False``, pages are
+    yielded as they arrive (each newest first) and at most two per worker are held.
+
+    Usage::
+
+        scan = client.scan_messages(123, "tag_values", after=month_ago, shards=16)
+        async for message in scan:
+            ...
+
+    Stop the workers early with ``await scan.aclose()`` or ``async with``.
+    """
+
+    def __init__(
+        self,
+        client: AsyncDataClient,
+        agent_id: int,
+        channel_name: str,
+        *,
+        after: int | datetime,
+        before: int | datetime | None = None,
+        shards: int = DEFAULT_SCAN_SHARDS,
+        concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+        ordered: bool = True,
+        field_names: list[str] | None = None,
+        organisation_id: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        buffer_pages: int | None = DEFAULT_SCAN_BUFFER_PAGES,
+    ):
+        super().__init__(after, before, shards, concurrency, ordered, buffer_pages)
+        self._shards = [
+            AsyncMessageIterator(
+                client,
+                agent_id,
+                channel_name,
+                before=shard_before,
+                after=shard_after,
+                field_names=field_names,
+                organisation_id=organisation_id,
+                page_size=page_size,
+                prefetch=0,
+            )
+            for shard_after, shard_before in self._ranges
+        ]
+        self._tasks: list[asyncio.Task] = []
+
+    def _start(self):
+        self._started = True
+        slots = asyncio.Semaphore(self._concurrency)
+        per_slice, shared_size = self._queue_sizes()
+        if self._ordered:
+            self._queues = [asyncio.Queue(per_slice) for _ in self._shards]
+        else:
+            shared = asyncio.Queue(shared_size)
+            self._queues = [shared] * len(self._shards)
+        self._tasks = [
+            asyncio.create_task(_scan_shard_async(shard, pages, slots))
+            for shard, pages in zip(self._shards, self._queues)
+        ]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Message:
+        while not self._buffer:
+            if self._finished:
+                raise StopAsyncIteration
+            if not self._started:
+                self._start()
+            pages = self._queues[self._current if self._ordered else 0]
+            self._buffer.extend(self._handle(await pages.get()))
+        return self._buffer.popleft()
+
+    async def collect(self) -> list[Message]:
+        """Run the whole scan and return the messages as a list."""
+        results = []
+        async for message in self:
+            results.append(message)
+        return results
+
+    def _stop_shards(self):
+        for task in self._tasks:
+            task.cancel()
+
+    async def aclose(self):
+        """Cancel the outstanding requests. Only needed when stopping early."""
+        self._finished = True
+        self._buffer.clear()
+        self._stop_shards()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def __del__(self):
+        for task in getattr(self, "_tasks", ()):
+            if not task.done() and not task.get_loop().is_closed():
+                task.cancel()
+
+
+class MessageScan(_ShardedScan):
+    """Sync version of :class:`AsyncMessageScan`, fetching slices on worker threads.
+
+    Usage::
+
+        for message in client.scan_messages(123, "tag_values", after=month_ago):
+            ...
+
+    Stop the workers early with ``scan.close()`` or ``with``.
+    """
+
+    def __init__(
+        self,
+        client: DataClient,
+        agent_id: int,
+        channel_name: str,
+        *,
+        after: int | datetime,
+        before: int | datetime | None = None,
+        shards: int = DEFAULT_SCAN_SHARDS,
+        concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+        ordered: bool = True,
+        field_names: list[str] | None = None,
+        organisation_id: int | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        buffer_pages: int | None = DEFAULT_SCAN_BUFFER_PAGES,
+    ):
+        super().__init__(after, before, shards, concurrency, ordered, buffer_pages)
+        self._shards = [
+            MessageIterator(
+                client,
+                agent_id,
+                channel_name,
+                before=shard_before,
+                after=shard_after,
+                field_names=field_names,
+                organisation_id=organisation_id,
+                page_size=page_size,
+                prefetch=0,
+            )
+            for shard_after, shard_before in self._ranges
+        ]
+        self._stop = threading.Event()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _start(self):
+        self._started = True
+        per_slice, shared_size = self._queue_sizes()
+        if self._ordered:
+            self._queues = [queue.Queue(per_slice) for _ in self._shards]
+        else:
+            shared = queue.Queue(shared_size)
+            self._queues = [shared] * len(self._shards)
+        # the pool runs shards in submission order, as the async scan's slots do
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._concurrency, thread_name_prefix="pydoover-scan"
+        )
+        for shard, pages in zip(self._shards, self._queues):
+            self._executor.submit(_scan_shard, shard, pages, self._stop)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Message:
+        while not self._buffer:
+            if self._finished:
+                raise StopIteration
+            if not self._started:
+                self._start()
+            pages = self._queues[self._current if self._ordered else 0]
+            self._buffer.extend(self._handle(pages.get()))
+        return self._buffer.popleft()
 
     def collect(self) -> list[Message]:
-        """Consume the iterator and return all messages as a list."""
+        """Run the whole scan and return the messages as a list."""
         return list(self)
+
+    def _stop_shards(self):
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """Stop the workers. Only needed when stopping early.
+
+        Requests already in flight finish in the background and are discarded.
+        """
+        self._finished = True
+        self._buffer.clear()
+        self._stop_shards()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, "_executor", None) is not None:
+            self.close()
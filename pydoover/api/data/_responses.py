@@ -0,0 +1,292 @@
+"""A short-lived, in-memory cache of GET responses for the data API clients.
+
+Inside one processor invocation or report, separate code paths often ask for the same
+channel, aggregate or channel list within moments of each other. With a
+:class:`ResponseCache` attached to a client, concurrent identical GETs share a single
+request (single-flight), and the response is reused for a few seconds after it lands.
+
+Entries hold the raw response body, so every caller decodes its own copy and can't
+change what another one sees. A write through the same client drops the cached
+responses for the resource it touched: the channel it names, everything under it and
+every listing above it. The cache is keyed by URL and organisation, not credentials, so
+share one only between clients that authenticate as the same user.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from fnmatch import fnmatchcase
+from typing import Any
+
+from ...utils import clock
+
+DEFAULT_TTL = 5.0
+DEFAULT_MAX_ENTRIES = 1024
+
+# the stats key for paths no ``ttls`` pattern matches
+DEFAULT_ENDPOINT = "*"
+
+
+class ResponseCacheStats:
+    """Hit counts for a :class:`ResponseCache`, or one endpoint of it."""
+
+    __slots__ = ("hits", "coalesced", "misses")
+
+    def __init__(self, hits: int = 0, coalesced: int = 0, misses: int = 0):
+        #: answered from a cached response
+        self.hits = hits
+        #: shared a request already in flight
+        self.coalesced = coalesced
+        #: went to the server
+        self.misses = misses
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.coalesced + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of requests that didn't go to the server."""
+        if not self.requests:
+            return 0.0
+        return (self.hits + self.coalesced) / self.requests
+
+    def __repr__(self):
+        return (
+            f"<ResponseCacheStats hits={self.hits} coalesced={self.coalesced} "
+            f"misses={self.misses} hit_rate={self.hit_rate:.2f}>"
+        )
+
+
+class _Flight:
+    """A sync request in progress, for other threads asking for the same thing."""
+
+    __slots__ = ("done", "body", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.body: bytes | None = None
+        self.error: BaseException | None = None
+
+
+def _resource(path: str) -> str:
+    # /agents/{agent}/channels/{channel}/... -> /agents/{agent}/channels/{channel}
+    return "/".join(path.split("/")[:5])
+
+
+def _related(cached: str, written: str) -> bool:
+    # under the written resource, or a listing above it
+    return (
+        cached == written
+        or cached.startswith(written + "/")
+        or written.startswith(cached + "/")
+    )
+
+
+class ResponseCache:
+    """Single-flight and short-TTL caching for the GET requests of a data API client.
+
+    Parameters
+    ----------
+    ttl
+        Seconds to reuse a response for. ``0`` only shares requests in flight.
+    ttls
+        Per-endpoint TTLs, as glob patterns matched against the request path
+        (``*`` matches across ``/``). The first match wins; other paths get ``ttl``.
+        For example ``{"/agents/*/channels/*/messages*": 0}``.
+    max_entries
+        Responses kept at once; the least recently used go first.
+
+    Examples
+    --------
+    >>> client = AsyncDataClient(response_cache=ResponseCache(ttl=2))
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        ttls: dict[str, float] | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        if ttl < 0 or any(t < 0 for t in (ttls or {}).values()):
+            raise ValueError("ttl must not be negative")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        # key -> (path, expires, body)
+        self._entries: OrderedDict[Any, tuple[str, float, bytes | None]] = OrderedDict()
+        self._flights: dict[Any, _Flight] = {}
+        self._tasks: dict[Any, asyncio.Future] = {}
+        # bumped on every invalidation, so a response fetched across one isn't stored
+        self._generation = 0
+        self._stats: dict[str, ResponseCacheStats] = {}
+        self.invalidations = 0
+
+    # ── Stats ──────────────────────────────────────────────────────────────
+
+    @property
+    def stats(self) -> ResponseCacheStats:
+        """Totals across every endpoint."""
+        with self._lock:
+            total = ResponseCacheStats()
+            for stats in self._stats.values():
+                total.hits += stats.hits
+                total.coalesced += stats.coalesced
+                total.misses += stats.misses
+            return total
+
+    def endpoint_stats(self) -> dict[str, ResponseCacheStats]:
+        """Stats per ``ttls`` pattern, with unmatched paths under ``"*"``."""
+        with self._lock:
+            return {
+                endpoint: ResponseCacheStats(s.hits, s.coalesced, s.misses)
+                for endpoint, s in self._stats.items()
+            }
+
+    def _count(self, endpoint: str) -> ResponseCacheStats:
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = ResponseCacheStats()
+        return stats
+
+    # ── Lookup ─────────────────────────────────────────────────────────────
+
+    def _endpoint(self, path: str) -> tuple[str, float]:
+        for pattern, ttl in self.ttls.items():
+            if fnmatchcase(path, pattern):
+                return pattern, ttl
+        return DEFAULT_ENDPOINT, self.ttl
+
+    def _lookup(self, key) -> tuple[bool, bytes | None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[1] <= clock.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[2]
+
+    def _store(self, key, path: str, ttl: float, generation: int, body: bytes | None):
+        if ttl <= 0 or generation != self._generation:
+            return
+        self._entries[key] = (path, clock.monotonic() + ttl, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def fetch(self, key, path: str, send: Callable[[], bytes | None]) -> bytes | None:
+        """Return the cached body for ``key``, or share or make a request for it."""
+        endpoint, ttl = self._endpoint(path)
+        with self._lock:
+            stats = self._count(endpoint)
+            found, body = self._lookup(key)
+            if found:
+                stats.hits += 1
+                return body
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                stats.misses += 1
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+            else:
+                stats.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.body
+
+        try:
+            flight.body = send()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._store(key, path, ttl, generation, flight.body)
+            return flight.body
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def fetch_async(
+        self, key, path: str, send: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        """Like :meth:`fetch`, sharing requests in flight between tasks."""
+        endpoint, ttl = self._endpoint(path)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            stats = self._count(endpoint)
+            found, body = self._lookup(key)
+            if found:
+                stats.hits += 1
+                return body
+            task = self._tasks.get(key)
+            if task is not None and task.get_loop() is loop:
+                stats.coalesced += 1
+            else:
+                stats.misses += 1
+                # a task of its own, so cancelling one caller doesn't fail the others
+                task = self._tasks[key] = asyncio.ensure_future(send())
+                task.add_done_callback(
+                    self._landed_callback(key, path, ttl, self._generation)
+                )
+        return await asyncio.shield(task)
+
+    def _landed_callback(self, key, path: str, ttl: float, generation: int):
+        def landed(task: asyncio.Future):
+            with self._lock:
+                if self._tasks.get(key) is task:
+                    del self._tasks[key]
+                if task.cancelled() or task.exception() is not None:
+                    return
+                self._store(key, path, ttl, generation, task.result())
+
+        return landed
+
+    # ── Invalidation ───────────────────────────────────────────────────────
+
+    def invalidate(self, path: str, data: Any = None):
+        """Drop the responses a write to ``path`` (with body ``data``) may change.
+
+        Batch writes name their agents and channels per item, so each of those
+        is dropped instead.
+        """
+        items = data.get("items") if isinstance(data, dict) else None
+        if path in ("/agents/messages", "/agents/aggregates") and items:
+            written = {
+                f"/agents/{item['agent_id']}/channels/{item['channel_name']}"
+                for item in items
+            }
+        else:
+            written = {_resource(path)}
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            stale = [
+                key
+                for key, (cached, _, _) in self._entries.items()
+                if any(_related(cached, w) for w in written)
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every cached response (requests in flight aren't stored either)."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
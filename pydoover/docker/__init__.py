@@ -10,11 +10,19 @@ if TYPE_CHECKING:
         ModbusInterface as ModbusInterface,
         ModbusConfig as ModbusConfig,
         ManyModbusConfig as ManyModbusConfig,
+        RegisterField as RegisterField,
+        RegisterMap as RegisterMap,
+        MockModbusInterface as MockModbusInterface,
     )
     from .platform import (
         PlatformInterface as PlatformInterface,
         PulseCounter as PulseCounter,
+        MockPlatformInterface as MockPlatformInterface,
     )
+    from .host import AppHost as AppHost, run_host as run_host
+    from .periodic_tasks import periodic as periodic, PeriodicTask as PeriodicTask
+    from .timing import CatchUp as CatchUp
+    from .simulation import Simulation as Simulation
 
 _LAZY_ATTRS = {
     "Application": (".application", "Application"),
@@ -24,8 +32,18 @@ _LAZY_ATTRS = {
     "ModbusInterface": (".modbus", "ModbusInterface"),
     "ModbusConfig": (".modbus", "ModbusConfig"),
     "ManyModbusConfig": (".modbus", "ManyModbusConfig"),
+    "RegisterField": (".modbus", "RegisterField"),
+    "RegisterMap": (".modbus", "RegisterMap"),
+    "MockModbusInterface": (".modbus", "MockModbusInterface"),
     "PlatformInterface": (".platform", "PlatformInterface"),
     "PulseCounter": (".platform", "PulseCounter"),
+    "MockPlatformInterface": (".platform", "MockPlatformInterface"),
+    "AppHost": (".host", "AppHost"),
+    "run_host": (".host", "run_host"),
+    "periodic": (".periodic_tasks", "periodic"),
+    "PeriodicTask": (".periodic_tasks", "PeriodicTask"),
+    "CatchUp": (".timing", "CatchUp"),
+    "Simulation": (".simulation", "Simulation"),
 }
 
 __all__ = list(_LAZY_ATTRS)
@@ -1,10 +1,9 @@
 import asyncio
 import argparse
+import importlib.util
 import json
 import os
 import logging
-import time
-from collections import deque
 
 from datetime import datetime, timezone
 from pathlib import Path
@@ -16,16 +15,12 @@ from collections.abc import Coroutine
 
 from ..ui import UICommandsManager
 
-try:
-    from aiohttp.web import Response, Server, ServerRunner, TCPSite
-except ImportError:
-    RUN_HEALTHCHECK = False
-else:
-    RUN_HEALTHCHECK = True
-
 from .device_agent.device_agent import DeviceAgentInterface
 from .modbus import ModbusInterface
+from .periodic_tasks import PeriodicTaskManager
 from .platform import PlatformInterface
+from .profiler import AppProfiler, MIN_SAMPLE_INTERVAL, PROFILE_METHOD, ProfileResult
+from .timing import CatchUp, LoopScheduler, LoopTimings
 
 from ..models import (
     Aggregate,
@@ -40,17 +35,28 @@ from ..models import (
     NotificationSeverity,
     OneShotMessage,
 )
-from ..rpc import RPCManager
+from ..rpc import (
+    DEFAULT_CHANNEL as RPC_DEFAULT_CHANNEL,
+    RPCContext,
+    RPCError,
+    RPCManager,
+)
 from ..ui import UI
 from ..utils import (
     setup_logging as utils_setup_logging,
     apply_diff,
     generate_diff,
 )
+from ..utils import clock
+from ..utils.event_loop import EVENT_LOOP_ENV_VAR, EVENT_LOOPS, run_with_loop
 from ..config import Schema
 
 log = logging.getLogger(__name__)
 
+# aiohttp.web is only needed once the healthcheck server starts, so check it's
+# installed here and import it then.
+RUN_HEALTHCHECK = importlib.util.find_spec("aiohttp") is not None
+
 
 class Application:
     """Base class for a Doover application. All apps will inherit from this class, and override the setup and main_loop methods.
@@ -107,11 +113,29 @@ class Application:
         The UI manager for the application, which handles the user interface elements and commands.
     app_key : str
         The application key for the app, used to identify it in the Doover cloud. This is globally unique.
+    loop_target_period : float
+        The target time in seconds between the starts of consecutive main loop iterations.
+    loop_catch_up : CatchUp
+        What the main loop does after overrunning one or more periods: ``CatchUp.SKIP``
+        (the default) drops the missed iterations, ``CatchUp.BURST`` runs them back to back.
+    loop_timings : LoopTimings
+        Per-phase timings of the main loop (``main_loop``, ``commit_tags``, ``events``
+        and the whole ``loop``).
+    periodic_tasks : PeriodicTaskManager
+        Methods decorated with :func:`periodic`, each run at its own rate alongside the
+        main loop.
+    profiler : AppProfiler
+        Runs on-demand profiles. See :meth:`profile`.
+    remote_profiling : bool
+        Whether to subscribe to the ``dv-rpc`` channel for remote ``dv-profile``
+        requests. Apps already subscribed to it for their own RPC handlers answer them
+        either way; others receive nothing extra unless this is set.
     """
 
     config_cls: type[Schema] = Schema
     ui_cls: type[UI] = UI
     tags_cls: type[Tags] = Tags
+    remote_profiling: bool = False
 
     def __init__(
         self,
@@ -154,6 +178,8 @@ class Application:
 
         self.rpc = RPCManager(self.device_agent, app_key)
         self.ui_manager = UICommandsManager(self.device_agent)
+        self.periodic_tasks = PeriodicTaskManager()
+        self.profiler = AppProfiler(self)
 
         self.app_key = app_key
         self.app_display_name = ""
@@ -173,9 +199,10 @@ class Application:
         self._error_wait_period = 10
         self.dda_startup_timeout: int = 300
 
-        self._last_interval_time: float | None = None
+        self.loop_timings = LoopTimings()
+        self._loop_scheduler = LoopScheduler()
+        self._last_loop_start: float | None = None
         self._last_loop_time_warning: float | None = None
-        self._loop_times = deque(maxlen=20)
 
         self._test_next_event = asyncio.Event()
         self._test_next_loop_done = asyncio.Event()
@@ -183,6 +210,8 @@ class Application:
 
         self._is_healthy = False
         self._healthcheck_port = healthcheck_port
+        # apps run by an AppHost share the host's healthcheck server
+        self.serve_healthcheck = True
 
     @property
     def is_being_observed(self) -> bool:
@@ -209,6 +238,8 @@ class Application:
         return self.tag_manager.is_live_tag_open(tag_name, app_key=app_key)
 
     async def _handle_healthcheck(self, _request):
+        from aiohttp.web import Response
+
         if self._is_healthy:
             return Response(text="OK", status=200)
         else:
@@ -288,11 +319,15 @@ class Application:
         await self._test_next_loop_done.wait()
 
     async def _run(self):
-        if RUN_HEALTHCHECK:
+        if not self.serve_healthcheck:
+            log.debug("Healthcheck server disabled; health is reported by the host.")
+        elif RUN_HEALTHCHECK:
             try:
                 log.info(
                     f"Starting healthcheck server on http://127.0.0.1:{self._healthcheck_port}"
                 )
+                from aiohttp.web import Server, ServerRunner, TCPSite
+
                 server = Server(self._handle_healthcheck, access_log=None)
                 runner = ServerRunner(server)
                 await runner.setup()
@@ -354,19 +389,31 @@ class Application:
             await self._check_shutdown_at(shutdown_at)
 
         self.tag_manager.subscribe_to_tag("shutdown_at", self._on_shutdown_at)
+        self.periodic_tasks.start()
 
         ## allow for other async tasks to run between setup and loop
         await asyncio.sleep(0.2)
 
+        self._loop_scheduler.start(self.loop_target_period)
         while True:
             if self.test_mode:
                 await self._test_next_event.wait()
                 self._test_next_event.clear()  # clear it for the next iteration...
 
+            if self.platform_iface.io_snapshot is not None:
+                self.platform_iface.io_snapshot.new_tick()
+
+            loop_start = clock.monotonic()
+            if self._last_loop_start is not None:
+                self.loop_timings.record("loop", loop_start - self._last_loop_start)
+            self._last_loop_start = loop_start
+
             try:
-                await self._main_loop()
-                await self.main_loop()
-                await self.tag_manager.commit_tags()
+                with self.loop_timings.measure("main_loop"):
+                    await self._main_loop()
+                    await self.main_loop()
+                with self.loop_timings.measure("commit_tags"):
+                    await self.tag_manager.commit_tags()
             except Exception as e:
                 log.error(f"Error in loop function: {e}", exc_info=e)
                 log.warning(
@@ -390,53 +437,48 @@ class Application:
                 # signal that the loop is done.
                 self._test_next_loop_done.set()
 
+    @property
+    def loop_catch_up(self) -> CatchUp:
+        return self._loop_scheduler.catch_up
+
+    @loop_catch_up.setter
+    def loop_catch_up(self, value: CatchUp | str):
+        self._loop_scheduler.catch_up = CatchUp(value)
+
     async def wait_for_interval(self, target_time: float):
         """
-        Waits for the necessary amount of time to maintain a consistent interval
-        of `target_time` seconds between calls to this method.
+        Waits until the next main loop deadline, `target_time` seconds after the previous one.
+
+        Deadlines are absolute on the monotonic clock, so loop body time does not
+        accumulate into drift and wall-clock changes do not stall or storm the loop.
         """
-        if target_time is None or target_time <= 0:
-            return
+        self._check_loop_time(target_time)
+        await self._loop_scheduler.wait(target_time)
 
-        current_time = time.time()
-        if self._last_interval_time is None:
-            self._last_interval_time = current_time
-            ## Wait for half the target time on the first call
-            await asyncio.sleep(target_time / 2)
+    def _check_loop_time(self, target_time: float | None):
+        """Warn, at most every 6 seconds, if the loop is running slower than target."""
+        if not target_time or "loop" not in self.loop_timings.phases:
             return
 
-        elapsed = current_time - self._last_interval_time
-        await self._assess_loop_time(
-            elapsed, target_time
-        )  ## This will display a warning if the loop is running slower than target
-        elapsed = current_time - self._last_interval_time
-        remaining = target_time - elapsed
-        log.debug(f"Last loop time: {elapsed}, target_time: {target_time}")
-        if remaining > 0:
-            log.debug(f"Sleeping for {remaining} seconds to maintain target loop time")
-            await asyncio.sleep(remaining)
-        self._last_interval_time = time.time()
-
-    async def _assess_loop_time(self, last_loop_time: float, target_time: float):
-        """
-        Assess the loop time and adjust the target time if necessary.
-        """
-        self._loop_times.append(last_loop_time)
-        average_loop_time = sum(self._loop_times) / len(self._loop_times)
+        average_loop_time = self.loop_timings["loop"].mean
         log.debug(f"Average loop time: {average_loop_time}, target_time: {target_time}")
 
         ## If the loop time is greater than 20% above the target time, display a warning every 6 seconds or so
         if average_loop_time > (target_time * 1.2):
-            if (
-                not hasattr(self, "_last_loop_time_warning")
-                or self._last_loop_time_warning is None
-            ):
-                self._last_loop_time_warning = time.time()
-            elif time.time() - self._last_loop_time_warning > 6:
+            now = clock.monotonic()
+            if self._last_loop_time_warning is None:
+                self._last_loop_time_warning = now
+            elif now - self._last_loop_time_warning > 6:
+                phases = ", ".join(
+                    f"{phase}={timing.mean:.3f}s"
+                    for phase, timing in self.loop_timings.phases.items()
+                    if phase != "loop"
+                )
                 log.warning(
-                    f"Loop is running slower than target. Average loop time: {average_loop_time}, target_time: {target_time}"
+                    f"Loop is running slower than target. Average loop time: {average_loop_time}, "
+                    f"target_time: {target_time} ({phases})"
                 )
-                self._last_loop_time_warning = time.time()
+                self._last_loop_time_warning = now
 
     async def close(self):
         log.info(
@@ -445,6 +487,7 @@ class Application:
             "########################################\n"
         )
 
+        await self.periodic_tasks.stop()
         await self.device_agent.close()
         await self.platform_iface.close()
         await self.modbus_iface.close()
@@ -600,6 +643,10 @@ class Application:
 
     async def _dispatch_event(self, event):
         """Dispatch an event to the appropriate user-facing handler."""
+        with self.loop_timings.measure("events"):
+            await self._dispatch_event_inner(event)
+
+    async def _dispatch_event_inner(self, event):
         if isinstance(event, OneShotMessage):
             await self.on_oneshot_message(event)
         elif isinstance(event, MessageCreateEvent):
@@ -840,6 +887,9 @@ class Application:
         poll_secs=None,
         modbus_id=None,
         bus_id=None,
+        change_filter=None,
+        deadband=0,
+        max_silence_secs=None,
     ):
         return self.modbus_iface.add_read_register_subscription(
             bus_id=bus_id,
@@ -849,6 +899,9 @@ class Application:
             register_type=register_type,
             poll_secs=poll_secs,
             callback=callback,
+            change_filter=change_filter,
+            deadband=deadband,
+            max_silence_secs=max_silence_secs,
         )
 
     # state
@@ -871,9 +924,7 @@ class Application:
             return
 
         dt = datetime.fromtimestamp(shutdown_at, tz=timezone.utc)
-        if self._shutdown_at is None or (
-            dt > self._shutdown_at and dt > datetime.now(tz=timezone.utc)
-        ):
+        if self._shutdown_at is None or (dt > self._shutdown_at and dt > clock.now()):
             # shutdown should be in the future and not already scheduled
             log.info(f"Shutdown scheduled at {dt.strftime('%Y-%m-%d %H:%M:%S')}")
             self._shutdown_at = dt
@@ -1148,12 +1199,86 @@ class Application:
         """
         return True
 
+    async def profile(
+        self,
+        duration: float,
+        mode: str = "sample",
+        interval: float = 0.005,
+        upload: bool = True,
+    ) -> ProfileResult:
+        """Profile the running application for ``duration`` seconds.
+
+        Profiling has no cost until it is requested. It can also be started remotely
+        by calling the reserved ``dv-profile`` RPC method on the ``dv-rpc`` channel with
+        ``{"duration": ..., "mode": ..., "interval": ...}``, if the app is subscribed to
+        that channel (see ``remote_profiling``).
+
+        Examples
+        --------
+
+        From another app or a processor::
+
+            await rpc.call(
+                "dv-profile", {"duration": 30}, app_key="my-app", timeout=60
+            )
+
+        Parameters
+        ----------
+        duration : float
+            Seconds to profile for, up to 300.
+        mode : str
+            ``"sample"`` (the default) periodically samples the event loop's stack and
+            reports collapsed stacks, ready for a flame graph. ``"cprofile"`` traces
+            every call with :mod:`cProfile`; it is exact but slows the app while running.
+        interval : float
+            Seconds between stack samples in ``"sample"`` mode, at least 1ms.
+        upload : bool
+            Whether to upload the result as a message on the ``dv-profiles`` channel,
+            with the report attached.
+
+        Returns
+        -------
+        ProfileResult
+            The profile.
+        """
+        result, _ = await self.profiler.run(duration, mode, interval, upload)
+        return result
+
+    async def _on_profile_request(self, ctx: RPCContext, payload: dict[str, Any]):
+        try:
+            duration = float(payload.get("duration", 10))
+            mode = payload.get("mode", "sample")
+            interval = max(MIN_SAMPLE_INTERVAL, float(payload.get("interval", 0.005)))
+        except (TypeError, ValueError) as e:
+            raise RPCError("INVALID_PARAMS", str(e))
+
+        await ctx.acknowledge()
+        try:
+            result, message_id = await self.profiler.run(duration, mode, interval)
+        except RuntimeError as e:
+            raise RPCError("BUSY", str(e))
+        except ValueError as e:
+            raise RPCError("INVALID_PARAMS", str(e))
+
+        return {
+            "message_id": message_id,
+            "mode": result.mode,
+            "duration": result.duration,
+            "samples": result.samples,
+        }
+
     ## App Functions
 
     async def _setup(self):
         log.info(f"Setting up internal app: {self.name}")
         self.rpc.register_handlers(self)
+        # the profiler rides on an existing dv-rpc subscription rather than forcing one
+        if self.remote_profiling or self.rpc.is_subscribed(RPC_DEFAULT_CHANNEL):
+            self.rpc.add_handler(
+                PROFILE_METHOD, self._on_profile_request, RPC_DEFAULT_CHANNEL
+            )
         self.ui_manager.register_handlers(self)
+        self.periodic_tasks.register_tasks(self)
 
         # default commands can come through...
         self.ui_manager.subscribe("ui_cmds")
@@ -1282,6 +1407,13 @@ def parse_args():
         default=None,
         help="Port for the healthcheck server (default: 49200). This must be overidden per-app to avoid conflicts.",
     )
+    parser.add_argument(
+        "--event-loop",
+        type=str,
+        choices=EVENT_LOOPS,
+        default=None,
+        help="Event loop implementation (default: asyncio)",
+    )
     parser.add_argument(
         "--debug", action="store_true", default=False, help="Debug Mode"
     )
@@ -1304,6 +1436,7 @@ def parse_args():
         modbus_uri = modbus_uri.replace("localhost", remote_dev)
 
     debug = args.debug or os.environ.get("DEBUG") == "1"
+    event_loop = args.event_loop or os.environ.get(EVENT_LOOP_ENV_VAR)
     return (
         app_key,
         dda_uri,
@@ -1313,6 +1446,7 @@ def parse_args():
         config_fp,
         debug,
         healthcheck_port,
+        event_loop,
     )
 
 
@@ -1322,6 +1456,7 @@ def run_app(
     setup_logging: bool = True,
     log_formatter: logging.Formatter = None,
     log_filters: logging.Filter | list[logging.Filter] = None,
+    event_loop: str | None = None,
 ):
     """Run the application.
 
@@ -1356,6 +1491,10 @@ def run_app(
         The logging formatter to use. Defaults to None, which will use a simple custom formatter defined in `pydoover.utils.LogFormatter`.
     log_filters : logging.Filter | list[logging.Filter], optional
         The logging filters to use. Defaults to None, which will not apply any filters.
+    event_loop : str, optional
+        The event loop to run on when `start` is True: ``"asyncio"``, ``"uvloop"`` or ``"auto"`` (uvloop if installed).
+        Defaults to the ``--event-loop`` argument or ``DOOVER_EVENT_LOOP`` environment variable, then ``"asyncio"``.
+        If uvloop is requested but not installed, the default asyncio loop is used instead.
     """
     (
         app_key,
@@ -1366,6 +1505,7 @@ def run_app(
         config_fp,
         debug,
         healthcheck_port,
+        arg_event_loop,
     ) = parse_args()
 
     if setup_logging:
@@ -1397,7 +1537,7 @@ def run_app(
 
     if start:
         try:
-            asyncio.run(runner())
+            run_with_loop(runner(), event_loop or arg_event_loop)
         except KeyboardInterrupt:
             pass
     else:
@@ -1419,6 +1559,7 @@ def run_app2(
         config_fp,
         debug,
         healthcheck_port,
+        event_loop,
     ) = parse_args()
 
     utils_setup_logging(debug)
@@ -1439,6 +1580,6 @@ def run_app2(
             await app._run()
 
     try:
-        asyncio.run(runner())
+        run_with_loop(runner(), event_loop)
     except KeyboardInterrupt:
         pass
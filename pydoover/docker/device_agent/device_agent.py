@@ -7,10 +7,12 @@ import sys
 import json
 
 from collections.abc import Callable
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from ...utils import clock
+from ...utils.diff import apply_diff
 from ...utils.snowflake import generate_snowflake_id_at
 
 import grpc
@@ -31,6 +33,7 @@ from ...models.data import (
     OneShotMessage,
     TurnCredential,
     Attachment,
+    ChannelID,
     WireFormat,
 )
 from ..grpc_interface import GRPCInterface
@@ -133,6 +136,14 @@ class DeviceAgentInterface(GRPCInterface):
         self._aggregates: dict[str, Aggregate] = {}
         self.last_channel_message_ts: dict[str, datetime] = {}
 
+        # callbacks this interface registered, so an app view can remove just its own
+        self._own_callbacks: list[tuple[str, tuple[Callable, EventSubscription]]] = []
+
+    def _init_app_view(self):
+        # Channel streams, callbacks and the aggregate cache stay shared: each channel
+        # has one stream for every hosted app, dispatching to all of their callbacks.
+        self._own_callbacks = []
+
     @staticmethod
     def has_persistent_connection():
         """For the Device Agent, this always returns `True`. This method exists to provide interoperability with the API client."""
@@ -151,7 +162,7 @@ class DeviceAgentInterface(GRPCInterface):
         return self.has_dda_been_online
 
     async def wait_until_healthy(self, timeout: float = 10):
-        start_time = datetime.now(tz=timezone.utc)
+        start_time = clock.now()
         backoff = 1
         while True:
             try:
@@ -164,7 +175,7 @@ class DeviceAgentInterface(GRPCInterface):
                 log.info("DDA is available.")
                 return True
 
-            if (datetime.now(tz=timezone.utc) - start_time).seconds > timeout:
+            if (clock.now() - start_time).seconds > timeout:
                 log.warning(
                     f"Timed out waiting {timeout} seconds for DDA to become available"
                 )
@@ -232,6 +243,7 @@ class DeviceAgentInterface(GRPCInterface):
             self._event_callbacks[channel_name].append(entry)
         except KeyError:
             self._event_callbacks[channel_name] = [entry]
+        self._own_callbacks.append((channel_name, entry))
 
         self._ensure_stream(channel_name, wire_format, replay_missed_messages)
 
@@ -249,6 +261,29 @@ class DeviceAgentInterface(GRPCInterface):
             return EventSubscription.channel_sync
         return None
 
+    def _distribute_event(self, channel_name: str, event) -> None:
+        """Update the aggregate cache from a channel event and hand it to callbacks."""
+        # Update internal aggregate state on AggregateUpdate
+        if isinstance(event, AggregateUpdateEvent):
+            self._aggregates[channel_name] = event.aggregate
+            self._synced_channels[channel_name] = True
+            self.last_channel_message_ts[channel_name] = clock.now()
+
+        # Determine which flag this event corresponds to
+        event_flag = self._event_type_to_flag(event)
+
+        # Distribute to matching registered callbacks
+        for callback, events in self._event_callbacks.get(channel_name, []):
+            if event_flag is None or event_flag not in events:
+                continue
+            try:
+                asyncio.create_task(callback(event))
+            except Exception as e:
+                log.error(
+                    f"Error dispatching event callback for {channel_name}: {e}",
+                    exc_info=e,
+                )
+
     async def _run_channel_stream(
         self,
         channel_name: str,
@@ -301,28 +336,7 @@ class DeviceAgentInterface(GRPCInterface):
                 async for event in self.stream_channel_events(
                     channel_name, wire_format, replay_missed_messages
                 ):
-                    # Update internal aggregate state on AggregateUpdate
-                    if isinstance(event, AggregateUpdateEvent):
-                        self._aggregates[channel_name] = event.aggregate
-                        self._synced_channels[channel_name] = True
-                        self.last_channel_message_ts[channel_name] = datetime.now(
-                            tz=timezone.utc
-                        )
-
-                    # Determine which flag this event corresponds to
-                    event_flag = self._event_type_to_flag(event)
-
-                    # Distribute to matching registered callbacks
-                    for callback, events in self._event_callbacks.get(channel_name, []):
-                        if event_flag is None or event_flag not in events:
-                            continue
-                        try:
-                            asyncio.create_task(callback(event))
-                        except Exception as e:
-                            log.error(
-                                f"Error dispatching event callback for {channel_name}: {e}",
-                                exc_info=e,
-                            )
+                    self._distribute_event(channel_name, event)
             except asyncio.CancelledError:
                 raise
             except BaseException as e:
@@ -459,11 +473,11 @@ class DeviceAgentInterface(GRPCInterface):
         bool
             True if all channels are synced within the timeout, False otherwise.
         """
-        start_time = datetime.now(tz=timezone.utc)
+        start_time = clock.now()
         while not all(
             [self.is_channel_synced(channel_name) for channel_name in channel_names]
         ):
-            if (datetime.now(tz=timezone.utc) - start_time).seconds > timeout:
+            if (clock.now() - start_time).seconds > timeout:
                 return False
             await asyncio.sleep(inter_wait)
         return True
@@ -619,7 +633,7 @@ class DeviceAgentInterface(GRPCInterface):
         validate_payload(data)
 
         files = files or []
-        timestamp = (timestamp or datetime.now(tz=timezone.utc)).timestamp() * 1000
+        timestamp = (timestamp or clock.now()).timestamp() * 1000
         req = device_agent_pb2.CreateMessageRequest(
             header=device_agent_pb2.RequestHeader(app_id=self.app_key),
             channel_name=channel_name,
@@ -811,6 +825,16 @@ class DeviceAgentInterface(GRPCInterface):
         }
 
     async def close(self):
+        if self.is_app_view:
+            # leave the shared streams running for the other apps
+            for channel_name, entry in self._own_callbacks:
+                try:
+                    self._event_callbacks[channel_name].remove(entry)
+                except (KeyError, ValueError):
+                    pass
+            self._own_callbacks.clear()
+            return
+
         for task in self._stream_tasks.values():
             task.cancel()
         self._stream_tasks.clear()
@@ -837,6 +861,11 @@ class DeviceAgentInterface(GRPCInterface):
 class MockDeviceAgentInterface(DeviceAgentInterface):
     """
     This interface is used to test the Device Agent Interface without relying on a real Device Agent service.
+
+    Messages the app creates are recorded in ``messages`` (and one-shot messages in
+    ``oneshot_messages``), keyed by channel name. Events from the cloud can be scripted
+    with :meth:`simulate_aggregate_update` and :meth:`simulate_message`, which are
+    delivered to subscribers as the real event stream would deliver them.
     """
 
     def __init__(self, *args, **kwargs):
@@ -846,6 +875,55 @@ class MockDeviceAgentInterface(DeviceAgentInterface):
         self.is_dda_available = True
         self.has_dda_been_online = True
 
+        self.messages: dict[str, list[Message]] = {}
+        self.oneshot_messages: dict[str, list[dict[str, Any]]] = {}
+
+    def _channel_id(self, channel_name: str) -> ChannelID:
+        return ChannelID(self.agent_id or 0, channel_name)
+
+    def simulate_aggregate_update(
+        self, channel_name: str, data: dict[str, Any], replace: bool = False
+    ) -> Aggregate:
+        """Update a channel's aggregate as if from the cloud, notifying subscribers.
+
+        Parameters
+        ----------
+        channel_name : str
+            The channel to update.
+        data : dict
+            A diff merged into the aggregate, or the new aggregate if ``replace``.
+        replace : bool
+            Replace the aggregate rather than merging ``data`` into it.
+        """
+        existing = self._aggregates.get(channel_name)
+        if replace or existing is None:
+            new_data = copy.deepcopy(data)
+        else:
+            new_data = apply_diff(existing.data or {}, data)
+
+        aggregate = Aggregate(data=new_data, attachments=[], last_updated=clock.now())
+        request = Aggregate(data=data, attachments=[], last_updated=None)
+        event = AggregateUpdateEvent(
+            0, self._channel_id(channel_name), aggregate, request, 0
+        )
+        self._distribute_event(channel_name, event)
+        return aggregate
+
+    def simulate_message(
+        self, channel_name: str, data: dict[str, Any], oneshot: bool = False
+    ) -> Message:
+        """Deliver a new message on a channel to subscribers, as if from the cloud."""
+        message = Message(
+            generate_snowflake_id_at(clock.now()),
+            0,
+            self._channel_id(channel_name),
+            data,
+            [],
+        )
+        event_cls = OneShotMessage if oneshot else MessageCreateEvent
+        self._distribute_event(channel_name, event_cls(message.channel, message))
+        return message
+
     async def wait_for_channels_sync(
         self, channel_names: list[str], timeout: int = 5, inter_wait: float = 0.2
     ):
@@ -897,9 +975,22 @@ class MockDeviceAgentInterface(DeviceAgentInterface):
         existing = self._aggregates.get(
             channel_name, Aggregate(data={}, attachments=[], last_updated=None)
         )
-        existing.data.update(data)
+        # merged like the cloud does, so nested values (e.g. per-app tags) survive
+        existing.data = apply_diff(existing.data or {}, data)
         self._aggregates[channel_name] = existing
         return copy.deepcopy(existing)
 
-    async def create_message(self, channel_name, data, **kwargs):
-        return 0
+    async def create_message(self, channel_name, data, timestamp=None, **kwargs):
+        message = Message(
+            generate_snowflake_id_at(timestamp or clock.now()),
+            0,
+            self._channel_id(channel_name),
+            copy.deepcopy(data),
+            [],
+        )
+        self.messages.setdefault(channel_name, []).append(message)
+        return message.id
+
+    async def send_oneshot_message(self, channel_name, data, timestamp=None):
+        self.oneshot_messages.setdefault(channel_name, []).append(copy.deepcopy(data))
+        return True
@@ -1,6 +1,7 @@
 import asyncio
+import copy
 import logging
-from typing import ClassVar
+from typing import ClassVar, Self
 
 import grpc
 
@@ -89,8 +90,35 @@ class GRPCInterface:
         self._channel: grpc.aio.Channel | None = None
         self._channel_stub = None
         self._channel_lock = asyncio.Lock()
+        # the interface that owns the gRPC channel; another interface for app views
+        self._transport: "GRPCInterface" = self
+
+    @property
+    def is_app_view(self) -> bool:
+        """Whether this interface is a view created by :meth:`for_app`."""
+        return self._transport is not self
+
+    def for_app(self, app_key: str) -> Self:
+        """A view of this interface for another app in the same process.
+
+        The view sends requests as ``app_key`` over this interface's gRPC channel, so
+        several apps hosted together (see :class:`AppHost`) share one connection per
+        service. Closing a view releases only the view's own state; the channel is
+        closed with the interface that owns it.
+        """
+        view = copy.copy(self)
+        view.app_key = app_key
+        view._transport = self._transport
+        view._init_app_view()
+        return view
+
+    def _init_app_view(self):
+        """Reset per-app state on a new view. Subclasses extend this."""
+        pass
 
     async def _get_stub(self):
+        if self.is_app_view:
+            return await self._transport._get_stub()
         async with self._channel_lock:
             if self._channel is None:
                 self._channel = grpc.aio.insecure_channel(
@@ -106,6 +134,8 @@ class GRPCInterface:
         any concurrent in-flight calls on it can finish rather than being
         cancelled out from under their callers.
         """
+        if self.is_app_view:
+            return await self._transport._discard_channel()
         async with self._channel_lock:
             channel, self._channel, self._channel_stub = self._channel, None, None
         if channel is not None:
@@ -143,6 +173,8 @@ class GRPCInterface:
             ) from e
 
     async def close(self):
+        if self.is_app_view:
+            return
         await self._discard_channel()
 
     def process_response(self, stub_call: str, response, *args, **kwargs):
@@ -0,0 +1,280 @@
+"""Run several docker applications in one process."""
+
+import asyncio
+import importlib.util
+import logging
+from pathlib import Path
+from typing import Any
+
+from ..utils import setup_logging as utils_setup_logging
+from ..utils.event_loop import run_with_loop
+from .application import Application, parse_args
+from .device_agent import DeviceAgentInterface
+from .modbus import ModbusInterface
+from .platform import PlatformInterface
+
+log = logging.getLogger(__name__)
+
+# aiohttp.web is only needed once the healthcheck server starts, so check it's
+# installed here and import it then.
+RUN_HEALTHCHECK = importlib.util.find_spec("aiohttp") is not None
+
+
+class HostedApp:
+    """An application registered with an :class:`AppHost`.
+
+    Attributes
+    ----------
+    app_cls : type[Application]
+        The application class, instantiated again on each restart.
+    app_key : str
+        The app's key.
+    app : Application | None
+        The current instance, once the host has started.
+    restarts : int
+        How many times the app has been restarted after stopping or failing.
+    """
+
+    def __init__(
+        self,
+        app_cls: type[Application],
+        app_key: str,
+        config_fp: str | Path | None = None,
+        kwargs: dict[str, Any] | None = None,
+    ):
+        self.app_cls = app_cls
+        self.app_key = app_key
+        self.config_fp = config_fp
+        self.kwargs = kwargs or {}
+
+        self.app: Application | None = None
+        self.restarts = 0
+        self.task: asyncio.Task | None = None
+
+    @property
+    def is_healthy(self) -> bool:
+        return self.app is not None and self.app._is_healthy
+
+
+class AppHost:
+    """Runs several applications on one event loop, sharing their connections.
+
+    Each app gets views (see :meth:`GRPCInterface.for_app`) of a single device agent,
+    platform and modbus interface, so the process holds one gRPC channel per service
+    and one event stream per subscribed channel (``tag_values``, ``dv-ui-sub`` and so
+    on), however many apps subscribe to it. The channel aggregate cache is shared too.
+
+    Apps keep their own app key, config, tags and UI. They are isolated from each
+    other's failures: when an app's main loop stops (after an error in setup or the
+    loop), only that app is torn down and, after ``restart_delay`` seconds, started
+    again as a fresh instance. The other apps keep running.
+
+    Examples
+    --------
+
+    Run two apps in one container::
+
+        from pydoover.docker import AppHost, run_host
+
+        from .pump import PumpApplication
+        from .tank import TankApplication
+
+        def main():
+            host = AppHost()
+            host.add_app(PumpApplication, "pump-1234")
+            host.add_app(TankApplication, "tank-5678")
+            run_host(host)
+
+    Parameters
+    ----------
+    device_agent : DeviceAgentInterface, optional
+        The shared device agent interface.
+    platform_iface : PlatformInterface, optional
+        The shared platform interface.
+    modbus_iface : ModbusInterface, optional
+        The shared modbus interface.
+    restart_delay : float
+        Seconds to wait before restarting an app that stopped.
+    healthcheck_port : int, optional
+        Serve one healthcheck for the whole host on this port, healthy while every
+        app is. Without a port no healthcheck server runs.
+    """
+
+    def __init__(
+        self,
+        device_agent: DeviceAgentInterface | None = None,
+        platform_iface: PlatformInterface | None = None,
+        modbus_iface: ModbusInterface | None = None,
+        restart_delay: float = 10,
+        healthcheck_port: int | None = None,
+    ):
+        self.device_agent = device_agent or DeviceAgentInterface(None)
+        self.platform_iface = platform_iface or PlatformInterface(None)
+        self.modbus_iface = modbus_iface or ModbusInterface(None)
+        self.restart_delay = restart_delay
+        self.healthcheck_port = healthcheck_port
+
+        self.apps: dict[str, HostedApp] = {}
+
+    def add_app(
+        self,
+        app_cls: type[Application],
+        app_key: str,
+        config_fp: str | Path | None = None,
+        **kwargs,
+    ) -> HostedApp:
+        """Register an application to run in this host.
+
+        Parameters
+        ----------
+        app_cls : type[Application]
+            The application class.
+        app_key : str
+            The app's key. Must be unique within the host.
+        config_fp : str | Path, optional
+            A config file overriding the app's deployment config.
+        **kwargs
+            Any other arguments for the application's constructor.
+        """
+        if app_key in self.apps:
+            raise ValueError(f"An app with key {app_key!r} is already hosted")
+        hosted = HostedApp(app_cls, app_key, config_fp, kwargs)
+        self.apps[app_key] = hosted
+        return hosted
+
+    def _create_app(self, hosted: HostedApp) -> Application:
+        app = hosted.app_cls(
+            hosted.app_key,
+            device_agent=self.device_agent.for_app(hosted.app_key),
+            platform_iface=self.platform_iface.for_app(hosted.app_key),
+            modbus_iface=self.modbus_iface.for_app(hosted.app_key),
+            config_fp=hosted.config_fp,
+            **hosted.kwargs,
+        )
+        app.modbus_iface.config = app.config
+        app.serve_healthcheck = False
+        return app
+
+    async def _stop_app(self, app: Application):
+        # Application.close() would cancel every task in the process, so release
+        # only what belongs to this app.
+        app._ready.clear()
+        app._is_healthy = False
+        await app.periodic_tasks.stop()
+        for iface in (app.device_agent, app.platform_iface, app.modbus_iface):
+            try:
+                await iface.close()
+            except Exception as e:
+                log.error(f"Error closing {app.app_key}'s interface: {e}", exc_info=e)
+
+    async def _supervise(self, hosted: HostedApp):
+        while True:
+            hosted.app = app = self._create_app(hosted)
+            try:
+                await app._run()
+            except asyncio.CancelledError:
+                await self._stop_app(app)
+                raise
+            except Exception as e:
+                log.error(f"App {hosted.app_key} crashed: {e}", exc_info=e)
+            else:
+                log.warning(f"App {hosted.app_key} stopped.")
+
+            await self._stop_app(app)
+            log.info(f"Restarting app {hosted.app_key} in {self.restart_delay}s")
+            await asyncio.sleep(self.restart_delay)
+            hosted.restarts += 1
+
+    async def _handle_healthcheck(self, _request):
+        from aiohttp.web import Response
+
+        if self.apps and all(hosted.is_healthy for hosted in self.apps.values()):
+            return Response(text="OK", status=200)
+        unhealthy = [k for k, hosted in self.apps.items() if not hosted.is_healthy]
+        return Response(text=f"ERROR: {', '.join(unhealthy)}", status=503)
+
+    async def _start_healthcheck(self):
+        if self.healthcheck_port is None:
+            return None
+        if not RUN_HEALTHCHECK:
+            log.info("`aiohttp` not installed, skipping healthcheck server.")
+            return None
+        from aiohttp.web import Server, ServerRunner, TCPSite
+
+        try:
+            runner = ServerRunner(Server(self._handle_healthcheck, access_log=None))
+            await runner.setup()
+            await TCPSite(runner, "127.0.0.1", self.healthcheck_port).start()
+        except Exception as e:
+            log.error(f"Error starting healthcheck server: {e}", exc_info=e)
+            return None
+        return runner
+
+    async def run(self):
+        """Run every registered app until cancelled."""
+        if not self.apps:
+            raise RuntimeError("No apps have been added to the host")
+
+        runner = await self._start_healthcheck()
+        try:
+            for hosted in self.apps.values():
+                hosted.task = asyncio.create_task(
+                    self._supervise(hosted), name=f"app:{hosted.app_key}"
+                )
+            await asyncio.gather(*(hosted.task for hosted in self.apps.values()))
+        finally:
+            await self.close()
+            if runner is not None:
+                await runner.cleanup()
+
+    async def close(self):
+        """Stop every app, then close the shared interfaces."""
+        tasks = [h.task for h in self.apps.values() if h.task and not h.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        await self.device_agent.close()
+        await self.platform_iface.close()
+        await self.modbus_iface.close()
+
+
+def run_host(
+    host: AppHost,
+    setup_logging: bool = True,
+    log_formatter: logging.Formatter = None,
+    log_filters: logging.Filter | list[logging.Filter] = None,
+    event_loop: str | None = None,
+):
+    """Run an :class:`AppHost`, blocking until interrupted.
+
+    Service URIs, the healthcheck port and debug logging are read from the same command
+    line arguments and environment variables as :func:`run_app`. App keys come from
+    :meth:`AppHost.add_app`, so ``--app-key`` and ``--config-fp`` are ignored. The event
+    loop is chosen as for :func:`run_app`.
+    """
+    (
+        _app_key,
+        dda_uri,
+        plt_uri,
+        modbus_uri,
+        _remote_dev,
+        _config_fp,
+        debug,
+        healthcheck_port,
+        arg_event_loop,
+    ) = parse_args()
+
+    if setup_logging:
+        utils_setup_logging(debug=debug, formatter=log_formatter, filters=log_filters)
+
+    host.device_agent.uri = dda_uri
+    host.platform_iface.uri = plt_uri
+    host.modbus_iface.uri = modbus_uri
+    if host.healthcheck_port is None:
+        host.healthcheck_port = healthcheck_port
+
+    try:
+        run_with_loop(host.run(), event_loop or arg_event_loop)
+    except KeyboardInterrupt:
+        pass
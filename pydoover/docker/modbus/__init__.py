@@ -1,2 +1,11 @@
-from .modbus_iface import ModbusInterface as ModbusInterface
+from .modbus_iface import (
+    ModbusInterface as ModbusInterface,
+    MockModbusInterface as MockModbusInterface,
+)
 from .config import ModbusConfig as ModbusConfig, ManyModbusConfig as ManyModbusConfig
+from .decoding import RegisterField as RegisterField, RegisterMap as RegisterMap
+from .server import ModbusServerBridge as ModbusServerBridge
+from .subscriptions import (
+    ChangeFilter as ChangeFilter,
+    RegisterSubscription as RegisterSubscription,
+)
@@ -0,0 +1,267 @@
+import operator
+import struct
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ...tags import Tags
+
+# struct format character and width in 16-bit words for each supported type
+_FIELD_TYPES = {
+    "int16": ("h", 1),
+    "uint16": ("H", 1),
+    "int32": ("i", 2),
+    "uint32": ("I", 2),
+    "float32": ("f", 2),
+    "int64": ("q", 4),
+    "uint64": ("Q", 4),
+    "float64": ("d", 4),
+}
+_ORDERS = ("big", "little")
+_INT_RANGES = {
+    "int16": (-(2**15), 2**15 - 1),
+    "uint16": (0, 2**16 - 1),
+    "int32": (-(2**31), 2**31 - 1),
+    "uint32": (0, 2**32 - 1),
+    "int64": (-(2**63), 2**63 - 1),
+    "uint64": (0, 2**64 - 1),
+}
+
+
+@dataclass(frozen=True)
+class RegisterField:
+    """A single typed value within a block of modbus registers.
+
+    Attributes
+    ----------
+    name : str
+        The key this value is returned under (and the tag it is written to).
+    address : int
+        The register address of the field's first word.
+    type : str
+        One of ``int16``, ``uint16``, ``int32``, ``uint32``, ``float32``, ``int64``,
+        ``uint64`` or ``float64``.
+    word_order : str
+        ``big`` if the most significant word comes first (the Modbus convention),
+        ``little`` if the words are swapped.
+    byte_order : str
+        ``big`` if each register holds its high byte first (the Modbus convention),
+        ``little`` if the bytes within each register are swapped.
+    scale : float
+        Multiplier applied to the raw value.
+    offset : float
+        Added to the raw value after scaling.
+    """
+
+    name: str
+    address: int
+    type: str = "uint16"
+    word_order: str = "big"
+    byte_order: str = "big"
+    scale: float = 1
+    offset: float = 0
+
+    def __post_init__(self):
+        if self.type not in _FIELD_TYPES:
+            raise ValueError(
+                f"Unknown register type {self.type!r} for field {self.name!r}. "
+                f"Must be one of {', '.join(_FIELD_TYPES)}."
+            )
+        if self.word_order not in _ORDERS or self.byte_order not in _ORDERS:
+            raise ValueError(
+                f"Word and byte order for field {self.name!r} must be 'big' or 'little'."
+            )
+
+    @property
+    def width(self) -> int:
+        """The number of registers this field spans."""
+        return _FIELD_TYPES[self.type][1]
+
+    def encode(self, value: int | float | bool) -> list[int]:
+        """Encode ``value`` into this field's registers, in bus order.
+
+        This is the inverse of decoding: the offset is removed and the scale divided
+        out, then integer types are rounded and saturated to their range.
+        """
+        if self.scale == 1 and self.offset == 0:
+            raw = value  # keep 64-bit integers exact
+        else:
+            raw = (value - self.offset) / self.scale
+        limits = _INT_RANGES.get(self.type)
+        if limits is not None:
+            raw = min(max(round(raw), limits[0]), limits[1])
+
+        char, width = _FIELD_TYPES[self.type]
+        words = list(struct.unpack(f">{width}H", struct.pack(">" + char, raw)))
+        if self.word_order == "little":
+            words.reverse()
+        if self.byte_order == "little":
+            words = [((w & 0xFF) << 8) | (w >> 8) for w in words]
+        return words
+
+
+class RegisterMap:
+    """A declarative layout of typed fields in a block of modbus registers.
+
+    The map is compiled once into a single gather, two ``struct`` packs and a single
+    ``struct`` unpack, so decoding a whole block costs a handful of C calls rather than
+    per-field Python arithmetic.
+
+    Examples
+    --------
+
+    Decode a meter's register block::
+
+        meter_map = RegisterMap(
+            [
+                RegisterField("voltage", 0, "float32"),
+                RegisterField("current", 2, "float32", word_order="little"),
+                RegisterField("energy_kwh", 4, "uint32", scale=0.1),
+                RegisterField("temperature", 6, "int16", scale=0.1, offset=-40),
+            ]
+        )
+
+        values = await self.modbus_iface.read_register_map(meter_map, modbus_id=1)
+        # {"voltage": 239.8, "current": 4.2, "energy_kwh": 12345.6, "temperature": 21.5}
+
+    Parameters
+    ----------
+    fields : Iterable[RegisterField]
+        The fields in the block. Fields may overlap.
+    start_address : int, optional
+        The address of the first register in blocks passed to :meth:`decode`.
+        Defaults to the lowest field address.
+    """
+
+    def __init__(self, fields: Iterable[RegisterField], start_address: int = None):
+        self.fields = tuple(fields)
+        if not self.fields:
+            raise ValueError("A register map needs at least one field.")
+
+        names = [f.name for f in self.fields]
+        if len(set(names)) != len(names):
+            raise ValueError("Register map field names must be unique.")
+
+        if start_address is None:
+            start_address = min(f.address for f in self.fields)
+        if any(f.address < start_address for f in self.fields):
+            raise ValueError("Register map fields must not precede start_address.")
+        self.start_address = start_address
+        self.num_registers = (
+            max(f.address + f.width for f in self.fields) - start_address
+        )
+
+        self._compile()
+
+    def _compile(self):
+        # Each field's words are gathered in most-significant-first order, so
+        # word order is resolved by the gather. Byte order is resolved by the
+        # pack: big-endian fields are packed ">H", byte-swapped fields "<H",
+        # which leaves the whole buffer big-endian for one combined unpack.
+        groups = {"big": ([], [], []), "little": ([], [], [])}
+        for field in self.fields:
+            char, width = _FIELD_TYPES[field.type]
+            first = field.address - self.start_address
+            words = list(range(first, first + width))
+            if field.word_order == "little":
+                words.reverse()
+
+            indices, fmt, ordered = groups[field.byte_order]
+            indices.extend(words)
+            fmt.append(char)
+            ordered.append(field)
+
+        big_indices, big_fmt, big_fields = groups["big"]
+        little_indices, little_fmt, little_fields = groups["little"]
+        indices = big_indices + little_indices
+
+        self._gather = operator.itemgetter(*indices)
+        self._single = len(indices) == 1
+        self._num_big = len(big_indices)
+        self._pack_big = struct.Struct(f">{len(big_indices)}H").pack
+        self._pack_little = struct.Struct(f"<{len(little_indices)}H").pack
+        self._unpack = struct.Struct(">" + "".join(big_fmt + little_fmt)).unpack
+
+        ordered = big_fields + little_fields
+        self._names = tuple(f.name for f in ordered)
+        self._transforms = tuple(
+            (i, f.name, f.scale, f.offset)
+            for i, f in enumerate(ordered)
+            if f.scale != 1 or f.offset != 0
+        )
+
+    def decode(self, registers: Sequence[int]) -> dict[str, Any]:
+        """Decode a block of registers into a ``{field name: value}`` dict.
+
+        Parameters
+        ----------
+        registers : Sequence[int]
+            The register values, starting at ``start_address``. This is what
+            :meth:`ModbusInterface.read_registers` and register subscriptions return.
+
+        Returns
+        -------
+        dict[str, int | float]
+            The decoded, scaled value of every field.
+        """
+        if len(registers) < self.num_registers:
+            raise ValueError(
+                f"Register block too short: need {self.num_registers} registers, "
+                f"got {len(registers)}."
+            )
+
+        words = self._gather(registers)
+        if self._single:
+            words = (words,)
+
+        nb = self._num_big
+        try:
+            buffer = self._pack_big(*words[:nb]) + self._pack_little(*words[nb:])
+        except struct.error:
+            # registers came back sign-extended; reinterpret as raw 16-bit words
+            words = [w & 0xFFFF for w in words]
+            buffer = self._pack_big(*words[:nb]) + self._pack_little(*words[nb:])
+
+        raw = self._unpack(buffer)
+        result = dict(zip(self._names, raw))
+        for i, name, scale, offset in self._transforms:
+            result[name] = raw[i] * scale + offset
+        return result
+
+    def encode(self, values: dict[str, Any]) -> dict[int, int]:
+        """Encode field values into registers; the inverse of :meth:`decode`.
+
+        Parameters
+        ----------
+        values : dict[str, int | float | bool]
+            Values keyed by field name. Fields that are missing, or whose value is
+            None, are skipped.
+
+        Returns
+        -------
+        dict[int, int]
+            The encoded ``{register address: value}`` of every field given.
+        """
+        registers = {}
+        for field in self.fields:
+            value = values.get(field.name)
+            if value is None:
+                continue
+            for i, word in enumerate(field.encode(value)):
+                registers[field.address + i] = word
+        return registers
+
+    async def decode_to_tags(self, registers: Sequence[int], tags: "Tags") -> dict:
+        """Decode a block of registers and set each tag whose name matches a field.
+
+        Fields without a matching tag are ignored.
+
+        Returns
+        -------
+        dict[str, int | float]
+            The decoded values, as returned by :meth:`decode`.
+        """
+        values = self.decode(registers)
+        await tags.update(values)
+        return values
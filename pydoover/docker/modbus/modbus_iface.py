@@ -1,11 +1,16 @@
 import asyncio
 import logging
 import warnings
-from collections.abc import Coroutine, Callable
-
 import grpc
 
 from .config import ModbusConfig, ModbusType, ManyModbusConfig
+from .decoding import RegisterMap
+from .subscriptions import (
+    ChangeFilter,
+    ReadRegisterSubscriptionCallback,
+    RegisterPollSchedule,
+    RegisterSubscription,
+)
 from ...models.generated.modbus import modbus_iface_pb2, modbus_iface_pb2_grpc
 from ..grpc_interface import GRPCInterface
 from ...utils import call_maybe_async
@@ -13,9 +18,6 @@ from ...cli.decorators import command as cli_command
 from ...config import Schema
 
 log = logging.getLogger(__name__)
-ReadRegisterSubscriptionCallback = (
-    Callable[[list[int]], None] | Coroutine[[list[int]], None]
-)
 
 
 def two_words_to_32bit_float(word1: int, word2: int, swap: bool = False):
@@ -36,6 +38,10 @@ class ModbusInterface(GRPCInterface):
     config : Schema
         Configuration schema for the modbus interface, containing modbus bus definitions.
         This is loaded from application config automatically and should be specified in your `app_config.py` file.
+    subscription_merge_gap : int
+        The largest hole, in registers, bridged when merging two register subscriptions
+        into one polled block. Defaults to 0 (only overlapping or adjacent ranges merge),
+        since reading unmapped registers makes some slaves reject the whole block.
     """
 
     stub = modbus_iface_pb2_grpc.modbusIfaceStub
@@ -47,15 +53,26 @@ class ModbusInterface(GRPCInterface):
         service_name: str = "doover.ModbusInterface",
         timeout: int = 7,
         config: Schema = None,
+        subscription_merge_gap: int = 0,
     ):
         super().__init__(app_key, modbus_uri, service_name, timeout)
 
         self.subscription_tasks = []
+        self.subscription_merge_gap = subscription_merge_gap
+        self._poll_schedules: dict[tuple, list[RegisterPollSchedule]] = {}
         self._setup_task = None
 
         self.config = config
         self.config_complete = False
 
+    def _init_app_view(self):
+        # register subscriptions are polled per app; the host sets the view's config
+        self.subscription_tasks = []
+        self._poll_schedules = {}
+        self._setup_task = None
+        self.config = None
+        self.config_complete = False
+
     async def setup(self):
         # Buses are no longer pre-opened here. read_registers/write_registers
         # carry their bus's connection settings (resolved from config by bus name,
@@ -82,6 +99,7 @@ class ModbusInterface(GRPCInterface):
         log.info("Closing modbus interface")
         for task in self.subscription_tasks:
             task.cancel()
+        self._poll_schedules.clear()
         await super().close()
 
     @staticmethod
@@ -340,6 +358,53 @@ class ModbusInterface(GRPCInterface):
         resp = await self.make_request("readRegisters", req)
         return resp and self._parse_register_output(resp.values)
 
+    async def read_register_map(
+        self,
+        register_map: RegisterMap,
+        modbus_id: int = 1,
+        register_type: int = 4,
+        bus=None,
+        retries: int | None = None,
+    ) -> dict | None:
+        """Read the block covered by a :class:`RegisterMap` and decode it in one call.
+
+        Examples
+        --------
+        >>> values = await self.modbus_iface.read_register_map(meter_map, modbus_id=1)
+        >>> print(values["voltage"])
+
+        Parameters
+        ----------
+        register_map : RegisterMap
+            The compiled layout of the fields to read.
+        modbus_id : int, optional
+            The modbus ID of the device to read registers from (default is 1)
+        register_type : int, optional
+            The type of registers to read (default is 4, which is typically holding registers)
+        bus : ModbusConfig, optional
+            The bus to read from. If omitted, the bus configured in the application config is used.
+        retries : int, optional
+            How many times the interface retries on failure. Left unset, the interface applies its default.
+
+        Returns
+        -------
+        dict | None
+            The decoded ``{field name: value}`` mapping, or None if the read failed.
+        """
+        values = await self.read_registers(
+            modbus_id=modbus_id,
+            start_address=register_map.start_address,
+            num_registers=register_map.num_registers,
+            register_type=register_type,
+            bus=bus,
+            retries=retries,
+        )
+        if values is None:
+            return None
+        if isinstance(values, int):
+            values = [values]
+        return register_map.decode(values)
+
     @cli_command()
     async def write_registers(
         self,
@@ -413,12 +478,23 @@ class ModbusInterface(GRPCInterface):
         poll_secs: int = 3,
         callback: ReadRegisterSubscriptionCallback = None,
         bus=None,
+        change_filter: ChangeFilter | str | None = None,
+        deadband: int | list[int] = 0,
+        max_silence_secs: float | None = None,
     ):
         """Add a subscription to read registers from a modbus bus.
 
         This method creates a subcscription that will periodically read registers from the specified modbus device and
         invoke the provided callback when a read request succeeds.
 
+        Subscriptions are multiplexed: every subscription on the same bus, slave and register type whose range
+        overlaps or adjoins another's (see ``subscription_merge_gap``) and whose ``poll_secs`` is a whole multiple of
+        an existing schedule's interval shares that schedule's single gRPC stream and bus transaction. Each callback
+        receives only the registers it asked for.
+
+        By default the callback runs on every poll. Pass ``change_filter`` (or a ``deadband``) to only run it when
+        the registers meaningfully change, and ``max_silence_secs`` to still get a periodic refresh when they don't.
+
         The provided callback can be a regular function or a coroutine.
 
         Examples
@@ -454,7 +530,23 @@ class ModbusInterface(GRPCInterface):
             This accepts a list of integers representing the register values.
             If only one register is read, this will be a single integer.
             This callback can be a regular function or a coroutine.
+        bus : ModbusConfig, optional
+            The bus to read from. If omitted, the bus configured in the application config is used.
+        change_filter : ChangeFilter | str, optional
+            ``"exact"`` to only call back when a register changed, ``"hash"`` to do the same while keeping only a
+            hash of the last block, or ``"deadband"`` to only call back once a register moves further than
+            ``deadband`` from the last delivered value. Failed reads, and recovery from them, always call back.
+        deadband : int | list[int], optional
+            The deadband for ``"deadband"`` filtering; one value for every register, or one per register.
+            Passing a deadband without a ``change_filter`` implies ``"deadband"``.
+        max_silence_secs : float, optional
+            With a change filter, call back anyway once this long has passed without a delivery.
 
+        Returns
+        -------
+        RegisterSubscription | None
+            A handle for the subscription; call ``cancel()`` on it to unsubscribe.
+            Returns None if the subscription could not be created.
         """
 
         if callback is None:
@@ -462,27 +554,65 @@ class ModbusInterface(GRPCInterface):
             return None
 
         try:
-            new_task = asyncio.create_task(
-                self.run_read_register_subscription_task(
-                    bus_id=str(bus_id),
-                    modbus_id=modbus_id,
-                    start_address=start_address,
-                    num_registers=num_registers,
-                    register_type=register_type,
-                    poll_secs=poll_secs,
-                    callback=callback,
-                    bus=bus,
-                )
+            subscription = RegisterSubscription(
+                start_address,
+                num_registers,
+                poll_secs,
+                callback,
+                change_filter=change_filter,
+                deadband=deadband,
+                max_silence_secs=max_silence_secs,
             )
-
-            self.subscription_tasks.append(new_task)
-            new_task.add_done_callback(self.subscription_tasks.remove)
-            return new_task
+            key = (
+                self._bus_key(self._resolve_bus_settings(bus)),
+                modbus_id,
+                register_type,
+            )
+            schedules = self._poll_schedules.setdefault(key, [])
+            # Fastest schedules first, so slower subscribers decimate an
+            # existing stream rather than opening their own.
+            for schedule in sorted(schedules, key=lambda s: s.poll_secs or 0):
+                if schedule.try_add(subscription):
+                    return subscription
+
+            schedule = RegisterPollSchedule(
+                self,
+                bus_id=str(bus_id),
+                modbus_id=modbus_id,
+                register_type=register_type,
+                poll_secs=poll_secs,
+                bus=bus,
+                merge_gap=self.subscription_merge_gap,
+            )
+            schedule.try_add(subscription)
+            schedules.append(schedule)
+            return subscription
 
         except Exception as e:
             log.error("Error adding read register subscription: " + str(e))
             return None
 
+    @staticmethod
+    def _bus_key(settings: dict) -> tuple:
+        return tuple(
+            (name, msg.SerializeToString(deterministic=True))
+            for name, msg in sorted(settings.items())
+        )
+
+    def _remove_poll_schedule(self, schedule: RegisterPollSchedule):
+        for key, schedules in list(self._poll_schedules.items()):
+            if schedule in schedules:
+                schedules.remove(schedule)
+                if not schedules:
+                    del self._poll_schedules[key]
+                return
+
+    def _discard_subscription_task(self, task: asyncio.Task):
+        try:
+            self.subscription_tasks.remove(task)
+        except ValueError:
+            pass
+
     async def run_read_register_subscription_task(
         self,
         bus_id: str,
@@ -537,6 +667,126 @@ class ModbusInterface(GRPCInterface):
             log.error("Error in read register subscription task: " + str(e))
             return None
 
+    @cli_command()
+    async def create_server(
+        self,
+        server_type: str = "tcp",
+        port: int = 502,
+        host: str | None = None,
+        modbus_id: int = 1,
+        holding_registers: list[int] = None,
+        input_registers: list[int] = None,
+        coils: list[bool] = None,
+        discrete_inputs: list[bool] = None,
+    ) -> bool:
+        """Start a modbus server (slave) that other masters, e.g. a SCADA system, can poll.
+
+        Parameters
+        ----------
+        server_type : str, optional
+            The server type, e.g. ``"tcp"`` (default).
+        port : int, optional
+            The port to serve on (default 502). This also identifies the server in later calls.
+        host : str, optional
+            The host to bind to. Left unset, the modbus interface applies its default.
+        modbus_id : int, optional
+            The slave id the server answers to (default 1).
+        holding_registers, input_registers : list[int], optional
+            The initial register tables.
+        coils, discrete_inputs : list[bool], optional
+            The initial bit tables.
+
+        Returns
+        -------
+        bool
+            True if the server was created, False otherwise.
+        """
+        req = modbus_iface_pb2.createServerRequest(
+            type=server_type,
+            port=port,
+            modbus_id=modbus_id,
+            holding_registers=holding_registers or [],
+            input_registers=input_registers or [],
+            coils=coils or [],
+            discrete_inputs=discrete_inputs or [],
+            **({} if host is None else {"host": host}),
+        )
+        resp = await self.make_request("createServer", req)
+        return bool(resp and self._validate_read_register_resp(resp))
+
+    @cli_command()
+    async def close_server(self, port: int = 502) -> bool:
+        """Close a modbus server started with :meth:`create_server`."""
+        resp = await self.make_request(
+            "closeServer", modbus_iface_pb2.closeServerRequest(port=port)
+        )
+        return bool(resp and self._validate_read_register_resp(resp))
+
+    @cli_command()
+    async def set_server_registers(
+        self,
+        port: int = 502,
+        function_code: int = 3,
+        start_address: int = 0,
+        values: list[int] = None,
+    ) -> bool:
+        """Set a contiguous run of registers in a modbus server's table.
+
+        ``setServerRegistersRequest.address`` is repeated and paired with ``values``
+        element by element, so the request carries one address per value.
+
+        Parameters
+        ----------
+        port : int, optional
+            The port of the server to update (default 502).
+        function_code : int, optional
+            The table to write: 3 for holding registers (default), 4 for input registers.
+        start_address : int, optional
+            The first register to set (default 0).
+        values : list[int]
+            The register values, starting at ``start_address``.
+
+        Returns
+        -------
+        bool
+            True if the registers were set, False otherwise.
+        """
+        values = values or []
+        req = modbus_iface_pb2.setServerRegistersRequest(
+            port=port,
+            function_code=function_code,
+            address=range(start_address, start_address + len(values)),
+            values=values,
+        )
+        resp = await self.make_request("setServerRegisters", req)
+        return bool(resp and self._validate_read_register_resp(resp))
+
+    @cli_command()
+    async def fetch_server_registers(
+        self,
+        port: int = 502,
+        function_code: int = 3,
+        start_address: int = 0,
+        num_registers: int = 1,
+    ) -> list[int] | None:
+        """Get the current values of registers in a modbus server's table.
+
+        Returns
+        -------
+        list[int] | None
+            The register values, or None if the request failed.
+        """
+        req = modbus_iface_pb2.getServerRegistersRequest(
+            port=port,
+            function_code=function_code,
+            address=start_address,
+            count=num_registers,
+        )
+        resp = await self.make_request("getServerRegisters", req)
+        if not (resp and self._validate_read_register_resp(resp)):
+            return None
+        return list(resp.values)
+
     @cli_command()
     async def test_comms(self, message: str = "Comms Check Message") -> str | None:
         """Test connection by sending a basic echo response to modbus interface container.
@@ -558,4 +808,113 @@ class ModbusInterface(GRPCInterface):
         )
 
 
+class _MockModbusService:
+    """An in-memory stand-in for the modbus interface gRPC service."""
+
+    # the RPCs answered from memory; anything else is refused before it's sent
+    RPCS = frozenset({"readRegisters", "writeRegisters"})
+
+    def __init__(self, iface: "MockModbusInterface"):
+        self.iface = iface
+
+    @staticmethod
+    def _ok():
+        return modbus_iface_pb2.responseHeader(success=True)
+
+    async def readRegisters(self, request, timeout=None):
+        values = self.iface.get_registers(
+            request.address, request.count, request.modbus_id, request.register_type
+        )
+        return modbus_iface_pb2.readRegisterResponse(
+            response_header=self._ok(), values=values
+        )
+
+    async def writeRegisters(self, request, timeout=None):
+        self.iface.set_registers(
+            request.address, request.values, request.modbus_id, request.register_type
+        )
+        return modbus_iface_pb2.writeRegisterResponse(response_header=self._ok())
+
+
+class MockModbusInterface(ModbusInterface):
+    """A modbus interface backed by in-memory registers, for tests and simulations.
+
+    Reads, writes and register subscriptions go through the same request path as the
+    real interface, against ``registers``: one ``{address: value}`` dict per
+    ``(modbus_id, register_type)``. Unset registers read as 0. Subscriptions are polled
+    every ``poll_secs`` on the event loop, as the modbus service would. Other requests
+    (buses, servers) raise AttributeError.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.registers: dict[tuple[int, int], dict[int, int]] = {}
+        self._service = _MockModbusService(self)
+
+    def set_registers(
+        self,
+        start_address: int,
+        values: list[int],
+        modbus_id: int = 1,
+        register_type: int = 4,
+    ):
+        """Set register values, as if the slave device changed them."""
+        block = self.registers.setdefault((modbus_id, register_type), {})
+        for offset, value in enumerate(values):
+            block[start_address + offset] = int(value)
+
+    def get_registers(
+        self,
+        start_address: int,
+        num_registers: int = 1,
+        modbus_id: int = 1,
+        register_type: int = 4,
+    ) -> list[int]:
+        block = self.registers.get((modbus_id, register_type), {})
+        return [
+            block.get(address, 0)
+            for address in range(start_address, start_address + num_registers)
+        ]
+
+    async def _get_stub(self):
+        if self.is_app_view:
+            return await self._transport._get_stub()
+        return self._service
+
+    async def make_request(self, stub_call, request, *args, **kwargs):
+        if not self.is_app_view and stub_call not in _MockModbusService.RPCS:
+            raise AttributeError(f"MockModbusInterface does not support {stub_call}")
+        return await super().make_request(stub_call, request, *args, **kwargs)
+
+    async def _discard_channel(self):
+        pass
+
+    async def health_check(self):
+        return True
+
+    async def run_read_register_subscription_task(
+        self,
+        bus_id: str,
+        modbus_id: int,
+        start_address: int,
+        num_registers: int,
+        register_type: int,
+        poll_secs: int,
+        callback: ReadRegisterSubscriptionCallback,
+        configure_bus: bool = True,
+        bus=None,
+    ):
+        while True:
+            values = await self.read_registers(
+                modbus_id=modbus_id,
+                start_address=start_address,
+                num_registers=num_registers,
+                register_type=register_type,
+                bus=bus,
+            )
+            if callback is not None:
+                await call_maybe_async(callback, values)
+            await asyncio.sleep(poll_secs)
+
+
 modbus_iface = ModbusInterface
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import struct
+from typing import TYPE_CHECKING, Any
+
+from ...tags.manager import KeyPath
+from .decoding import RegisterMap
+
+if TYPE_CHECKING:
+    from ...tags.manager import TagsManagerDocker
+    from .modbus_iface import ModbusInterface
+
+log = logging.getLogger(__name__)
+
+# createServer takes the initial table per function code
+_SERVER_TABLES = {3: "holding_registers", 4: "input_registers"}
+
+
+class ModbusServerBridge:
+    """Serve tag values to a modbus master (e.g. SCADA) from a modbus server.
+
+    Each field of the register map is named after a tag. The bridge keeps a shadow
+    copy of the server's register table, and on every tag change re-encodes only the
+    affected fields. Registers whose value actually changed are pushed with as few
+    ``setServerRegisters`` calls as possible: one per contiguous run of changed
+    registers, with runs separated by no more than ``coalesce_gap`` registers merged.
+
+    Changes made within the same event loop iteration (e.g. several ``set_tag`` calls
+    in one ``main_loop``) are pushed together. Registers whose push failed stay dirty
+    and are retried after ``retry_delay`` seconds, doubling up to ``max_retry_delay``
+    while pushes keep failing, so a quiet tag isn't left stale until its next change.
+
+    Examples
+    --------
+
+    Serve a few tags as holding registers on port 5020::
+
+        SCADA_MAP = RegisterMap(
+            [
+                RegisterField("pump_running", 0, "uint16"),
+                RegisterField("flow_rate", 1, "float32"),
+                RegisterField("total_litres", 3, "uint32", scale=0.1),
+            ]
+        )
+
+        async def setup(self):
+            self.scada = ModbusServerBridge(self.modbus_iface, SCADA_MAP, port=5020)
+            await self.scada.start(self.tag_manager)
+
+    Parameters
+    ----------
+    modbus_iface : ModbusInterface
+        The modbus interface hosting the server.
+    register_map : RegisterMap
+        The register layout; field names are tag names.
+    port : int
+        The port the server listens on.
+    host : str, optional
+        The host the server binds to.
+    modbus_id : int
+        The slave id the server answers to.
+    function_code : int
+        3 to serve holding registers (default), 4 to serve input registers.
+    server_type : str
+        The server type passed to ``createServer`` (default ``"tcp"``).
+    app_key : str, optional
+        The app whose tags are served. Defaults to the tag manager's app.
+    coalesce_gap : int
+        Changed runs separated by this many unchanged registers or fewer are pushed
+        as one call, re-sending the unchanged registers in between.
+    retry_delay : float
+        Seconds to wait before retrying a failed push (default 1).
+    max_retry_delay : float
+        The longest wait between retries (default 30).
+    """
+
+    def __init__(
+        self,
+        modbus_iface: "ModbusInterface",
+        register_map: RegisterMap,
+        port: int = 502,
+        host: str | None = None,
+        modbus_id: int = 1,
+        function_code: int = 3,
+        server_type: str = "tcp",
+        app_key: str | None = None,
+        coalesce_gap: int = 0,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+    ):
+        if function_code not in _SERVER_TABLES:
+            raise ValueError(
+                "function_code must be 3 (holding registers) or 4 (input registers)"
+            )
+
+        self.modbus_iface = modbus_iface
+        self.register_map = register_map
+        self.port = port
+        self.host = host
+        self.modbus_id = modbus_id
+        self.function_code = function_code
+        self.server_type = server_type
+        self.app_key = app_key
+        self.coalesce_gap = coalesce_gap
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        self.tag_manager: "TagsManagerDocker | None" = None
+        self._key_paths: dict[str, KeyPath] = {}
+        self._table: list[int] = []
+        self._dirty: set[int] = set()
+        self._flush_task: asyncio.Task | None = None
+        self._retry_task: asyncio.Task | None = None
+        self._failed_flushes = 0
+
+    @property
+    def registers(self) -> list[int]:
+        """The bridge's copy of the server's register table."""
+        return list(self._table)
+
+    async def start(self, tag_manager: "TagsManagerDocker") -> bool:
+        """Create the server, seeded with current tag values, and start following tag changes.
+
+        Returns
+        -------
+        bool
+            True if the server was created.
+        """
+        self.tag_manager = tag_manager
+        app_key = self.app_key or tag_manager.app_key
+        self._key_paths = {
+            f.name: KeyPath(f.name, app_key=app_key) for f in self.register_map.fields
+        }
+
+        self._table = [0] * (
+            self.register_map.start_address + self.register_map.num_registers
+        )
+        current = {
+            name: tag_manager.get_tag(path) for name, path in self._key_paths.items()
+        }
+        for address, value in self._encode(current).items():
+            self._table[address] = value
+
+        created = await self.modbus_iface.create_server(
+            server_type=self.server_type,
+            port=self.port,
+            host=self.host,
+            modbus_id=self.modbus_id,
+            **{_SERVER_TABLES[self.function_code]: self._table},
+        )
+        if not created:
+            log.error(f"Failed to create modbus server on port {self.port}")
+            return False
+
+        tag_manager.add_change_listener(self._on_tags_changed)
+        return True
+
+    async def close(self):
+        """Stop following tag changes and close the server."""
+        if self.tag_manager is not None:
+            self.tag_manager.remove_change_listener(self._on_tags_changed)
+        for task in (self._flush_task, self._retry_task):
+            if task is not None:
+                task.cancel()
+        self._flush_task = self._retry_task = None
+        await self.modbus_iface.close_server(self.port)
+
+    def _on_tags_changed(self, diff: dict[str, Any]):
+        values = {
+            name: path.lookup_dict(diff)
+            for name, path in self._key_paths.items()
+            if path.in_dict(diff)
+        }
+        if values:
+            self.update(values)
+
+    def _encode(self, values: dict[str, Any]) -> dict[int, int]:
+        registers = {}
+        for name, value in values.items():
+            try:
+                registers.update(self.register_map.encode({name: value}))
+            except (TypeError, ValueError, struct.error) as e:
+                log.warning(f"Cannot serve tag {name}={value!r} over modbus: {e}")
+        return registers
+
+    def update(self, values: dict[str, Any]):
+        """Stage new field values; changed registers are pushed on the next loop iteration."""
+        for address, value in self._encode(values).items():
+            if self._table[address] != value:
+                self._table[address] = value
+                self._dirty.add(address)
+
+        if self._dirty and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_soon())
+
+    async def _flush_soon(self):
+        # yield once so changes from the rest of this loop iteration coalesce
+        await asyncio.sleep(0)
+        self._flush_task = None
+        await self.flush()
+
+    async def _retry_later(self, delay: float):
+        await asyncio.sleep(delay)
+        self._retry_task = None
+        if self._dirty:
+            await self.flush()
+
+    def _dirty_runs(self) -> list[tuple[int, int]]:
+        runs = []
+        for address in sorted(self._dirty):
+            if runs and address - runs[-1][1] <= self.coalesce_gap:
+                runs[-1][1] = address + 1
+            else:
+                runs.append([address, address + 1])
+        return [(start, end) for start, end in runs]
+
+    async def flush(self) -> int:
+        """Push every changed register to the server now.
+
+        Returns
+        -------
+        int
+            The number of ``setServerRegisters`` calls made.
+        """
+        runs = self._dirty_runs()
+        self._dirty.clear()
+        failed = False
+        for start, end in runs:
+            try:
+                ok = await self.modbus_iface.set_server_registers(
+                    port=self.port,
+                    function_code=self.function_code,
+                    start_address=start,
+                    values=self._table[start:end],
+                )
+            except Exception as e:
+                log.error(f"Error setting modbus server registers: {e}", exc_info=e)
+                ok = False
+            if not ok:
+                failed = True
+                self._dirty.update(range(start, end))
+
+        if not failed:
+            self._failed_flushes = 0
+        elif self._retry_task is None:
+            self._failed_flushes += 1
+            delay = min(
+                self.max_retry_delay,
+                self.retry_delay * 2 ** (self._failed_flushes - 1),
+            )
+            log.warning(
+                f"Retrying {len(self._dirty)} modbus server registers in {delay}s"
+            )
+            self._retry_task = asyncio.create_task(self._retry_later(delay))
+        return len(runs)
@@ -0,0 +1,322 @@
+import asyncio
+import enum
+import logging
+from collections.abc import Callable, Coroutine, Sequence
+from typing import TYPE_CHECKING
+
+from ...utils import clock
+from ...utils import call_maybe_async
+
+if TYPE_CHECKING:
+    from .modbus_iface import ModbusInterface
+
+log = logging.getLogger(__name__)
+
+ReadRegisterSubscriptionCallback = (
+    Callable[[list[int]], None] | Coroutine[[list[int]], None]
+)
+
+# Protocol limits for a single read transaction (Modbus application protocol
+# spec, function codes 1-4): 2000 bits for coils / discrete inputs, 125 words
+# for holding / input registers. A merged schedule never spans more than this,
+# so it always stays a single bus transaction per poll.
+MAX_BITS_PER_READ = 2000
+MAX_REGISTERS_PER_READ = 125
+
+
+class ChangeFilter(enum.Enum):
+    """How a subscription decides whether a poll result is worth a callback.
+
+    ``EXACT`` delivers when any register differs from the last delivered block.
+    ``HASH`` does the same but keeps only a hash of the last block, for large blocks.
+    ``DEADBAND`` delivers when any register moved more than its deadband away from
+    the last delivered value, so slow drift still comes through once it adds up.
+    """
+
+    EXACT = "exact"
+    HASH = "hash"
+    DEADBAND = "deadband"
+
+
+def max_read_count(register_type: int) -> int:
+    """The largest number of registers one read of ``register_type`` may cover."""
+    return MAX_BITS_PER_READ if register_type in (1, 2) else MAX_REGISTERS_PER_READ
+
+
+class RegisterSubscription:
+    """A single subscriber to a shared register polling schedule.
+
+    This is returned by :meth:`ModbusInterface.add_read_register_subscription`. Several
+    subscriptions to the same bus and slave share one gRPC stream; each subscription
+    receives only the slice of the polled block it asked for.
+
+    Attributes
+    ----------
+    start_address : int
+        The first register this subscription is interested in.
+    num_registers : int
+        The number of registers this subscription is interested in.
+    poll_secs : int | None
+        The requested polling interval. The shared schedule may poll faster, in which
+        case the callback is only invoked every ``poll_secs``.
+    callback : ReadRegisterSubscriptionCallback
+        The callback invoked with this subscription's register values.
+    change_filter : ChangeFilter | None
+        If set, the callback only runs when the registers meaningfully change.
+    deadband : int | Sequence[int]
+        Per-register deadband for :attr:`ChangeFilter.DEADBAND`; either one value for
+        every register or one per register.
+    max_silence_secs : float | None
+        With a change filter, deliver anyway if nothing has been delivered for this long.
+    """
+
+    def __init__(
+        self,
+        start_address: int,
+        num_registers: int,
+        poll_secs: int | None,
+        callback: ReadRegisterSubscriptionCallback,
+        change_filter: ChangeFilter | str | None = None,
+        deadband: int | Sequence[int] = 0,
+        max_silence_secs: float | None = None,
+    ):
+        self.start_address = start_address
+        self.num_registers = num_registers
+        self.poll_secs = poll_secs
+        self.callback = callback
+
+        if change_filter is None and deadband:
+            change_filter = ChangeFilter.DEADBAND
+        self.change_filter = (
+            ChangeFilter(change_filter) if change_filter is not None else None
+        )
+        if isinstance(deadband, Sequence):
+            if len(deadband) != num_registers:
+                raise ValueError("deadband needs exactly one value per register")
+            self.deadband = tuple(deadband)
+        else:
+            self.deadband = (deadband,) * num_registers
+        self.max_silence_secs = max_silence_secs
+
+        self._schedule: "RegisterPollSchedule | None" = None
+        self._every = 1
+        self._cancelled = False
+
+        self._last = None
+        self._last_delivered_at: float | None = None
+
+    @property
+    def end_address(self) -> int:
+        return self.start_address + self.num_registers
+
+    def cancel(self) -> bool:
+        """Stop receiving updates. The shared stream closes once its last subscriber leaves.
+
+        Returns
+        -------
+        bool
+            True if the subscription was active, False if it was already cancelled.
+        """
+        if self._cancelled:
+            return False
+        self._cancelled = True
+        if self._schedule is not None:
+            self._schedule.remove(self)
+            self._schedule = None
+        return True
+
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def done(self) -> bool:
+        return self._cancelled
+
+    def _slice(self, values, schedule_start: int) -> list[int] | None:
+        if values is None:
+            return None
+        offset = self.start_address - schedule_start
+        return values[offset : offset + self.num_registers]
+
+    def _should_deliver(self, chunk: list[int] | None, now: float) -> bool:
+        """Whether ``chunk`` passes the change filter, recording it as delivered if so."""
+        mode = self.change_filter
+        if mode is None:
+            return True
+
+        if self._last_delivered_at is None or self._silence_expired(now):
+            changed = True
+        elif chunk is None or self._last is None:
+            # a read starting to fail, or recovering, is always worth reporting
+            changed = (chunk is None) != (self._last is None)
+        elif mode is ChangeFilter.HASH:
+            changed = hash(tuple(chunk)) != self._last
+        elif mode is ChangeFilter.DEADBAND:
+            changed = any(
+                abs(new - old) > band
+                for new, old, band in zip(chunk, self._last, self.deadband)
+            )
+        else:
+            changed = chunk != self._last
+
+        if not changed:
+            return False
+
+        if chunk is None:
+            self._last = None
+        elif mode is ChangeFilter.HASH:
+            self._last = hash(tuple(chunk))
+        else:
+            self._last = chunk
+        self._last_delivered_at = now
+        return True
+
+    def _silence_expired(self, now: float) -> bool:
+        return (
+            self.max_silence_secs is not None
+            and now - self._last_delivered_at >= self.max_silence_secs
+        )
+
+
+class RegisterPollSchedule:
+    """One polling stream on a bus / slave / register type, shared by many subscriptions.
+
+    The schedule reads the smallest contiguous block covering every subscriber's range
+    at the fastest interval it was created with, then fans each result out in-process.
+    Subscribers asking for a slower, whole-multiple interval are decimated rather than
+    given a stream of their own.
+    """
+
+    def __init__(
+        self,
+        interface: "ModbusInterface",
+        bus_id: str,
+        modbus_id: int,
+        register_type: int,
+        poll_secs: int | None,
+        bus=None,
+        merge_gap: int = 0,
+    ):
+        self.interface = interface
+        self.bus_id = bus_id
+        self.modbus_id = modbus_id
+        self.register_type = register_type
+        self.poll_secs = poll_secs
+        self.bus = bus
+        self.merge_gap = merge_gap
+
+        self.subscriptions: list[RegisterSubscription] = []
+        self.start_address: int | None = None
+        self.num_registers = 0
+
+        self.task: asyncio.Task | None = None
+        self._tick = 0
+
+    @property
+    def end_address(self) -> int:
+        return (self.start_address or 0) + self.num_registers
+
+    def _period_ratio(self, poll_secs: int | None) -> int | None:
+        if poll_secs == self.poll_secs:
+            return 1
+        if not poll_secs or not self.poll_secs:
+            return None
+        ratio, remainder = divmod(poll_secs, self.poll_secs)
+        if ratio >= 1 and remainder == 0:
+            return int(ratio)
+        return None
+
+    def _merged_range(self, sub: RegisterSubscription) -> tuple[int, int] | None:
+        if self.start_address is None:
+            return sub.start_address, sub.num_registers
+        # Only bridge small holes: reading unmapped registers can make a slave
+        # reply with an illegal-address exception and fail the whole block.
+        if (
+            sub.start_address > self.end_address + self.merge_gap
+            or sub.end_address < self.start_address - self.merge_gap
+        ):
+            return None
+        start = min(self.start_address, sub.start_address)
+        end = max(self.end_address, sub.end_address)
+        if end - start > max_read_count(self.register_type):
+            return None
+        return start, end - start
+
+    def try_add(self, sub: RegisterSubscription) -> bool:
+        """Attach ``sub`` if its range and period fit this schedule, restarting the stream if the block grew."""
+        every = self._period_ratio(sub.poll_secs)
+        if every is None:
+            return False
+        merged = self._merged_range(sub)
+        if merged is None:
+            return False
+
+        sub._schedule = self
+        sub._every = every
+        self.subscriptions.append(sub)
+        if merged != (self.start_address, self.num_registers) or self.task is None:
+            self.start_address, self.num_registers = merged
+            self._restart()
+        return True
+
+    def remove(self, sub: RegisterSubscription):
+        try:
+            self.subscriptions.remove(sub)
+        except ValueError:
+            return
+        if not self.subscriptions:
+            self.stop()
+            self.interface._remove_poll_schedule(self)
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def _restart(self):
+        self.stop()
+        log.debug(
+            f"Polling modbus_id={self.modbus_id} type={self.register_type} "
+            f"registers {self.start_address}..{self.end_address - 1} every {self.poll_secs}s "
+            f"for {len(self.subscriptions)} subscriber(s)"
+        )
+        self.task = asyncio.create_task(
+            self.interface.run_read_register_subscription_task(
+                bus_id=self.bus_id,
+                modbus_id=self.modbus_id,
+                start_address=self.start_address,
+                num_registers=self.num_registers,
+                register_type=self.register_type,
+                poll_secs=self.poll_secs,
+                callback=self.dispatch,
+                bus=self.bus,
+            )
+        )
+        self.interface.subscription_tasks.append(self.task)
+        self.task.add_done_callback(self.interface._discard_subscription_task)
+
+    async def dispatch(self, values):
+        """Fan one poll result out to every subscriber due on this tick."""
+        if isinstance(values, int):
+            values = [values]
+        elif values is not None:
+            values = list(values)
+
+        tick = self._tick
+        self._tick += 1
+        start = self.start_address
+        now = clock.monotonic()
+        for sub in list(self.subscriptions):
+            if tick % sub._every != 0:
+                continue
+            chunk = sub._slice(values, start)
+            if not sub._should_deliver(chunk, now):
+                continue
+            if chunk is not None and len(chunk) == 1:
+                chunk = chunk[0]
+            try:
+                await call_maybe_async(sub.callback, chunk)
+            except Exception as e:
+                # one bad callback must not starve the other subscribers
+                log.error(
+                    f"Error in read register subscription callback: {e}", exc_info=e
+                )
@@ -0,0 +1,290 @@
+"""Periodic tasks that run alongside an application's main loop, each at its own rate."""
+
+import asyncio
+import inspect
+import logging
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from ..utils import call_maybe_async
+from ..utils import clock
+from .timing import LoopScheduler, PhaseTiming
+
+log = logging.getLogger(__name__)
+
+
+def periodic(
+    period: float,
+    jitter: float = 0.0,
+    skip_if_running: bool = True,
+    name: str | None = None,
+):
+    """Decorator to run an application method every ``period`` seconds.
+
+    Decorated methods are discovered when the application starts and run on the same
+    event loop as ``main_loop``, each on its own schedule. Methods can be synchronous
+    (run in an executor) or asynchronous.
+
+    Examples
+    --------
+
+    Sample fast, tidy up slowly::
+
+        from pydoover.docker import Application, periodic
+
+        class MyApp(Application):
+            @periodic(0.1)
+            async def sample_pressure(self):
+                self.pressure.append(await self.platform_iface.fetch_ai(0))
+
+            @periodic(60, jitter=5)
+            async def housekeeping(self):
+                await self.flush_logs()
+
+    Parameters
+    ----------
+    period : float
+        Seconds between the start of one run and the next.
+    jitter : float
+        Up to this many seconds of random delay is added to each run, spreading out
+        tasks that share a period. Jitter never accumulates into drift.
+    skip_if_running : bool
+        If a run is still in progress when the next is due, skip the new run (the
+        default). If False, runs are allowed to overlap.
+    name : str, optional
+        The task's name in stats and logs. Defaults to the method name.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        func._is_periodic_task = True
+        func._periodic_options = {
+            "period": period,
+            "jitter": jitter,
+            "skip_if_running": skip_if_running,
+            "name": name,
+        }
+        return func
+
+    return decorator
+
+
+class PeriodicTask:
+    """A function run on a fixed period, with timing statistics.
+
+    Runs are started on absolute monotonic deadlines (see :class:`LoopScheduler`), so a
+    slow run delays nothing but itself. A run that takes longer than ``period`` is an
+    overrun; with ``skip_if_running``, any run due while it is still in progress is
+    skipped.
+
+    Attributes
+    ----------
+    timing : PhaseTiming
+        Durations of completed runs.
+    runs : int
+        Runs started.
+    skipped : int
+        Runs skipped because the previous run was still in progress.
+    overruns : int
+        Runs that took longer than ``period``.
+    errors : int
+        Runs that raised an exception.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        period: float,
+        jitter: float = 0.0,
+        skip_if_running: bool = True,
+        name: str | None = None,
+    ):
+        if period <= 0:
+            raise ValueError("period must be greater than 0")
+        if not 0 <= jitter < period:
+            raise ValueError("jitter must be at least 0 and less than period")
+
+        self.func = func
+        self.period = period
+        self.jitter = jitter
+        self.skip_if_running = skip_if_running
+        self.name = name or getattr(func, "__name__", repr(func))
+
+        self.timing = PhaseTiming()
+        self.runs = 0
+        self.skipped = 0
+        self.overruns = 0
+        self.errors = 0
+
+        self._scheduler = LoopScheduler()
+        self._runner: asyncio.Task | None = None
+        self._in_flight: set[asyncio.Task] = set()
+        self._last_overrun_warning: float | None = None
+
+    @property
+    def missed(self) -> int:
+        """Deadlines missed because the event loop itself was blocked."""
+        return self._scheduler.missed_ticks
+
+    @property
+    def is_running(self) -> bool:
+        """Whether a run is in progress."""
+        return bool(self._in_flight)
+
+    def start(self):
+        """Start the schedule. The first run is immediate (plus any jitter)."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run_forever())
+
+    async def stop(self):
+        """Stop the schedule and cancel any run in progress."""
+        tasks = list(self._in_flight)
+        if self._runner is not None:
+            tasks.append(self._runner)
+            self._runner = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_forever(self):
+        if self.jitter:
+            await asyncio.sleep(random.uniform(0, self.jitter))
+        self._scheduler.start(self.period)
+        while True:
+            self._tick()
+            delay = self._scheduler.delay(self.period)
+            if self.jitter:
+                delay += random.uniform(0, self.jitter)
+            await asyncio.sleep(delay)
+
+    def _tick(self):
+        if self._in_flight and self.skip_if_running:
+            self.skipped += 1
+            self._warn_overrun("skipping this run")
+            return
+
+        self.runs += 1
+        task = asyncio.create_task(self._run_once())
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _run_once(self):
+        start = time.perf_counter()
+        try:
+            await call_maybe_async(self.func)
+        except Exception as e:
+            self.errors += 1
+            log.error(f"Error in periodic task {self.name}: {e}", exc_info=e)
+        finally:
+            secs = time.perf_counter() - start
+            self.timing.record(secs)
+            if secs > self.period:
+                self.overruns += 1
+                self._warn_overrun(f"took {secs:.3f}s")
+
+    def _warn_overrun(self, detail: str):
+        # at most one warning every 6 seconds per task, so a fast task can't flood the log
+        now = clock.monotonic()
+        if self._last_overrun_warning is None or now - self._last_overrun_warning > 6:
+            log.warning(
+                f"Periodic task {self.name} overran its {self.period}s period: {detail}"
+            )
+            self._last_overrun_warning = now
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "period": self.period,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "overruns": self.overruns,
+            "errors": self.errors,
+            "missed": self.missed,
+            "timing": self.timing.to_dict(),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"PeriodicTask(name={self.name!r}, period={self.period}, runs={self.runs})"
+        )
+
+
+class PeriodicTaskManager:
+    """Runs an application's periodic tasks.
+
+    Every application has one of these as ``app.periodic_tasks``. Methods decorated with
+    :func:`periodic` are registered during setup and started before the main loop; tasks
+    can also be added at runtime with :meth:`add_task`.
+    """
+
+    def __init__(self):
+        self.tasks: dict[str, PeriodicTask] = {}
+        self._started = False
+
+    def __getitem__(self, name: str) -> PeriodicTask:
+        return self.tasks[name]
+
+    @staticmethod
+    def check_task(func: Callable) -> bool:
+        return inspect.ismethod(func) and getattr(func, "_is_periodic_task", False)
+
+    def register_tasks(self, obj: object):
+        """Scan ``obj`` for methods decorated with :func:`periodic` and add them.
+
+        Like :meth:`RPCManager.register_handlers`, attributes are resolved statically
+        first so property getters are never invoked.
+        """
+        for _name in dir(obj):
+            try:
+                static_attr = inspect.getattr_static(obj, _name)
+            except AttributeError:
+                continue
+            if not inspect.isfunction(static_attr):
+                continue
+            func = getattr(obj, _name)
+            if not self.check_task(func):
+                continue
+            self.add_task(func, **func._periodic_options)
+
+    def add_task(
+        self,
+        func: Callable,
+        period: float,
+        jitter: float = 0.0,
+        skip_if_running: bool = True,
+        name: str | None = None,
+    ) -> PeriodicTask:
+        """Run ``func`` every ``period`` seconds. See :func:`periodic` for the options.
+
+        Returns
+        -------
+        PeriodicTask
+            The task, which is started straight away if the manager is running.
+        """
+        task = PeriodicTask(func, period, jitter, skip_if_running, name)
+        if task.name in self.tasks:
+            raise ValueError(f"A periodic task named {task.name!r} already exists")
+
+        log.info(f"Registering periodic task: {task.name} (period={period}s)")
+        self.tasks[task.name] = task
+        if self._started:
+            task.start()
+        return task
+
+    async def remove_task(self, name: str):
+        """Stop and remove a task."""
+        task = self.tasks.pop(name)
+        await task.stop()
+
+    def start(self):
+        self._started = True
+        for task in self.tasks.values():
+            task.start()
+
+    async def stop(self):
+        self._started = False
+        await asyncio.gather(*(task.stop() for task in self.tasks.values()))
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        """Stats for every task, keyed by name."""
+        return {name: task.to_dict() for name, task in self.tasks.items()}
@@ -1,5 +1,6 @@
 from .platform import (
     PlatformInterface as PlatformInterface,
+    MockPlatformInterface as MockPlatformInterface,
     PulseCounter as PulseCounter,
 )
 from .platform_types import (
@@ -9,3 +10,11 @@ from .platform_types import (
     IoDevice as IoDevice,
     IoDetails as IoDetails,
 )
+from .pulse_buffer import PulseBuffer as PulseBuffer
+from .snapshot import IoSnapshot as IoSnapshot
+from .pulse_mux import (
+    PulseListener as PulseListener,
+    PulseStreamMultiplexer as PulseStreamMultiplexer,
+)
+from .events import EventCursor as EventCursor
+from .backfill import SleepLogBackfill as SleepLogBackfill
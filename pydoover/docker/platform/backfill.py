@@ -0,0 +1,143 @@
+import logging
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ...models.generated.platform import platform_iface_pb2
+from .state import load_state, save_state
+
+if TYPE_CHECKING:
+    from ...tags.manager import TagsManagerDocker
+    from .platform import PlatformInterface
+
+log = logging.getLogger(__name__)
+
+SleepLogEntry = platform_iface_pb2.SleepLogEntry
+SleepLogMapper = Callable[[SleepLogEntry], "dict[str, Any] | None"]
+
+
+def sleep_log_entry_to_tags(entry: SleepLogEntry) -> dict[str, Any]:
+    """The default sleep log mapping: each reading becomes a tag of the same name.
+
+    Readings the platform didn't record are left out; IO readings are lists indexed by pin.
+    """
+    tags = {}
+    for field in ("input_voltage", "system_current", "system_power"):
+        if entry.HasField(field):
+            tags[field] = getattr(entry, field)
+    for field in ("di", "do", "ai", "ao"):
+        values = list(getattr(entry, field))
+        if values:
+            tags[field] = values
+    return tags
+
+
+class SleepLogBackfill:
+    """Writes the platform's sleep log to tag history, resuming where it last stopped.
+
+    The sleep log is read in pages (``fetch_sleep_log(since=...)``) and written in chunks
+    of ``chunk_size`` entries. Each entry is mapped to tag values by ``to_tags`` and
+    logged as a historical message dated at the entry's timestamp, with up to
+    ``max_concurrency`` writes in flight (see :meth:`TagsManagerDocker.log_history`).
+
+    Progress is saved to ``state_file`` after every chunk. A device that goes back to
+    sleep part way through resumes from the last completed chunk on its next run.
+    Entries in an interrupted chunk may be written twice.
+
+    Examples
+    --------
+
+    Backfill voltage history captured while the device slept::
+
+        async def setup(self):
+            backfill = SleepLogBackfill(
+                self.platform_iface,
+                self.tag_manager,
+                to_tags=lambda entry: {"battery_voltage": entry.input_voltage},
+                state_file="/data/sleep_log_backfill.json",
+            )
+            written = await backfill.run()
+
+    Parameters
+    ----------
+    platform_iface : PlatformInterface
+        The interface to read the sleep log from.
+    tag_manager : TagsManagerDocker
+        The tag manager to write history through.
+    to_tags : Callable[[SleepLogEntry], dict | None], optional
+        Maps an entry to the tag values to log for it. Returning None or ``{}`` skips
+        the entry. Defaults to :func:`sleep_log_entry_to_tags`.
+    state_file : Path | str, optional
+        A file to persist progress in. Without one, every run starts from the oldest
+        stored entry.
+    chunk_size : int
+        Entries written between progress saves.
+    max_concurrency : int
+        Messages in flight at once.
+    app_key : str, optional
+        The app the tags belong to. Defaults to the tag manager's app.
+    """
+
+    def __init__(
+        self,
+        platform_iface: "PlatformInterface",
+        tag_manager: "TagsManagerDocker",
+        to_tags: SleepLogMapper | None = None,
+        state_file: Path | str | None = None,
+        chunk_size: int = 20,
+        max_concurrency: int = 4,
+        app_key: str | None = None,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.platform_iface = platform_iface
+        self.tag_manager = tag_manager
+        self.to_tags = to_tags or sleep_log_entry_to_tags
+        self.state_file = state_file
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.app_key = app_key
+
+        self.last_timestamp: int = load_state(state_file).get("last_timestamp", 0)
+
+    def _points(self, entries: list[SleepLogEntry]):
+        for entry in entries:
+            tags = self.to_tags(entry)
+            if tags:
+                timestamp = datetime.fromtimestamp(
+                    entry.timestamp / 1000, tz=timezone.utc
+                )
+                yield timestamp, tags
+
+    async def run(self) -> int:
+        """Write every sleep log entry newer than the saved progress.
+
+        Returns
+        -------
+        int
+            The number of historical messages written.
+        """
+        written = 0
+        while True:
+            # `since` is inclusive, so ask for the millisecond after the last entry
+            page = await self.platform_iface.fetch_sleep_log(
+                since=self.last_timestamp + 1 if self.last_timestamp else 0
+            )
+            page = [e for e in page if e.timestamp > self.last_timestamp]
+            if not page:
+                break
+
+            page.sort(key=lambda e: e.timestamp)
+            for start in range(0, len(page), self.chunk_size):
+                chunk = page[start : start + self.chunk_size]
+                written += await self.tag_manager.log_history(
+                    self._points(chunk),
+                    app_key=self.app_key,
+                    max_concurrency=self.max_concurrency,
+                )
+                self.last_timestamp = chunk[-1].timestamp
+                save_state(self.state_file, {"last_timestamp": self.last_timestamp})
+
+        log.info(f"Backfilled {written} sleep log entries")
+        return written
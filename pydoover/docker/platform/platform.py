@@ -1,6 +1,5 @@
 import asyncio
 import logging
-import time
 import json
 
 from collections.abc import Iterable, Coroutine, Callable
@@ -10,8 +9,13 @@ import grpc
 from ...models import DooverAPIError
 from ...models.generated.platform import platform_iface_pb2, platform_iface_pb2_grpc
 from .platform_types import Location, Event, IoDetails
+from .events import EventCursor
+from .pulse_buffer import PulseBuffer, pulse_capacity
+from .pulse_mux import PulseListener, PulseStreamMultiplexer
+from .snapshot import IoSnapshot
 from ..grpc_interface import GRPCInterface
 from ...utils import call_maybe_async, deprecated
+from ...utils import clock
 from ...cli.decorators import command as cli_command
 
 log = logging.getLogger(__name__)
@@ -46,10 +50,16 @@ class PulseCounter:
         The size of the window in seconds for which the rate of pulses is calculated.
     count : int
         The total number of pulses received.
-    pulse_timestamps : list[float]
-        A list of timestamps for each pulse received.
+    pulse_timestamps : PulseBuffer
+        Timestamps of the most recent pulses received, oldest first. This holds at most
+        ``max_pulses`` timestamps; older ones are overwritten (see ``dropped_pulses``).
     receiving_pulses : bool
         Whether the PulseCounter is currently receiving pulses.
+    max_pulses : int, optional
+        The most pulse timestamps kept (8 bytes each). By default, enough for
+        ``rate_window_secs`` of pulses at 10 kHz; storage grows only as pulses arrive.
+        A warning is logged the first time a timestamp still inside the window is
+        overwritten, as rates are under-reported from then on.
 
     """
 
@@ -61,6 +71,7 @@ class PulseCounter:
         callback: PulseCounterCallback = None,
         rate_window_secs: int = 60,
         auto_start: bool = True,
+        max_pulses: int | None = None,
     ):
         self.platform_iface = plt_iface
         self.pin = pin
@@ -69,14 +80,20 @@ class PulseCounter:
         self.rate_window_secs = rate_window_secs
         self.count = 0
 
-        self.start_time = time.time()
+        self.start_time = clock.time()
         self.pulse_grace_period = (
             0.2  # Need to ignore pulses for a short period after starting
         )
-        self.pulse_timestamps = []
+        # sized to the window unless given, and kept that way if the window changes
+        self._sized_to_window = max_pulses is None
+        self.pulse_timestamps = PulseBuffer(
+            max_pulses or pulse_capacity(rate_window_secs)
+        )
+        self._warned_window_overflow = False
 
         self.receiving_pulses = False
         self.receiving_events = False
+        self._listener: PulseListener | None = None
 
         if auto_start:
             self.start_listener_pulses()
@@ -93,11 +110,19 @@ class PulseCounter:
             return
         self.receiving_pulses = True
 
-        self.start_time = time.time()
-        self.platform_iface.start_di_pulse_listener(
+        self.start_time = clock.time()
+        if self._listener is not None:
+            self._listener.cancel()
+        self._listener = self.platform_iface.start_di_pulse_listener(
             self.pin, self.receive_pulse, edge=self.edge, start_count=self.count
         )
 
+    def stop_listener_pulses(self):
+        """Stop listening for pulses. The pin's stream closes if nothing else listens to it."""
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
     def update_events(self):
         """Listen for offline events for a digital input pin.
 
@@ -121,8 +146,9 @@ class PulseCounter:
             return
         self.receiving_events = True
 
-        self.pulse_timestamps += time_stamps
-        self.count = len(self.pulse_timestamps)
+        for timestamp in time_stamps:
+            self._store_pulse(timestamp)
+        self.count = len(self.pulse_timestamps) + self.pulse_timestamps.overflowed
 
     async def receive_pulse(self, di, di_value, dt_secs, counter, edge):
         """Receive active pulses on the digital input pin.
@@ -135,13 +161,14 @@ class PulseCounter:
             return
         self.receiving_pulses = True
 
-        if time.time() - self.start_time < self.pulse_grace_period:
+        now = clock.time()
+        if now - self.start_time < self.pulse_grace_period:
             log.info(f"Ignoring pulse on di={di} with dt={dt_secs}s")
             return
 
         log.debug(f"Received pulse on di={di} with dt={dt_secs}s")
         self.count += 1
-        self.pulse_timestamps += [time.time()]
+        self._store_pulse(now)
         if self.callback is not None:
             await call_maybe_async(
                 self.callback, self.pin, di_value, dt_secs, self.count, edge
@@ -168,7 +195,7 @@ class PulseCounter:
                 self.handle_system_event(event)
                 continue
 
-            timestamp = event.time / 1000 or time.time()
+            timestamp = event.time / 1000 or clock.time()
             dt_secs = 0
             if len(self.pulse_timestamps) > 0:
                 if timestamp <= self.pulse_timestamps[-1] + 0.01:
@@ -179,7 +206,7 @@ class PulseCounter:
                 dt_secs = timestamp - self.pulse_timestamps[-1]
             log.info(f"Received event on di={event.pin} with t={dt_secs}s")
             self.count += 1
-            self.pulse_timestamps += [timestamp]
+            self._store_pulse(timestamp)
             if self.callback is not None:
                 self.callback(self.pin, di_value, dt_secs, timestamp, self.count, edge)
 
@@ -188,36 +215,58 @@ class PulseCounter:
 
     @deprecated("Use get_pulses_in_window to not damage record of pulses/events")
     def clean_pulse_timestamps(self):
-        if len(self.pulse_timestamps) == 0:
-            return
-
         ## Remove timestamps older than the rate window
-        while (
-            len(self.pulse_timestamps) > 0
-            and self.pulse_timestamps[0] < time.time() - self.rate_window_secs
-        ):
-            self.pulse_timestamps.pop(0)
+        self.pulse_timestamps.discard_before(clock.time() - self.rate_window_secs)
 
-    def get_pulses_in_window(self):
-        if len(self.pulse_timestamps) == 0:
+    def get_pulses_in_window(self) -> list[float]:
+        """The timestamps within ``rate_window_secs`` of the most recent pulse."""
+        if not self.pulse_timestamps:
             return []
+        return self.pulse_timestamps.after(
+            self.pulse_timestamps[-1] - self.rate_window_secs
+        )
 
-        pulses = []
-        ## Remove timestamps older than the rate window
-        for timestamp in self.pulse_timestamps:
-            if timestamp > self.pulse_timestamps[-1] - self.rate_window_secs:
-                pulses.append(timestamp)
-        return pulses
+    def count_pulses_in_window(self) -> int:
+        """The number of pulses within ``rate_window_secs`` of the most recent pulse."""
+        if not self.pulse_timestamps:
+            return 0
+        return self.pulse_timestamps.count_after(
+            self.pulse_timestamps[-1] - self.rate_window_secs
+        )
+
+    @property
+    def dropped_pulses(self) -> int:
+        """The number of timestamps overwritten because ``max_pulses`` was reached.
+
+        ``count`` still includes these pulses; only their timestamps are lost. If this
+        grows, rates over ``rate_window_secs`` are under-reported, so raise ``max_pulses``.
+        """
+        return self.pulse_timestamps.overflowed
+
+    def _store_pulse(self, timestamp: float):
+        evicted = self.pulse_timestamps.append(timestamp)
+        if (
+            evicted is not None
+            and not self._warned_window_overflow
+            and evicted > self.pulse_timestamps[-1] - self.rate_window_secs
+        ):
+            self._warned_window_overflow = True
+            log.warning(
+                f"Pulse counter on di={self.pin} is full: more than "
+                f"{self.pulse_timestamps.capacity} pulses in {self.rate_window_secs}s, "
+                "so rates are under-reported. Raise max_pulses."
+            )
 
     def set_rate_window(self, rate_window_secs):
         self.rate_window_secs = rate_window_secs
+        if self._sized_to_window:
+            self.pulse_timestamps.reserve(pulse_capacity(rate_window_secs))
 
     def get_rate_window(self):
         return self.rate_window_secs
 
     def get_pulses_per_minute(self):
-        pulses = self.get_pulses_in_window()
-        return len(pulses) * 60 / self.rate_window_secs
+        return self.count_pulses_in_window() * 60 / self.rate_window_secs
 
     def set_counter(self, counter):
         self.count = counter
@@ -248,9 +297,24 @@ class PlatformInterface(GRPCInterface):
     ):
         super().__init__(app_key, plt_uri, service_name)
         self.pulse_counter_listeners = []
+        self.pulse_mux = PulseStreamMultiplexer(self)
+        self.io_snapshot: IoSnapshot | None = None
+        self._own_pulse_listeners: list[PulseListener] = []
+
+    def _init_app_view(self):
+        # Pulse streams stay shared through the multiplexer; snapshots and
+        # dedicated listener tasks belong to each app.
+        self.pulse_counter_listeners = []
+        self.io_snapshot = None
+        self._own_pulse_listeners = []
 
     async def close(self):
         log.info("Closing platform interface...")
+        if self.is_app_view:
+            for listener in self._own_pulse_listeners:
+                listener.cancel()
+        else:
+            await self.pulse_mux.close()
         for listener in self.pulse_counter_listeners:
             listener.cancel()
         await super().close()
@@ -274,6 +338,47 @@ class PlatformInterface(GRPCInterface):
 
         return res
 
+    def enable_io_snapshot(
+        self,
+        max_age: float | None = None,
+        pins: dict[str, Iterable[int]] | None = None,
+    ) -> IoSnapshot:
+        """Serve ``fetch_di``, ``fetch_ai``, ``fetch_do`` and ``fetch_ao`` from a batched snapshot.
+
+        Instead of one request per call, each IO kind is fetched for every pin the app
+        uses in a single request, at most once per main loop iteration (or once per
+        ``max_age`` seconds). ``set_do`` and ``set_ao`` invalidate the pins they set.
+
+        Examples
+        --------
+
+        Read a 16 channel IO board with 4 requests per loop, however many helpers read it::
+
+            async def setup(self):
+                self.platform_iface.enable_io_snapshot(
+                    pins={"di": range(8), "ai": range(4), "do": range(4)}
+                )
+
+        Parameters
+        ----------
+        max_age : float, optional
+            Serve values for this many seconds rather than one loop iteration.
+        pins : dict[str, Iterable[int]], optional
+            Pins to fetch from the start, keyed by ``"di"``, ``"ai"``, ``"do"`` or ``"ao"``.
+            Any other pin is added the first time it is read.
+
+        Returns
+        -------
+        IoSnapshot
+            The snapshot now serving reads.
+        """
+        self.io_snapshot = IoSnapshot(self, max_age=max_age, pins=pins)
+        return self.io_snapshot
+
+    def disable_io_snapshot(self):
+        """Go back to one request per ``fetch_*`` call."""
+        self.io_snapshot = None
+
     def get_new_pulse_counter(
         self,
         di: int,
@@ -281,6 +386,7 @@ class PlatformInterface(GRPCInterface):
         callback: PulseCounterCallback = None,
         rate_window_secs: int = 20,
         auto_start: bool = True,
+        max_pulses: int | None = None,
     ) -> PulseCounter:
         """Create a new Pulse Counter for counting pulses on a digital input pin.
 
@@ -315,6 +421,9 @@ class PlatformInterface(GRPCInterface):
             The size of window for which the rate of pulses is calculated. Default is 20.
         auto_start: bool
             Whether to automatically start listening for pulses. Default is True.
+        max_pulses: int, optional
+            The most pulse timestamps kept for rate calculations. Defaults to enough
+            for ``rate_window_secs`` at 10 kHz, allocated only as pulses arrive.
         """
 
         return PulseCounter(
@@ -324,6 +433,7 @@ class PlatformInterface(GRPCInterface):
             callback=callback,
             rate_window_secs=rate_window_secs,
             auto_start=auto_start,
+            max_pulses=max_pulses,
         )
 
     def get_new_event_counter(
@@ -333,6 +443,7 @@ class PlatformInterface(GRPCInterface):
         callback: PulseCounterCallback = None,
         rate_window_secs: int = 20,
         auto_collect: bool = True,
+        max_pulses: int | None = None,
     ) -> PulseCounter:
         """Create a new Pulse Counter for counting events.
 
@@ -358,6 +469,9 @@ class PlatformInterface(GRPCInterface):
             The size of window for which the rate of events is calculated.
         auto_collect : bool = True
             Whether to automatically collect the events from the platform interface.
+        max_pulses : int, optional
+            The most event timestamps kept for rate calculations. Defaults to enough
+            for ``rate_window_secs`` at 10 kHz, allocated only as events arrive.
 
         Returns
         -------
@@ -371,29 +485,127 @@ class PlatformInterface(GRPCInterface):
             callback=callback,
             rate_window_secs=rate_window_secs,
             auto_start=False,
+            max_pulses=max_pulses,
         )
         if auto_collect:
             counter.update_events()
         return counter
 
+    def get_new_event_cursor(
+        self,
+        di_pin: int | None = None,
+        edge: str = "both",
+        include_system_events: bool = False,
+        state_file: str | None = None,
+    ) -> EventCursor:
+        """Create a cursor that reads new events incrementally.
+
+        Examples
+        --------
+
+        Handle DI 0 edges buffered while the app was asleep. Delivery is at least
+        once: a page interrupted by a restart is delivered again, so keep handlers
+        idempotent (e.g. keyed on ``event.event_id``)::
+
+            cursor = self.platform_iface.get_new_event_cursor(
+                di_pin=0, state_file="/data/di0_events.json"
+            )
+            async for event in cursor:
+                print(event.event_id, event.event, event.time)
+
+        Parameters
+        ----------
+        di_pin : int, optional
+            Read this digital input's events. If None, read every event.
+        edge : "rising" or "falling" or "both"
+            For a DI cursor, the edges to read.
+        include_system_events : bool
+            For a DI cursor, whether to include system events.
+        state_file : str, optional
+            A file to persist the cursor position in, so it survives restarts.
+
+        Returns
+        -------
+        EventCursor
+            The cursor. See :class:`pydoover.docker.platform.EventCursor`.
+        """
+        return EventCursor(
+            self,
+            di_pin=di_pin,
+            edge=edge,
+            include_system_events=include_system_events,
+            state_file=state_file,
+        )
+
     def start_di_pulse_listener(
         self, di: int, callback, edge: str = "rising", start_count: int = 0
-    ):
-        ## Callback should be a function that takes the following arguments:
-        ## di, di_value, dt_secs, counter, edge
+    ) -> PulseListener:
+        """Listen for pulses on a digital input.
+
+        Listeners on the same pin share one pulse stream (see :class:`PulseStreamMultiplexer`).
 
-        listener = asyncio.create_task(
-            self.recv_di_pulses(di, callback, edge=edge, start_count=start_count)
+        The callback is called with ``di, di_value, dt_secs, counter, edge``.
+
+        Returns
+        -------
+        PulseListener
+            A handle whose ``cancel()`` stops the listener.
+        """
+        listener = self.pulse_mux.add_listener(
+            di, callback, edge=edge, start_count=start_count
         )
-        self.pulse_counter_listeners.append(listener)
-        listener.add_done_callback(self.pulse_counter_listeners.remove)
+        self._own_pulse_listeners = [
+            other for other in self._own_pulse_listeners if not other.cancelled()
+        ]
+        self._own_pulse_listeners.append(listener)
+        return listener
 
     async def recv_di_pulses(
         self, di: int, callback, edge: str = "rising", start_count: int = 0
     ):
+        """Receive pulses on a digital input on a dedicated stream until cancelled.
+
+        Most apps should use :meth:`start_di_pulse_listener` instead, which shares
+        one stream between every listener on the pin.
+        """
         counter = start_count
         active_callbacks = set()
 
+        async def on_pulse(response):
+            nonlocal counter
+            ## Increment the counter
+            counter += 1
+            ## Call the callback function with the response
+            task = await call_maybe_async(
+                callback,
+                di,
+                response.value,
+                response.dt_secs,
+                counter,
+                edge,
+                as_task=True,
+            )
+            if task:
+                active_callbacks.add(task)
+                task.add_done_callback(active_callbacks.remove)
+
+        await self.stream_di_pulses(di, on_pulse, edge=edge)
+
+        ## Wait for all active callbacks to finish
+        while active_callbacks:
+            await asyncio.wait(active_callbacks, timeout=1)
+
+    async def stream_di_pulses(
+        self,
+        di: int,
+        on_pulse: Callable[[platform_iface_pb2.pulseCounterResponse], Coroutine],
+        edge: str = "rising",
+    ):
+        """Read a pulse stream for a digital input, reconnecting on errors.
+
+        ``on_pulse`` is awaited with each ``pulseCounterResponse`` that reports a pulse.
+        This returns when the stream is cancelled or ends.
+        """
         while True:
             try:
                 # Setup the connection to the platform interface. Keepalive
@@ -423,21 +635,7 @@ class PlatformInterface(GRPCInterface):
                             and response.dt_secs is not None
                             and response.dt_secs > 0
                         ):
-                            ## Increment the counter
-                            counter += 1
-                            ## Call the callback function with the response
-                            task = await call_maybe_async(
-                                callback,
-                                di,
-                                response.value,
-                                response.dt_secs,
-                                counter,
-                                edge,
-                                as_task=True,
-                            )
-                            if task:
-                                active_callbacks.add(task)
-                                task.add_done_callback(active_callbacks.remove)
+                            await on_pulse(response)
 
             except asyncio.CancelledError:
                 log.info(f"pulseCounter for di={di} cancelled.")
@@ -454,10 +652,6 @@ class PlatformInterface(GRPCInterface):
             ## Loop again
             await asyncio.sleep(1)
 
-        ## Wait for all active callbacks to finish
-        while active_callbacks:
-            await asyncio.wait(active_callbacks, timeout=1)
-
     @staticmethod
     def _cast_pins(pins):
         if isinstance(pins, int):
@@ -577,6 +771,8 @@ class PlatformInterface(GRPCInterface):
             Returns None if the request failed.
         """
         pins = self._cast_pins(di)
+        if self.io_snapshot is not None:
+            return await self.io_snapshot.read("di", pins)
         return await self.make_request(
             "getDI", platform_iface_pb2.getDIRequest(di=pins), response_field="di"
         )
@@ -616,6 +812,8 @@ class PlatformInterface(GRPCInterface):
         # allows for fetch_ai(1, 2, 3) or fetch_ai(1) or fetch_ai(*[1, 2, 3])
 
         pins = self._cast_pins(ai)
+        if self.io_snapshot is not None:
+            return await self.io_snapshot.read("ai", pins)
         return await self.make_request(
             "getAI", platform_iface_pb2.getAIRequest(ai=pins), response_field="ai"
         )
@@ -649,6 +847,8 @@ class PlatformInterface(GRPCInterface):
             Returns None if the request failed.
         """
         pins = self._cast_pins(do)
+        if self.io_snapshot is not None:
+            return await self.io_snapshot.read("do", pins)
         return await self.make_request(
             "getDO", platform_iface_pb2.getDORequest(do=pins), response_field="do"
         )
@@ -689,6 +889,8 @@ class PlatformInterface(GRPCInterface):
             Returns None if the request failed.
         """
         pins, values = self._cast_pin_values(do, value)
+        if self.io_snapshot is not None:
+            self.io_snapshot.invalidate("do", pins)
         return await self.make_request(
             "setDO",
             platform_iface_pb2.setDORequest(do=pins, value=values),
@@ -773,6 +975,8 @@ class PlatformInterface(GRPCInterface):
             If the request failed, returns None.
         """
         pins = self._cast_pins(ao)
+        if self.io_snapshot is not None:
+            return await self.io_snapshot.read("ao", pins)
         return await self.make_request(
             "getAO", platform_iface_pb2.getAORequest(ao=pins), response_field="ao"
         )
@@ -813,6 +1017,8 @@ class PlatformInterface(GRPCInterface):
         # if not isinstance(value, list):
         #     value = [value]
         pins, values = self._cast_ao_pin_values(ao, value)
+        if self.io_snapshot is not None:
+            self.io_snapshot.invalidate("ao", pins)
         return await self.make_request(
             "setAO",
             platform_iface_pb2.setAORequest(ao=pins, value=values),
@@ -1409,5 +1615,180 @@ class PlatformInterface(GRPCInterface):
         )
 
 
+class _MockPlatformService:
+    """An in-memory stand-in for the platform interface gRPC service."""
+
+    # the RPCs answered from memory; anything else is refused before it's sent
+    RPCS = frozenset(
+        {
+            "getDI",
+            "getAI",
+            "getDO",
+            "getAO",
+            "setDO",
+            "setAO",
+            "scheduleDO",
+            "scheduleAO",
+            "getInputVoltage",
+            "getSystemPower",
+            "getTemperature",
+            "TestComms",
+        }
+    )
+
+    def __init__(self, iface: "MockPlatformInterface"):
+        self.iface = iface
+
+    @staticmethod
+    def _ok():
+        return platform_iface_pb2.ResponseHeader(success=True)
+
+    async def getDI(self, request, timeout=None):
+        di = [self.iface.di.get(pin, False) for pin in request.di]
+        return platform_iface_pb2.getDIResponse(response_header=self._ok(), di=di)
+
+    async def getAI(self, request, timeout=None):
+        ai = [self.iface.ai.get(pin, 0.0) for pin in request.ai]
+        return platform_iface_pb2.getAIResponse(response_header=self._ok(), ai=ai)
+
+    async def getDO(self, request, timeout=None):
+        do = [self.iface.do.get(pin, False) for pin in request.do]
+        return platform_iface_pb2.getDOResponse(response_header=self._ok(), do=do)
+
+    async def getAO(self, request, timeout=None):
+        ao = [self.iface.ao.get(pin, 0.0) for pin in request.ao]
+        return platform_iface_pb2.getAOResponse(response_header=self._ok(), ao=ao)
+
+    async def setDO(self, request, timeout=None):
+        self.iface.do.update(zip(request.do, request.value))
+        return platform_iface_pb2.setDOResponse(
+            response_header=self._ok(), do=[True] * len(request.do)
+        )
+
+    async def setAO(self, request, timeout=None):
+        self.iface.ao.update(zip(request.ao, request.value))
+        return platform_iface_pb2.setAOResponse(
+            response_header=self._ok(), ao=[True] * len(request.ao)
+        )
+
+    async def scheduleDO(self, request, timeout=None):
+        values = dict(zip(request.do, request.value))
+        asyncio.get_running_loop().call_later(
+            request.time_secs, self.iface.do.update, values
+        )
+        return platform_iface_pb2.scheduleDOResponse(
+            response_header=self._ok(), do=[True] * len(request.do)
+        )
+
+    async def scheduleAO(self, request, timeout=None):
+        values = dict(zip(request.ao, request.value))
+        asyncio.get_running_loop().call_later(
+            request.time_secs, self.iface.ao.update, values
+        )
+        return platform_iface_pb2.scheduleAOResponse(
+            response_header=self._ok(), ao=[True] * len(request.ao)
+        )
+
+    async def getInputVoltage(self, request, timeout=None):
+        return platform_iface_pb2.getInputVoltageResponse(
+            response_header=self._ok(), voltage=self.iface.system_voltage
+        )
+
+    async def getSystemPower(self, request, timeout=None):
+        return platform_iface_pb2.getSystemPowerResponse(
+            response_header=self._ok(), power_watts=self.iface.system_power
+        )
+
+    async def getTemperature(self, request, timeout=None):
+        return platform_iface_pb2.getTemperatureResponse(
+            response_header=self._ok(), temperature=self.iface.system_temperature
+        )
+
+    async def TestComms(self, request, timeout=None):
+        return platform_iface_pb2.TestCommsResponse(
+            response_header=self._ok(), response=request.message
+        )
+
+
+class MockPlatformInterface(PlatformInterface):
+    """A platform interface backed by in-memory IO, for tests and simulations.
+
+    IO is read from and written to the ``di``, ``ai``, ``do`` and ``ao`` dicts (pin to
+    value; unset pins read low or zero), going through the same request path, IO
+    snapshot and pulse listeners as the real interface. Scheduled outputs are applied
+    by the event loop after their delay. Changing a digital input with :meth:`set_di`
+    delivers pulses to any pulse counters or listeners on that pin.
+
+    IO, input voltage, system power, temperature and ``TestComms`` requests are
+    supported; any other platform request raises ``AttributeError`` where it is made.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.di: dict[int, bool] = {}
+        self.ai: dict[int, float] = {}
+        self.do: dict[int, bool] = {}
+        self.ao: dict[int, float] = {}
+        self.system_voltage = 12.0
+        self.system_power = 0.0
+        self.system_temperature = 25.0
+
+        self._service = _MockPlatformService(self)
+        self._pulse_streams: dict[int, list[tuple[str, asyncio.Queue]]] = {}
+        self._last_edge: dict[int, float] = {}
+
+    async def _get_stub(self):
+        if self.is_app_view:
+            return await self._transport._get_stub()
+        return self._service
+
+    async def make_request(self, stub_call, request, *args, **kwargs):
+        if not self.is_app_view and stub_call not in _MockPlatformService.RPCS:
+            raise AttributeError(f"MockPlatformInterface does not support {stub_call}")
+        return await super().make_request(stub_call, request, *args, **kwargs)
+
+    async def _discard_channel(self):
+        pass
+
+    async def health_check(self):
+        return True
+
+    def set_di(self, pin: int, value: bool):
+        """Set a digital input, delivering a pulse to listeners if it changed."""
+        previous = self.di.get(pin, False)
+        self.di[pin] = value = bool(value)
+        if value == previous:
+            return
+
+        now = clock.monotonic()
+        dt_secs = now - self._last_edge.get(pin, now)
+        self._last_edge[pin] = now
+        # a first edge has no interval to report, so it's reported as a tiny one
+        # rather than dropped as the real stream drops dt_secs=0
+        response = platform_iface_pb2.pulseCounterResponse(
+            di=pin, value=value, dt_secs=dt_secs or 1e-6
+        )
+        for edge, queue in self._pulse_streams.get(pin, []):
+            if edge == "both" or (edge == "rising") == value:
+                queue.put_nowait(response)
+
+    def pulse(self, pin: int):
+        """Pulse a digital input high, then low again."""
+        self.set_di(pin, True)
+        self.set_di(pin, False)
+
+    async def stream_di_pulses(self, di, on_pulse, edge: str = "rising"):
+        stream = (edge, asyncio.Queue())
+        self._pulse_streams.setdefault(di, []).append(stream)
+        try:
+            while True:
+                await on_pulse(await stream[1].get())
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._pulse_streams[di].remove(stream)
+
+
 platform_iface = PlatformInterface
 pulse_counter = PulseCounter
@@ -0,0 +1,174 @@
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+
+# The highest pulse rate a counter is sized for by default.
+MAX_PULSE_RATE_HZ = 10_000
+# Storage starts this small and doubles as pulses arrive, up to the capacity.
+INITIAL_PULSE_STORAGE = 1024
+
+
+def pulse_capacity(window_secs: float, rate_hz: float = MAX_PULSE_RATE_HZ) -> int:
+    """The timestamps needed to hold ``window_secs`` of pulses at ``rate_hz``."""
+    return max(INITIAL_PULSE_STORAGE, math.ceil(window_secs * rate_hz))
+
+
+# a minute of pulses at the highest rate: 4.8 MB at most, allocated only as needed
+DEFAULT_PULSE_CAPACITY = pulse_capacity(60)
+
+
+class PulseBuffer:
+    """A bounded ring buffer of pulse timestamps, oldest first.
+
+    Timestamps are stored in an ``array("d")`` that starts small and doubles as pulses
+    arrive, so a slow counter holds a few KiB while memory never exceeds
+    :attr:`max_nbytes` (``8 * capacity`` bytes) however fast pulses arrive. Appending is
+    amortised O(1); once the buffer is full the oldest timestamp is overwritten and
+    :attr:`overflowed` is incremented. Window queries bisect the (at most two)
+    contiguous segments of the ring, so they are O(log n) rather than a scan.
+
+    Timestamps are kept non-decreasing: one older than the newest stored timestamp
+    (e.g. after a wall-clock step backwards) is stored as the newest timestamp.
+
+    This supports the read-only list operations existing code uses on
+    ``PulseCounter.pulse_timestamps`` (``len``, indexing, iteration and ``+=``).
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of timestamps held.
+    """
+
+    __slots__ = ("capacity", "overflowed", "_buf", "_start", "_len")
+
+    def __init__(self, capacity: int = DEFAULT_PULSE_CAPACITY):
+        if capacity < 1:
+            raise ValueError("PulseBuffer capacity must be at least 1")
+        self.capacity = capacity
+        self.overflowed = 0
+        self._buf = array("d", bytes(8 * min(capacity, INITIAL_PULSE_STORAGE)))
+        self._start = 0
+        self._len = 0
+
+    @property
+    def nbytes(self) -> int:
+        """The memory held by the timestamp storage now, in bytes."""
+        return self._buf.itemsize * len(self._buf)
+
+    @property
+    def max_nbytes(self) -> int:
+        """The most memory the timestamp storage can grow to, in bytes."""
+        return self._buf.itemsize * self.capacity
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __getitem__(self, index: int) -> float:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("PulseBuffer index out of range")
+        return self._buf[(self._start + index) % len(self._buf)]
+
+    def __iter__(self) -> Iterator[float]:
+        for lo, hi in self._segments():
+            yield from self._buf[lo:hi]
+
+    def __iadd__(self, timestamps: Iterable[float]) -> "PulseBuffer":
+        self.extend(timestamps)
+        return self
+
+    def __repr__(self) -> str:
+        return f"PulseBuffer(len={self._len}, capacity={self.capacity}, overflowed={self.overflowed})"
+
+    def _segments(self) -> tuple[tuple[int, int], ...]:
+        size = len(self._buf)
+        end = self._start + self._len
+        if end <= size:
+            return ((self._start, end),)
+        return (self._start, size), (0, end - size)
+
+    def _grow(self):
+        size = min(self.capacity, 2 * len(self._buf))
+        buf = array("d", self)
+        buf.frombytes(bytes(8 * (size - self._len)))
+        self._buf = buf
+        self._start = 0
+
+    def append(self, timestamp: float) -> float | None:
+        """Add a timestamp, overwriting the oldest if the buffer is full.
+
+        Returns
+        -------
+        float or None
+            The timestamp that was overwritten, if any.
+        """
+        size = len(self._buf)
+        if self._len:
+            last = self._buf[(self._start + self._len - 1) % size]
+            if timestamp < last:
+                timestamp = last
+
+        if self._len == size < self.capacity:
+            self._grow()
+            size = len(self._buf)
+
+        if self._len == size:
+            evicted = self._buf[self._start]
+            self._buf[self._start] = timestamp
+            self._start = (self._start + 1) % size
+            self.overflowed += 1
+            return evicted
+        self._buf[(self._start + self._len) % size] = timestamp
+        self._len += 1
+        return None
+
+    def reserve(self, capacity: int):
+        """Raise the capacity to at least ``capacity``. Storage still grows lazily."""
+        self.capacity = max(self.capacity, capacity)
+
+    def extend(self, timestamps: Iterable[float]):
+        for timestamp in timestamps:
+            self.append(timestamp)
+
+    def clear(self):
+        self._start = 0
+        self._len = 0
+
+    def _index_after(self, timestamp: float, strict: bool) -> int:
+        """The logical index of the first timestamp ``> timestamp`` (``>=`` if not strict)."""
+        search = bisect_right if strict else bisect_left
+        skipped = 0
+        for lo, hi in self._segments():
+            i = search(self._buf, timestamp, lo, hi)
+            if i < hi:
+                return skipped + i - lo
+            skipped += hi - lo
+        return skipped
+
+    def count_after(self, timestamp: float) -> int:
+        """The number of stored timestamps strictly after ``timestamp``."""
+        return self._len - self._index_after(timestamp, strict=True)
+
+    def after(self, timestamp: float) -> list[float]:
+        """The stored timestamps strictly after ``timestamp``, oldest first."""
+        skip = self._index_after(timestamp, strict=True)
+        result = []
+        for lo, hi in self._segments():
+            if skip < hi - lo:
+                result.extend(self._buf[lo + skip : hi])
+                skip = 0
+            else:
+                skip -= hi - lo
+        return result
+
+    def discard_before(self, timestamp: float) -> int:
+        """Drop every timestamp older than ``timestamp``, returning how many were dropped."""
+        dropped = self._index_after(timestamp, strict=False)
+        self._start = (self._start + dropped) % len(self._buf)
+        self._len -= dropped
+        return dropped
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine
+from typing import TYPE_CHECKING, Any
+
+from ...utils import call_maybe_async
+
+if TYPE_CHECKING:
+    from .platform import PlatformInterface
+
+log = logging.getLogger(__name__)
+
+PulseListenerCallback = (
+    Callable[[int, bool, float, int, str], Any]
+    | Coroutine[[int, bool, float, int, str], Any]
+)
+_EDGES = ("rising", "falling", "both")
+
+
+class PulseListener:
+    """One listener on a digital input's shared pulse stream.
+
+    This is returned by :meth:`PlatformInterface.start_di_pulse_listener`.
+
+    Attributes
+    ----------
+    pin : int
+        The digital input listened to.
+    edge : str
+        ``"rising"``, ``"falling"`` or ``"both"``.
+    callback : PulseListenerCallback
+        Called with ``pin, di_value, dt_secs, count, edge`` for each matching pulse.
+    count : int
+        The number of pulses delivered to this listener, plus its ``start_count``.
+    """
+
+    def __init__(
+        self,
+        mux: "PulseStreamMultiplexer",
+        pin: int,
+        edge: str,
+        callback: PulseListenerCallback,
+        start_count: int = 0,
+    ):
+        self.pin = pin
+        self.edge = edge
+        self.callback = callback
+        self.count = start_count
+
+        self._mux = mux
+        self._cancelled = False
+        # time since the last pulse delivered to this listener, summed across any
+        # pulses of the other edge the shared stream carried in between
+        self._dt_secs = 0.0
+
+    def cancel(self) -> bool:
+        """Stop listening. The pin's stream closes once its last listener leaves.
+
+        Returns
+        -------
+        bool
+            True if the listener was active, False if it was already cancelled.
+        """
+        if self._cancelled:
+            return False
+        self._cancelled = True
+        self._mux.remove_listener(self)
+        return True
+
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def _accepts(self, di_value: bool, stream_edge: str) -> bool:
+        # a stream on this listener's own edge was filtered by the platform; only a
+        # "both" stream shared with other edges needs filtering on the DI value
+        if self.edge in ("both", stream_edge):
+            return True
+        return (self.edge == "rising") == bool(di_value)
+
+
+class PulseStreamMultiplexer:
+    """Shares one pulse stream per digital input between every listener on it.
+
+    Each pin with listeners has a single ``startPulseCounter`` stream, requesting the
+    union of the edges its listeners want: a single edge if they all agree, otherwise
+    ``"both"``, with each pulse then filtered on its DI value for listeners that want
+    only one edge. The stream
+    is restarted when that union changes and closed when the last listener leaves.
+    Reconnection is handled by :meth:`PlatformInterface.stream_di_pulses`.
+
+    Every platform interface has one of these as ``platform_iface.pulse_mux``.
+    """
+
+    def __init__(self, platform_iface: "PlatformInterface"):
+        self.platform_iface = platform_iface
+        self.listeners: dict[int, list[PulseListener]] = {}
+        self._streams: dict[int, tuple[str, asyncio.Task]] = {}
+        self._callback_tasks: set[asyncio.Task] = set()
+
+    def add_listener(
+        self,
+        pin: int,
+        callback: PulseListenerCallback,
+        edge: str = "rising",
+        start_count: int = 0,
+    ) -> PulseListener:
+        """Start delivering pulses on ``pin`` to ``callback``.
+
+        Returns
+        -------
+        PulseListener
+            The listener, which can be cancelled.
+        """
+        if edge not in _EDGES:
+            raise ValueError(f"edge must be one of {', '.join(_EDGES)}, not {edge!r}")
+
+        listener = PulseListener(self, pin, edge, callback, start_count)
+        self.listeners.setdefault(pin, []).append(listener)
+        self._resize(pin)
+        return listener
+
+    def remove_listener(self, listener: PulseListener):
+        listeners = self.listeners.get(listener.pin, [])
+        try:
+            listeners.remove(listener)
+        except ValueError:
+            return
+        if not listeners:
+            del self.listeners[listener.pin]
+        self._resize(listener.pin)
+
+    def stream_edge(self, pin: int) -> str | None:
+        """The edge the pin's stream requests, or None if it has no listeners."""
+        edges = {listener.edge for listener in self.listeners.get(pin, [])}
+        if not edges:
+            return None
+        if len(edges) == 1:
+            return edges.pop()
+        return "both"
+
+    def _resize(self, pin: int):
+        wanted = self.stream_edge(pin)
+        current = self._streams.get(pin)
+        if current is not None and current[0] == wanted:
+            return
+
+        if current is not None:
+            current[1].cancel()
+            del self._streams[pin]
+        if wanted is None:
+            return
+
+        log.debug(
+            f"Starting shared pulse stream for di={pin} edge={wanted} "
+            f"({len(self.listeners[pin])} listener(s))"
+        )
+        task = asyncio.create_task(
+            self.platform_iface.stream_di_pulses(
+                pin,
+                lambda response: self._dispatch(pin, response, wanted),
+                edge=wanted,
+            )
+        )
+        self._streams[pin] = (wanted, task)
+        self.platform_iface.pulse_counter_listeners.append(task)
+        task.add_done_callback(self.platform_iface.pulse_counter_listeners.remove)
+
+    async def _dispatch(self, pin: int, response, stream_edge: str):
+        """Fan one pulse out to every listener on the pin that wants its edge."""
+        for listener in list(self.listeners.get(pin, [])):
+            listener._dt_secs += response.dt_secs
+            if not listener._accepts(response.value, stream_edge):
+                continue
+
+            listener.count += 1
+            dt_secs, listener._dt_secs = listener._dt_secs, 0.0
+            try:
+                task = await call_maybe_async(
+                    listener.callback,
+                    pin,
+                    response.value,
+                    dt_secs,
+                    listener.count,
+                    listener.edge,
+                    as_task=True,
+                )
+            except Exception as e:
+                # one bad callback must not starve the other listeners
+                log.error(f"Error in pulse callback for di={pin}: {e}", exc_info=e)
+                continue
+            if task:
+                self._callback_tasks.add(task)
+                task.add_done_callback(self._callback_tasks.discard)
+
+    async def close(self):
+        """Close every stream and wait for in-flight callbacks."""
+        streams = [task for _, task in self._streams.values()]
+        self._streams.clear()
+        self.listeners.clear()
+        for task in streams:
+            task.cancel()
+        await asyncio.gather(*streams, return_exceptions=True)
+        if self._callback_tasks:
+            await asyncio.wait(self._callback_tasks, timeout=1)
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from ...models.generated.platform import platform_iface_pb2
+from ...utils import clock
+
+if TYPE_CHECKING:
+    from .platform import PlatformInterface
+
+log = logging.getLogger(__name__)
+
+# IO kind -> (stub call, request class, request / response field)
+_IO_KINDS = {
+    "di": ("getDI", platform_iface_pb2.getDIRequest, "di"),
+    "ai": ("getAI", platform_iface_pb2.getAIRequest, "ai"),
+    "do": ("getDO", platform_iface_pb2.getDORequest, "do"),
+    "ao": ("getAO", platform_iface_pb2.getAORequest, "ao"),
+}
+
+
+class IoSnapshot:
+    """A cache of IO values, refreshed with one batched request per IO kind.
+
+    This is normally enabled with :meth:`PlatformInterface.enable_io_snapshot`, after
+    which ``fetch_di``, ``fetch_ai``, ``fetch_do`` and ``fetch_ao`` are served from it.
+
+    The snapshot tracks which pins have been read (plus any given up front). When it is
+    stale, the first read of a kind re-fetches every tracked pin of that kind in a single
+    request; reads of a pin not seen before fetch the whole kind again, now including it.
+
+    By default the snapshot is valid for one main loop iteration: the application calls
+    :meth:`new_tick` at the start of each loop. With ``max_age`` set, it is instead valid
+    for that many seconds, regardless of loop iterations.
+
+    Parameters
+    ----------
+    platform_iface : PlatformInterface
+        The interface used to fetch values.
+    max_age : float, optional
+        How long, in seconds, fetched values are served for. Defaults to one loop iteration.
+    pins : dict[str, Iterable[int]], optional
+        Pins to always fetch, keyed by ``"di"``, ``"ai"``, ``"do"`` or ``"ao"``.
+    """
+
+    def __init__(
+        self,
+        platform_iface: "PlatformInterface",
+        max_age: float | None = None,
+        pins: dict[str, Iterable[int]] | None = None,
+    ):
+        self.platform_iface = platform_iface
+        self.max_age = max_age
+
+        self.pins: dict[str, set[int]] = {kind: set() for kind in _IO_KINDS}
+        for kind, kind_pins in (pins or {}).items():
+            self._check_kind(kind)
+            self.pins[kind].update(kind_pins)
+
+        self._values: dict[str, dict[int, bool | float]] = {k: {} for k in _IO_KINDS}
+        self._fetched_at: dict[str, float | None] = {k: None for k in _IO_KINDS}
+        self._locks = {kind: asyncio.Lock() for kind in _IO_KINDS}
+        self.requests_made = 0
+
+    @staticmethod
+    def _check_kind(kind: str):
+        if kind not in _IO_KINDS:
+            raise ValueError(
+                f"Unknown IO kind {kind!r}. Must be one of {', '.join(_IO_KINDS)}."
+            )
+
+    def new_tick(self):
+        """Mark the snapshot stale for the next loop iteration (unless ``max_age`` is set)."""
+        if self.max_age is None:
+            for kind in _IO_KINDS:
+                self._fetched_at[kind] = None
+
+    def invalidate(self, kind: str | None = None, pins: Iterable[int] | None = None):
+        """Drop cached values so they are re-fetched on the next read.
+
+        Parameters
+        ----------
+        kind : str, optional
+            The IO kind to invalidate. Defaults to every kind.
+        pins : Iterable[int], optional
+            The pins to invalidate. Defaults to every pin of the kind.
+        """
+        kinds = _IO_KINDS if kind is None else [kind]
+        for k in kinds:
+            if pins is None:
+                self._values[k].clear()
+                self._fetched_at[k] = None
+            else:
+                for pin in pins:
+                    self._values[k].pop(pin, None)
+
+    def _is_fresh(self, kind: str) -> bool:
+        fetched_at = self._fetched_at[kind]
+        if fetched_at is None:
+            return False
+        return self.max_age is None or clock.monotonic() - fetched_at < self.max_age
+
+    def _has(self, kind: str, pins: list[int]) -> bool:
+        values = self._values[kind]
+        return self._is_fresh(kind) and all(p in values for p in pins)
+
+    async def read(self, kind: str, pins: list[int]):
+        """Read pins from the snapshot, refreshing it first if needed.
+
+        Returns
+        -------
+        bool | float | list[bool | float] | None
+            A single value if one pin was requested, otherwise a list, matching the
+            direct ``fetch_*`` methods. None if the platform returned fewer values than
+            requested.
+        """
+        self._check_kind(kind)
+        self.pins[kind].update(pins)
+
+        if not self._has(kind, pins):
+            async with self._locks[kind]:
+                # another reader may have refreshed while we waited for the lock
+                if not self._has(kind, pins):
+                    await self._refresh(kind)
+
+        values = self._values[kind]
+        try:
+            result = [values[p] for p in pins]
+        except KeyError:
+            return None
+        return result[0] if len(result) == 1 else result
+
+    async def refresh(self):
+        """Re-fetch every tracked pin now, one request per IO kind."""
+        await asyncio.gather(
+            *(self._refresh(kind) for kind, pins in self.pins.items() if pins)
+        )
+
+    async def _refresh(self, kind: str):
+        stub_call, request_cls, field = _IO_KINDS[kind]
+        pins = sorted(self.pins[kind])
+        response = await self.platform_iface.make_request(
+            stub_call, request_cls(**{field: pins})
+        )
+        self.requests_made += 1
+
+        received = list(getattr(response, field))
+        if len(received) != len(pins):
+            log.warning(
+                f"{stub_call} returned {len(received)} values for {len(pins)} pins"
+            )
+        self._values[kind] = dict(zip(pins, received))
+        self._fetched_at[kind] = clock.monotonic()
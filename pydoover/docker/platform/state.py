@@ -0,0 +1,33 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+
+def load_state(path: Path | str | None) -> dict:
+    """Load a small JSON state file, returning an empty dict if it is missing or unreadable."""
+    if path is None:
+        return {}
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log.warning(f"Ignoring unreadable state file {path}: {e}")
+        return {}
+
+
+def save_state(path: Path | str | None, data: dict):
+    """Atomically replace a small JSON state file, so a power cut never leaves it half written."""
+    if path is None:
+        return
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,259 @@
+"""On-demand profiling of a running application.
+
+Nothing here runs until a profile is requested: there are no hooks installed and no
+background threads while profiling is off.
+"""
+
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from ..models import File
+
+if TYPE_CHECKING:
+    from .application import Application
+
+log = logging.getLogger(__name__)
+
+PROFILE_METHOD = "dv-profile"
+PROFILE_CHANNEL = "dv-profiles"
+MAX_PROFILE_DURATION = 300
+# shorter intervals busy-spin the sampler and throttle the app through the switch interval
+MIN_SAMPLE_INTERVAL = 0.001
+_MODES = ("sample", "cprofile")
+
+
+class StackSampler:
+    """Samples one thread's stack on a timer, counting identical stacks.
+
+    A daemon thread reads the target thread's frame from ``sys._current_frames()`` every
+    ``interval`` seconds, so the sampled code runs at full speed apart from briefly
+    contending for the GIL. While sampling, the interpreter's switch interval is
+    shortened so the sampler gets the GIL promptly rather than only when the sampled
+    thread blocks, which would bias samples towards I/O waits. Results are in the collapsed-stack format used by flame graph
+    tools: one ``outer;...;inner count`` line per distinct stack.
+
+    Parameters
+    ----------
+    interval : float
+        Seconds between samples, at least ``MIN_SAMPLE_INTERVAL`` (1ms); shorter
+        intervals are raised to it.
+    thread_id : int, optional
+        The thread to sample. Defaults to the thread that creates the sampler.
+    max_depth : int
+        Frames beyond this depth (counting from the innermost) are dropped.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        thread_id: int | None = None,
+        max_depth: int = 128,
+    ):
+        self.interval = max(MIN_SAMPLE_INTERVAL, interval)
+        self.thread_id = thread_id or threading.get_ident()
+        self.max_depth = max_depth
+
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._switch_interval: float | None = None
+
+    def start(self):
+        self._stop.clear()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 10))
+        self._thread = threading.Thread(
+            target=self._run, name="pydoover-stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._switch_interval is not None:
+            sys.setswitchinterval(self._switch_interval)
+            self._switch_interval = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.stacks[self._collapse(frame)] += 1
+            self.samples += 1
+
+    def _collapse(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(
+                f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(names)
+
+    def collapsed(self) -> str:
+        """The samples as collapsed stacks, most frequent first."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+class ProfileResult:
+    """The output of one profiling run.
+
+    Attributes
+    ----------
+    mode : str
+        ``"sample"`` or ``"cprofile"``.
+    duration : float
+        How long the profile ran, in seconds.
+    samples : int
+        Stack samples taken (``"sample"`` mode) or function calls recorded
+        (``"cprofile"`` mode).
+    report : str
+        Collapsed stacks (``"sample"``) or a ``pstats`` report sorted by cumulative time
+        (``"cprofile"``).
+    """
+
+    def __init__(self, mode: str, duration: float, samples: int, report: str):
+        self.mode = mode
+        self.duration = duration
+        self.samples = samples
+        self.report = report
+
+    def to_file(self, name: str = "profile") -> File:
+        ext = "collapsed" if self.mode == "sample" else "txt"
+        data = self.report.encode()
+        return File(f"{name}.{ext}", "text/plain", len(data), data)
+
+
+async def profile(
+    duration: float, mode: str = "sample", interval: float = 0.005
+) -> ProfileResult:
+    """Profile the running event loop's thread for ``duration`` seconds.
+
+    Parameters
+    ----------
+    duration : float
+        Seconds to profile for.
+    mode : str
+        ``"sample"`` (the default) periodically samples the loop thread's stack, with
+        overhead independent of how much code runs. ``"cprofile"`` records every
+        function call with :mod:`cProfile`, which is exact but slows the app down.
+    interval : float
+        Seconds between stack samples in ``"sample"`` mode.
+    """
+    if mode not in _MODES:
+        raise ValueError(f"mode must be one of {', '.join(_MODES)}, not {mode!r}")
+
+    start = time.monotonic()
+    if mode == "sample":
+        sampler = StackSampler(interval)
+        sampler.start()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            sampler.stop()
+        return ProfileResult(
+            mode, time.monotonic() - start, sampler.samples, sampler.collapsed()
+        )
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        profiler.disable()
+
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats()
+    return ProfileResult(
+        mode, time.monotonic() - start, stats.total_calls, out.getvalue()
+    )
+
+
+class AppProfiler:
+    """Runs profiles on an application and uploads the results.
+
+    Every application has one of these as ``app.profiler``. Profiles are usually
+    requested remotely with the reserved ``dv-profile`` RPC method (see
+    :meth:`Application.profile`); only one can run at a time.
+
+    Results are uploaded as a message on the ``dv-profiles`` channel, with the report
+    attached as a file.
+    """
+
+    def __init__(self, app: "Application"):
+        self.app = app
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    async def run(
+        self,
+        duration: float,
+        mode: str = "sample",
+        interval: float = 0.005,
+        upload: bool = True,
+    ) -> tuple[ProfileResult, int | None]:
+        """Profile for ``duration`` seconds, then optionally upload the result.
+
+        Returns
+        -------
+        tuple[ProfileResult, int | None]
+            The result, and the ID of the uploaded message (None if not uploaded).
+
+        Raises
+        ------
+        RuntimeError
+            If a profile is already running.
+        ValueError
+            If the duration or mode is invalid.
+        """
+        if self.is_running:
+            raise RuntimeError("A profile is already running")
+        if not 0 < duration <= MAX_PROFILE_DURATION:
+            raise ValueError(
+                f"duration must be greater than 0 and at most {MAX_PROFILE_DURATION}s"
+            )
+
+        async with self._lock:
+            log.info(f"Profiling for {duration}s (mode={mode})")
+            result = await profile(duration, mode, interval)
+
+        message_id = None
+        if upload:
+            message_id = await self.upload(result)
+        return result, message_id
+
+    async def upload(self, result: ProfileResult) -> int:
+        started = datetime.now(tz=timezone.utc)
+        name = f"{self.app.app_key or self.app.name}-{started:%Y%m%dT%H%M%S}"
+        return await self.app.create_message(
+            PROFILE_CHANNEL,
+            {
+                "type": "profile",
+                "app_key": self.app.app_key,
+                "mode": result.mode,
+                "duration": result.duration,
+                "samples": result.samples,
+            },
+            files=[result.to_file(name)],
+        )
@@ -0,0 +1,286 @@
+"""Deterministic simulation of docker applications on a virtual clock.
+
+A :class:`Simulation` runs an application against in-memory device agent, platform and
+modbus interfaces on an event loop whose clock only moves when every task is waiting.
+Sleeps, timeouts, the main loop's pacing, periodic tasks and everything that reads
+:mod:`pydoover.utils.clock` (tag log intervals, UI freshness windows, alarms, pulse
+rates) see simulated time, so hours of operation run as fast as the CPU allows and give
+the same result every time.
+"""
+
+import asyncio
+import logging
+import selectors
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from ..models import Aggregate
+from ..utils import clock
+from .application import Application
+from .device_agent import MockDeviceAgentInterface
+from .modbus import MockModbusInterface
+from .platform import MockPlatformInterface
+
+log = logging.getLogger(__name__)
+
+DEFAULT_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class VirtualClock:
+    """A clock that only moves when advanced.
+
+    Parameters
+    ----------
+    start : datetime | float, optional
+        The wall-clock time the simulation starts at, as an aware datetime or epoch
+        seconds. Defaults to 2025-01-01 00:00 UTC, so runs are reproducible.
+    """
+
+    def __init__(self, start: datetime | float | None = None):
+        if start is None:
+            start = DEFAULT_START
+        if isinstance(start, datetime):
+            start = start.timestamp()
+        self._start = float(start)
+        self._elapsed = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds simulated so far."""
+        return self._elapsed
+
+    def time(self) -> float:
+        return self._start + self._elapsed
+
+    def monotonic(self) -> float:
+        return self._elapsed
+
+    def now(self, tz=timezone.utc) -> datetime:
+        return datetime.fromtimestamp(self.time(), tz)
+
+    def advance(self, secs: float):
+        if secs < 0:
+            raise ValueError("A virtual clock can't go backwards")
+        self._elapsed += secs
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Polls for real I/O without blocking, advancing the clock instead of waiting."""
+
+    def __init__(self, virtual_clock: VirtualClock):
+        super().__init__()
+        self.clock = virtual_clock
+
+    def select(self, timeout=None):
+        ready = super().select(0)
+        if ready or timeout == 0:
+            return ready
+        if timeout is None:
+            # nothing is scheduled, so only real I/O can wake the loop
+            return super().select(None)
+        # every task is waiting: jump straight to the next timer
+        self.clock.advance(timeout)
+        return []
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    """An event loop driven by a :class:`VirtualClock`.
+
+    Whenever no callback is ready, the clock jumps to the next scheduled timer rather
+    than waiting for it. Executor jobs (sync callbacks run through
+    :func:`call_maybe_async`, :func:`asyncio.to_thread`) run inline, so they take no
+    simulated time and their ordering is deterministic.
+    """
+
+    def __init__(self, virtual_clock: VirtualClock | None = None):
+        self.clock = virtual_clock or VirtualClock()
+        super().__init__(_VirtualSelector(self.clock))
+
+    def time(self) -> float:
+        return self.clock.monotonic()
+
+    def run_in_executor(self, executor, func, *args):
+        future = self.create_future()
+        try:
+            future.set_result(func(*args))
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class Simulation:
+    """Runs a docker application on a virtual clock against mock interfaces.
+
+    The app is built with a :class:`MockDeviceAgentInterface`,
+    :class:`MockPlatformInterface` and :class:`MockModbusInterface`, and runs its full
+    lifecycle (setup, periodic tasks, paced main loop, tag commits) as it would on a
+    device. Between runs, drive its inputs through the mocks, or script them to happen
+    at a simulated time with :meth:`call_later` and :meth:`call_at`.
+
+    While the simulation is open, :mod:`pydoover.utils.clock` reads its virtual clock.
+
+    Examples
+    --------
+
+    Check a day of pump cycling in a test::
+
+        from datetime import timedelta
+
+        from pydoover.docker.simulation import Simulation
+
+        def test_pump_runs_on_low_level():
+            with Simulation(PumpApp, config={"low_level": 20}) as sim:
+                sim.platform_iface.ai[0] = 10.0
+                sim.call_later(3600, sim.platform_iface.ai.__setitem__, 0, 80.0)
+                sim.run_for(timedelta(days=1))
+
+                assert sim.platform_iface.do[1] is False
+                assert sim.messages("tag_values")
+
+    Parameters
+    ----------
+    app_cls : type[Application]
+        The application class to run.
+    app_key : str
+        The app key.
+    config : dict, optional
+        The app's deployment config, as it would appear in the ``deployment_config``
+        channel for this app.
+    start : datetime | float, optional
+        The simulated wall-clock start time. See :class:`VirtualClock`.
+    **kwargs
+        Any other arguments for the application's constructor.
+    """
+
+    def __init__(
+        self,
+        app_cls: type[Application],
+        app_key: str = "sim_app",
+        config: dict[str, Any] | None = None,
+        start: datetime | float | None = None,
+        **kwargs,
+    ):
+        self.clock = VirtualClock(start)
+        self.loop = VirtualEventLoop(self.clock)
+
+        self.device_agent = MockDeviceAgentInterface(app_key, "")
+        self.platform_iface = MockPlatformInterface(app_key, "")
+        self.modbus_iface = MockModbusInterface(app_key, "")
+        self.device_agent._aggregates["deployment_config"] = Aggregate(
+            data={"applications": {app_key: config or {}}},
+            attachments=[],
+            last_updated=None,
+        )
+
+        self.app = app_cls(
+            app_key,
+            device_agent=self.device_agent,
+            platform_iface=self.platform_iface,
+            modbus_iface=self.modbus_iface,
+            **kwargs,
+        )
+        self.modbus_iface.config = self.app.config
+        self.app.serve_healthcheck = False
+
+        self._task: asyncio.Task | None = None
+        self._previous_clock: clock.Clock | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def now(self) -> datetime:
+        """The simulated wall-clock time."""
+        return self.clock.now()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds simulated so far."""
+        return self.clock.elapsed
+
+    def start(self):
+        """Start the app and run it until setup has finished.
+
+        Called automatically by the first :meth:`run_for` or :meth:`run_until`.
+        """
+        if self._task is not None:
+            return
+        self._previous_clock = clock.set_clock(self.clock)
+        self._task = self.loop.create_task(self.app._run())
+        self._run(self.app.wait_until_ready())
+
+    def run_for(self, duration: float | Any):
+        """Run the app for ``duration`` simulated seconds (or a ``timedelta``)."""
+        if hasattr(duration, "total_seconds"):
+            duration = duration.total_seconds()
+        self.start()
+        self._run(asyncio.sleep(duration))
+
+    def run_until(self, when: datetime):
+        """Run the app until the simulated wall clock reaches ``when``."""
+        self.run_for(max(0.0, when.timestamp() - self.clock.time()))
+
+    def _run(self, coro):
+        waiter = self.loop.create_task(coro)
+        # stop early if the app stops, rather than simulating an idle loop
+        done = asyncio.wait([waiter, self._task], return_when=asyncio.FIRST_COMPLETED)
+        self.loop.run_until_complete(done)
+        if not self._task.done():
+            return waiter.result()
+
+        waiter.cancel()
+        if self._task.cancelled():
+            raise RuntimeError("The application was cancelled")
+        exc = self._task.exception()
+        if exc is not None:
+            raise exc
+        raise RuntimeError(
+            f"The application stopped after {self.elapsed:.1f} simulated seconds "
+            "(see the log for the error in setup or the main loop)"
+        )
+
+    def call_later(self, delay: float, callback: Callable, *args) -> asyncio.Handle:
+        """Call ``callback(*args)`` after ``delay`` simulated seconds.
+
+        The callback can be synchronous or a coroutine function.
+        """
+        return self.loop.call_later(delay, self._invoke, callback, args)
+
+    def call_at(self, when: datetime, callback: Callable, *args) -> asyncio.Handle:
+        """Call ``callback(*args)`` when the simulated wall clock reaches ``when``."""
+        delay = max(0.0, when.timestamp() - self.clock.time())
+        return self.call_later(delay, callback, *args)
+
+    def _invoke(self, callback: Callable, args: tuple):
+        result = callback(*args)
+        if asyncio.iscoroutine(result):
+            self.loop.create_task(result)
+
+    def messages(self, channel_name: str) -> list:
+        """Messages the app has created on a channel, oldest first."""
+        return self.device_agent.messages.get(channel_name, [])
+
+    def close(self):
+        """Stop the app, close the loop and restore the system clock."""
+        if self.loop.is_closed():
+            return
+        try:
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                self.loop.run_until_complete(
+                    asyncio.gather(*tasks, return_exceptions=True)
+                )
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        finally:
+            self.loop.close()
+            if self._previous_clock is not None:
+                clock.set_clock(self._previous_clock)
+                self._previous_clock = None
@@ -0,0 +1,188 @@
+import asyncio
+import contextlib
+import enum
+import logging
+import math
+import time
+
+from ..utils import clock
+
+log = logging.getLogger(__name__)
+
+
+class CatchUp(enum.Enum):
+    """What a schedule does after falling more than one period behind.
+
+    ``SKIP`` runs once as soon as possible, then realigns to the next future deadline,
+    dropping the ticks that were missed. ``BURST`` runs the missed ticks back to back
+    (up to ``max_burst``) before returning to the normal rate.
+    """
+
+    SKIP = "skip"
+    BURST = "burst"
+
+
+class PhaseTiming:
+    """Running timing statistics for one phase of a loop.
+
+    All durations are in seconds. ``mean`` is an exponentially weighted moving average, so
+    it follows recent behaviour without keeping a window of samples.
+
+    Attributes
+    ----------
+    count : int
+        How many times the phase has run.
+    last : float
+        The duration of the most recent run.
+    mean : float
+        The moving average duration.
+    max : float
+        The longest run so far.
+    total : float
+        The total time spent in the phase.
+    """
+
+    __slots__ = ("count", "last", "mean", "max", "total", "alpha")
+
+    def __init__(self, alpha: float = 0.1):
+        self.alpha = alpha
+        self.count = 0
+        self.last = 0.0
+        self.mean = 0.0
+        self.max = 0.0
+        self.total = 0.0
+
+    def record(self, secs: float):
+        self.count += 1
+        self.last = secs
+        self.total += secs
+        if secs > self.max:
+            self.max = secs
+        if self.count == 1:
+            self.mean = secs
+        else:
+            self.mean += self.alpha * (secs - self.mean)
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "last": self.last,
+            "mean": self.mean,
+            "max": self.max,
+            "total": self.total,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"PhaseTiming(count={self.count}, last={self.last:.4f}, "
+            f"mean={self.mean:.4f}, max={self.max:.4f})"
+        )
+
+
+class LoopTimings:
+    """Per-phase timings of an application's main loop.
+
+    The application records ``main_loop`` (including the internal loop), ``commit_tags``
+    and ``events`` (dispatched channel events), plus ``loop``, the time from the start
+    of one iteration to the start of the next.
+
+    Examples
+    --------
+
+    Log where loop time goes::
+
+        for phase, timing in self.loop_timings.phases.items():
+            log.info(f"{phase}: mean={timing.mean * 1000:.1f}ms max={timing.max * 1000:.1f}ms")
+    """
+
+    def __init__(self):
+        self.phases: dict[str, PhaseTiming] = {}
+
+    def __getitem__(self, phase: str) -> PhaseTiming:
+        return self.phases[phase]
+
+    def record(self, phase: str, secs: float):
+        try:
+            timing = self.phases[phase]
+        except KeyError:
+            timing = self.phases[phase] = PhaseTiming()
+        timing.record(secs)
+
+    @contextlib.contextmanager
+    def measure(self, phase: str):
+        """Time the enclosed block as one run of ``phase``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        return {phase: timing.to_dict() for phase, timing in self.phases.items()}
+
+
+class LoopScheduler:
+    """Paces a loop to a fixed period on the monotonic clock.
+
+    Deadlines are absolute (``start + n * period``), so time spent in the loop body never
+    accumulates into drift, and wall-clock changes (RTC sync, NTP steps) have no effect.
+
+    Parameters
+    ----------
+    catch_up : CatchUp
+        What to do after missing one or more deadlines.
+    max_burst : int
+        With :attr:`CatchUp.BURST`, the most missed ticks run back to back; beyond this
+        the schedule skips ahead instead.
+    """
+
+    def __init__(self, catch_up: CatchUp = CatchUp.SKIP, max_burst: int = 10):
+        self.catch_up = CatchUp(catch_up)
+        self.max_burst = max_burst
+
+        self.next_deadline: float | None = None
+        self.period: float | None = None
+        self.missed_ticks = 0
+
+    def start(self, period: float | None = None, now: float | None = None):
+        """Anchor the schedule so that the first deadline is one period from now."""
+        now = clock.monotonic() if now is None else now
+        self.period = period
+        self.next_deadline = now + period if period else now
+
+    def delay(self, period: float | None, now: float | None = None) -> float:
+        """Advance to the next tick, returning how long to sleep until it is due.
+
+        Call this once per loop iteration, after the loop body has run.
+        """
+        now = clock.monotonic() if now is None else now
+        if period is None or period <= 0:
+            self.start(period, now)
+            return 0.0
+
+        if self.next_deadline is None or not self.period:
+            self.start(period, now)
+        elif period != self.period:
+            # re-anchor on the current deadline so a period change takes effect next tick
+            self.next_deadline += period - self.period
+            self.period = period
+
+        deadline = self.next_deadline
+        if now < deadline:
+            self.next_deadline = deadline + period
+            return deadline - now
+
+        # late: this tick runs immediately
+        behind = math.floor((now - deadline) / period)
+        if self.catch_up is CatchUp.BURST and behind < self.max_burst:
+            self.next_deadline = deadline + period
+        else:
+            self.missed_ticks += behind
+            self.next_deadline = deadline + (behind + 1) * period
+        return 0.0
+
+    async def wait(self, period: float | None):
+        """Sleep until the next tick is due."""
+        delay = self.delay(period)
+        if delay > 0:
+            await asyncio.sleep(delay)
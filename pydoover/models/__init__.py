@@ -50,6 +50,8 @@ if TYPE_CHECKING:
         RotatedDeviceToken,
         ScheduleEvent,
         SubscriptionInfo,
+        TimeseriesColumn,
+        TimeseriesColumns,
         TimeseriesResponse,
         TokenRefreshError,
         TurnCredential,
@@ -105,6 +107,8 @@ __all__ = [
     "RotatedDeviceToken",
     "ScheduleEvent",
     "SubscriptionInfo",
+    "TimeseriesColumn",
+    "TimeseriesColumns",
     "TimeseriesResponse",
     "TokenRefreshError",
     "TurnCredential",
@@ -9,6 +9,8 @@ from .batch import (
     BatchMutationItem,
     BatchMutationResponse,
     BatchMutationResult,
+    BulkMutationFailure,
+    BulkMutationResponse,
 )
 from .channel import Channel, ChannelID, ChannelList, ChannelListing
 from .device_token import ConfirmedDeviceToken, RotatedDeviceToken
@@ -54,7 +56,12 @@ from .notification import (
 from .notification_response import AgentNotificationResponse
 from .processor_info import SubscriptionInfo
 from .processor_response import ProcessorTokenResponse
-from .timeseries import DataPoint, TimeseriesResponse
+from .timeseries import (
+    DataPoint,
+    TimeseriesColumn,
+    TimeseriesColumns,
+    TimeseriesResponse,
+)
 from .turn_credential import TurnCredential
 from .wss_connection import (
     ConnectionDetail,
@@ -77,6 +84,8 @@ __all__ = [
     "BatchMutationItem",
     "BatchMutationResponse",
     "BatchMutationResult",
+    "BulkMutationFailure",
+    "BulkMutationResponse",
     "Channel",
     "ChannelList",
     "ChannelListing",
@@ -117,6 +126,8 @@ __all__ = [
     "RotatedDeviceToken",
     "ScheduleEvent",
     "SubscriptionInfo",
+    "TimeseriesColumn",
+    "TimeseriesColumns",
     "TimeseriesResponse",
     "TokenRefreshError",
     "TurnCredential",
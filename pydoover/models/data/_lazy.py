@@ -0,0 +1,61 @@
+"""Lazily decoded JSON payloads for the data models.
+
+Bulk loads (reports, processors, the device agent's message listings) build far more
+:class:`Message` and :class:`Aggregate` objects than they ever read the payload of. A
+payload handed over as raw JSON ``bytes`` is kept that way, which is several times
+smaller than the decoded dicts, and only parsed the first time ``.data`` is read.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised by environments without the extra
+    orjson = None
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class LazyJSON:
+    """A payload attribute that accepts decoded data or raw JSON ``bytes``.
+
+    Assigning ``bytes`` stores them undecoded; the first read parses and caches the
+    result, so later reads (and in-place mutation of the returned dict) behave exactly
+    like a plain attribute. ``bytes`` is never a valid decoded JSON value, so both
+    states share one slot: the owning class declares ``_<name>`` in its ``__slots__``,
+    and its constructor may assign that slot directly.
+    """
+
+    __slots__ = ("slot",)
+
+    def __set_name__(self, owner, name):
+        # the slot's member descriptor, which is quicker than getattr/setattr by name
+        self.slot = owner.__dict__[f"_{name}"]
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj)
+        if type(value) is bytes:
+            value = _loads(value)
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        if isinstance(value, (bytearray, memoryview)):
+            value = bytes(value)
+        self.slot.__set__(obj, value)
+
+    def is_loaded(self, obj) -> bool:
+        """Whether the payload on ``obj`` has been decoded."""
+        return type(self.slot.__get__(obj)) is not bytes
+
+    def raw(self, obj) -> bytes | None:
+        """The undecoded JSON on ``obj``, or None once it has been decoded."""
+        value = self.slot.__get__(obj)
+        return value if type(value) is bytes else None
@@ -0,0 +1,24 @@
+"""Lazy access to the device agent protobuf stubs.
+
+Only code talking to the device agent over gRPC needs the stubs (and protobuf itself),
+so models load them the first time they convert to or from a proto message rather than
+at import time. Processors and API clients never pay for them.
+"""
+
+from functools import cache
+
+
+@cache
+def device_agent_pb2():
+    """The ``device_agent_pb2`` module, imported on first use.
+
+    Raises
+    ------
+    RuntimeError
+        If the proto stubs (or protobuf) are not installed.
+    """
+    try:
+        from ..generated.device_agent import device_agent_pb2
+    except ImportError:
+        raise RuntimeError("Proto stubs not available") from None
+    return device_agent_pb2
@@ -3,30 +3,33 @@ from typing import Any
 
 from .attachment import Attachment
 
-try:
-    from ._proto_json import decode_data_fields, encode_data_fields
-    from ..generated.device_agent.device_agent_pb2 import (
-        Aggregate as ProtoAggregate,
-    )
-
-    _HAS_PROTO = True
-except ImportError:
-    _HAS_PROTO = False
+from ._lazy import LazyJSON
+from ._proto import device_agent_pb2
 
 
 class Aggregate:
+    """A channel's aggregate.
+
+    Like :class:`Message`, ``data`` can be given as raw JSON ``bytes`` and is then
+    decoded on first access.
+    """
+
     # pub struct ChannelAggregate {
     #     pub data: Value,
     #     pub attachments: Vec<Attachment>,
     #     pub last_updated: Option<u64>,
     # }
+    __slots__ = ("_data", "attachments", "last_updated")
+
+    data = LazyJSON()
+
     def __init__(
         self,
-        data: dict[str, Any],
+        data: dict[str, Any] | bytes,
         attachments: list[Attachment],
         last_updated: datetime | None,
     ):
-        self.data: dict[str, Any] = data
+        self._data = data
         self.attachments = attachments
         self.last_updated: datetime | None = last_updated
 
@@ -42,17 +45,24 @@ class Aggregate:
 
     @classmethod
     def from_proto(cls, response):
+        if response.data_json:
+            data = response.data_json.encode()
+        else:
+            from ._proto_json import decode_data_fields
+
+            data = decode_data_fields(response)
+
         return cls(
-            decode_data_fields(response),
+            data,
             [Attachment.from_proto(a) for a in response.attachments],
             response.last_updated
             and datetime.fromtimestamp(response.last_updated / 1000.0, tz=timezone.utc),
         )
 
     def to_proto(self):
-        if not _HAS_PROTO:
-            raise RuntimeError("Proto stubs not available")
-        return ProtoAggregate(
+        from ._proto_json import encode_data_fields
+
+        return device_agent_pb2().Aggregate(
             attachments=[a.to_proto() for a in self.attachments],
             last_updated=self.last_updated
             and int(self.last_updated.timestamp() * 1000.0),
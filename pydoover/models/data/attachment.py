@@ -1,14 +1,6 @@
 from typing import Any
 
-try:
-    from ..generated.device_agent.device_agent_pb2 import (
-        Attachment as ProtoAttachment,
-        File as ProtoFile,
-    )
-
-    _HAS_PROTO = True
-except ImportError:
-    _HAS_PROTO = False
+from ._proto import device_agent_pb2
 
 
 class Attachment:
@@ -16,6 +8,8 @@ class Attachment:
     #     pub content_type: Option<String>,
     #     pub size: u64,
     #     pub url: String,
+    __slots__ = ("filename", "content_type", "size", "url")
+
     def __init__(self, filename: str, content_type: str, size: int, url: str):
         self.filename = filename
         self.content_type = content_type
@@ -41,9 +35,7 @@ class Attachment:
         )
 
     def to_proto(self):
-        if not _HAS_PROTO:
-            raise RuntimeError("Proto stubs not available")
-        return ProtoAttachment(
+        return device_agent_pb2().Attachment(
             filename=self.filename,
             content_type=self.content_type,
             size_bytes=self.size,
@@ -60,6 +52,8 @@ class Attachment:
 
 
 class File:
+    __slots__ = ("filename", "content_type", "size", "data")
+
     def __init__(self, filename: str, content_type: str, size: int, data: bytes):
         self.filename = filename
         self.content_type = content_type
@@ -76,9 +70,7 @@ class File:
         )
 
     def to_proto(self):
-        if not _HAS_PROTO:
-            raise RuntimeError("Proto stubs not available")
-        return ProtoFile(
+        return device_agent_pb2().File(
             filename=self.filename,
             content_type=self.content_type,
             size_bytes=self.size,
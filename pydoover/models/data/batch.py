@@ -219,3 +219,53 @@ class BatchMutationResponse:
             "succeeded": self.succeeded,
             "failed": self.failed,
         }
+
+
+class BulkMutationFailure:
+    """An item a bulk mutation gave up on, with the last error it got."""
+
+    __slots__ = ("item", "error", "attempts")
+
+    def __init__(self, item: BatchMutationItem, error: str | None, attempts: int):
+        self.item = item
+        self.error = error
+        self.attempts = attempts
+
+    def __repr__(self):
+        return (
+            f"<BulkMutationFailure agent_id={self.item.agent_id} "
+            f"channel={self.item.channel_name!r} attempts={self.attempts} "
+            f"error={self.error!r}>"
+        )
+
+
+class BulkMutationResponse:
+    """The consolidated outcome of a bulk mutation.
+
+    Only the totals and the items that still failed after every retry are kept, so
+    the response stays small however many items were written.
+    """
+
+    def __init__(
+        self,
+        count: int = 0,
+        succeeded: int = 0,
+        failures: list[BulkMutationFailure] | None = None,
+        requests: int = 0,
+        retried: int = 0,
+    ):
+        self.count = count
+        self.succeeded = succeeded
+        self.failures = failures if failures is not None else []
+        self.requests = requests
+        self.retried = retried
+
+    def __repr__(self):
+        return (
+            f"<BulkMutationResponse count={self.count} succeeded={self.succeeded} "
+            f"failed={self.failed} requests={self.requests}>"
+        )
+
+    @property
+    def failed(self) -> int:
+        return len(self.failures)
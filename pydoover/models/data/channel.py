@@ -3,17 +3,12 @@ from typing import Any
 
 from .aggregate import Aggregate
 
-try:
-    from ..generated.device_agent.device_agent_pb2 import (
-        ChannelID as ProtoChannelID,
-    )
-
-    _HAS_PROTO = True
-except ImportError:
-    _HAS_PROTO = False
+from ._proto import device_agent_pb2
 
 
 class ChannelID:
+    __slots__ = ("agent_id", "name")
+
     def __init__(self, agent_id: int, name: str):
         self.agent_id = int(agent_id)
         self.name = name
@@ -39,9 +34,7 @@ class ChannelID:
         )
 
     def to_proto(self):
-        if not _HAS_PROTO:
-            raise RuntimeError("Proto stubs not available")
-        return ProtoChannelID(
+        return device_agent_pb2().ChannelID(
             agent_id=self.agent_id,
             name=self.name,
         )
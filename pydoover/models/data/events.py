@@ -45,6 +45,8 @@ class MessageCreateEvent:
     #     pub channel: ChannelID,
     #     pub data: Value,
     # }
+    __slots__ = ("channel", "message")
+
     def __init__(
         self,
         channel: ChannelID,
@@ -79,7 +81,7 @@ class MessageCreateEvent:
 class OneShotMessage(MessageCreateEvent):
     """A one-shot message that is not persisted. Supports isinstance checks."""
 
-    pass
+    __slots__ = ()
 
 
 class MessageUpdateEvent:
@@ -92,6 +94,8 @@ class MessageUpdateEvent:
     #     pub message: Message,
     #     pub request_data: Value,
     # }
+    __slots__ = ("channel", "author_id", "organisation_id", "message", "request_data")
+
     def __init__(
         self,
         channel: ChannelID,
@@ -134,6 +138,14 @@ class AggregateUpdateEvent:
     #     pub request_data: ChannelAggregate,
     #     pub organisation_id: SnowflakeID,
     # }
+    __slots__ = (
+        "author_id",
+        "channel",
+        "aggregate",
+        "request_data",
+        "organisation_id",
+    )
+
     def __init__(
         self,
         author_id: int,
@@ -175,11 +187,21 @@ class ChannelSyncEvent:
     before any live aggregate_update events arrive.
     """
 
+    __slots__ = ("aggregate",)
+
     def __init__(self, aggregate: Aggregate):
         self.aggregate = aggregate
 
 
 class DeploymentEvent:
+    __slots__ = (
+        "agent_id",
+        "app_id",
+        "app_install_id",
+        "app_key",
+        "app_display_name",
+    )
+
     def __init__(
         self,
         agent_id: int,
@@ -215,6 +237,8 @@ class DeploymentEvent:
 
 
 class ScheduleEvent:
+    __slots__ = ("schedule_id",)
+
     def __init__(self, schedule_id: int):
         self.schedule_id = schedule_id
 
@@ -231,6 +255,15 @@ class ScheduleEvent:
 
 
 class IngestionEndpointEvent:
+    __slots__ = (
+        "ingestion_id",
+        "agent_id",
+        "organisation_id",
+        "payload",
+        "invocation_url",
+        "content_type",
+    )
+
     def __init__(
         self,
         ingestion_id: int,
@@ -272,6 +305,8 @@ class IngestionEndpointEvent:
 
 
 class ManualInvokeEvent:
+    __slots__ = ("organisation_id", "payload")
+
     def __init__(
         self,
         organisation_id: int,
@@ -5,18 +5,17 @@ from ...utils.snowflake import get_datetime_from_snowflake
 from .attachment import Attachment
 from .channel import ChannelID
 
-try:
-    from ._proto_json import decode_data_fields, encode_data_fields
-    from ..generated.device_agent.device_agent_pb2 import (
-        Message as ProtoMessage,
-    )
-
-    _HAS_PROTO = True
-except ImportError:
-    _HAS_PROTO = False
+from ._lazy import LazyJSON
+from ._proto import device_agent_pb2
 
 
 class Message:
+    """A message on a channel.
+
+    ``data`` can be given as raw JSON ``bytes``, in which case it is decoded the first
+    time it's read (see :class:`LazyJSON`).
+    """
+
     # pub struct Message {
     #     pub id: SnowflakeID,
     #     pub author_id: SnowflakeID,
@@ -24,18 +23,22 @@ class Message:
     #     pub data: Value,
     #     pub attachments: Vec<Attachment>,
     # }
+    __slots__ = ("id", "author_id", "channel", "_data", "attachments")
+
+    data = LazyJSON()
+
     def __init__(
         self,
         id: int,
         author_id: int,
         channel: ChannelID,
-        data: dict,
+        data: dict | bytes,
         attachments: list[Attachment],
     ):
         self.id = int(id)
         self.author_id = int(author_id)
         self.channel = channel
-        self.data = data
+        self._data = data
         self.attachments = attachments
 
     @property
@@ -63,18 +66,26 @@ class Message:
 
     @classmethod
     def from_proto(cls, response):
+        if response.data_json:
+            # decoded on first access
+            data = response.data_json.encode()
+        else:
+            from ._proto_json import decode_data_fields
+
+            data = decode_data_fields(response)
+
         return cls(
             response.message_id,
             response.author_id,
             ChannelID.from_proto(response.channel),
-            decode_data_fields(response),
+            data,
             [Attachment.from_proto(a) for a in response.attachments],
         )
 
     def to_proto(self):
-        if not _HAS_PROTO:
-            raise RuntimeError("Proto stubs not available")
-        return ProtoMessage(
+        from ._proto_json import encode_data_fields
+
+        return device_agent_pb2().Message(
             message_id=self.id,
             author_id=self.author_id,
             channel=self.channel.to_proto(),
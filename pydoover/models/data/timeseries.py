@@ -2,6 +2,8 @@ from typing import Any
 
 
 class DataPoint:
+    __slots__ = ("value", "message_id")
+
     def __init__(self, value: Any, message_id: int):
         self.value = value
         self.message_id = int(message_id)
@@ -47,3 +49,75 @@ class TimeseriesResponse:
         if self.next is not None:
             result["next"] = self.next
         return result
+
+
+class TimeseriesColumn:
+    """One field of a columnar timeseries, as contiguous arrays ordered oldest first.
+
+    ``timestamps`` are milliseconds since the Unix epoch and ``mask`` is true where the
+    field had no value, following :mod:`numpy.ma`'s convention, so
+    ``numpy.ma.array(column.values, mask=column.mask)`` gives a masked array. With NumPy
+    installed the arrays are ``ndarray`` objects; otherwise they are :class:`array.array`
+    objects, with ``mask`` stored as unsigned bytes.
+
+    ``values`` are float64 (masked entries are NaN) when every value is a number or
+    bool. Otherwise they are an object array, or a list without NumPy, with None for
+    masked entries. ``message_ids`` identifies the message behind each point, and is
+    None for downsampled columns, where each point is a time bucket.
+    """
+
+    __slots__ = ("name", "timestamps", "values", "mask", "message_ids")
+
+    def __init__(self, name: str, timestamps, values, mask, message_ids=None):
+        self.name = name
+        self.timestamps = timestamps
+        self.values = values
+        self.mask = mask
+        self.message_ids = message_ids
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __repr__(self):
+        return f"<TimeseriesColumn name={self.name!r} points={len(self)}>"
+
+
+class TimeseriesColumns:
+    """The columns returned by a columnar timeseries fetch, keyed by field name.
+
+    ``count`` is the number of raw points received across ``pages`` pages, before any
+    downsampling. ``interval`` is the bucket width in milliseconds when the points were
+    downsampled (with ``aggregate`` naming how), and None otherwise.
+    """
+
+    def __init__(
+        self,
+        columns: dict[str, TimeseriesColumn],
+        count: int,
+        pages: int,
+        interval: int | None = None,
+        aggregate: str | None = None,
+    ):
+        self.columns = columns
+        self.count = count
+        self.pages = pages
+        self.interval = interval
+        self.aggregate = aggregate
+
+    def __getitem__(self, name: str) -> TimeseriesColumn:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __repr__(self):
+        return (
+            f"<TimeseriesColumns fields={list(self.columns)!r} count={self.count} "
+            f"pages={self.pages}>"
+        )
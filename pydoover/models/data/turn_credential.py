@@ -1,11 +1,4 @@
-try:
-    from ..generated.device_agent.device_agent_pb2 import (
-        TurnCredential as ProtoTurnCredential,
-    )
-
-    _HAS_PROTO = True
-except ImportError:
-    _HAS_PROTO = False
+from ._proto import device_agent_pb2
 
 
 class TurnCredential:
@@ -51,9 +44,7 @@ class TurnCredential:
         )
 
     def to_proto(self):
-        if not _HAS_PROTO:
-            raise RuntimeError("Proto stubs not available")
-        return ProtoTurnCredential(
+        return device_agent_pb2().TurnCredential(
             username=self.username,
             credential=self.credential,
             ttl=self.ttl,
@@ -8,6 +8,7 @@ from enum import StrEnum
 
 from typing import Any
 
+from ..api._pool import shared_pool
 from ..rpc import RPCManager
 from ..tags import Tags
 from ..tags.manager import TagsManagerProcessor
@@ -79,7 +80,9 @@ class Application:
             os.environ.get("DOOVER_DATA_ENDPOINT") or DEFAULT_DATA_ENDPOINT
         )
 
-        self.api = ProcessorDataClient(self._api_endpoint)
+        # the session is closed after each invocation, but the pooled connections
+        # stay open for the next warm one on the same loop
+        self.api = ProcessorDataClient(self._api_endpoint, pool=shared_pool())
 
         # set per-task
         self.agent_id: int | None = None
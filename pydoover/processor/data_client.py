@@ -1,10 +1,10 @@
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 
 from ..api import AsyncDataClient
-from ..api.data import AsyncMessageIterator
+from ..api.data import AsyncMessageIterator, AsyncMessageScan
 from ..models.data import (
     Aggregate,
     Channel,
@@ -14,6 +14,7 @@ from ..models.data import (
     ConnectionConfig,
     ConnectionDetermination,
     ConnectionStatus,
+    TimeseriesColumns,
     TimeseriesResponse,
 )
 
@@ -27,8 +28,8 @@ class ProcessorDataClient(AsyncDataClient):
     conversion, chunked message fetching, and connection helpers.
     """
 
-    def __init__(self, base_url: str):
-        super().__init__(base_url)
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(base_url, **kwargs)
 
         self.has_persistent_connection = lambda: False
         self.is_processor_v2 = True
@@ -174,6 +175,7 @@ class ProcessorDataClient(AsyncDataClient):
         agent_id: int | None = None,
         organisation_id: int | None = None,
         page_size: int = 50,
+        prefetch: int = 1,
     ) -> AsyncMessageIterator:
         return super().iter_messages(
             agent_id=self._resolve_agent_id(agent_id),
@@ -183,6 +185,53 @@ class ProcessorDataClient(AsyncDataClient):
             field_names=field_names,
             organisation_id=organisation_id,
             page_size=page_size,
+            prefetch=prefetch,
+        )
+
+    def scan_messages(
+        self,
+        channel_name: str,
+        after: int | datetime,
+        before: int | datetime | None = None,
+        shards: int = 8,
+        concurrency: int = 4,
+        ordered: bool = True,
+        field_names: list[str] | None = None,
+        page_size: int = 50,
+        agent_id: int | None = None,
+        organisation_id: int | None = None,
+        buffer_pages: int | None = 8,
+    ) -> AsyncMessageScan:
+        return super().scan_messages(
+            agent_id=self._resolve_agent_id(agent_id),
+            channel_name=channel_name,
+            after=after,
+            before=before,
+            shards=shards,
+            concurrency=concurrency,
+            ordered=ordered,
+            field_names=field_names,
+            page_size=page_size,
+            organisation_id=organisation_id,
+            buffer_pages=buffer_pages,
+        )
+
+    async def cached_messages(
+        self,
+        channel_name: str,
+        after: int | datetime | None = None,
+        before: int | datetime | None = None,
+        agent_id: int | None = None,
+        organisation_id: int | None = None,
+        page_size: int = 200,
+    ) -> list[Message]:
+        return await super().cached_messages(
+            agent_id=self._resolve_agent_id(agent_id),
+            channel_name=channel_name,
+            after=after,
+            before=before,
+            organisation_id=organisation_id,
+            page_size=page_size,
         )
 
     async def fetch_message(
@@ -331,6 +380,30 @@ class ProcessorDataClient(AsyncDataClient):
             organisation_id=organisation_id,
         )
 
+    async def fetch_timeseries_columns(
+        self,
+        channel_name: str,
+        field_names: list[str] | None = None,
+        before: int | datetime | None = None,
+        after: int | datetime | None = None,
+        downsample: timedelta | float | None = None,
+        aggregate: str = "mean",
+        page_size: int | None = None,
+        agent_id: int | None = None,
+        organisation_id: int | None = None,
+    ) -> TimeseriesColumns:
+        return await super().fetch_timeseries_columns(
+            agent_id=self._resolve_agent_id(agent_id),
+            channel_name=channel_name,
+            field_names=field_names,
+            before=before,
+            after=after,
+            downsample=downsample,
+            aggregate=aggregate,
+            page_size=page_size,
+            organisation_id=organisation_id,
+        )
+
     async def fetch_channel_aggregate(
         self,
         channel_name: str,
@@ -5,6 +5,7 @@ import logging
 import os
 from typing import Any
 
+from ..utils.event_loop import new_event_loop
 from .application import Application
 from ._logging import (
     StreamToLogger,
@@ -15,16 +16,31 @@ from ._logging import (
 
 
 # should probably fact check this but I don't think we can run asyncio.run in a lambda because it
-# recycles the environment...
-try:
-    loop = asyncio.get_running_loop()
-except RuntimeError:
-    loop = asyncio.new_event_loop()
+# recycles the environment... so one loop is created on the first invocation and reused.
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_loop(event_loop: str | None = None) -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = new_event_loop(event_loop)
+    return _loop
 
 
 def run_app(
-    app: Application, event: dict[str, Any], context, setup_logging: bool = True
+    app: Application,
+    event: dict[str, Any],
+    context,
+    setup_logging: bool = True,
+    event_loop: str | None = None,
 ):
+    """Handle one Lambda invocation with ``app``.
+
+    ``event_loop`` picks the loop created on the first invocation (``"asyncio"``,
+    ``"uvloop"`` or ``"auto"``), defaulting to the ``DOOVER_EVENT_LOOP`` environment
+    variable, then ``"asyncio"``. If uvloop is requested but not installed, the default
+    asyncio loop is used. The loop is reused by later invocations.
+    """
     if setup_logging:
         debug_env = os.environ.get("DEBUG", "FALSE").upper()
         default_level = logging.DEBUG if debug_env in ("TRUE", "1") else logging.INFO
@@ -70,5 +86,6 @@ def run_app(
             StreamToLogger(logging.getLogger("stderr"), logging.ERROR)
         ),
     ):
+        loop = _get_loop(event_loop)
         task = loop.create_task(app._handle_event(data, subscription_id))
         return loop.run_until_complete(task)
@@ -9,7 +9,7 @@ import inspect
 import logging
 import re
 from collections.abc import Callable
-from datetime import timezone, timedelta, datetime
+from datetime import timedelta, datetime
 from typing import Any, TYPE_CHECKING, Union
 
 from .models.data import (
@@ -19,6 +19,7 @@ from .models.data import (
     Message,
     OneShotMessage,
 )
+from .utils import clock
 
 if TYPE_CHECKING:
     from .docker.application import DeviceAgentInterface
@@ -112,7 +113,7 @@ def command_is_expired(message: Message) -> bool:
     expires_at = command_expires_at(message)
     if expires_at is None:
         return False
-    return datetime.now(tz=timezone.utc) >= expires_at
+    return clock.now() >= expires_at
 
 
 class RPCContext:
@@ -168,15 +169,13 @@ class RPCContext:
         payload = {
             "status": {
                 "code": "acknowledged",
-                "message": {
-                    "timestamp": int(datetime.now(tz=timezone.utc).timestamp() * 1000)
-                },
+                "message": {"timestamp": int(clock.now().timestamp() * 1000)},
             }
         }
         await self._update_fn(self.channel.name, self.message.id, payload)
 
     async def defer(self, seconds: float):
-        now = datetime.now(tz=timezone.utc)
+        now = clock.now()
         until = now + timedelta(seconds=seconds)
         payload = {
             "status": {
@@ -252,20 +251,32 @@ class RPCManager:
             func = getattr(obj, _name)
             if not self.check_handler(func):
                 continue
-            method_name = func._rpc_method
-            channel = func._rpc_channel
-            request_parser = func._rpc_parser
-            log.info(f"Registering RPC handler: {method_name} (channel={channel})")
-            if isinstance(method_name, re.Pattern):
-                # this is less efficient lookup-wise, so only do it if needed
-                # but is a pretty useful / flexible feature for the user (ie. subscribe to all get_*_di handlers)
-                self._re_handlers.append((channel, method_name, request_parser, func))
-            else:
-                self._handlers[(channel, method_name)] = (request_parser, func)
+            self.add_handler(
+                func._rpc_method, func, func._rpc_channel, func._rpc_parser
+            )
 
-            # Auto-subscribe to the handler's channel if specified
-            if channel is not None:
-                self.subscribe(channel)
+    def add_handler(
+        self,
+        method: str | re.Pattern,
+        func: Callable,
+        channel: str | None = None,
+        parser: Callable = None,
+    ) -> None:
+        """Register *func* to handle *method*, as if decorated with :func:`handler`.
+
+        If *channel* is set, it is subscribed to.
+        """
+        log.info(f"Registering RPC handler: {method} (channel={channel})")
+        if isinstance(method, re.Pattern):
+            # this is less efficient lookup-wise, so only do it if needed
+            # but is a pretty useful / flexible feature for the user (ie. subscribe to all get_*_di handlers)
+            self._re_handlers.append((channel, method, parser, func))
+        else:
+            self._handlers[(channel, method)] = (parser, func)
+
+        # Auto-subscribe to the handler's channel if specified
+        if channel is not None:
+            self.subscribe(channel)
 
     # -- channel subscription -----------------------------------------------
 
@@ -286,6 +297,10 @@ class RPCManager:
         )
         log.info(f"RPC subscribed to channel: {channel_name}")
 
+    def is_subscribed(self, channel_name: str) -> bool:
+        """Whether RPC events on *channel_name* are being received."""
+        return channel_name in self._subscribed_channels
+
     def _ensure_subscribed(self, channel_name: str) -> None:
         """Subscribe if not already subscribed."""
         self.subscribe(channel_name)
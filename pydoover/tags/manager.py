@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-import time
-from datetime import datetime, timezone
+from datetime import datetime
 
 from pydoover.models import EventSubscription, AggregateUpdateEvent, ChannelSyncEvent
 
@@ -10,6 +9,7 @@ import enum
 import logging
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable
 
+from pydoover.utils import clock
 from pydoover.utils.diff import apply_diff, generate_diff
 from pydoover.utils.utils import call_maybe_async
 
@@ -223,6 +223,7 @@ class TagsManagerDocker(TagsManager):
 
         self._tag_values: dict[str, Any] = {}
         self._tag_subscriptions: dict[KeyPath, Callable] = {}
+        self._change_listeners: list[Callable[[dict[str, Any]], None]] = []
 
         # Resolved (app_key, tag_name) paths for tags declared ``live=True``;
         # populated by ``set_live_tags`` once tag setup completes.
@@ -275,7 +276,7 @@ class TagsManagerDocker(TagsManager):
         claim has been dropped (or the tab was closed without a clean teardown).
         """
         entries = self.ui_sub_aggregate.get(bucket) or {}
-        now_ms = datetime.now(tz=timezone.utc).timestamp() * 1000
+        now_ms = clock.now().timestamp() * 1000
         for entry in entries.values():
             if entry is None:
                 continue
@@ -356,12 +357,40 @@ class TagsManagerDocker(TagsManager):
 
     async def _on_tag_sync(self, event: ChannelSyncEvent):
         self._tag_values = event.aggregate.data
+        self._notify_change_listeners(self._tag_values)
 
     async def _on_tag_update(self, event: AggregateUpdateEvent):
         diff = generate_diff(self._tag_values, event.aggregate.data, do_delete=False)
         self._tag_values = event.aggregate.data or {}
+        self._notify_change_listeners(diff)
         await self.fulfill_tag_subscriptions(diff)
 
+    def add_change_listener(self, callback: Callable[[dict[str, Any]], None]):
+        """Register a callback for every tag change, local or remote.
+
+        Unlike :meth:`subscribe_to_tag`, any number of listeners may be registered,
+        and they also see values set locally (before they are committed). The
+        callback receives the changed values as a nested ``{app_key: {tag: value}}``
+        diff. It is called synchronously on the event loop, so it must not block.
+        """
+        self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[dict[str, Any]], None]):
+        """Remove a listener registered with :meth:`add_change_listener`."""
+        try:
+            self._change_listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def _notify_change_listeners(self, diff: dict[str, Any] | None):
+        if not diff:
+            return
+        for callback in list(self._change_listeners):
+            try:
+                callback(diff)
+            except Exception as e:
+                logger.exception(f"Error in tag change listener: {e}", exc_info=e)
+
     async def fulfill_tag_subscriptions(self, diff):
         """Invoke any callbacks whose subscribed tag paths changed."""
         if diff is None or len(diff) == 0:
@@ -461,6 +490,9 @@ class TagsManagerDocker(TagsManager):
                     f"set_tags: tags={tags} Value did not change existing values {self._tag_values}"
                 )
                 return
+            self._notify_change_listeners(diff)
+        else:
+            self._notify_change_listeners(tags)
 
         if log:
             # Promote these paths to the immediate-log buffer (flushed at
@@ -501,7 +533,7 @@ class TagsManagerDocker(TagsManager):
         if self._pending_immediate_log:
             await self.flush_immediate_logs()
 
-        now = time.time()
+        now = clock.time()
         if self._pending_tag_log and (
             now - self._last_tag_log_time >= self.tag_log_interval
         ):
@@ -590,7 +622,7 @@ class TagsManagerDocker(TagsManager):
 
         log_data = self._pending_tag_log
         self._pending_tag_log = {}
-        self._last_tag_log_time = time.time()
+        self._last_tag_log_time = clock.time()
 
         await self.client.create_message(
             TAG_CHANNEL_NAME, log_data, timestamp=timestamp
@@ -619,6 +651,7 @@ class TagsManagerDocker(TagsManager):
         self,
         points: Iterable[tuple[datetime, dict[str, Any]]],
         app_key: str | None = None,
+        max_concurrency: int = 1,
     ) -> int:
         """Backfill historical logged tag values.
 
@@ -634,18 +667,48 @@ class TagsManagerDocker(TagsManager):
         defaults to this manager's own app, matching where the app's own tags
         are stored (``{app_key: {tag_name: value}}``).
 
+        With ``max_concurrency`` above 1, up to that many messages are in flight at
+        once. Each message carries its own timestamp, so history stays in order;
+        ``points`` is still consumed lazily. If a write fails, the rest are cancelled
+        and the error is raised.
+
         Returns the number of messages written.
         """
         app_key = app_key if app_key is not None else self.app_key
         count = 0
-        for timestamp, tags in points:
-            if not tags:
-                continue
+        in_flight: set[asyncio.Task] = set()
+
+        async def write(timestamp, tags):
             payload = {app_key: tags} if app_key else tags
             await self.client.create_message(
                 TAG_CHANNEL_NAME, payload, timestamp=timestamp
             )
-            count += 1
+
+        try:
+            for timestamp, tags in points:
+                if not tags:
+                    continue
+                if max_concurrency <= 1:
+                    await write(timestamp, tags)
+                    count += 1
+                    continue
+
+                if len(in_flight) >= max_concurrency:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        task.result()
+                in_flight.add(asyncio.create_task(write(timestamp, tags)))
+                count += 1
+
+            if in_flight:
+                done, in_flight = await asyncio.wait(in_flight)
+                for task in done:
+                    task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
         return count
 
 
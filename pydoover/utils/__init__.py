@@ -33,3 +33,9 @@ from .snowflake import (
     DOOVER_EPOCH as DOOVER_EPOCH,
     get_datetime_from_snowflake as get_datetime_from_snowflake,
 )
+
+from .event_loop import (
+    get_loop_factory as get_loop_factory,
+    new_event_loop as new_event_loop,
+    run_with_loop as run_with_loop,
+)
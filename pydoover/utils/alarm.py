@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 
-import time
 import logging
 import asyncio
 
+from . import clock
+
 ## A generic alarm class that can be used to trigger things via a callback function when a threshold is met
 ## threshold can be greater than or less than a specified value
 
@@ -66,11 +67,11 @@ class Alarm:
 
     def _check_grace_period(self):
         if self.initial_trigger_time is None:
-            self.initial_trigger_time = time.time()
+            self.initial_trigger_time = clock.time()
             return False
 
         else:
-            if self.initial_trigger_time + self.grace_period < time.time():
+            if self.initial_trigger_time + self.grace_period < clock.time():
                 return True
             else:
                 return False
@@ -79,7 +80,7 @@ class Alarm:
         if self.last_alarm_time is None:
             return True
         else:
-            if self.last_alarm_time + self.min_inter_alarm < time.time():
+            if self.last_alarm_time + self.min_inter_alarm < clock.time():
                 return True
             else:
                 return False
@@ -90,7 +91,7 @@ class Alarm:
                 await self.callback()
             else:
                 self.callback()
-        self.last_alarm_time = time.time()
+        self.last_alarm_time = clock.time()
 
     def reset_alarm(self):
         self.last_alarm_time = None
@@ -0,0 +1,75 @@
+"""The clock that application-level timers read.
+
+Code that measures intervals or stamps values in the docker stack (tag logging, UI
+freshness, alarms, loop pacing, pulse rates) reads time through this module rather than
+:mod:`time` or :class:`datetime.datetime` directly, so a simulation can swap in a
+virtual clock (see :class:`pydoover.docker.simulation.VirtualClock`). Outside a
+simulation these are the system clocks.
+"""
+
+import contextlib
+import time as _time
+from datetime import datetime, timezone
+from typing import Protocol
+
+
+class Clock(Protocol):
+    def time(self) -> float:
+        """Seconds since the epoch, like :func:`time.time`."""
+        ...
+
+    def monotonic(self) -> float:
+        """A monotonic clock in seconds, like :func:`time.monotonic`."""
+        ...
+
+
+class SystemClock:
+    """The real system clocks."""
+
+    @staticmethod
+    def time() -> float:
+        return _time.time()
+
+    @staticmethod
+    def monotonic() -> float:
+        return _time.monotonic()
+
+
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """The clock currently in use."""
+    return _clock
+
+
+def set_clock(clock: Clock | None) -> Clock:
+    """Replace the clock (None restores the system clock), returning the previous one."""
+    global _clock
+    previous, _clock = _clock, clock or SystemClock()
+    return previous
+
+
+@contextlib.contextmanager
+def use_clock(clock: Clock):
+    """Use ``clock`` for the duration of the ``with`` block."""
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+def time() -> float:
+    """Seconds since the epoch on the current clock."""
+    return _clock.time()
+
+
+def monotonic() -> float:
+    """Monotonic seconds on the current clock."""
+    return _clock.monotonic()
+
+
+def now(tz=timezone.utc) -> datetime:
+    """The current time on the current clock as an aware datetime (UTC by default)."""
+    return datetime.fromtimestamp(_clock.time(), tz)
@@ -0,0 +1,83 @@
+"""Event loop selection for the docker and processor runners.
+
+Apps spend much of their time dispatching small gRPC callbacks and tasks, where an
+alternative loop implementation such as ``uvloop`` cuts per-callback overhead. Runners
+choose a loop by name, from an argument or the ``DOOVER_EVENT_LOOP`` environment
+variable, and fall back to the standard asyncio loop when the choice isn't installed.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+EVENT_LOOP_ENV_VAR = "DOOVER_EVENT_LOOP"
+EVENT_LOOPS = ("asyncio", "uvloop", "auto")
+
+LoopFactory = Callable[[], asyncio.AbstractEventLoop]
+
+
+def _uvloop_factory() -> LoopFactory | None:
+    if sys.platform == "win32":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def get_loop_factory(event_loop: str | None = None) -> LoopFactory | None:
+    """Resolve an event loop name to a loop factory.
+
+    Parameters
+    ----------
+    event_loop : str, optional
+        ``"asyncio"`` for the standard loop, ``"uvloop"`` for uvloop, or ``"auto"`` for
+        uvloop when it's installed and the standard loop otherwise. Defaults to the
+        ``DOOVER_EVENT_LOOP`` environment variable, then ``"asyncio"``.
+
+    Returns
+    -------
+    Callable[[], asyncio.AbstractEventLoop] | None
+        A factory for :class:`asyncio.Runner`, or None for the standard loop. If uvloop
+        is requested but not installed, a warning is logged and None is returned.
+
+    Raises
+    ------
+    ValueError
+        If the loop name isn't recognised.
+    """
+    name = (event_loop or os.environ.get(EVENT_LOOP_ENV_VAR) or "asyncio").lower()
+    if name not in EVENT_LOOPS:
+        raise ValueError(
+            f"event loop must be one of {', '.join(EVENT_LOOPS)}, not {name!r}"
+        )
+
+    if name == "asyncio":
+        return None
+
+    factory = _uvloop_factory()
+    if factory is None:
+        if name == "uvloop":
+            log.warning("uvloop is not available, using the default asyncio loop.")
+        return None
+
+    log.debug("Using the uvloop event loop.")
+    return factory
+
+
+def new_event_loop(event_loop: str | None = None) -> asyncio.AbstractEventLoop:
+    """Create a new event loop of the kind chosen by :func:`get_loop_factory`."""
+    factory = get_loop_factory(event_loop)
+    return factory() if factory is not None else asyncio.new_event_loop()
+
+
+def run_with_loop(coro: Coroutine[Any, Any, Any], event_loop: str | None = None):
+    """Run a coroutine to completion like :func:`asyncio.run`, on the chosen loop."""
+    with asyncio.Runner(loop_factory=get_loop_factory(event_loop)) as runner:
+        return runner.run(coro)
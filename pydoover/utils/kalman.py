@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
-import time
 import logging
 
+from . import clock
+
 
 ## A simple 1D Kalman filter implementation
 ## This filter is designed to be used with a single sensor reading (e.g., a voltage reading, a temperature reading, etc.)
@@ -115,10 +116,10 @@ class KalmanFilter1D:
             )
         if self.estimate is None:
             self.estimate = measurement
-            self.last_timestamp = time.time()
+            self.last_timestamp = clock.time()
             return self.estimate
 
-        current_time = time.time()
+        current_time = clock.time()
         # If dt is not provided, calculate it based on the time since the last update
         if dt is None:
             if self.last_timestamp is None:
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark bulk message writes against sending batches one after another.
+
+Writes 5,000 messages to a stand-in data API that takes 20 ms to answer each batch
+and fails 2% of items on their first try. The baseline sends one batch at a time and
+resends failures by hand, as callers did before; ``bulk_create_messages`` keeps
+several batches in flight and resends failures itself. Peak memory is what
+``tracemalloc`` sees while the items are generated lazily.
+
+Run with:
+    uv run python scripts/bench_bulk.py
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+
+from pydoover.api import DataClient
+from pydoover.models.data import MAX_BATCH_MUTATIONS, BatchMutationItem
+
+ITEMS = 5_000
+LATENCY = 0.02
+
+_tried: set[int] = set()
+_tried_lock = threading.Lock()
+
+
+def _request(method, path, data=None, **kwargs):
+    time.sleep(LATENCY)
+    results = []
+    for item in data["items"]:
+        # fail one item in fifty, on its first try only
+        id_ = int(item["message_id"])
+        with _tried_lock:
+            ok = id_ % 50 or id_ in _tried
+            _tried.add(id_)
+        results.append(
+            {
+                "agent_id": item["agent_id"],
+                "channel_name": item["channel_name"],
+                "success": bool(ok),
+                "message_id": item["message_id"],
+            }
+        )
+    failed = sum(not r["success"] for r in results)
+    return {
+        "items": results,
+        "count": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+    }
+
+
+def items():
+    for i in range(1, ITEMS + 1):
+        yield BatchMutationItem(1, "tag_values", {"n": i}, message_id=i)
+
+
+def sequential(client: DataClient) -> int:
+    written = 0
+    batch = []
+    for item in items():
+        batch.append(item)
+        if len(batch) == MAX_BATCH_MUTATIONS:
+            written += _send(client, batch)
+            batch = []
+    if batch:
+        written += _send(client, batch)
+    return written
+
+
+def _send(client: DataClient, batch: list) -> int:
+    written = 0
+    while batch:
+        response = client.batch_create_messages(batch)
+        failed = {r.message_id for r in response.failures}
+        written += response.succeeded
+        batch = [item for item in batch if item.message_id in failed]
+    return written
+
+
+def bulk(client: DataClient) -> int:
+    return client.bulk_create_messages(items(), concurrency=8, retry_delay=0).succeeded
+
+
+def measure(write) -> tuple[float, int, int]:
+    client = DataClient(base_url="https://data.example", token="bench")
+    client._request = _request
+    _tried.clear()
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        written = write(client)
+        secs = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        client.close()
+    return secs, peak, written
+
+
+def main():
+    print(f"{ITEMS:,} messages, {LATENCY * 1000:.0f} ms per batch\n")
+    results = {}
+    for name, write in (("one batch at a time", sequential), ("bulk, 8 at once", bulk)):
+        secs, peak, written = results[name] = measure(write)
+        assert written == ITEMS, written
+        print(f"{name:>20}: {secs * 1000:6.0f} ms, {peak / 2**20:5.2f} MiB peak")
+
+    before, after = results["one batch at a time"], results["bulk, 8 at once"]
+    print(f"\nbulk writes are {before[0] / after[0]:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
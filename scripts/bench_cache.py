@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark the local message cache against re-fetching a channel's history.
+
+A report reads the last 30 days of a channel every hour. The stand-in data API answers
+each page request after ``LATENCY`` seconds. Without a cache every run pays for every
+page. With one, the first run fills it and later runs only fetch what arrived since
+the last one (``NEW_PER_RUN`` messages here), reading the rest from SQLite.
+
+Run with:
+    uv run python scripts/bench_cache.py
+"""
+
+from __future__ import annotations
+
+import bisect
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from pydoover.api import DataClient
+from pydoover.utils.clock import use_clock
+from pydoover.utils.snowflake import generate_snowflake_id_at
+
+MESSAGES = 20_000
+NEW_PER_RUN = 50
+PAGE_SIZE = 200
+LATENCY = 0.02
+RUNS = 5
+
+FIRST_RUN = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+class HourlyClock:
+    """Stands in for the system clock: run ``n`` happens ``n`` hours after the first."""
+
+    def __init__(self, run: int):
+        self.at = (FIRST_RUN + timedelta(hours=run)).timestamp()
+
+    def time(self) -> float:
+        return self.at
+
+    def monotonic(self) -> float:
+        return self.at
+
+
+class Server:
+    def __init__(self):
+        start = FIRST_RUN - timedelta(days=30)
+        step = (timedelta(days=30) - timedelta(minutes=10)) / MESSAGES
+        self.ids = [generate_snowflake_id_at(start + step * i) for i in range(MESSAGES)]
+        self.requests = 0
+
+    def add(self, run: int):
+        """The messages that arrived between the previous run and ``run``."""
+        start = FIRST_RUN + timedelta(hours=run - 1)
+        step = timedelta(minutes=50) / NEW_PER_RUN
+        self.ids.extend(
+            generate_snowflake_id_at(start + step * i)
+            for i in range(1, NEW_PER_RUN + 1)
+        )
+
+    def request(self, method, path, params=None, **kwargs):
+        self.requests += 1
+        time.sleep(LATENCY)
+        after, before = params.get("after") or 0, params.get("before")
+        lo = bisect.bisect_right(self.ids, after)
+        hi = len(self.ids) if before is None else bisect.bisect_left(self.ids, before)
+        page = self.ids[max(lo, hi - params["limit"]) : hi][::-1]
+        return [
+            {
+                "id": i,
+                "author_id": 1,
+                "channel": {"agent_id": 1, "name": "tag_values"},
+                "data": {"temperature": 21.5, "pressure": 101.3, "seq": i & 0xFFFF},
+            }
+            for i in page
+        ]
+
+
+def run(server: Server, cache, n: int) -> tuple[float, int, int]:
+    client = DataClient(base_url="https://data.example", token="bench", cache=cache)
+    client._request = server.request
+    server.requests = 0
+    after = FIRST_RUN + timedelta(hours=n) - timedelta(days=30)
+    start = time.perf_counter()
+    with use_clock(HourlyClock(n)):
+        if cache is None:
+            messages = client.iter_messages(
+                1, "tag_values", after=after, page_size=PAGE_SIZE
+            )
+            count = len(messages.collect())
+        else:
+            count = len(
+                client.cached_messages(
+                    1, "tag_values", after=after, page_size=PAGE_SIZE
+                )
+            )
+    secs = time.perf_counter() - start
+    client.close()
+    return secs, count, server.requests
+
+
+def main():
+    print(
+        f"{MESSAGES:,} messages over 30 days, {PAGE_SIZE} per page, "
+        f"{LATENCY * 1000:.0f} ms per request, {NEW_PER_RUN} new per run\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "messages.db"
+        for name, cache in (("no cache", None), ("cache", path)):
+            server = Server()
+            for n in range(RUNS):
+                if n:
+                    server.add(n)
+                secs, count, requests = run(server, cache, n)
+                print(
+                    f"{name:>8} run {n + 1}: {secs * 1000:6.0f} ms, "
+                    f"{requests:3} requests, {count:,} messages"
+                )
+            print()
+        print(f"cache file: {path.stat().st_size / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Benchmark tag and event dispatch on the asyncio and uvloop event loops.
+
+Streams aggregate updates on the tag channel through the device agent's real dispatch
+path (``_run_channel_stream``), with the tag manager diffing each update and firing a
+tag subscription, plus a few app-level callbacks on the same channel, as an app with
+several subscribers would have. Each event therefore fans out into several tasks, which
+is where loop overhead shows up. The gRPC stream itself is replaced by an in-memory
+generator, so only dispatch is measured.
+
+uvloop is skipped if it isn't installed (``pip install uvloop``).
+
+Run with:
+    uv run python scripts/bench_event_loop.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from pydoover.docker.device_agent import DeviceAgentInterface
+from pydoover.models import (
+    Aggregate,
+    AggregateUpdateEvent,
+    ChannelID,
+    EventSubscription,
+)
+from pydoover.tags.manager import TAG_CHANNEL_NAME, TagsManagerDocker
+from pydoover.utils.event_loop import get_loop_factory
+
+EVENTS = 50_000
+EXTRA_CALLBACKS = 3
+RUNS = 5
+
+
+class StreamingDeviceAgent(DeviceAgentInterface):
+    """Feeds a prebuilt list of events through the normal channel dispatch."""
+
+    def __init__(self, events: list[AggregateUpdateEvent]):
+        super().__init__(app_key="bench", dda_uri="localhost:50051")
+        self.events = events
+        self.done = asyncio.Event()
+
+    async def wait_until_healthy(self, timeout: float = 10):
+        return True
+
+    async def fetch_channel_aggregate(self, channel_name: str):
+        return Aggregate({}, [], None)
+
+    async def stream_channel_events(self, channel_name, *args, **kwargs):
+        for event in self.events:
+            yield event
+            # let dispatched callbacks interleave with the stream, as they would
+            # between gRPC reads
+            await asyncio.sleep(0)
+        await self.done.wait()
+
+
+def make_events() -> list[AggregateUpdateEvent]:
+    channel = ChannelID(1, TAG_CHANNEL_NAME)
+    events = []
+    for i in range(EVENTS):
+        aggregate = Aggregate(
+            {"bench": {"pressure": i * 0.1, "pump_on": i % 2 == 0, "count": i}},
+            [],
+            None,
+        )
+        events.append(AggregateUpdateEvent(1, channel, aggregate, aggregate, 1))
+    return events
+
+
+async def dispatch(events: list[AggregateUpdateEvent]) -> float:
+    dda = StreamingDeviceAgent(events)
+    tags = TagsManagerDocker(dda, app_key="bench")
+    await tags.setup(skip_sync=True)
+
+    expected = len(events) * (EXTRA_CALLBACKS + 1)
+    received = 0
+    all_received = asyncio.Event()
+
+    def count():
+        nonlocal received
+        received += 1
+        if received == expected:
+            all_received.set()
+
+    async def on_pressure(_key, _value):
+        count()
+
+    async def on_event(_event):
+        count()
+
+    tags.subscribe_to_tag("pressure", on_pressure, app_key="bench")
+    for _ in range(EXTRA_CALLBACKS):
+        dda.add_event_callback(
+            TAG_CHANNEL_NAME, on_event, EventSubscription.aggregate_update
+        )
+
+    start = time.perf_counter()
+    await all_received.wait()
+    elapsed = time.perf_counter() - start
+
+    dda.done.set()
+    for task in dda._stream_tasks.values():
+        task.cancel()
+    await asyncio.gather(*dda._stream_tasks.values(), return_exceptions=True)
+    return elapsed
+
+
+def bench(event_loop: str, events: list[AggregateUpdateEvent]) -> list[float]:
+    factory = get_loop_factory(event_loop)
+    timings = []
+    for _ in range(RUNS):
+        with asyncio.Runner(loop_factory=factory) as runner:
+            timings.append(runner.run(dispatch(events)))
+    return timings
+
+
+def main():
+    events = make_events()
+    print(
+        f"{EVENTS} tag updates, {EXTRA_CALLBACKS + 1} callbacks each, best of {RUNS}\n"
+    )
+
+    results = {"asyncio": bench("asyncio", events)}
+    if get_loop_factory("auto") is not None:
+        results["uvloop"] = bench("uvloop", events)
+    else:
+        print("uvloop is not installed, skipping.\n")
+
+    for name, timings in results.items():
+        best = min(timings)
+        print(
+            f"{name:>8}: best {best * 1000:7.1f} ms, "
+            f"median {statistics.median(timings) * 1000:7.1f} ms, "
+            f"{EVENTS / best:9,.0f} events/s, "
+            f"{best / EVENTS * 1e6:5.2f} us/event"
+        )
+
+    if "uvloop" in results:
+        speedup = min(results["asyncio"]) / min(results["uvloop"])
+        print(f"\nuvloop speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
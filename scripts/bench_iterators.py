@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark read-ahead in the data API's message iterators.
+
+Scans a channel history through ``iter_messages`` against a stand-in client whose pages
+take ``LATENCY`` seconds to arrive, while the consumer spends ``WORK`` seconds on each
+page. Without read-ahead the two alternate; with it, the next page is in flight while
+the current one is processed.
+
+Run with:
+    uv run python scripts/bench_iterators.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from pydoover.api.data import AsyncMessageIterator, MessageIterator
+from pydoover.models.data import ChannelID, Message
+
+PAGES = 40
+PAGE_SIZE = 100
+LATENCY = 0.02
+WORK = 0.02
+
+CHANNEL = ChannelID(1, "history")
+
+
+def _page(before: int | None) -> list[Message]:
+    top = PAGES * PAGE_SIZE if before is None else before
+    return [
+        Message(i, 1, CHANNEL, {"n": i}, [])
+        for i in range(top - 1, max(top - 1 - PAGE_SIZE, 0), -1)
+    ]
+
+
+class SlowClient:
+    def list_messages(self, before=None, **kwargs):
+        time.sleep(LATENCY)
+        return _page(before)
+
+
+class AsyncSlowClient:
+    async def list_messages(self, before=None, **kwargs):
+        await asyncio.sleep(LATENCY)
+        return _page(before)
+
+
+def scan_sync(prefetch: int) -> float:
+    start = time.perf_counter()
+    iterator = MessageIterator(
+        SlowClient(), 1, "history", page_size=PAGE_SIZE, prefetch=prefetch
+    )
+    for n, _ in enumerate(iterator, 1):
+        if n % PAGE_SIZE == 0:
+            time.sleep(WORK)
+    return time.perf_counter() - start
+
+
+async def scan_async(prefetch: int) -> float:
+    start = time.perf_counter()
+    iterator = AsyncMessageIterator(
+        AsyncSlowClient(), 1, "history", page_size=PAGE_SIZE, prefetch=prefetch
+    )
+    n = 0
+    async for _ in iterator:
+        n += 1
+        if n % PAGE_SIZE == 0:
+            await asyncio.sleep(WORK)
+    return time.perf_counter() - start
+
+
+def main():
+    print(
+        f"{PAGES} pages of {PAGE_SIZE}, {LATENCY * 1000:.0f} ms per fetch, "
+        f"{WORK * 1000:.0f} ms work per page\n"
+    )
+    for prefetch in (0, 1, 2):
+        sync_secs = scan_sync(prefetch)
+        async_secs = asyncio.run(scan_async(prefetch))
+        print(
+            f"prefetch={prefetch}: sync {sync_secs * 1000:6.0f} ms, "
+            f"async {async_secs * 1000:6.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
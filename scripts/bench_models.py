@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Benchmark memory and construction time of 100k data-model messages.
+
+Compares the slotted, lazily decoded :class:`Message` against an equivalent plain class
+with a per-instance ``__dict__`` that decodes every payload up front (how the models
+worked before). Messages are built from device agent protos carrying ``data_json``, as
+``list_messages`` returns them, and from already-parsed dicts, as the data API returns
+them.
+
+Each scenario runs in a fresh child process. Memory is the growth in resident set size
+while building the list (Linux), with the bytes traced by ``tracemalloc`` as a
+cross-check.
+
+Run with:
+    uv run python scripts/bench_models.py
+"""
+
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+import time
+import tracemalloc
+
+from pydoover.models.data import Attachment, ChannelID, Message
+from pydoover.models.data._proto_json import decode_data_fields
+
+MESSAGES = 100_000
+FIELDS = 20
+
+
+class PlainMessage:
+    """The previous layout: a ``__dict__`` per instance and an eagerly decoded payload."""
+
+    def __init__(self, id, author_id, channel, data, attachments):
+        self.id = int(id)
+        self.author_id = int(author_id)
+        self.channel = channel
+        self.data = data
+        self.attachments = attachments
+
+
+class PlainChannelID:
+    def __init__(self, agent_id, name):
+        self.agent_id = int(agent_id)
+        self.name = name
+
+
+def plain_from_proto(response):
+    return PlainMessage(
+        response.message_id,
+        response.author_id,
+        PlainChannelID(response.channel.agent_id, response.channel.name),
+        decode_data_fields(response),
+        [Attachment.from_proto(a) for a in response.attachments],
+    )
+
+
+def plain_from_dict(data):
+    return PlainMessage(
+        data["id"],
+        data["author_id"],
+        PlainChannelID(data["channel"]["agent_id"], data["channel"]["name"]),
+        data["data"],
+        [Attachment.from_dict(d) for d in data.get("attachments", [])],
+    )
+
+
+def payload(i: int) -> dict:
+    return {
+        "app": {
+            f"field_{f}": (i * f) * 0.5 if f % 3 else f"state-{i % 7}"
+            for f in range(FIELDS)
+        },
+        "seq": i,
+    }
+
+
+def make_protos():
+    channel = ChannelID(1, "tag_values")
+    return [
+        Message(10_000 + i, 2, channel, payload(i), []).to_proto()
+        for i in range(MESSAGES)
+    ]
+
+
+def make_dicts():
+    return [
+        {
+            "id": 10_000 + i,
+            "author_id": 2,
+            "channel": {"agent_id": 1, "name": "tag_values"},
+            "data": payload(i),
+            "attachments": [],
+        }
+        for i in range(MESSAGES)
+    ]
+
+
+def _rss() -> int | None:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _build(scenario: str, inputs):
+    if scenario == "plain, eager (proto)":
+        return [plain_from_proto(p) for p in inputs]
+    if scenario == "slotted, lazy (proto)":
+        return [Message.from_proto(p) for p in inputs]
+    if scenario == "slotted, lazy, all read (proto)":
+        messages = [Message.from_proto(p) for p in inputs]
+        for m in messages:
+            m.data
+        return messages
+    if scenario == "plain (dict)":
+        return [plain_from_dict(d) for d in inputs]
+    if scenario == "slotted (dict)":
+        return [Message.from_dict(d) for d in inputs]
+    raise ValueError(scenario)
+
+
+def _run(scenario: str, conn):
+    inputs = make_protos() if "proto" in scenario else make_dicts()
+    gc.collect()
+
+    rss_before = _rss()
+    start = time.perf_counter()
+    built = _build(scenario, inputs)
+    secs = time.perf_counter() - start
+    rss_after = _rss()
+    del built
+    gc.collect()
+
+    tracemalloc.start()
+    built = _build(scenario, inputs)
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+
+    rss = None if rss_before is None else rss_after - rss_before
+    conn.send((secs, rss, traced))
+
+
+def measure(scenario: str) -> tuple[float, int | None, int]:
+    ctx = multiprocessing.get_context("fork" if os.name == "posix" else "spawn")
+    parent, child = ctx.Pipe()
+    proc = ctx.Process(target=_run, args=(scenario, child))
+    proc.start()
+    result = parent.recv()
+    proc.join()
+    return result
+
+
+def main():
+    print(f"{MESSAGES:,} messages, {FIELDS}-field payloads\n")
+    print(f"{'':34}{'build':>10}{'RSS':>12}{'traced':>12}")
+    results = {}
+    for scenario in (
+        "plain, eager (proto)",
+        "slotted, lazy (proto)",
+        "slotted, lazy, all read (proto)",
+        "plain (dict)",
+        "slotted (dict)",
+    ):
+        secs, rss, traced = results[scenario] = measure(scenario)
+        rss_text = "n/a" if rss is None else f"{rss / 2**20:.1f} MiB"
+        print(
+            f"{scenario:34}{secs * 1000:8.0f} ms{rss_text:>12}"
+            f"{traced / 2**20:>8.1f} MiB"
+        )
+
+    before, after = results["plain, eager (proto)"], results["slotted, lazy (proto)"]
+    print(
+        f"\nproto: {before[0] / after[0]:.1f}x faster to build, "
+        f"{before[2] / after[2]:.1f}x less memory until payloads are read"
+    )
+    before, after = results["plain (dict)"], results["slotted (dict)"]
+    print(f"dict: {before[2] / after[2]:.2f}x less memory from slots alone")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark warm processor invocations with and without a shared ``ConnectionPool``.
+
+Each invocation does what a processor does: set up a data client, make a few reads and
+close it, on the same event loop as the invocation before. Without a pool, closing the
+client closes its connections, so every invocation connects again; with one, they're
+reused. Most of the difference is the 50 ms an unpooled client waits on close for TLS
+teardown. The stand-in server is local plain HTTP, so connecting again is cheap here;
+against the real API each reconnect also costs a DNS lookup and a TLS handshake.
+
+Run with:
+    uv run python scripts/bench_pool.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from aiohttp import web
+
+from pydoover.api import AsyncDataClient, ConnectionPool
+
+INVOCATIONS = 200
+READS = 3
+
+
+async def serve() -> tuple[web.AppRunner, str, set]:
+    peers: set = set()
+
+    async def aggregate(request: web.Request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.json_response({"data": {"n": 1}, "attachments": []})
+
+    app = web.Application()
+    app.router.add_get("/agents/{agent}/channels/{channel}/aggregate", aggregate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}", peers
+
+
+async def invoke(url: str, pool: ConnectionPool | None):
+    client = AsyncDataClient(base_url=url, token="bench", pool=pool)
+    await client.setup()
+    try:
+        for _ in range(READS):
+            await client.fetch_channel_aggregate(1, "tag_values")
+    finally:
+        await client.close()
+
+
+async def measure(url: str, peers: set, pool: ConnectionPool | None):
+    peers.clear()
+    start = time.perf_counter()
+    for _ in range(INVOCATIONS):
+        await invoke(url, pool)
+    return time.perf_counter() - start, len(peers)
+
+
+async def main():
+    runner, url, peers = await serve()
+    try:
+        print(f"{INVOCATIONS} invocations, {READS} reads each\n")
+        secs, connections = await measure(url, peers, None)
+        print(f"{'own sessions':>13}: {secs * 1000:6.0f} ms, {connections} connections")
+        pool = ConnectionPool()
+        pooled_secs, pooled_connections = await measure(url, peers, pool)
+        await pool.aclose()
+        print(
+            f"{'shared pool':>13}: {pooled_secs * 1000:6.0f} ms, "
+            f"{pooled_connections} connections"
+        )
+        print(f"\n{secs / pooled_secs:.1f}x faster")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
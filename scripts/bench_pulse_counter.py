@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark PulseCounter at a sustained 10k pulses per second.
+
+Feeds one minute of pulses at 10 kHz into a PulseCounter through the same path the
+pulse stream uses (``receive_pulse``), querying the rate after every 1000 pulses the
+way an app's main loop would. Then, with a full one-minute window, compares the ring
+buffer with the list-based store PulseCounter used before (``+=`` on receive, linear
+window scan, ``pop(0)`` cleanup).
+
+Run with:
+    uv run python scripts/bench_pulse_counter.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from pydoover.docker.platform import PulseCounter
+from pydoover.utils.clock import use_clock
+
+RATE_HZ = 10_000
+SECONDS = 60
+QUERY_EVERY = 1_000
+WINDOW_SECS = 60
+STEADY_SECS = 5
+
+
+class ListPulseCounter:
+    """The previous list-backed timestamp store, for comparison."""
+
+    def __init__(self, rate_window_secs: int):
+        self.rate_window_secs = rate_window_secs
+        self.pulse_timestamps = []
+
+    def receive(self, timestamp: float):
+        self.pulse_timestamps += [timestamp]
+
+    def get_pulses_per_minute(self):
+        pulses = [
+            t
+            for t in self.pulse_timestamps
+            if t > self.pulse_timestamps[-1] - self.rate_window_secs
+        ]
+        return len(pulses) * 60 / self.rate_window_secs
+
+    def clean_pulse_timestamps(self, now: float):
+        while (
+            self.pulse_timestamps
+            and self.pulse_timestamps[0] < now - self.rate_window_secs
+        ):
+            self.pulse_timestamps.pop(0)
+
+
+class ReplayClock:
+    """Returns the next pulse timestamp each time the counter reads the clock."""
+
+    def __init__(self, stamps: list[float]):
+        self._stamps = iter(stamps)
+
+    def time(self) -> float:
+        return next(self._stamps)
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+def timestamps():
+    start = 1_700_000_000.0
+    return [start + i / RATE_HZ for i in range(RATE_HZ * SECONDS)]
+
+
+async def run_ring(stamps: list[float]) -> tuple[float, float]:
+    # the default capacity holds the window at 10 kHz
+    counter = PulseCounter(None, 0, rate_window_secs=WINDOW_SECS, auto_start=False)
+    counter.start_time = 0
+    rate = 0.0
+    with use_clock(ReplayClock(stamps)):
+        start = time.perf_counter()
+        for i in range(len(stamps)):
+            await counter.receive_pulse(0, True, 1 / RATE_HZ, i, "rising")
+            if i % QUERY_EVERY == 0:
+                rate = counter.get_pulses_per_minute()
+        elapsed = time.perf_counter() - start
+    assert counter.count == len(stamps) and counter.dropped_pulses == 0
+    print(f"  memory cap       : {counter.pulse_timestamps.max_nbytes / 1e6:.1f} MB")
+    print(f"  memory used      : {counter.pulse_timestamps.nbytes / 1e6:.1f} MB")
+    return elapsed, rate
+
+
+def steady_state_ring(stamps: list[float], warm: int) -> float:
+    counter = PulseCounter(
+        None, 0, rate_window_secs=WINDOW_SECS, auto_start=False, max_pulses=warm
+    )
+    counter.pulse_timestamps.extend(stamps[:warm])
+    start = time.perf_counter()
+    for i, t in enumerate(stamps[warm:]):
+        counter.pulse_timestamps.append(t)
+        if i % QUERY_EVERY == 0:
+            counter.get_pulses_per_minute()
+    return time.perf_counter() - start
+
+
+def steady_state_list(stamps: list[float], warm: int) -> float:
+    counter = ListPulseCounter(WINDOW_SECS)
+    counter.pulse_timestamps = stamps[:warm]
+    start = time.perf_counter()
+    for i, t in enumerate(stamps[warm:]):
+        counter.receive(t)
+        if i % QUERY_EVERY == 0:
+            counter.get_pulses_per_minute()
+        # without a cleanup the list grows without bound
+        counter.clean_pulse_timestamps(t)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    stamps = timestamps()
+    print(
+        f"{len(stamps)} pulses ({RATE_HZ} Hz for {SECONDS}s), rate queried every {QUERY_EVERY}"
+    )
+
+    elapsed, rate = asyncio.run(run_ring(stamps))
+    print(
+        f"  via receive_pulse: {elapsed:8.2f} s ({len(stamps) / elapsed:,.0f} pulses/s), final rate {rate:,.0f}/min"
+    )
+
+    # steady state with a full 60s window: the next STEADY_SECS of pulses
+    warm = RATE_HZ * WINDOW_SECS
+    more = [stamps[-1] + (i + 1) / RATE_HZ for i in range(RATE_HZ * STEADY_SECS)]
+    ring = steady_state_ring(stamps + more, warm)
+    listed = steady_state_list(stamps + more, warm)
+    print(f"steady state, full window, next {STEADY_SECS}s of pulses:")
+    print(f"  ring buffer      : {ring:8.2f} s")
+    print(f"  list             : {listed:8.2f} s")
+    print(f"  speedup          : {listed / ring:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark a processor-style burst of reads with and without a ``ResponseCache``.
+
+Twenty tasks each read the same channel, its aggregate and the agent's channel list,
+the way independent code paths in one processor invocation do, from a stand-in data
+API that takes 20 ms per request. Without a cache every read is a request; with one,
+concurrent identical reads share a request and later ones are answered from memory.
+
+Run with:
+    uv run python scripts/bench_response_cache.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from pydoover.api import AsyncDataClient
+from pydoover.api._json import loads
+from pydoover.api.data import ResponseCache
+
+TASKS = 20
+LATENCY = 0.02
+
+_CHANNEL = b'{"name": "tag_values", "owner_id": 1, "is_private": false}'
+_AGGREGATE = b'{"data": {"temperature": 21.5}, "attachments": []}'
+
+
+class StubTransport:
+    def __init__(self):
+        self.requests = 0
+
+    async def send(self, method, path, *args, decode=True, **kwargs):
+        self.requests += 1
+        await asyncio.sleep(LATENCY)
+        if path.endswith("/aggregate"):
+            body = _AGGREGATE
+        elif path.endswith("/channels"):
+            body = b"[" + _CHANNEL + b"]"
+        else:
+            body = _CHANNEL
+        return loads(body) if decode else body
+
+
+async def reader(client: AsyncDataClient):
+    await client.fetch_channel(1, "tag_values")
+    await client.fetch_channel_aggregate(1, "tag_values")
+    await client.list_channels(1)
+    await client.fetch_channel_aggregate(1, "tag_values")
+
+
+async def measure(responses: ResponseCache | None) -> tuple[float, int]:
+    client = AsyncDataClient(
+        base_url="https://data.example", token="bench", response_cache=responses
+    )
+    transport = StubTransport()
+    client._send = transport.send
+    start = time.perf_counter()
+    await asyncio.gather(*(reader(client) for _ in range(TASKS)))
+    return time.perf_counter() - start, transport.requests
+
+
+async def main():
+    print(f"{TASKS} tasks, 4 reads each, {LATENCY * 1000:.0f} ms per request\n")
+    secs, requests = await measure(None)
+    print(f"{'no cache':>14}: {secs * 1000:5.0f} ms, {requests:3} requests")
+    responses = ResponseCache()
+    cached_secs, cached_requests = await measure(responses)
+    print(
+        f"{'ResponseCache':>14}: {cached_secs * 1000:5.0f} ms, {cached_requests:3} "
+        f"requests (hit rate {responses.stats.hit_rate:.0%})"
+    )
+    print(f"\n{requests / cached_requests:.0f}x fewer requests")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
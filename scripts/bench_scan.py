@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Benchmark sharded range scans against sequential cursor paging.
+
+Exports a month of messages from a stand-in client whose requests each take
+``LATENCY`` seconds and that serves up to ``SERVER_CONCURRENCY`` requests at once. The
+sequential iterator pays one round trip per page; the sharded scan pages through
+several time slices at once, so it's bound by the server's concurrency instead.
+
+Run with:
+    uv run python scripts/bench_scan.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from pydoover.api.data import (
+    AsyncMessageIterator,
+    AsyncMessageScan,
+    MessageIterator,
+    MessageScan,
+)
+from pydoover.models.data import ChannelID, Message
+from pydoover.utils.snowflake import generate_snowflake_id_at
+
+MESSAGES = 10_000
+PAGE_SIZE = 100
+LATENCY = 0.02
+SERVER_CONCURRENCY = 8
+
+END = datetime(2025, 6, 1, tzinfo=timezone.utc)
+START = END - timedelta(days=30)
+CHANNEL = ChannelID(1, "tag_values")
+
+_step = (END - START) / MESSAGES
+IDS = [generate_snowflake_id_at(START + _step * i) + 1 for i in range(MESSAGES)]
+
+
+def _page(before, after, limit) -> list[Message]:
+    hi = bisect.bisect_left(IDS, before) if before is not None else len(IDS)
+    lo = bisect.bisect_right(IDS, after) if after is not None else 0
+    ids = IDS[max(lo, hi - limit) : hi][::-1]
+    return [Message(i, 1, CHANNEL, {"n": i}, []) for i in ids]
+
+
+class Server:
+    def __init__(self):
+        self.requests = 0
+        self.slots = threading.Semaphore(SERVER_CONCURRENCY)
+
+    def list_messages(self, before=None, after=None, limit=None, **kwargs):
+        with self.slots:
+            self.requests += 1
+            time.sleep(LATENCY)
+            return _page(before, after, limit)
+
+
+class AsyncServer:
+    def __init__(self):
+        self.requests = 0
+        self.slots = asyncio.Semaphore(SERVER_CONCURRENCY)
+
+    async def list_messages(self, before=None, after=None, limit=None, **kwargs):
+        async with self.slots:
+            self.requests += 1
+            await asyncio.sleep(LATENCY)
+            return _page(before, after, limit)
+
+
+def run_sync(make) -> tuple[float, int, int]:
+    server = Server()
+    start = time.perf_counter()
+    count = sum(1 for _ in make(server))
+    return time.perf_counter() - start, count, server.requests
+
+
+async def run_async(make) -> tuple[float, int, int]:
+    server = AsyncServer()
+    start = time.perf_counter()
+    count = len(await make(server).collect())
+    return time.perf_counter() - start, count, server.requests
+
+
+def main():
+    print(
+        f"{MESSAGES:,} messages over 30 days, {PAGE_SIZE} per page, "
+        f"{LATENCY * 1000:.0f} ms per request, server handles {SERVER_CONCURRENCY} "
+        "at once\n"
+    )
+    kwargs = dict(after=START, before=END, page_size=PAGE_SIZE)
+    cases = [
+        (
+            "sequential",
+            lambda c: MessageIterator(c, 1, "t", prefetch=0, **kwargs),
+            lambda c: AsyncMessageIterator(c, 1, "t", prefetch=0, **kwargs),
+        ),
+    ]
+    for shards, concurrency, ordered in (
+        (8, 4, True),
+        (16, 8, True),
+        (16, 8, False),
+        (32, 16, True),
+    ):
+        cases.append(
+            (
+                f"{shards} shards, {concurrency} workers"
+                + ("" if ordered else ", unordered"),
+                lambda c, s=shards, w=concurrency, o=ordered: MessageScan(
+                    c, 1, "t", shards=s, concurrency=w, ordered=o, **kwargs
+                ),
+                lambda c, s=shards, w=concurrency, o=ordered: AsyncMessageScan(
+                    c, 1, "t", shards=s, concurrency=w, ordered=o, **kwargs
+                ),
+            )
+        )
+
+    for name, make_sync, make_async in cases:
+        sync_secs, sync_count, requests = run_sync(make_sync)
+        async_secs, async_count, _ = asyncio.run(run_async(make_async))
+        assert sync_count == async_count == MESSAGES, (sync_count, async_count)
+        print(
+            f"{name:>35}: sync {sync_secs * 1000:6.0f} ms, "
+            f"async {async_secs * 1000:6.0f} ms ({requests} requests)"
+        )
+
+
+if __name__ == "__main__":
+    main()
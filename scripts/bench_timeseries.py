@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark columnar timeseries fetches against walking ``fetch_timeseries`` pages.
+
+Fetches a week of one-second readings from a stand-in data API that answers instantly,
+so the numbers are client-side cost only: decoding the pages and holding the result.
+The baseline walks ``next`` by hand and keeps every page's :class:`DataPoint` list, as
+callers did before; the columnar fetch keeps per-field arrays, with and without
+downsampling to one-minute means. Memory is what ``tracemalloc`` sees held by the
+result once the fetch is done.
+
+Run with:
+    uv run python scripts/bench_timeseries.py
+"""
+
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+
+from pydoover.api import DataClient
+
+POINTS = 7 * 24 * 60 * 60 // 3
+PAGE_SIZE = 1000
+STEP_MS = 3000
+
+
+def _request(method, path, params=None, **kwargs):
+    before = params["before"]
+    top = POINTS if before is None else (before >> 22) // STEP_MS
+    bottom = max(top - params["limit"], 0)
+    results = [
+        {"message_id": str((i * STEP_MS) << 22), "value": 20 + (i % 600) / 60}
+        for i in range(top - 1, bottom - 1, -1)
+    ]
+    return {
+        "count": len(results),
+        "results": results,
+        "next": str((bottom * STEP_MS) << 22) if bottom else None,
+    }
+
+
+def points(client: DataClient):
+    pages = []
+    before = None
+    while True:
+        page = client.fetch_timeseries(
+            1, "tag_values", ["temperature"], before=before, limit=PAGE_SIZE
+        )
+        pages.append(page.results)
+        if page.next is None:
+            return pages
+        before = page.next
+
+
+def columns(client: DataClient):
+    return client.fetch_timeseries_columns(
+        1, "tag_values", ["temperature"], page_size=PAGE_SIZE
+    )
+
+
+def downsampled(client: DataClient):
+    return client.fetch_timeseries_columns(
+        1, "tag_values", ["temperature"], downsample=60, page_size=PAGE_SIZE
+    )
+
+
+def measure(fetch) -> tuple[float, int]:
+    client = DataClient(base_url="https://data.example", token="bench")
+    client._request = _request
+    try:
+        start = time.perf_counter()
+        fetch(client)
+        secs = time.perf_counter() - start
+
+        gc.collect()
+        tracemalloc.start()
+        result = fetch(client)
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+    finally:
+        client.close()
+    return secs, held
+
+
+def main():
+    print(f"{POINTS:,} points, {PAGE_SIZE} per page\n")
+    results = {}
+    for name, fetch in (
+        ("DataPoint pages", points),
+        ("columns", columns),
+        ("columns, 1 min means", downsampled),
+    ):
+        secs, held = results[name] = measure(fetch)
+        print(f"{name:>22}: {secs * 1000:6.0f} ms, {held / 2**20:6.2f} MiB held")
+
+    before, after = results["DataPoint pages"], results["columns"]
+    print(f"\ncolumns hold {before[1] / after[1]:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark token refresh under concurrent requests.
+
+A stand-in auth client takes 100 ms to refresh. First, 50 requests arrive together
+just after the token has expired: previously each one started its own refresh; now
+they share one. Second, requests arrive every 10 ms across the token's expiry, with
+and without ``refresh_ahead``, and the slowest ``ensure_token()`` wait is reported.
+
+Run with:
+    uv run python scripts/bench_token_refresh.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from pydoover.api.auth._base import AsyncAuthBase
+
+REFRESH_LATENCY = 0.1
+REQUESTS = 50
+
+
+class StubAuth(AsyncAuthBase):
+    def __init__(self, expires_in: float, **kwargs):
+        super().__init__(
+            token="token",
+            token_expires=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+            **kwargs,
+        )
+        self.refreshes = 0
+
+    async def refresh_access_token(self) -> None:
+        self.refreshes += 1
+        await asyncio.sleep(REFRESH_LATENCY)
+        self._set_access_token("token", expires_in=3600)
+
+
+async def burst():
+    # what every request did before: each saw the expired token and refreshed
+    auth = StubAuth(expires_in=-1)
+    await asyncio.gather(*(auth.refresh_access_token() for _ in range(REQUESTS)))
+    print(f"{'uncoalesced':>12}: {auth.refreshes:2} refreshes")
+
+    auth = StubAuth(expires_in=-1)
+    await asyncio.gather(*(auth.ensure_token() for _ in range(REQUESTS)))
+    print(f"{'coalesced':>12}: {auth.refreshes:2} refreshes")
+
+
+async def slowest_wait(refresh_ahead: float | None) -> float:
+    # expires 30.5 s out: inside the 30 s buffer after half a second
+    auth = StubAuth(expires_in=30.5, refresh_ahead=refresh_ahead)
+    slowest = 0.0
+    for _ in range(100):
+        start = time.perf_counter()
+        await auth.ensure_token()
+        slowest = max(slowest, time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return slowest
+
+
+async def main():
+    print(
+        f"{REQUESTS} requests on an expired token, {REFRESH_LATENCY * 1000:.0f} ms per refresh\n"
+    )
+    await burst()
+    print("\nslowest request across expiry:")
+    for refresh_ahead in (None, 60):
+        slowest = await slowest_wait(refresh_ahead)
+        print(f"{'refresh_ahead=' + str(refresh_ahead):>20}: {slowest * 1000:5.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
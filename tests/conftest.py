@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+from collections.abc import Callable, Iterable, Iterator
+
 import pytest
+from aiohttp import web
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
@@ -31,3 +36,53 @@ def pytest_collection_modifyitems(
     for item in items:
         if "live" in item.keywords:
             item.add_marker(skip_live)
+
+
+class ThreadedServer:
+    """An aiohttp app on its own thread and event loop, so sync clients can call it too."""
+
+    def __init__(self, routes: Iterable[web.RouteDef], **runner_kwargs):
+        self.app = web.Application()
+        self.app.add_routes(routes)
+        self._runner_kwargs = runner_kwargs
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._runner = None
+        self.url = None
+
+    async def _start(self):
+        self._runner = web.AppRunner(self.app, **self._runner_kwargs)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+@pytest.fixture
+def serve_routes() -> Iterator[Callable[..., str]]:
+    """Serve aiohttp routes on a background thread for the test; returns the base URL.
+
+    Keyword arguments are passed to ``web.AppRunner``.
+    """
+    servers = []
+
+    def serve(routes: Iterable[web.RouteDef], **runner_kwargs) -> str:
+        server = ThreadedServer(routes, **runner_kwargs)
+        server.start()
+        servers.append(server)
+        return server.url
+
+    yield serve
+    for server in servers:
+        server.stop()
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -15,6 +20,8 @@ from pydoover.api.auth import (
     DataServiceAuthClient,
     Doover2AuthClient,
 )
+from pydoover.api.auth._base import AsyncAuthBase
+from pydoover.api.auth._utils import token_needs_refresh
 from pydoover.models.data.exceptions import TokenRefreshError
 
 
@@ -605,6 +612,29 @@ def test_trusted_publisher_exchanges_oidc_token(monkeypatch):
     assert body == {"provider": "GH", "token": "gh-oidc"}
 
 
+def test_trusted_publisher_exchange_uses_the_pool(monkeypatch):
+    import httpx
+
+    from pydoover.api import ConnectionPool
+    from pydoover.api.auth import TrustedPublisherAuthClient
+
+    minted = future_token(15)
+    pool = ConnectionPool()
+    pool._transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"token": minted})
+    )
+    monkeypatch.setattr("httpx.post", pytest.fail)
+    auth = TrustedPublisherAuthClient(
+        oidc_token="gh-oidc", control_base_url="https://control.example"
+    )
+    auth.pool = pool
+    try:
+        auth.ensure_token()
+    finally:
+        pool.close()
+    assert auth.token == minted
+
+
 def test_trusted_publisher_raises_on_error(monkeypatch):
     from pydoover.api.auth import TrustedPublisherAuthClient
 
@@ -649,3 +679,125 @@ def test_fetch_github_actions_oidc_token_requires_runtime(monkeypatch):
 
     with pytest.raises(TokenRefreshError):
         fetch_github_actions_oidc_token()
+
+
+class CountingAsyncAuth(AsyncAuthBase):
+    def __init__(self, token: str, fail: bool = False, **kwargs):
+        super().__init__(token=token, **kwargs)
+        self.refreshes = 0
+        self.fail = fail
+
+    async def refresh_access_token(self) -> None:
+        self.refreshes += 1
+        await asyncio.sleep(0.02)
+        if self.fail:
+            raise TokenRefreshError("auth server unavailable")
+        self._set_access_token(future_token(60))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_refresh():
+    auth = CountingAsyncAuth(expired_token())
+
+    await asyncio.gather(*(auth.ensure_token() for _ in range(10)))
+
+    assert auth.refreshes == 1
+    assert not token_needs_refresh(auth.token, auth.token_expires)
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_reaches_every_waiting_request():
+    auth = CountingAsyncAuth(expired_token(), fail=True)
+
+    results = await asyncio.gather(
+        *(auth.ensure_token() for _ in range(3)), return_exceptions=True
+    )
+
+    assert auth.refreshes == 1
+    assert all(isinstance(r, TokenRefreshError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_does_not_cancel_the_refresh():
+    auth = CountingAsyncAuth(expired_token())
+    first = asyncio.ensure_future(auth.ensure_token())
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(auth.ensure_token())
+    await asyncio.sleep(0)
+    first.cancel()
+
+    await second
+
+    assert first.cancelled() and auth.refreshes == 1
+    assert not token_needs_refresh(auth.token, auth.token_expires)
+
+
+@pytest.mark.asyncio
+async def test_refresh_ahead_refreshes_in_the_background():
+    token = future_token(2)
+    auth = CountingAsyncAuth(token, refresh_ahead=300)
+
+    for _ in range(5):
+        await auth.ensure_token()
+        # requests carry on with the current token meanwhile
+        assert auth.token == token
+    await asyncio.sleep(0.05)
+
+    assert auth.refreshes == 1 and auth.token != token
+    await auth.ensure_token()
+    assert auth.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_not_refreshed_early_by_default():
+    auth = CountingAsyncAuth(future_token(2))
+    await auth.ensure_token()
+    await asyncio.sleep(0.05)
+    assert auth.refreshes == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_background_refresh_is_logged_and_retried(caplog):
+    auth = CountingAsyncAuth(future_token(2), fail=True, refresh_ahead=300)
+
+    with caplog.at_level(logging.WARNING, logger="pydoover.api.auth._base"):
+        await auth.ensure_token()
+        await asyncio.sleep(0.05)
+    assert "Background token refresh failed" in caplog.text
+
+    auth.fail = False
+    await auth.ensure_token()
+    await asyncio.sleep(0.05)
+    assert auth.refreshes == 2
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_a_background_refresh():
+    auth = CountingAsyncAuth(future_token(2), refresh_ahead=300)
+    await auth.ensure_token()
+    task = auth._refresh_task
+    await asyncio.sleep(0)  # let it start
+
+    await auth.close()
+
+    assert task.cancelled() and auth.refreshes == 1
+
+
+def test_sync_threads_share_one_refresh(monkeypatch):
+    refreshed = future_token()
+    calls = []
+
+    def slow_post(*args, **kwargs):
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return SyncResponse(payload={"access_token": refreshed, "expires_in": 600})
+
+    monkeypatch.setattr("httpx.post", slow_post)
+    auth = DataServiceAuthClient(
+        token=expired_token(), client_id="client-id", client_secret="secret"
+    )
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: auth.ensure_token(), range(8)))
+
+    assert len(calls) == 1 and auth.token == refreshed
@@ -0,0 +1,307 @@
+import asyncio
+import threading
+
+import aiohttp
+import httpx
+import pytest
+
+from pydoover.api import AsyncDataClient, DataClient
+from pydoover.models.data import (
+    MAX_BATCH_MUTATIONS,
+    BadRequestError,
+    BatchMutationItem,
+    BulkMutationResponse,
+    HTTPError,
+    UnauthorizedError,
+)
+
+
+def _items(count: int, channel: str = "tag_values"):
+    for i in range(count):
+        yield BatchMutationItem(1, channel, {"n": i}, message_id=i + 1)
+
+
+class FakeBatchServer:
+    """Answers the batch endpoints, failing each id in ``flaky`` the first
+    ``flaky[id]`` times it's sent and always failing the ids in ``broken``. A batch
+    holding an id in ``lose`` raises ``lost_error`` the first ``lose[id]`` times."""
+
+    def __init__(self, flaky=None, broken=(), refuse=None, lose=None, lost_error=None):
+        self.flaky = dict(flaky or {})
+        self.broken = set(broken)
+        self.refuse = refuse
+        self.lose = dict(lose or {})
+        self.lost_error = lost_error
+        self.batches: list[tuple[str, str, list[int]]] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def respond(self, method, path, data):
+        ids = [int(item["message_id"]) for item in data["items"]]
+        with self._lock:
+            self.batches.append((method, path, ids))
+        if self.refuse is not None and self.refuse in ids:
+            raise BadRequestError("invalid channel")
+        with self._lock:
+            lost = [id_ for id_ in ids if self.lose.get(id_, 0) > 0]
+            for id_ in lost:
+                self.lose[id_] -= 1
+        if lost:
+            raise self.lost_error()
+        results = []
+        for item, id_ in zip(data["items"], ids):
+            with self._lock:
+                failing = id_ in self.broken or self.flaky.get(id_, 0) > 0
+                if id_ in self.flaky:
+                    self.flaky[id_] -= 1
+            results.append(
+                {
+                    "agent_id": item["agent_id"],
+                    "channel_name": item["channel_name"],
+                    "success": not failing,
+                    "message_id": str(id_),
+                    "error": "conflict" if failing else None,
+                }
+            )
+        failed = sum(not r["success"] for r in results)
+        return {
+            "items": results,
+            "count": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+        }
+
+    def sync_request(self, method, path, data=None, organisation_id=None, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            threading.Event().wait(0.005)
+            return self.respond(method, path, data)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    async def async_request(
+        self, method, path, data=None, organisation_id=None, **kwargs
+    ):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.005)
+            return self.respond(method, path, data)
+        finally:
+            self.in_flight -= 1
+
+
+def _client(server: FakeBatchServer) -> DataClient:
+    client = DataClient(base_url="https://data.example", token="test-token")
+    client._request = server.sync_request
+    return client
+
+
+def _async_client(server: FakeBatchServer) -> AsyncDataClient:
+    client = AsyncDataClient(base_url="https://data.example", token="test-token")
+    client._request = server.async_request
+    return client
+
+
+class TestBulkMutations:
+    def test_items_are_chunked_to_the_batch_limit(self):
+        server = FakeBatchServer()
+        with _client(server) as client:
+            result = client.bulk_create_messages(_items(120), retry_delay=0)
+
+        assert isinstance(result, BulkMutationResponse)
+        assert (result.count, result.succeeded, result.failed) == (120, 120, 0)
+        sizes = sorted(len(ids) for _, _, ids in server.batches)
+        assert sizes == [20, MAX_BATCH_MUTATIONS, MAX_BATCH_MUTATIONS]
+        assert result.requests == 3 and result.retried == 0
+        sent = sorted(i for _, _, ids in server.batches for i in ids)
+        assert sent == list(range(1, 121))
+
+    def test_only_failed_items_are_retried(self):
+        server = FakeBatchServer(flaky={3: 1, 7: 2})
+        with _client(server) as client:
+            result = client.bulk_update_messages(
+                _items(10), replace_data=True, retry_delay=0
+            )
+
+        assert (result.succeeded, result.failed) == (10, 0)
+        assert [ids for _, _, ids in server.batches] == [
+            list(range(1, 11)),
+            [3, 7],
+            [7],
+        ]
+        assert {method for method, _, _ in server.batches} == {"PUT"}
+        assert result.requests == 3 and result.retried == 3
+
+    def test_items_still_failing_are_reported(self):
+        server = FakeBatchServer(broken={4})
+        with _client(server) as client:
+            result = client.bulk_delete_messages(
+                _items(5), max_attempts=2, retry_delay=0
+            )
+
+        assert (result.count, result.succeeded, result.failed) == (5, 4, 1)
+        (failure,) = result.failures
+        assert failure.item.message_id == 4
+        assert failure.error == "conflict" and failure.attempts == 2
+        assert server.batches[-1] == ("DELETE", "/agents/messages", [4])
+
+    def test_a_refused_batch_fails_its_items_without_retrying(self):
+        server = FakeBatchServer(refuse=60)
+        with _client(server) as client:
+            result = client.bulk_update_aggregates(
+                _items(120), concurrency=1, retry_delay=0
+            )
+
+        assert (result.succeeded, result.failed) == (70, 50)
+        assert {f.item.message_id for f in result.failures} == set(range(51, 101))
+        assert all("invalid channel" in f.error for f in result.failures)
+        assert len(server.batches) == 3
+        assert {path for _, path, _ in server.batches} == {"/agents/aggregates"}
+
+    def test_a_lost_batch_is_resent_then_reported(self):
+        server = FakeBatchServer(
+            lose={10: 1, 60: 5}, lost_error=lambda: httpx.ReadTimeout("timed out")
+        )
+        with _client(server) as client:
+            result = client.bulk_create_messages(
+                _items(150), concurrency=2, max_attempts=3, retry_delay=0
+            )
+
+        # the first batch got through on its second attempt, the second never did
+        assert (result.succeeded, result.failed) == (100, 50)
+        assert {f.item.message_id for f in result.failures} == set(range(51, 101))
+        assert all(f.error == "timed out" and f.attempts == 3 for f in result.failures)
+        assert result.requests == 6
+
+    def test_a_batch_hit_by_a_server_error_is_resent(self):
+        server = FakeBatchServer(
+            lose={3: 1}, lost_error=lambda: HTTPError(503, "unavailable")
+        )
+        with _client(server) as client:
+            result = client.bulk_create_messages(_items(10), retry_delay=0)
+
+        assert (result.succeeded, result.failed, result.retried) == (10, 0, 10)
+        assert [ids for _, _, ids in server.batches] == [list(range(1, 11))] * 2
+
+    def test_bad_credentials_propagate(self):
+        server = FakeBatchServer()
+
+        def unauthorised(*args, **kwargs):
+            raise UnauthorizedError()
+
+        with _client(server) as client:
+            client._request = unauthorised
+            with pytest.raises(UnauthorizedError):
+                client.bulk_create_messages(_items(200), retry_delay=0)
+
+    def test_input_is_read_as_workers_free_up(self):
+        server = FakeBatchServer()
+        pulled = []
+
+        def items():
+            for item in _items(1000):
+                pulled.append(item.message_id)
+                yield item
+
+        with _client(server) as client:
+            original = server.respond
+
+            def respond(method, path, data):
+                # each batch is sent before the rest of the input is read
+                sent = sum(len(ids) for _, _, ids in server.batches)
+                assert len(pulled) <= sent + 2 * MAX_BATCH_MUTATIONS + 1
+                return original(method, path, data)
+
+            server.respond = respond
+            result = client.bulk_create_messages(items(), concurrency=2, retry_delay=0)
+
+        assert result.succeeded == 1000
+        assert server.peak <= 2
+
+    def test_invalid_arguments(self):
+        with _client(FakeBatchServer()) as client:
+            with pytest.raises(ValueError):
+                client.bulk_create_messages(
+                    _items(1), chunk_size=MAX_BATCH_MUTATIONS + 1
+                )
+            with pytest.raises(ValueError):
+                client.bulk_create_messages(_items(1), concurrency=0)
+            with pytest.raises(ValueError):
+                client.bulk_create_messages(_items(1), max_attempts=0)
+
+
+@pytest.mark.asyncio
+async def test_async_bulk_create_from_an_async_iterable():
+    server = FakeBatchServer(flaky={2: 1, 130: 1})
+
+    async def items():
+        for item in _items(150):
+            await asyncio.sleep(0)
+            yield item
+
+    client = _async_client(server)
+    try:
+        result = await client.bulk_create_messages(
+            items(), concurrency=2, retry_delay=0
+        )
+    finally:
+        await client.close()
+
+    assert (result.count, result.succeeded, result.failed) == (150, 150, 0)
+    assert result.requests == 5 and result.retried == 2
+    assert server.peak <= 2
+
+
+@pytest.mark.asyncio
+async def test_async_failures_are_reported():
+    server = FakeBatchServer(broken={9}, refuse=75)
+    client = _async_client(server)
+    try:
+        result = await client.bulk_update_messages(
+            list(_items(100)), max_attempts=3, retry_delay=0
+        )
+    finally:
+        await client.close()
+
+    assert result.succeeded == 49 and result.failed == 51
+    (broken,) = [f for f in result.failures if f.item.message_id == 9]
+    assert broken.attempts == 3 and broken.error == "conflict"
+
+
+@pytest.mark.asyncio
+async def test_async_lost_batches_do_not_stop_the_run():
+    server = FakeBatchServer(lose={1: 3, 120: 1}, lost_error=asyncio.TimeoutError)
+    client = _async_client(server)
+    try:
+        result = await client.bulk_create_messages(
+            _items(150), concurrency=3, max_attempts=3, retry_delay=0
+        )
+    finally:
+        await client.close()
+
+    assert (result.succeeded, result.failed) == (100, 50)
+    assert {f.item.message_id for f in result.failures} == set(range(1, 51))
+    assert all(f.error == "TimeoutError" for f in result.failures)
+
+    server = FakeBatchServer(lose={5: 1}, lost_error=lambda: HTTPError(502, "gateway"))
+    client = _async_client(server)
+    try:
+        result = await client.bulk_create_messages(_items(10), retry_delay=0)
+    finally:
+        await client.close()
+    assert (result.succeeded, result.failed, result.retried) == (10, 0, 10)
+
+    server = FakeBatchServer(
+        lose={1: 1}, lost_error=lambda: aiohttp.ServerDisconnectedError()
+    )
+    client = _async_client(server)
+    try:
+        result = await client.bulk_create_messages(_items(10), retry_delay=0)
+    finally:
+        await client.close()
+    assert (result.succeeded, result.failed, result.retried) == (10, 0, 10)
@@ -0,0 +1,155 @@
+import asyncio
+
+import httpx
+import pytest
+from aiohttp import web
+
+from pydoover.api import (
+    AsyncControlClient,
+    AsyncDataClient,
+    ConnectionPool,
+    ControlClient,
+    DataClient,
+    shared_pool,
+)
+
+AGENT = 123
+
+
+class StubServer:
+    """Answers channel aggregate reads, noting the client port of each request."""
+
+    def __init__(self):
+        self.ports: list[int] = []
+        self.url = None
+
+    @property
+    def connections(self) -> int:
+        return len(set(self.ports))
+
+    async def _aggregate(self, request: web.Request):
+        self.ports.append(request.transport.get_extra_info("peername")[1])
+        return web.json_response({"data": {"n": 1}, "attachments": []})
+
+    def routes(self) -> list[web.RouteDef]:
+        return [
+            web.get("/agents/{agent}/channels/{channel}/aggregate", self._aggregate)
+        ]
+
+
+@pytest.fixture
+def server(serve_routes):
+    stub = StubServer()
+    # keep connections open between requests, so reuse shows in the client ports
+    stub.url = serve_routes(stub.routes(), keepalive_timeout=30)
+    return stub
+
+
+async def _read_with_fresh_clients(server, pool, clients: int = 3):
+    for _ in range(clients):
+        client = AsyncDataClient(base_url=server.url, token="test-token", pool=pool)
+        await client.setup()
+        try:
+            await client.fetch_channel_aggregate(AGENT, "tag_values")
+        finally:
+            await client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_clients_share_connections(server):
+    pool = ConnectionPool()
+    try:
+        await _read_with_fresh_clients(server, pool)
+    finally:
+        await pool.aclose()
+    assert len(server.ports) == 3 and server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_async_clients_without_a_pool_reconnect(server):
+    await _read_with_fresh_clients(server, None)
+    assert server.connections == 3
+
+
+@pytest.mark.asyncio
+async def test_control_and_auth_clients_use_the_pool(server):
+    pool = ConnectionPool()
+    control = AsyncControlClient(base_url=server.url, token="test-token", pool=pool)
+    await control.setup()
+    try:
+        assert control._session.connector is pool.connector()
+        assert control.auth.pool is pool
+        session = await control.auth._get_session()
+        assert session.connector is pool.connector()
+    finally:
+        await control.close()
+        await pool.aclose()
+
+
+def test_each_event_loop_gets_its_own_connector():
+    pool = ConnectionPool()
+
+    async def connector():
+        return pool.connector()
+
+    first = asyncio.run(connector())
+    second = asyncio.run(connector())
+    assert first is not second
+
+
+def test_sync_clients_share_connections(server):
+    pool = ConnectionPool()
+    try:
+        for _ in range(3):
+            with DataClient(base_url=server.url, token="test-token", pool=pool) as c:
+                assert c.auth.pool is pool
+                c.fetch_channel_aggregate(AGENT, "tag_values")
+        # a closed control client leaves the pool open for the others
+        ControlClient(base_url=server.url, token="test-token", pool=pool).close()
+        with DataClient(base_url=server.url, token="test-token", pool=pool) as c:
+            c.fetch_channel_aggregate(AGENT, "tag_values")
+    finally:
+        pool.close()
+    assert len(server.ports) == 4 and server.connections == 1
+
+
+def test_sync_clients_without_a_pool_reconnect(server):
+    for _ in range(3):
+        with DataClient(base_url=server.url, token="test-token") as client:
+            client.fetch_channel_aggregate(AGENT, "tag_values")
+    assert server.connections == 3
+
+
+def test_sync_token_refresh_uses_the_pool(monkeypatch):
+    pool = ConnectionPool()
+    client = DataClient(
+        base_url="https://data.example",
+        client_id="id",
+        client_secret="secret",
+        pool=pool,
+    )
+    sent = []
+
+    def handler(request):
+        sent.append(str(request.url))
+        return httpx.Response(200, json={"access_token": "fresh", "expires_in": 60})
+
+    pool._transport = httpx.MockTransport(handler)
+    monkeypatch.setattr("httpx.post", pytest.fail)
+    try:
+        client.auth.refresh_access_token()
+    finally:
+        client.close()
+    assert client.token == "fresh"
+    assert sent == ["https://data.example/oauth2/token"]
+
+
+def test_shared_pool_is_one_per_process():
+    assert shared_pool() is shared_pool()
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        ConnectionPool(limit=0)
+    with pytest.raises(ValueError):
+        ConnectionPool(limit_per_host=-1)
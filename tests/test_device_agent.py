@@ -517,6 +517,17 @@ class TestMockDeviceAgentInterface:
         result = await self.mock.fetch_channel_aggregate("ch")
         assert result.data == {"a": 1, "b": 2}
 
+    @pytest.mark.asyncio
+    async def test_update_channel_aggregate_merges_nested_diffs(self):
+        # tag commits are per-app diffs; a second one must not drop the first's tags
+        await self.mock.update_channel_aggregate("tag_values", {"app": {"a": 1}})
+        await self.mock.update_channel_aggregate(
+            "tag_values", {"app": {"b": 2}, "old": None}
+        )
+
+        result = await self.mock.fetch_channel_aggregate("tag_values")
+        assert result.data == {"app": {"a": 1, "b": 2}}
+
     @pytest.mark.asyncio
     async def test_update_channel_aggregate_updates_cache(self):
         await self.mock.update_channel_aggregate("ch", {"x": 1})
@@ -0,0 +1,106 @@
+import asyncio
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+from pydoover.processor import handler
+from pydoover.utils import event_loop
+from pydoover.utils.event_loop import (
+    EVENT_LOOP_ENV_VAR,
+    get_loop_factory,
+    new_event_loop,
+    run_with_loop,
+)
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+requires_uvloop = pytest.mark.skipif(uvloop is None, reason="uvloop not installed")
+
+
+@pytest.fixture
+def no_uvloop(monkeypatch):
+    # a None entry in sys.modules makes ``import uvloop`` raise ImportError
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+
+@pytest.fixture(autouse=True)
+def clear_env(monkeypatch):
+    monkeypatch.delenv(EVENT_LOOP_ENV_VAR, raising=False)
+
+
+class TestGetLoopFactory:
+    def test_default_is_asyncio(self):
+        assert get_loop_factory() is None
+        assert get_loop_factory("asyncio") is None
+
+    def test_invalid_name(self):
+        with pytest.raises(ValueError):
+            get_loop_factory("trio")
+
+    def test_invalid_env_var(self, monkeypatch):
+        monkeypatch.setenv(EVENT_LOOP_ENV_VAR, "trio")
+        with pytest.raises(ValueError):
+            get_loop_factory()
+
+    def test_uvloop_falls_back_when_missing(self, no_uvloop, monkeypatch):
+        monkeypatch.setattr(event_loop, "log", log := Mock())
+        assert get_loop_factory("uvloop") is None
+        log.warning.assert_called_once()
+
+    def test_auto_falls_back_quietly(self, no_uvloop, monkeypatch):
+        monkeypatch.setattr(event_loop, "log", log := Mock())
+        assert get_loop_factory("auto") is None
+        log.warning.assert_not_called()
+
+    @requires_uvloop
+    def test_uvloop(self):
+        assert get_loop_factory("uvloop") is uvloop.new_event_loop
+        assert get_loop_factory("auto") is uvloop.new_event_loop
+
+    @requires_uvloop
+    def test_argument_overrides_env_var(self, monkeypatch):
+        monkeypatch.setenv(EVENT_LOOP_ENV_VAR, "uvloop")
+        assert get_loop_factory() is uvloop.new_event_loop
+        assert get_loop_factory("asyncio") is None
+
+
+class TestRunWithLoop:
+    async def _loop_type(self):
+        return type(asyncio.get_running_loop())
+
+    def test_runs_on_asyncio(self, no_uvloop):
+        assert run_with_loop(self._loop_type(), "uvloop") is type(
+            asyncio.new_event_loop()
+        )
+
+    @requires_uvloop
+    def test_runs_on_uvloop(self):
+        assert run_with_loop(self._loop_type(), "uvloop") is uvloop.Loop
+
+    @requires_uvloop
+    def test_new_event_loop(self, monkeypatch):
+        monkeypatch.setenv(EVENT_LOOP_ENV_VAR, "uvloop")
+        loop = new_event_loop()
+        try:
+            assert isinstance(loop, uvloop.Loop)
+        finally:
+            loop.close()
+
+
+class TestProcessorLoop:
+    def test_loop_created_once_and_reused(self, monkeypatch, no_uvloop):
+        monkeypatch.setattr(handler, "_loop", None)
+        loop = handler._get_loop("uvloop")
+        try:
+            assert isinstance(loop, asyncio.AbstractEventLoop)
+            assert handler._get_loop() is loop
+        finally:
+            loop.close()
+        # a closed loop is replaced
+        replacement = handler._get_loop()
+        assert replacement is not loop
+        replacement.close()
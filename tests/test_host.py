@@ -0,0 +1,124 @@
+"""Tests for hosting several docker applications in one process."""
+
+import asyncio
+
+import pytest
+
+from pydoover.docker.device_agent import MockDeviceAgentInterface
+from pydoover.docker.host import AppHost
+from pydoover.docker.modbus import ModbusInterface
+from pydoover.docker.platform import PlatformInterface
+from pydoover.models import EventSubscription
+
+docker_application = pytest.importorskip("pydoover.docker.application")
+
+
+class TestInterfaceViews:
+    @pytest.mark.asyncio
+    async def test_views_share_the_owners_channel(self):
+        owner = PlatformInterface(None, "127.0.0.1:1")
+        view = owner.for_app("app_a")
+
+        assert view.app_key == "app_a"
+        assert view.is_app_view and not owner.is_app_view
+        assert await view._get_stub() is await owner._get_stub()
+        # a view of a view still shares the original channel
+        assert await view.for_app("app_b")._get_stub() is await owner._get_stub()
+
+        await view.close()
+        assert owner._channel is not None
+        await owner.close()
+        assert owner._channel is None
+
+    @pytest.mark.asyncio
+    async def test_platform_views_keep_their_own_snapshots(self):
+        owner = PlatformInterface(None, "127.0.0.1:1")
+        view = owner.for_app("app_a")
+        view.enable_io_snapshot()
+
+        assert owner.io_snapshot is None
+        assert view.pulse_mux is owner.pulse_mux
+        assert view.pulse_counter_listeners is not owner.pulse_counter_listeners
+
+    def test_modbus_views_poll_separately(self):
+        owner = ModbusInterface(None, "127.0.0.1:1", config=object())
+        view = owner.for_app("app_a")
+
+        assert view.config is None
+        assert view._poll_schedules is not owner._poll_schedules
+        assert view.subscription_tasks is not owner.subscription_tasks
+
+    @pytest.mark.asyncio
+    async def test_device_agent_views_share_one_stream_per_channel(self):
+        owner = MockDeviceAgentInterface(None)
+        app_a, app_b = owner.for_app("app_a"), owner.for_app("app_b")
+
+        async def on_a(event):
+            pass
+
+        async def on_b(event):
+            pass
+
+        app_a.add_event_callback("tag_values", on_a, EventSubscription.all)
+        app_b.add_event_callback("tag_values", on_b, EventSubscription.all)
+
+        assert len(owner._stream_tasks) == 1
+        assert [cb for cb, _ in owner._event_callbacks["tag_values"]] == [on_a, on_b]
+
+        await app_a.close()
+        assert [cb for cb, _ in owner._event_callbacks["tag_values"]] == [on_b]
+        assert "tag_values" in owner._stream_tasks
+        await owner.close()
+
+
+class CountingApp(docker_application.Application):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._error_wait_period = 0
+        self.loops = 0
+
+    async def main_loop(self):
+        self.loops += 1
+
+
+class CrashingApp(CountingApp):
+    async def setup(self):
+        raise RuntimeError("bad config")
+
+
+@pytest.mark.asyncio
+async def test_host_runs_apps_and_isolates_failures():
+    shared_dda = MockDeviceAgentInterface(None)
+    host = AppHost(
+        device_agent=shared_dda,
+        platform_iface=PlatformInterface(None, "127.0.0.1:1"),
+        modbus_iface=ModbusInterface(None, "127.0.0.1:1"),
+        restart_delay=0.01,
+    )
+    good = host.add_app(CountingApp, "good_app", test_mode=True)
+    bad = host.add_app(CrashingApp, "bad_app", test_mode=True)
+    with pytest.raises(ValueError):
+        host.add_app(CountingApp, "good_app")
+
+    task = asyncio.create_task(host.run())
+    try:
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if good.app is not None and good.app.is_ready and bad.restarts >= 2:
+                break
+
+        app = good.app
+        assert app.is_ready
+        assert app.device_agent.app_key == "good_app"
+        assert app.device_agent._transport is shared_dda
+        assert not app.serve_healthcheck
+
+        await app.next()
+        assert app.loops == 1
+        # the crashing app is restarted as a fresh instance each time
+        assert bad.restarts >= 2
+        assert good.restarts == 0
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
@@ -0,0 +1,66 @@
+"""Startup budgets for the package's entry points.
+
+Each import runs in a fresh interpreter so modules loaded by other tests don't count.
+The bounds are generous (roughly twice the measured cost) so they catch an eager import
+of a heavy subpackage, not normal growth.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+_MEASURE = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"secs": elapsed, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def _measure_import(imports: str) -> tuple[float, set[str]]:
+    out = subprocess.run(
+        [sys.executable, "-c", _MEASURE.format(imports=imports)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result["secs"], set(result["modules"])
+
+
+@pytest.mark.parametrize(
+    "imports, max_modules, forbidden",
+    [
+        pytest.param(
+            "from pydoover.docker import Application, run_app",
+            500,
+            ["pydoover.models.control", "pydoover.api.control", "aiohttp.web", "httpx"],
+            id="run_app",
+        ),
+        pytest.param(
+            "from pydoover.processor.handler import Application",
+            550,
+            [
+                "pydoover.models.control",
+                "pydoover.api.control",
+                "pydoover.docker.device_agent",
+                "grpc",
+                "httpx",
+            ],
+            id="processor",
+        ),
+    ],
+)
+def test_import_budget(imports, max_modules, forbidden):
+    secs, modules = _measure_import(imports)
+
+    loaded = [name for name in forbidden if name in modules]
+    assert not loaded, f"{imports!r} eagerly imported {loaded}"
+    assert len(modules) <= max_modules, (
+        f"{imports!r} loaded {len(modules)} modules (budget {max_modules})"
+    )
+    assert secs < 1.5, f"{imports!r} took {secs:.2f}s (budget 1.5s)"
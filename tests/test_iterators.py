@@ -0,0 +1,447 @@
+"""Tests for the data API's paginating message iterators."""
+
+import asyncio
+import gc
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pydoover.api.data import (
+    AsyncMessageIterator,
+    AsyncMessageScan,
+    AsyncMultiAgentMessageIterator,
+    MessageIterator,
+    MessageScan,
+    MultiAgentMessageIterator,
+)
+from pydoover.api.data._iterators import (
+    DEFAULT_SCAN_BUFFER_PAGES,
+    _TWO_DAYS_SNOWFLAKE,
+    _shard_ranges,
+)
+from pydoover.models.data import ChannelID, Message
+
+CHANNEL = ChannelID(1, "history")
+
+
+def _message(id_: int) -> Message:
+    return Message(id_, 1, CHANNEL, {"n": id_}, [])
+
+
+class FakeClient:
+    """Serves ``ids`` newest first, like the list messages endpoint."""
+
+    def __init__(self, ids, fail_on_call=None):
+        self.ids = sorted(ids, reverse=True)
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+        self.threads = set()
+
+    def list_messages(self, agent_id, channel_name, before, after, limit, **kwargs):
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("page failed")
+        ids = [
+            i
+            for i in self.ids
+            if (before is None or i < before) and (after is None or i > after)
+        ]
+        return [_message(i) for i in ids[:limit]]
+
+    def fetch_multi_agent_messages(
+        self, channel_name, agent_ids, before, after, limit, **kwargs
+    ):
+        self.calls += 1
+        ids = sorted(
+            i
+            for i in self.ids
+            if (before is None or i < before) and (after is None or i > after)
+        )
+        return SimpleNamespace(results=[_message(i) for i in ids[:limit]])
+
+
+class AsyncFakeClient(FakeClient):
+    async def list_messages(self, *args, **kwargs):
+        await asyncio.sleep(0)
+        return super().list_messages(*args, **kwargs)
+
+    async def fetch_multi_agent_messages(self, *args, **kwargs):
+        await asyncio.sleep(0)
+        return super().fetch_multi_agent_messages(*args, **kwargs)
+
+
+IDS = list(range(1, 24))
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_sync_collects_every_page_in_order(prefetch):
+    client = FakeClient(IDS)
+    messages = MessageIterator(
+        client, 1, "history", before=100, page_size=5, prefetch=prefetch
+    ).collect()
+    assert [m.id for m in messages] == sorted(IDS, reverse=True)
+    assert client.calls == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+async def test_async_collects_every_page_in_order(prefetch):
+    client = AsyncFakeClient(IDS)
+    messages = await AsyncMessageIterator(
+        client, 1, "history", before=100, page_size=5, prefetch=prefetch
+    ).collect()
+    assert [m.id for m in messages] == sorted(IDS, reverse=True)
+    assert client.calls == 5
+
+
+@pytest.mark.asyncio
+async def test_async_reads_ahead_up_to_prefetch_pages():
+    client = AsyncFakeClient(IDS)
+    iterator = AsyncMessageIterator(client, 1, "history", page_size=5, prefetch=2)
+
+    await iterator.__anext__()
+    for _ in range(20):
+        await asyncio.sleep(0)
+    # the page being consumed plus two ahead, and no further
+    assert client.calls == 3
+
+    for _ in range(5):
+        await iterator.__anext__()
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert client.calls == 4
+    await iterator.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_without_prefetch_fetches_on_demand():
+    client = AsyncFakeClient(IDS)
+    iterator = AsyncMessageIterator(client, 1, "history", page_size=5, prefetch=0)
+    await iterator.__anext__()
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert client.calls == 1
+
+
+def test_sync_reads_ahead_on_a_thread():
+    client = FakeClient(IDS)
+    iterator = MessageIterator(client, 1, "history", page_size=5, prefetch=2)
+
+    next(iterator)
+    deadline = time.monotonic() + 2
+    while client.calls < 3 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    time.sleep(0.05)
+    assert client.calls == 3
+    assert threading.get_ident() not in client.threads
+    iterator.close()
+
+
+@pytest.mark.asyncio
+async def test_async_errors_reach_the_consumer_after_earlier_pages():
+    client = AsyncFakeClient(IDS, fail_on_call=2)
+    iterator = AsyncMessageIterator(client, 1, "history", page_size=5)
+    seen = []
+    with pytest.raises(RuntimeError, match="page failed"):
+        async for message in iterator:
+            seen.append(message.id)
+    assert seen == [23, 22, 21, 20, 19]
+    with pytest.raises(StopAsyncIteration):
+        await iterator.__anext__()
+
+
+def test_sync_errors_reach_the_consumer_after_earlier_pages():
+    client = FakeClient(IDS, fail_on_call=2)
+    iterator = MessageIterator(client, 1, "history", page_size=5)
+    seen = []
+    with pytest.raises(RuntimeError, match="page failed"):
+        for message in iterator:
+            seen.append(message.id)
+    assert seen == [23, 22, 21, 20, 19]
+
+
+def test_sync_abandoned_iterator_stops_its_thread():
+    client = FakeClient(IDS)
+    iterator = MessageIterator(client, 1, "history", page_size=5)
+    next(iterator)
+    thread = iterator._producer
+
+    del iterator
+    gc.collect()
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+
+    with MessageIterator(client, 1, "history", page_size=5) as iterator:
+        next(iterator)
+        thread = iterator._producer
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+
+
+@pytest.mark.asyncio
+async def test_async_aclose_cancels_read_ahead():
+    client = AsyncFakeClient(IDS)
+    async with AsyncMessageIterator(client, 1, "history", page_size=5) as iterator:
+        await iterator.__anext__()
+        producer = iterator._producer
+    assert producer.done()
+    with pytest.raises(StopAsyncIteration):
+        await iterator.__anext__()
+
+
+def test_negative_prefetch_rejected():
+    with pytest.raises(ValueError):
+        MessageIterator(FakeClient(IDS), 1, "history", prefetch=-1)
+
+
+# a short page in one window followed by more messages in the next window
+WINDOWED_IDS = [10, 11, 12, _TWO_DAYS_SNOWFLAKE + 20, _TWO_DAYS_SNOWFLAKE + 21]
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_sync_multi_agent_keeps_short_pages_across_windows(prefetch):
+    client = FakeClient(WINDOWED_IDS)
+    iterator = MultiAgentMessageIterator(
+        client,
+        "history",
+        [1, 2],
+        after=1,
+        before=3 * _TWO_DAYS_SNOWFLAKE,
+        page_size=5,
+        prefetch=prefetch,
+    )
+    assert [m.id for m in iterator.collect()] == WINDOWED_IDS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [0, 2])
+async def test_async_multi_agent_keeps_short_pages_across_windows(prefetch):
+    client = AsyncFakeClient(WINDOWED_IDS)
+    iterator = AsyncMultiAgentMessageIterator(
+        client,
+        "history",
+        [1, 2],
+        after=1,
+        before=3 * _TWO_DAYS_SNOWFLAKE,
+        page_size=2,
+        prefetch=prefetch,
+    )
+    assert [m.id for m in await iterator.collect()] == WINDOWED_IDS
+
+
+# ── Sharded scans ─────────────────────────────────────────────────────────
+
+
+def _snowflake(ms: int, low: int = 5) -> int:
+    return ms << 22 | low
+
+
+# a message every 10 ms for 4 s, plus IDs exactly on millisecond boundaries
+SCAN_IDS = [_snowflake(ms) for ms in range(1000, 5000, 10)] + [
+    _snowflake(2000, 0),
+    _snowflake(3000, 0),
+]
+SCAN_AFTER, SCAN_BEFORE = _snowflake(1000, 0), _snowflake(5000, 0)
+
+
+class SlowFakeClient(FakeClient):
+    """Tracks how many requests overlap."""
+
+    def __init__(self, ids, delay=0.002, **kwargs):
+        super().__init__(ids, **kwargs)
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def list_messages(self, *args, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return super().list_messages(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class AsyncSlowFakeClient(FakeClient):
+    def __init__(self, ids, **kwargs):
+        super().__init__(ids, **kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def list_messages(self, *args, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            return FakeClient.list_messages(self, *args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+class TestShardRanges:
+    def test_slices_are_contiguous_newest_first(self):
+        ranges = _shard_ranges(SCAN_AFTER, SCAN_BEFORE, 4)
+        assert len(ranges) == 4
+        assert ranges[0][1] == SCAN_BEFORE
+        assert ranges[-1][0] == SCAN_AFTER
+        for (after, _), (_, before) in zip(ranges, ranges[1:]):
+            # each slice starts one below the previous slice's exclusive end
+            assert after == before - 1
+            assert before & ((1 << 22) - 1) == 0
+
+        for boundary_id in (_snowflake(2000, 0), _snowflake(3000, 0)):
+            assert sum(a < boundary_id < b for a, b in ranges) == 1
+
+    def test_short_and_empty_ranges(self):
+        assert len(_shard_ranges(_snowflake(10, 0), _snowflake(12, 0), 8)) == 2
+        assert _shard_ranges(5, 6, 4) == []
+        with pytest.raises(ValueError):
+            _shard_ranges(1, 100, 0)
+
+
+@pytest.mark.parametrize("shards, concurrency", [(1, 1), (7, 3), (16, 16)])
+def test_sync_ordered_scan_matches_iteration(shards, concurrency):
+    client = SlowFakeClient(SCAN_IDS, delay=0)
+    scan = MessageScan(
+        client,
+        1,
+        "history",
+        after=SCAN_AFTER,
+        before=SCAN_BEFORE,
+        shards=shards,
+        concurrency=concurrency,
+        page_size=7,
+    )
+    assert [m.id for m in scan.collect()] == sorted(SCAN_IDS, reverse=True)
+    assert scan._executor is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_async_scan_returns_every_message(ordered):
+    client = AsyncSlowFakeClient(SCAN_IDS)
+    scan = AsyncMessageScan(
+        client,
+        1,
+        "history",
+        after=SCAN_AFTER,
+        before=SCAN_BEFORE,
+        shards=8,
+        concurrency=3,
+        ordered=ordered,
+        page_size=10,
+    )
+    ids = [m.id for m in await scan.collect()]
+    if ordered:
+        assert ids == sorted(SCAN_IDS, reverse=True)
+    else:
+        assert sorted(ids) == sorted(SCAN_IDS)
+    assert 1 < client.max_in_flight <= 3
+
+
+def test_sync_unordered_scan_bounds_concurrency():
+    client = SlowFakeClient(SCAN_IDS)
+    with MessageScan(
+        client,
+        1,
+        "history",
+        after=SCAN_AFTER,
+        before=SCAN_BEFORE,
+        shards=8,
+        concurrency=4,
+        ordered=False,
+        page_size=10,
+    ) as scan:
+        ids = [m.id for m in scan]
+    assert sorted(ids) == sorted(SCAN_IDS)
+    assert 1 < client.max_in_flight <= 4
+
+
+def test_sync_ordered_scan_buffer_limit():
+    client = SlowFakeClient(SCAN_IDS, delay=0)
+    scan = MessageScan(
+        client,
+        1,
+        "history",
+        after=SCAN_AFTER,
+        before=SCAN_BEFORE,
+        shards=4,
+        concurrency=4,
+        page_size=5,
+        buffer_pages=1,
+    )
+    next(scan)
+    time.sleep(0.05)
+    # each later slice stops after filling its one page, plus one blocked in hand
+    assert client.calls <= 4 * 3
+    assert [m.id for m in scan][-1] == min(SCAN_IDS)
+
+
+@pytest.mark.asyncio
+async def test_async_scan_error_stops_the_scan():
+    client = AsyncSlowFakeClient(SCAN_IDS, fail_on_call=3)
+    scan = AsyncMessageScan(
+        client, 1, "history", after=SCAN_AFTER, before=SCAN_BEFORE, page_size=10
+    )
+    with pytest.raises(RuntimeError, match="page failed"):
+        await scan.collect()
+    await asyncio.sleep(0)
+    assert all(task.done() for task in scan._tasks)
+
+
+def test_sync_scan_close_stops_workers():
+    client = SlowFakeClient(SCAN_IDS)
+    scan = MessageScan(
+        client, 1, "history", after=SCAN_AFTER, before=SCAN_BEFORE, page_size=5
+    )
+    next(scan)
+    scan.close()
+    calls = client.calls
+    time.sleep(0.05)
+    # at most the requests already in flight complete
+    assert client.calls <= calls + 4
+    with pytest.raises(StopIteration):
+        next(scan)
+
+
+def test_scan_rejects_bad_options():
+    with pytest.raises(ValueError):
+        MessageScan(FakeClient([]), 1, "history", after=None)
+    with pytest.raises(ValueError):
+        MessageScan(FakeClient([]), 1, "history", after=1, concurrency=0)
+    with pytest.raises(ValueError):
+        MessageScan(FakeClient([]), 1, "history", after=1, buffer_pages=0)
+    assert MessageScan(FakeClient([]), 1, "history", after=SCAN_BEFORE).collect() == []
+
+
+@pytest.mark.asyncio
+async def test_client_scans_buffer_a_bounded_number_of_pages():
+    from pydoover.api import AsyncDataClient, DataClient
+    from pydoover.processor.data_client import ProcessorDataClient
+
+    with DataClient(base_url="https://data.example", token="t") as client:
+        scan = client.scan_messages(1, "history", after=SCAN_AFTER)
+        assert scan._buffer_pages == DEFAULT_SCAN_BUFFER_PAGES
+        scan = client.scan_messages(1, "history", after=SCAN_AFTER, buffer_pages=2)
+        assert scan._buffer_pages == 2
+
+    client = AsyncDataClient(base_url="https://data.example", token="t")
+    scan = client.scan_messages(1, "history", after=SCAN_AFTER, buffer_pages=None)
+    assert scan._buffer_pages is None
+    await client.close()
+
+    client = ProcessorDataClient("https://data.example")
+    client.agent_id = 1
+    scan = client.scan_messages("history", after=SCAN_AFTER, buffer_pages=3)
+    assert scan._buffer_pages == 3
+    assert client.scan_messages("history", after=SCAN_AFTER)._buffer_pages == (
+        DEFAULT_SCAN_BUFFER_PAGES
+    )
+    await client.close()
@@ -0,0 +1,86 @@
+"""Tests for the monotonic main-loop scheduler and phase timings."""
+
+import pytest
+
+from pydoover.docker.timing import CatchUp, LoopScheduler, LoopTimings, PhaseTiming
+
+
+def run(scheduler, period, body_secs, start=0.0):
+    """Simulate a loop: each iteration runs for body_secs then sleeps the returned delay.
+
+    Returns the start times of each iteration.
+    """
+    now = start
+    starts = []
+    for body in body_secs:
+        starts.append(now)
+        now += body
+        now += scheduler.delay(period, now=now)
+    return starts
+
+
+class TestLoopScheduler:
+    def test_absolute_deadlines_do_not_drift(self):
+        scheduler = LoopScheduler()
+        scheduler.start(1.0, now=0.0)
+        starts = run(scheduler, 1.0, [0.3, 0.7, 0.05, 0.99] * 25)
+        assert starts[-1] == pytest.approx(99.0)
+        assert starts[:5] == pytest.approx([0, 1, 2, 3, 4])
+
+    def test_skip_drops_missed_ticks_and_realigns(self):
+        scheduler = LoopScheduler(catch_up=CatchUp.SKIP)
+        scheduler.start(1.0, now=0.0)
+        starts = run(scheduler, 1.0, [0.1, 3.5, 0.1, 0.1])
+        # the tick due at 2 runs late at 4.5; those due at 3 and 4 are dropped
+        assert starts == pytest.approx([0, 1, 4.5, 5])
+        assert scheduler.missed_ticks == 2
+
+    def test_burst_runs_missed_ticks_back_to_back(self):
+        scheduler = LoopScheduler(catch_up="burst")
+        scheduler.start(1.0, now=0.0)
+        starts = run(scheduler, 1.0, [0.1, 3.5, 0.1, 0.1, 0.1, 0.1, 0.1])
+        assert starts == pytest.approx([0, 1, 4.5, 4.6, 4.7, 5, 6])
+        assert scheduler.missed_ticks == 0
+
+    def test_burst_is_capped(self):
+        scheduler = LoopScheduler(catch_up=CatchUp.BURST, max_burst=2)
+        scheduler.start(1.0, now=0.0)
+        starts = run(scheduler, 1.0, [0.1, 10.0, 0.1, 0.1])
+        assert starts == pytest.approx([0, 1, 11, 12])
+
+    def test_period_change_and_no_period(self):
+        scheduler = LoopScheduler()
+        scheduler.start(1.0, now=0.0)
+        assert scheduler.delay(1.0, now=0.2) == pytest.approx(0.8)
+        # deadline was 2.0 under the old period; 1 + 0.5 under the new one
+        assert scheduler.delay(0.5, now=1.1) == pytest.approx(0.4)
+        assert scheduler.delay(None, now=1.6) == 0
+        assert scheduler.delay(2.0, now=1.7) == pytest.approx(2.0)
+
+
+class TestLoopTimings:
+    def test_phase_stats(self):
+        timing = PhaseTiming(alpha=0.5)
+        for secs in (1.0, 3.0, 2.0):
+            timing.record(secs)
+        assert timing.count == 3
+        assert timing.last == 2.0
+        assert timing.max == 3.0
+        assert timing.total == 6.0
+        assert timing.mean == pytest.approx(2.0)
+
+    def test_measure_records_even_on_error(self):
+        timings = LoopTimings()
+        with timings.measure("main_loop"):
+            pass
+        with pytest.raises(RuntimeError):
+            with timings.measure("main_loop"):
+                raise RuntimeError
+        assert timings["main_loop"].count == 2
+        assert set(timings.to_dict()["main_loop"]) == {
+            "count",
+            "last",
+            "mean",
+            "max",
+            "total",
+        }
@@ -0,0 +1,299 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiohttp import web
+
+from pydoover.api import AsyncDataClient, DataClient
+from pydoover.api.data import MessageCache
+from pydoover.models.data import Message
+from pydoover.processor.data_client import ProcessorDataClient
+from pydoover.utils.clock import use_clock
+from pydoover.utils.snowflake import generate_snowflake_id_at
+
+AGENT = 123
+CHANNEL = "tag_values"
+
+
+class StubDataServer:
+    """The data API's message listing, served from memory on a background thread."""
+
+    def __init__(self):
+        # (agent_id, channel) -> message dicts
+        self.channels: dict[tuple[int, str], list[dict]] = {}
+        self.requests: list[dict] = []
+        self.url = None
+
+    def add(self, agent_id: int, channel: str, at: datetime, data: dict, **extra):
+        message = {
+            "id": str(generate_snowflake_id_at(at)),
+            "author_id": "1",
+            "channel": {"agent_id": agent_id, "name": channel},
+            "data": data,
+            "attachments": [],
+            **extra,
+        }
+        self.channels.setdefault((agent_id, channel), []).append(message)
+        return int(message["id"])
+
+    async def _list(self, request: web.Request):
+        query = request.query
+        self.requests.append(dict(query))
+        key = (int(request.match_info["agent"]), request.match_info["channel"])
+        after = int(query.get("after", 0))
+        before = int(query["before"]) if "before" in query else None
+        found = sorted(
+            (
+                m
+                for m in self.channels.get(key, [])
+                if int(m["id"]) > after and (before is None or int(m["id"]) < before)
+            ),
+            key=lambda m: int(m["id"]),
+            reverse=True,
+        )
+        return web.json_response(found[: int(query.get("limit", 50))])
+
+    def routes(self) -> list[web.RouteDef]:
+        return [web.get("/agents/{agent}/channels/{channel}/messages", self._list)]
+
+
+@pytest.fixture
+def server(serve_routes):
+    stub = StubDataServer()
+    stub.url = serve_routes(stub.routes())
+    return stub
+
+
+NOW = datetime.now(timezone.utc)
+START = NOW - timedelta(days=1)
+
+
+class FixedClock:
+    def __init__(self, at: datetime):
+        self.at = at.timestamp()
+
+    def time(self) -> float:
+        return self.at
+
+    def monotonic(self) -> float:
+        return self.at
+
+
+def _fill(server, count: int, channel: str = CHANNEL, start: datetime = START):
+    return [
+        server.add(AGENT, channel, start + timedelta(minutes=i), {"n": i})
+        for i in range(count)
+    ]
+
+
+def _client(server, cache, **kwargs) -> DataClient:
+    return DataClient(base_url=server.url, token="test-token", cache=cache, **kwargs)
+
+
+class TestCachedMessages:
+    def test_repeat_query_is_answered_locally(self, server):
+        ids = _fill(server, 120)
+        end = START + timedelta(hours=3)
+        with _client(server, MessageCache()) as client:
+            first = client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+            fetched = len(server.requests)
+            second = client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+
+        assert [m.id for m in first] == sorted(ids[1:], reverse=True)
+        assert [m.id for m in second] == [m.id for m in first]
+        assert fetched == 1  # 119 messages, one page of 200
+        assert len(server.requests) == fetched
+        assert second[0].data == {"n": 119}
+
+    def test_later_queries_fetch_only_the_delta(self, server):
+        _fill(server, 50)
+        cache = MessageCache()
+        with _client(server, cache) as client:
+            with use_clock(FixedClock(NOW - timedelta(hours=1))):
+                client.cached_messages(AGENT, CHANNEL, after=START)
+            (covered,) = cache.coverage(AGENT, CHANNEL)
+
+            # an hour later, one more message has arrived
+            new_id = server.add(AGENT, CHANNEL, NOW - timedelta(minutes=5), {"n": 50})
+            server.requests.clear()
+            with use_clock(FixedClock(NOW)):
+                messages = client.cached_messages(AGENT, CHANNEL, after=START)
+
+        assert messages[0].id == new_id and len(messages) == 50
+        # nothing older than what the first call covered was asked for again
+        assert server.requests
+        assert all(int(r["after"]) >= covered[1] for r in server.requests)
+        (merged,) = cache.coverage(AGENT, CHANNEL)
+        assert merged[0] == covered[0] and merged[1] > covered[1]
+
+    def test_only_uncovered_edges_are_fetched(self, server):
+        _fill(server, 300)
+        mid_lo, mid_hi = START + timedelta(hours=1), START + timedelta(hours=2)
+        cache = MessageCache()
+        with _client(server, cache) as client:
+            client.cached_messages(AGENT, CHANNEL, after=mid_lo, before=mid_hi)
+            server.requests.clear()
+            wide = client.cached_messages(
+                AGENT, CHANNEL, after=START, before=START + timedelta(hours=4)
+            )
+
+        assert len(wide) == 239
+        inner = (generate_snowflake_id_at(mid_lo), generate_snowflake_id_at(mid_hi))
+        for request in server.requests:
+            after, before = int(request["after"]), int(request["before"])
+            assert before <= inner[0] + 1 or after >= inner[1] - 1
+        assert len(cache.coverage(AGENT, CHANNEL)) == 1
+
+    def test_recent_messages_are_refetched_not_covered(self, server):
+        server.add(AGENT, CHANNEL, NOW - timedelta(seconds=1), {"fresh": True})
+        cache = MessageCache(settle=60)
+        with _client(server, cache) as client, use_clock(FixedClock(NOW)):
+            assert len(client.cached_messages(AGENT, CHANNEL, after=START)) == 1
+            server.requests.clear()
+            assert len(client.cached_messages(AGENT, CHANNEL, after=START)) == 1
+
+        # the last minute is never marked covered, so it's asked for again
+        assert len(server.requests) == 1
+        (covered,) = cache.coverage(AGENT, CHANNEL)
+        assert covered[1] < int(server.requests[0]["before"]) - 1
+
+    def test_cache_persists_across_clients(self, server, tmp_path):
+        _fill(server, 20)
+        end = START + timedelta(hours=1)
+        path = tmp_path / "cache" / "messages.db"
+        with _client(server, path) as client:
+            client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+        assert client.cache is None  # opened from a path, so closed with the client
+
+        server.requests.clear()
+        with _client(server, str(path)) as client:
+            messages = client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+        assert len(messages) == 19 and not server.requests
+
+    def test_payloads_are_decoded_lazily(self, server):
+        server.add(
+            AGENT,
+            CHANNEL,
+            START + timedelta(minutes=1),
+            {"n": 1},
+            attachments=[
+                {
+                    "filename": "a.png",
+                    "content_type": "image/png",
+                    "size": 3,
+                    "url": "u",
+                }
+            ],
+        )
+        with _client(server, MessageCache()) as client:
+            (message,) = client.cached_messages(
+                AGENT, CHANNEL, after=START, before=START + timedelta(hours=1)
+            )
+            (cached,) = client.cache.query(AGENT, CHANNEL, after=START)
+
+        assert isinstance(cached, Message)
+        assert not Message.data.is_loaded(cached)
+        assert cached.data == {"n": 1} == message.data
+        assert cached.attachments[0].filename == "a.png"
+
+    def test_invalidate(self, server):
+        _fill(server, 5)
+        end = START + timedelta(hours=1)
+        cache = MessageCache()
+        with _client(server, cache) as client:
+            client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+            cache.invalidate(AGENT, CHANNEL)
+            assert cache.size == 0 and cache.coverage(AGENT, CHANNEL) == []
+            server.requests.clear()
+            client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+        assert len(server.requests) == 1
+
+    def test_requires_a_cache(self, server):
+        with DataClient(base_url=server.url, token="test-token") as client:
+            with pytest.raises(RuntimeError, match="no message cache"):
+                client.cached_messages(AGENT, CHANNEL)
+
+
+class TestEviction:
+    def test_least_recently_used_channel_goes_first(self, server):
+        _fill(server, 40, channel="a")
+        _fill(server, 40, channel="b")
+        end = START + timedelta(hours=2)
+        cache = MessageCache()
+        with _client(server, cache) as client:
+            client.cached_messages(AGENT, "a", after=START, before=end)
+            per_channel = cache.size
+            cache.max_bytes = int(per_channel * 1.5)
+            client.cached_messages(AGENT, "b", after=START, before=end)
+
+        assert cache.coverage(AGENT, "a") == []
+        assert cache.query(AGENT, "a") == []
+        assert len(cache.query(AGENT, "b")) == 39
+        assert cache.size == per_channel
+
+    def test_oversized_channel_loses_its_oldest_messages(self, server):
+        ids = _fill(server, 100)
+        end = START + timedelta(hours=2)
+        cache = MessageCache()
+        with _client(server, cache) as client:
+            client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+            full = cache.size
+            cache.invalidate(AGENT, CHANNEL)
+            cache.max_bytes = full // 2
+
+            messages = client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+            kept = cache.query(AGENT, CHANNEL)
+            (covered,) = cache.coverage(AGENT, CHANNEL)
+
+            # the caller still gets the whole range, though only the newest is kept
+            assert len(messages) == 99
+            assert 0 < cache.size <= full // 2
+            assert kept[0].id == ids[99] and len(kept) < 99
+            # the dropped range is no longer covered, so asking for it refetches
+            assert covered[0] < kept[-1].id
+            assert covered[0] >= ids[1]
+            server.requests.clear()
+            again = client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+        assert len(again) == 99
+        assert server.requests
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            MessageCache(max_bytes=0)
+        with pytest.raises(ValueError):
+            MessageCache(settle=-1)
+
+
+@pytest.mark.asyncio
+async def test_async_client(server):
+    _fill(server, 30)
+    end = START + timedelta(hours=1)
+    cache = MessageCache()
+    client = AsyncDataClient(base_url=server.url, token="test-token", cache=cache)
+    await client.setup()
+    try:
+        first = await client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+        fetched = len(server.requests)
+        second = await client.cached_messages(AGENT, CHANNEL, after=START, before=end)
+    finally:
+        await client.close()
+
+    assert len(first) == 29 and [m.id for m in second] == [m.id for m in first]
+    assert len(server.requests) == fetched == 1
+    assert client.cache is cache  # a cache passed in is left open
+
+
+@pytest.mark.asyncio
+async def test_processor_client_resolves_agent(server):
+    _fill(server, 3)
+    client = ProcessorDataClient(server.url)
+    client.set_token("test-token")
+    client.cache = MessageCache()
+    client.agent_id = AGENT
+    await client.setup()
+    try:
+        messages = await client.cached_messages(
+            CHANNEL, after=START, before=START + timedelta(hours=1)
+        )
+    finally:
+        await client.close()
+    assert len(messages) == 2
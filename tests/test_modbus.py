@@ -1,5 +1,12 @@
+import asyncio
+import contextlib
+
+import grpc
+import pytest
+
+from pydoover.docker.modbus import ChangeFilter, RegisterSubscription
 from pydoover.docker.modbus.modbus_iface import ModbusInterface
-from pydoover.models.generated.modbus import modbus_iface_pb2
+from pydoover.models.generated.modbus import modbus_iface_pb2, modbus_iface_pb2_grpc
 
 
 def _values(*registers: int):
@@ -21,3 +28,212 @@ def test_parse_register_output_multiple_returns_list():
     # Must be a real list, not the protobuf repeated-field container —
     # callers validate responses with isinstance(result, list).
     assert isinstance(result, list)
+
+
+# ── shared register subscriptions ────────────────────────────────────────
+
+
+class FakeModbusServicer(modbus_iface_pb2_grpc.modbusIfaceServicer):
+    """Streams each register's address as its value, ``ticks`` times per stream."""
+
+    def __init__(self, ticks: int = 4):
+        self.ticks = ticks
+        self.requests = []
+
+    async def readRegisterSubscription(self, request, context):
+        self.requests.append(request)
+        for _ in range(self.ticks):
+            yield modbus_iface_pb2.readRegisterSubscriptionResponse(
+                response_header=modbus_iface_pb2.responseHeader(success=True),
+                values=range(request.address, request.address + request.count),
+            )
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(10)
+
+
+@contextlib.asynccontextmanager
+async def fake_modbus():
+    servicer = FakeModbusServicer()
+    server = grpc.aio.server()
+    modbus_iface_pb2_grpc.add_modbusIfaceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    iface = ModbusInterface(app_key="t", modbus_uri=f"127.0.0.1:{port}")
+    try:
+        yield iface, servicer
+    finally:
+        await iface.close()
+        await server.stop(None)
+
+
+async def _wait_for(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "timed out waiting for condition"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_adjacent_subscriptions_share_one_stream():
+    async with fake_modbus() as (iface, servicer):
+        received = {"a": [], "b": [], "c": []}
+
+        def recorder(name):
+            async def callback(values):
+                received[name].append(values)
+
+            return callback
+
+        iface.add_read_register_subscription(
+            start_address=0, num_registers=5, poll_secs=1, callback=recorder("a")
+        )
+        iface.add_read_register_subscription(
+            start_address=5, num_registers=5, poll_secs=1, callback=recorder("b")
+        )
+        iface.add_read_register_subscription(
+            start_address=7, num_registers=1, poll_secs=1, callback=recorder("c")
+        )
+        await _wait_for(lambda: all(len(v) >= 2 for v in received.values()))
+
+        # the last request is the one still streaming: the merged 0..9 block
+        assert (servicer.requests[-1].address, servicer.requests[-1].count) == (0, 10)
+        assert len(iface.subscription_tasks) == 1
+        assert received["a"][-1] == [0, 1, 2, 3, 4]
+        assert received["b"][-1] == [5, 6, 7, 8, 9]
+        assert received["c"][-1] == 7
+
+
+@pytest.mark.asyncio
+async def test_disjoint_ranges_and_slaves_get_separate_schedules():
+    async with fake_modbus() as (iface, _):
+        iface.add_read_register_subscription(
+            start_address=0, num_registers=2, poll_secs=1, callback=lambda v: None
+        )
+        iface.add_read_register_subscription(
+            start_address=100, num_registers=2, poll_secs=1, callback=lambda v: None
+        )
+        iface.add_read_register_subscription(
+            modbus_id=2, start_address=0, num_registers=2, callback=lambda v: None
+        )
+        assert len(iface.subscription_tasks) == 3
+
+
+@pytest.mark.asyncio
+async def test_merged_block_respects_read_limit():
+    async with fake_modbus() as (iface, _):
+        iface.add_read_register_subscription(
+            start_address=0, num_registers=100, poll_secs=1, callback=lambda v: None
+        )
+        iface.add_read_register_subscription(
+            start_address=100, num_registers=100, poll_secs=1, callback=lambda v: None
+        )
+        assert len(iface.subscription_tasks) == 2
+
+
+@pytest.mark.asyncio
+async def test_slower_multiple_period_is_decimated():
+    async with fake_modbus() as (iface, servicer):
+        fast, slow = [], []
+        iface.add_read_register_subscription(
+            start_address=0, num_registers=2, poll_secs=1, callback=fast.append
+        )
+        iface.add_read_register_subscription(
+            start_address=0, num_registers=2, poll_secs=2, callback=slow.append
+        )
+        await _wait_for(lambda: len(fast) >= 4)
+
+        assert len(servicer.requests) == 1
+        assert len(slow) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelling_last_subscriber_stops_the_stream():
+    async with fake_modbus() as (iface, _):
+        first = iface.add_read_register_subscription(
+            start_address=0, num_registers=2, callback=lambda v: None
+        )
+        second = iface.add_read_register_subscription(
+            start_address=0, num_registers=2, callback=lambda v: None
+        )
+        task = iface.subscription_tasks[0]
+
+        assert first.cancel()
+        assert not first.cancel()
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        second.cancel()
+        await _wait_for(task.done)
+        assert iface._poll_schedules == {}
+
+
+# ── change filtering ─────────────────────────────────────────────────────
+
+
+def _deliveries(subscription, blocks, step=1.0):
+    """Which of ``blocks`` (polled ``step`` seconds apart) reach the callback."""
+    return [
+        block
+        for i, block in enumerate(blocks)
+        if subscription._should_deliver(block, now=i * step)
+    ]
+
+
+def test_no_filter_delivers_every_poll():
+    sub = RegisterSubscription(0, 2, 1, callback=print)
+    assert _deliveries(sub, [[1, 2], [1, 2], [1, 2]]) == [[1, 2]] * 3
+
+
+@pytest.mark.parametrize("mode", ["exact", ChangeFilter.HASH])
+def test_exact_and_hash_only_deliver_changes(mode):
+    sub = RegisterSubscription(0, 2, 1, callback=print, change_filter=mode)
+    blocks = [[1, 2], [1, 2], [1, 3], [1, 3], [1, 2]]
+    assert _deliveries(sub, blocks) == [[1, 2], [1, 3], [1, 2]]
+
+
+def test_deadband_compares_against_last_delivered_value():
+    sub = RegisterSubscription(0, 2, 1, callback=print, deadband=[5, 0])
+    assert sub.change_filter is ChangeFilter.DEADBAND
+    # register 0 drifts by 3 per poll: suppressed until it has moved more than 5
+    blocks = [[100, 7], [103, 7], [106, 7], [107, 7], [107, 8]]
+    assert _deliveries(sub, blocks) == [[100, 7], [106, 7], [107, 8]]
+
+
+def test_deadband_length_must_match_registers():
+    with pytest.raises(ValueError):
+        RegisterSubscription(0, 3, 1, callback=print, deadband=[1, 2])
+
+
+def test_failures_and_recovery_are_delivered_once():
+    sub = RegisterSubscription(0, 1, 1, callback=print, change_filter="exact")
+    blocks = [[1], None, None, [1], [1]]
+    assert _deliveries(sub, blocks) == [[1], None, [1]]
+
+
+def test_max_silence_forces_periodic_delivery():
+    sub = RegisterSubscription(
+        0, 1, 1, callback=print, change_filter="exact", max_silence_secs=3
+    )
+    delivered = [i for i in range(10) if sub._should_deliver([42], now=float(i))]
+    assert delivered == [0, 3, 6, 9]
+
+
+@pytest.mark.asyncio
+async def test_change_filter_applies_per_subscriber_on_shared_stream():
+    async with fake_modbus() as (iface, servicer):
+        every, changes = [], []
+        iface.add_read_register_subscription(
+            start_address=0, num_registers=2, poll_secs=1, callback=every.append
+        )
+        iface.add_read_register_subscription(
+            start_address=0,
+            num_registers=2,
+            poll_secs=1,
+            callback=changes.append,
+            change_filter="exact",
+        )
+        await _wait_for(lambda: len(every) >= servicer.ticks)
+
+        assert len(servicer.requests) == 1
+        assert changes == [[0, 1]]
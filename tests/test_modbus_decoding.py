@@ -0,0 +1,147 @@
+import struct
+
+import pytest
+
+from pydoover.docker.modbus import RegisterField, RegisterMap
+
+
+def _words(fmt: str, *values) -> list[int]:
+    """Big-endian registers for ``values`` packed with ``fmt``."""
+    data = struct.pack(">" + fmt, *values)
+    return list(struct.unpack(f">{len(data) // 2}H", data))
+
+
+def _byteswap(words: list[int]) -> list[int]:
+    return [((w & 0xFF) << 8) | (w >> 8) for w in words]
+
+
+def test_decodes_every_type_in_one_block():
+    block = (
+        _words("h", -1234)
+        + _words("H", 54321)
+        + _words("i", -7_000_000)
+        + _words("I", 4_000_000_000)
+        + _words("f", 1.5)
+        + _words("q", -(2**40))
+        + _words("Q", 2**63 + 5)
+        + _words("d", 3.141592653589793)
+    )
+    register_map = RegisterMap(
+        [
+            RegisterField("a", 0, "int16"),
+            RegisterField("b", 1, "uint16"),
+            RegisterField("c", 2, "int32"),
+            RegisterField("d", 4, "uint32"),
+            RegisterField("e", 6, "float32"),
+            RegisterField("f", 8, "int64"),
+            RegisterField("g", 12, "uint64"),
+            RegisterField("h", 16, "float64"),
+        ]
+    )
+    assert register_map.num_registers == 20
+    assert register_map.decode(block) == {
+        "a": -1234,
+        "b": 54321,
+        "c": -7_000_000,
+        "d": 4_000_000_000,
+        "e": 1.5,
+        "f": -(2**40),
+        "g": 2**63 + 5,
+        "h": 3.141592653589793,
+    }
+
+
+def test_word_and_byte_order():
+    words = _words("f", 12.25)
+    swapped = words[::-1]
+    register_map = RegisterMap(
+        [
+            RegisterField("abcd", 0, "float32"),
+            RegisterField("cdab", 2, "float32", word_order="little"),
+            RegisterField("badc", 4, "float32", byte_order="little"),
+            RegisterField("dcba", 6, "float32", "little", "little"),
+        ]
+    )
+    block = words + swapped + _byteswap(words) + _byteswap(swapped)
+    assert register_map.decode(block) == {
+        "abcd": 12.25,
+        "cdab": 12.25,
+        "badc": 12.25,
+        "dcba": 12.25,
+    }
+
+
+def test_scale_offset_and_start_address():
+    register_map = RegisterMap(
+        [
+            RegisterField("temp", 102, "int16", scale=0.1, offset=-40),
+            RegisterField("raw", 100),
+        ],
+        start_address=100,
+    )
+    result = register_map.decode([7, 0, 615])
+    assert result["raw"] == 7
+    assert result["temp"] == pytest.approx(21.5)
+
+
+def test_overlapping_fields_and_sign_extended_registers():
+    register_map = RegisterMap(
+        [RegisterField("whole", 0, "uint32"), RegisterField("low", 1, "int16")]
+    )
+    # the interface may hand back registers as signed int32s
+    assert register_map.decode([1, -1]) == {"whole": 0x1FFFF, "low": -1}
+
+
+def test_single_field_map():
+    assert RegisterMap([RegisterField("x", 5)]).decode([9]) == {"x": 9}
+
+
+def test_short_block_raises():
+    register_map = RegisterMap([RegisterField("x", 0, "float64")])
+    with pytest.raises(ValueError, match="too short"):
+        register_map.decode([0, 0, 0])
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"type": "int8"}, {"word_order": "middle"}, {"byte_order": "native"}],
+)
+def test_invalid_field_definition(kwargs):
+    with pytest.raises(ValueError):
+        RegisterField("x", 0, **kwargs)
+
+
+def test_duplicate_field_names_rejected():
+    with pytest.raises(ValueError, match="unique"):
+        RegisterMap([RegisterField("x", 0), RegisterField("x", 1)])
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        (RegisterField("x", 0, "int16"), -1234),
+        (RegisterField("x", 0, "uint64"), 2**63 + 5),
+        (RegisterField("x", 0, "float32", word_order="little"), 12.25),
+        (RegisterField("x", 0, "float64", "little", "little"), -0.5),
+        (RegisterField("x", 0, "int16", scale=0.1, offset=-40), 21.5),
+    ],
+)
+def test_encode_round_trips(field, value):
+    register_map = RegisterMap([field])
+    registers = register_map.encode({"x": value})
+    block = [registers[a] for a in sorted(registers)]
+    assert register_map.decode(block)["x"] == pytest.approx(value)
+
+
+def test_encode_saturates_integers_and_skips_missing():
+    register_map = RegisterMap(
+        [
+            RegisterField("small", 10, "uint16"),
+            RegisterField("neg", 11, "int16"),
+            RegisterField("absent", 12, "uint32"),
+        ]
+    )
+    assert register_map.encode({"small": 70000, "neg": -40000, "absent": None}) == {
+        10: 0xFFFF,
+        11: 0x8000,
+    }
@@ -0,0 +1,186 @@
+"""Tests for ModbusServerBridge against a fake modbus gRPC server."""
+
+import asyncio
+import contextlib
+
+import grpc
+import pytest
+
+from pydoover.docker.device_agent import MockDeviceAgentInterface
+from pydoover.docker.modbus import (
+    ModbusInterface,
+    ModbusServerBridge,
+    RegisterField,
+    RegisterMap,
+)
+from pydoover.models.generated.modbus import modbus_iface_pb2, modbus_iface_pb2_grpc
+from pydoover.tags.manager import TagsManagerDocker
+
+
+def _ok():
+    return modbus_iface_pb2.serverResponseHeader(success=True)
+
+
+class FakeServerServicer(modbus_iface_pb2_grpc.modbusIfaceServicer):
+    """Holds a holding-register table like the modbus interface's server would."""
+
+    def __init__(self):
+        self.created = []
+        self.set_calls = []
+        self.closed = []
+        self.table = []
+        self.addresses = []
+        self.refuse = 0
+
+    async def createServer(self, request, context):
+        self.created.append(request)
+        self.table = list(request.holding_registers)
+        return modbus_iface_pb2.createServerResponse(response_header=_ok())
+
+    async def setServerRegisters(self, request, context):
+        # address is repeated and paired with values, one address per value
+        self.addresses.append(list(request.address))
+        if self.refuse:
+            self.refuse -= 1
+            return modbus_iface_pb2.setServerRegistersResponse(
+                response_header=modbus_iface_pb2.serverResponseHeader(success=False)
+            )
+        self.set_calls.append((request.address[0], list(request.values)))
+        for address, value in zip(request.address, request.values):
+            self.table[address] = value
+        return modbus_iface_pb2.setServerRegistersResponse(response_header=_ok())
+
+    async def closeServer(self, request, context):
+        self.closed.append(request.port)
+        return modbus_iface_pb2.closeServerResponse(
+            response_header=_ok(), port=request.port
+        )
+
+
+@contextlib.asynccontextmanager
+async def bridge_setup(register_map, initial_tags=None, **kwargs):
+    servicer = FakeServerServicer()
+    server = grpc.aio.server()
+    modbus_iface_pb2_grpc.add_modbusIfaceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+
+    iface = ModbusInterface(app_key="app", modbus_uri=f"127.0.0.1:{port}")
+    manager = TagsManagerDocker(
+        client=MockDeviceAgentInterface(app_key="app", dda_uri=""), app_key="app"
+    )
+    manager._tag_values = {"app": dict(initial_tags or {})}
+    bridge = ModbusServerBridge(iface, register_map, port=5020, **kwargs)
+    try:
+        assert await bridge.start(manager)
+        yield bridge, manager, servicer
+    finally:
+        await bridge.close()
+        await iface.close()
+        await server.stop(None)
+
+
+REGISTER_MAP = RegisterMap(
+    [
+        RegisterField("running", 0),
+        RegisterField("flow", 1, "float32"),
+        RegisterField("total", 3, "uint32"),
+        RegisterField("alarm", 10),
+    ]
+)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_server_is_seeded_from_current_tags():
+    async with bridge_setup(REGISTER_MAP, {"running": 1, "total": 70000}) as (
+        bridge,
+        _,
+        servicer,
+    ):
+        (created,) = servicer.created
+        assert created.port == 5020
+        assert list(created.holding_registers) == bridge.registers
+        assert bridge.registers[0] == 1
+        assert bridge.registers[3:5] == [1, 4464]
+
+
+@pytest.mark.asyncio
+async def test_only_changed_runs_are_pushed_in_one_call_each():
+    async with bridge_setup(REGISTER_MAP) as (bridge, manager, servicer):
+        # several tag writes in one loop iteration coalesce into one flush
+        await manager.set_tag("running", 1, app_key="app")
+        await manager.set_tag("flow", 2.5, app_key="app")
+        await manager.set_tag("alarm", 1, app_key="app")
+        await _settle()
+
+        # flow's low word (2.5 -> 0x4020_0000) was already 0, so it isn't resent
+        assert servicer.set_calls == [(0, [1, 16416]), (10, [1])]
+        assert servicer.table == bridge.registers
+
+        # re-setting a value that maps to the same registers pushes nothing
+        servicer.set_calls.clear()
+        await manager.set_tag("running", True, app_key="app")
+        await _settle()
+        assert servicer.set_calls == []
+
+
+@pytest.mark.asyncio
+async def test_coalesce_gap_bridges_nearby_runs():
+    async with bridge_setup(REGISTER_MAP, coalesce_gap=2) as (_, manager, servicer):
+        await manager.set_tags({"app": {"running": 1, "total": 5}})
+        await _settle()
+        # running @0 and total's low word @4 are 3 apart (> gap of 2)...
+        assert servicer.set_calls == [(0, [1]), (4, [5])]
+
+        servicer.set_calls.clear()
+        await manager.set_tags({"app": {"flow": 1.0, "total": 6}})
+        await _settle()
+        # ...but flow @1 (low word unchanged) and total @4 are within it
+        assert servicer.set_calls == [(1, [16256, 0, 0, 6])]
+
+
+@pytest.mark.asyncio
+async def test_remote_tag_updates_are_served_and_close_stops_following():
+    async with bridge_setup(REGISTER_MAP) as (bridge, manager, servicer):
+        manager._notify_change_listeners({"app": {"alarm": 1}, "other": {"x": 1}})
+        await _settle()
+        assert servicer.set_calls == [(10, [1])]
+
+        await bridge.close()
+        manager._notify_change_listeners({"app": {"alarm": 0}})
+        await _settle()
+        assert servicer.set_calls == [(10, [1])]
+        assert servicer.closed == [5020]
+
+
+@pytest.mark.asyncio
+async def test_each_value_is_sent_with_its_own_address():
+    async with bridge_setup(REGISTER_MAP) as (_, manager, servicer):
+        await manager.set_tags({"app": {"running": 1, "flow": 1.0}})
+        await _settle()
+        assert servicer.addresses == [[0, 1]]
+
+
+@pytest.mark.asyncio
+async def test_failed_pushes_are_retried_with_backoff():
+    async with bridge_setup(REGISTER_MAP, retry_delay=0.01) as (
+        bridge,
+        manager,
+        servicer,
+    ):
+        servicer.refuse = 2
+        await manager.set_tag("alarm", 1, app_key="app")
+        # no further tag changes: the bridge retries on its own
+        async with asyncio.timeout(2):
+            while not servicer.set_calls:
+                await asyncio.sleep(0.01)
+
+        assert servicer.addresses == [[10], [10], [10]]
+        assert servicer.set_calls == [(10, [1])]
+        assert servicer.table == bridge.registers
+        assert bridge._failed_flushes == 0 and bridge._retry_task is None
@@ -1,3 +1,5 @@
+import copy
+import pickle
 from datetime import datetime, timezone
 
 import pytest
@@ -202,6 +204,58 @@ class TestMessage:
         assert m.attachments == []
 
 
+class TestLazyPayload:
+    def test_raw_bytes_decoded_on_first_access(self):
+        m = Message(1, 2, ChannelID(3, "c"), b'{"big": 18446744073709551615}', [])
+        assert not Message.data.is_loaded(m)
+        assert Message.data.raw(m) == b'{"big": 18446744073709551615}'
+
+        assert m.data == {"big": 18446744073709551615}
+        assert Message.data.is_loaded(m)
+        assert m.data is m.data
+
+    def test_mutation_and_assignment(self):
+        m = Message(1, 2, ChannelID(3, "c"), b'{"a": 1}', [])
+        m.data["b"] = 2
+        assert m.data == {"a": 1, "b": 2}
+
+        m.data = b'{"c": 3}'
+        assert m.data == {"c": 3}
+        m.data = {"d": 4}
+        assert Message.data.raw(m) is None
+        assert m.to_dict()["data"] == {"d": 4}
+
+    def test_from_proto_is_lazy(self):
+        source = Message(1, 2, ChannelID(3, "c"), {"temperature": 22.5}, [])
+        m = Message.from_proto(source.to_proto())
+        assert not Message.data.is_loaded(m)
+        assert m.data == {"temperature": 22.5}
+
+        a = Aggregate.from_proto(Aggregate({"x": [1, 2]}, [], None).to_proto())
+        assert not Aggregate.data.is_loaded(a)
+        assert a.data == {"x": [1, 2]}
+
+    def test_copy_and_pickle_keep_payload(self):
+        m = Message(1, 2, ChannelID(3, "c"), b'{"a": 1}', [])
+        for clone in (copy.deepcopy(m), pickle.loads(pickle.dumps(m))):
+            assert clone.data == {"a": 1}
+            assert clone.channel.name == "c"
+
+    @pytest.mark.parametrize(
+        "obj",
+        [
+            Message(1, 2, ChannelID(3, "c"), {}, []),
+            Aggregate({}, [], None),
+            Attachment.from_dict(ATTACHMENT_DICT),
+            ChannelID(3, "c"),
+            OneShotMessage(ChannelID(3, "c"), Message(1, 2, ChannelID(3, "c"), {}, [])),
+        ],
+        ids=lambda obj: type(obj).__name__,
+    )
+    def test_models_are_slotted(self, obj):
+        assert not hasattr(obj, "__dict__")
+
+
 # ── MessageLogEntry ──────────────────────────────────────────────────────
 
 
@@ -0,0 +1,190 @@
+"""Tests for periodic tasks on docker applications."""
+
+import asyncio
+
+import pytest
+
+from pydoover.docker.periodic_tasks import PeriodicTask, PeriodicTaskManager, periodic
+
+
+class TestPeriodicTask:
+    def test_rejects_bad_options(self):
+        with pytest.raises(ValueError):
+            PeriodicTask(lambda: None, 0)
+        with pytest.raises(ValueError):
+            PeriodicTask(lambda: None, 1, jitter=1)
+
+    @pytest.mark.asyncio
+    async def test_skips_while_running(self):
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+
+        task = PeriodicTask(slow, 0.01)
+        task._tick()
+        await asyncio.sleep(0)
+        assert task.is_running
+        task._tick()
+        task._tick()
+        assert (task.runs, task.skipped) == (1, 2)
+
+        await asyncio.sleep(0.02)
+        release.set()
+        await asyncio.sleep(0.01)
+        assert not task.is_running
+        assert task.timing.count == 1
+        assert task.overruns == 1
+
+    @pytest.mark.asyncio
+    async def test_overlapping_runs_allowed(self):
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+
+        task = PeriodicTask(slow, 1, skip_if_running=False)
+        task._tick()
+        task._tick()
+        await asyncio.sleep(0)
+        assert (task.runs, task.skipped, len(task._in_flight)) == (2, 0, 2)
+        release.set()
+        await asyncio.sleep(0)
+        await task.stop()
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted_and_do_not_stop_the_schedule(self):
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        task = PeriodicTask(flaky, 0.01)
+        task.start()
+        await asyncio.sleep(0.055)
+        await task.stop()
+        assert task.errors == len(calls) >= 3
+        assert task.to_dict()["errors"] == task.errors
+
+    @pytest.mark.asyncio
+    async def test_runs_sync_functions(self):
+        calls = []
+        task = PeriodicTask(lambda: calls.append(1), 0.01)
+        task.start()
+        await asyncio.sleep(0.035)
+        await task.stop()
+        assert len(calls) >= 2
+
+
+class TestPeriodicTaskManager:
+    @pytest.mark.asyncio
+    async def test_registers_decorated_methods_at_their_rates(self):
+        class Worker:
+            def __init__(self):
+                self.fast = 0
+                self.slow = 0
+
+            @property
+            def broken(self):
+                raise AssertionError("property getters must not be called")
+
+            @periodic(0.01)
+            async def sample(self):
+                self.fast += 1
+
+            @periodic(10, name="housekeeping")
+            async def tidy(self):
+                self.slow += 1
+
+        worker = Worker()
+        manager = PeriodicTaskManager()
+        manager.register_tasks(worker)
+        assert set(manager.tasks) == {"sample", "housekeeping"}
+
+        manager.start()
+        await asyncio.sleep(0.055)
+        await manager.stop()
+
+        assert worker.fast >= 4
+        assert worker.slow == 1
+        stats = manager.to_dict()
+        assert stats["sample"]["runs"] == worker.fast
+        assert stats["housekeeping"]["period"] == 10
+
+    @pytest.mark.asyncio
+    async def test_add_and_remove_at_runtime(self):
+        calls = []
+        manager = PeriodicTaskManager()
+        manager.start()
+
+        async def tick():
+            calls.append(1)
+
+        task = manager.add_task(tick, 0.01)
+        with pytest.raises(ValueError):
+            manager.add_task(tick, 1)
+        await asyncio.sleep(0.025)
+        await manager.remove_task("tick")
+        count = len(calls)
+        await asyncio.sleep(0.02)
+
+        assert count >= 2
+        assert len(calls) == count
+        assert "tick" not in manager.tasks
+        assert task.runs == count
+
+
+@pytest.mark.asyncio
+async def test_application_runs_decorated_methods(monkeypatch):
+    docker_application = pytest.importorskip("pydoover.docker.application")
+    from tests.test_tags import (
+        FakeRuntimeDeviceAgent,
+        FakeRuntimeModbusInterface,
+        FakeRuntimePlatformInterface,
+        FakeSchema,
+    )
+
+    monkeypatch.setattr(docker_application, "RUN_HEALTHCHECK", False)
+
+    class SamplingApp(docker_application.Application):
+        config_cls = FakeSchema
+        samples = 0
+
+        @periodic(0.01)
+        async def sample(self):
+            self.samples += 1
+
+    app = SamplingApp(
+        app_key="test_app",
+        device_agent=FakeRuntimeDeviceAgent(),
+        platform_iface=FakeRuntimePlatformInterface(is_async=True),
+        modbus_iface=FakeRuntimeModbusInterface(is_async=True),
+        test_mode=True,
+        healthcheck_port=0,
+    )
+    task = asyncio.create_task(app._run())
+    try:
+        await app.wait_until_ready()
+        await asyncio.sleep(0.05)
+        assert app.samples >= 3
+        assert app.periodic_tasks["sample"].runs == app.samples
+    finally:
+        await app.periodic_tasks.stop()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+def test_package_export_is_the_decorator():
+    # importing the application loads the task module; that must not shadow the
+    # lazily exported decorator on the package
+    from pydoover.docker import Application, periodic
+
+    class App(Application):
+        @periodic(1, jitter=0.5)
+        async def sample(self):
+            pass
+
+    assert App.sample._is_periodic_task
+    assert App.sample._periodic_options["period"] == 1
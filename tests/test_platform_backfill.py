@@ -0,0 +1,133 @@
+"""Tests for SleepLogBackfill: paged, resumable sleep-log history writes."""
+
+import asyncio
+import contextlib
+import json
+
+import grpc
+import pytest
+
+from pydoover.docker.platform import PlatformInterface, SleepLogBackfill
+from pydoover.models.generated.platform import (
+    platform_iface_pb2,
+    platform_iface_pb2_grpc,
+)
+from pydoover.tags.manager import TagsManagerDocker
+
+T0 = 1_700_000_000_000
+
+
+class SleepLogServicer(platform_iface_pb2_grpc.platformIfaceServicer):
+    """Serves stored entries at or after `since`, at most `page_size` per response."""
+
+    def __init__(self, num_entries: int, page_size: int = 30):
+        self.entries = [
+            platform_iface_pb2.SleepLogEntry(
+                timestamp=T0 + i * 60_000, input_voltage=12.0 + i / 100, di=[i % 2 == 1]
+            )
+            for i in range(num_entries)
+        ]
+        self.page_size = page_size
+        self.requests = []
+
+    async def getSleepLog(self, request, context):
+        self.requests.append(request.since)
+        page = [e for e in self.entries if e.timestamp >= request.since]
+        return platform_iface_pb2.getSleepLogResponse(
+            response_header=platform_iface_pb2.ResponseHeader(success=True),
+            entries=page[: self.page_size],
+        )
+
+
+class HistoryClient:
+    """Records historical messages; optionally fails on the nth write."""
+
+    def __init__(self, fail_on: int | None = None):
+        self.messages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_on = fail_on
+        self.calls = 0
+
+    async def create_message(self, channel_name, data, timestamp=None):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise RuntimeError("device agent went away")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        self.messages.append((channel_name, data, timestamp))
+
+
+@contextlib.asynccontextmanager
+async def platform(servicer):
+    server = grpc.aio.server()
+    platform_iface_pb2_grpc.add_platformIfaceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+
+    plt = PlatformInterface("test_app", f"127.0.0.1:{port}")
+    try:
+        yield plt
+    finally:
+        await plt.close()
+        await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_backfills_every_entry_in_pages_with_bounded_concurrency():
+    servicer = SleepLogServicer(75, page_size=30)
+    client = HistoryClient()
+    manager = TagsManagerDocker(client=client, app_key="app")
+    async with platform(servicer) as plt:
+        backfill = SleepLogBackfill(
+            plt,
+            manager,
+            to_tags=lambda e: {"battery": round(e.input_voltage, 2)},
+            max_concurrency=4,
+        )
+        assert await backfill.run() == 75
+
+    assert len(servicer.requests) == 4  # 30 + 30 + 15, then an empty page
+    assert servicer.requests[0] == 0
+    assert 1 < client.max_in_flight <= 4
+    messages = sorted(client.messages, key=lambda m: m[2])
+    assert messages[0][:2] == ("tag_values", {"app": {"battery": 12.0}})
+    assert messages[-1][1] == {"app": {"battery": 12.74}}
+    assert int(messages[-1][2].timestamp() * 1000) == T0 + 74 * 60_000
+
+
+@pytest.mark.asyncio
+async def test_resumes_after_interruption(tmp_path):
+    state = tmp_path / "backfill.json"
+    servicer = SleepLogServicer(50, page_size=30)
+    async with platform(servicer) as plt:
+        client = HistoryClient(fail_on=27)
+        manager = TagsManagerDocker(client=client, app_key="app")
+        backfill = SleepLogBackfill(plt, manager, state_file=state, chunk_size=10)
+        with pytest.raises(RuntimeError):
+            await backfill.run()
+        # chunks of 10: the third chunk failed, so progress is the 20th entry
+        assert json.loads(state.read_text()) == {
+            "last_timestamp": servicer.entries[19].timestamp
+        }
+
+        client = HistoryClient()
+        manager = TagsManagerDocker(client=client, app_key="app")
+        resumed = SleepLogBackfill(plt, manager, state_file=state, chunk_size=10)
+        assert await resumed.run() == 30
+        assert await resumed.run() == 0
+
+    first = client.messages[0]
+    assert first[1] == {"app": {"input_voltage": pytest.approx(12.2), "di": [False]}}
+
+
+@pytest.mark.asyncio
+async def test_log_history_sequential_by_default():
+    client = HistoryClient()
+    manager = TagsManagerDocker(client=client, app_key="app")
+    points = [(None, {"a": i}) for i in range(5)] + [(None, {})]
+    assert await manager.log_history(points) == 5
+    assert client.max_in_flight == 1
+    assert [m[1]["app"]["a"] for m in client.messages] == [0, 1, 2, 3, 4]
@@ -0,0 +1,149 @@
+"""Tests for EventCursor: paged, persistent, exactly-once event retrieval."""
+
+import contextlib
+import json
+
+import grpc
+import pytest
+
+from pydoover.docker.platform import EventCursor, PlatformInterface
+from pydoover.models.generated.platform import (
+    platform_iface_pb2,
+    platform_iface_pb2_grpc,
+)
+
+
+def _ok():
+    return platform_iface_pb2.ResponseHeader(success=True)
+
+
+class EventServicer(platform_iface_pb2_grpc.platformIfaceServicer):
+    """Serves a buffer of events in fixed-size pages, treating events_from as inclusive."""
+
+    def __init__(self, num_events: int, page_size: int = 100):
+        self.events = [
+            platform_iface_pb2.EventDetail(
+                event_id=i,
+                event="DI_R" if i % 2 else "DI_F",
+                pin=i % 3,
+                time=1_700_000_000_000 + i,
+            )
+            for i in range(1, num_events + 1)
+        ]
+        self.page_size = page_size
+        self.requests = []
+
+    def _page(self, events_from, matches):
+        remaining = [e for e in self.events if e.event_id >= events_from and matches(e)]
+        return remaining[: self.page_size], len(remaining) <= self.page_size
+
+    async def getEvents(self, request, context):
+        self.requests.append(("getEvents", request.events_from))
+        page, synced = self._page(request.events_from, lambda e: True)
+        return platform_iface_pb2.getEventsResponse(
+            response_header=_ok(), events=page, events_synced=synced
+        )
+
+    async def getDIEvents(self, request, context):
+        self.requests.append(("getDIEvents", request.events_from))
+
+        def matches(e):
+            return e.pin == request.pin and (
+                (request.rising and e.event == "DI_R")
+                or (request.falling and e.event == "DI_F")
+            )
+
+        page, synced = self._page(request.events_from, matches)
+        return platform_iface_pb2.getDIEventsResponse(
+            response_header=_ok(), events=page, events_synced=synced
+        )
+
+
+@contextlib.asynccontextmanager
+async def platform(servicer):
+    server = grpc.aio.server()
+    platform_iface_pb2_grpc.add_platformIfaceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+
+    plt = PlatformInterface("test_app", f"127.0.0.1:{port}")
+    try:
+        yield plt
+    finally:
+        await plt.close()
+        await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_pages_through_backlog_exactly_once():
+    servicer = EventServicer(2500, page_size=400)
+    async with platform(servicer) as plt:
+        cursor = plt.get_new_event_cursor()
+        ids = [e.event_id async for e in cursor]
+        assert ids == list(range(1, 2501))
+        assert cursor.synced
+        assert len(servicer.requests) == 7
+
+        # nothing new: one request, no events
+        assert await cursor.fetch_all() == []
+
+        servicer.events.append(platform_iface_pb2.EventDetail(event_id=2501))
+        assert [e.event_id for e in await cursor.fetch_all()] == [2501]
+
+
+async def _take(cursor, n):
+    taken = []
+    async for event in cursor:
+        taken.append(event.event_id)
+        if len(taken) == n:
+            break  # e.g. the device went back to sleep part way through
+    return taken
+
+
+@pytest.mark.asyncio
+async def test_di_cursor_filters_and_persists_across_restarts(tmp_path):
+    state = tmp_path / "events" / "di1.json"
+    servicer = EventServicer(60, page_size=5)
+    expected = [e.event_id for e in servicer.events if e.pin == 1 and e.event == "DI_R"]
+    async with platform(servicer) as plt:
+        cursor = EventCursor(plt, di_pin=1, edge="rising", state_file=state)
+        first = await _take(cursor, 7)
+        cursor.commit()  # a clean stop
+
+        restarted = EventCursor(plt, di_pin=1, edge="rising", state_file=state)
+        rest = [e.event_id for e in await restarted.fetch_all()]
+        assert first + rest == expected
+
+        # without a commit, only fully handled pages are remembered
+        restarted.reset(0)
+        crashed = await _take(
+            EventCursor(plt, di_pin=1, state_file=state, edge="rising"), 7
+        )
+        assert json.loads(state.read_text()) == {"last_event_id": expected[4]}
+        replayed = EventCursor(plt, di_pin=1, edge="rising", state_file=state)
+        assert crashed == expected[:7]
+        assert [e.event_id for e in await replayed.fetch_all()] == expected[5:]
+
+
+@pytest.mark.asyncio
+async def test_max_pages_bounds_each_pass():
+    servicer = EventServicer(50, page_size=10)
+    async with platform(servicer) as plt:
+        cursor = EventCursor(plt, max_pages=2)
+        assert len(await cursor.fetch_all()) == 20
+        assert not cursor.synced
+        assert len(await cursor.fetch_all()) == 20
+        assert len(await cursor.fetch_all()) == 10
+        assert cursor.synced
+        assert [e for _, e in servicer.requests] == [1, 11, 21, 31, 41]
+
+
+def test_start_from_and_reset(tmp_path):
+    state = tmp_path / "cursor.json"
+    cursor = EventCursor(None, state_file=state, start_from=42)
+    assert cursor.last_event_id == 42
+    cursor.reset(7)
+    assert EventCursor(None, state_file=state).last_event_id == 7
+
+    with pytest.raises(ValueError):
+        EventCursor(None, edge="up")
@@ -0,0 +1,158 @@
+"""Tests for PulseStreamMultiplexer: one shared pulse stream per digital input."""
+
+import asyncio
+import contextlib
+
+import grpc
+import pytest
+
+from pydoover.docker.platform import PlatformInterface, PulseCounter
+from pydoover.models.generated.platform import (
+    platform_iface_pb2,
+    platform_iface_pb2_grpc,
+)
+
+
+class PulseServicer(platform_iface_pb2_grpc.platformIfaceServicer):
+    """Streams whatever the test pushes to a pin, honouring the requested edge."""
+
+    def __init__(self):
+        self.requests = []
+        self.open_streams: dict[int, list[tuple[str, asyncio.Queue]]] = {}
+
+    async def startPulseCounter(self, request, context):
+        self.requests.append((request.di, request.edge))
+        queue = asyncio.Queue()
+        entry = (request.edge, queue)
+        self.open_streams.setdefault(request.di, []).append(entry)
+        try:
+            while True:
+                value, dt_secs = await queue.get()
+                yield platform_iface_pb2.pulseCounterResponse(
+                    response_header=platform_iface_pb2.ResponseHeader(success=True),
+                    di=request.di,
+                    value=value,
+                    dt_secs=dt_secs,
+                )
+        finally:
+            self.open_streams[request.di].remove(entry)
+
+    def edge(self, di: int, value: bool, dt_secs: float):
+        """Simulate an edge on the pin; each open stream gets it if it wants it."""
+        for edge, queue in self.open_streams.get(di, []):
+            if edge == "both" or (edge == "rising") == value:
+                queue.put_nowait((value, dt_secs))
+
+    def streams(self, di: int) -> int:
+        return len(self.open_streams.get(di, []))
+
+
+@contextlib.asynccontextmanager
+async def platform():
+    servicer = PulseServicer()
+    server = grpc.aio.server()
+    platform_iface_pb2_grpc.add_platformIfaceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+
+    plt = PlatformInterface("test_app", f"127.0.0.1:{port}")
+    try:
+        yield plt, servicer
+    finally:
+        await plt.close()
+        await server.stop(grace=None)
+
+
+async def _wait_for(predicate, timeout=2.0):
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_listeners_on_one_pin_share_a_stream():
+    async with platform() as (plt, servicer):
+        first, second = [], []
+
+        async def on_first(*args):
+            first.append(args)
+
+        async def on_second(*args):
+            second.append(args)
+
+        plt.start_di_pulse_listener(0, on_first)
+        plt.start_di_pulse_listener(0, on_second, start_count=10)
+        await _wait_for(lambda: servicer.streams(0) == 1)
+
+        servicer.edge(0, True, 0.5)
+        servicer.edge(0, True, 0.25)
+        await _wait_for(lambda: len(second) == 2)
+
+        assert first == [(0, True, 0.5, 1, "rising"), (0, True, 0.25, 2, "rising")]
+        assert [count for *_, count, _ in second] == [11, 12]
+        assert servicer.requests == [(0, "rising")]
+
+
+@pytest.mark.asyncio
+async def test_mixed_edges_upgrade_to_both_and_filter_per_listener():
+    async with platform() as (plt, servicer):
+        rising, falling = [], []
+        rising_listener = plt.start_di_pulse_listener(
+            3, lambda *a: rising.append(a), edge="rising"
+        )
+        await _wait_for(lambda: servicer.streams(3) == 1)
+
+        plt.start_di_pulse_listener(3, lambda *a: falling.append(a), edge="falling")
+        await _wait_for(lambda: [e for e, _ in servicer.open_streams[3]] == ["both"])
+
+        servicer.edge(3, True, 1.0)
+        servicer.edge(3, False, 0.5)
+        servicer.edge(3, True, 2.0)
+        await _wait_for(lambda: len(rising) == 2 and len(falling) == 1)
+
+        # dt is the time since that listener's previous edge, across the other edge
+        assert [(dt, count) for _, _, dt, count, _ in rising] == [(1.0, 1), (2.5, 2)]
+        assert [(dt, count) for _, _, dt, count, _ in falling] == [(1.5, 1)]
+
+        # with the rising listener gone, the stream narrows back to falling only
+        assert rising_listener.cancel() is True
+        assert rising_listener.cancel() is False
+        await _wait_for(lambda: servicer.requests[-1] == (3, "falling"))
+        assert plt.pulse_mux.stream_edge(3) == "falling"
+
+
+@pytest.mark.asyncio
+async def test_single_edge_stream_is_not_refiltered_on_value():
+    async with platform() as (plt, servicer):
+        falling = []
+        plt.start_di_pulse_listener(2, lambda *a: falling.append(a), edge="falling")
+        await _wait_for(lambda: servicer.streams(2) == 1)
+
+        # the platform already filtered the stream, so trust it over the DI value
+        ((_, queue),) = servicer.open_streams[2]
+        queue.put_nowait((True, 0.5))
+        await _wait_for(lambda: len(falling) == 1)
+        assert falling == [(2, True, 0.5, 1, "falling")]
+
+
+@pytest.mark.asyncio
+async def test_stream_closes_when_last_listener_leaves():
+    async with platform() as (plt, servicer):
+        counter = PulseCounter(plt, 5)
+        other = plt.start_di_pulse_listener(5, lambda *a: None)
+        await _wait_for(lambda: servicer.streams(5) == 1)
+
+        counter.stop_listener_pulses()
+        await asyncio.sleep(0.05)
+        assert servicer.streams(5) == 1
+
+        other.cancel()
+        await _wait_for(lambda: servicer.streams(5) == 0)
+        assert plt.pulse_mux.listeners == {}
+        assert plt.pulse_counter_listeners == []
+
+
+def test_rejects_unknown_edge():
+    plt = PlatformInterface("test_app", "127.0.0.1:1")
+    with pytest.raises(ValueError):
+        plt.start_di_pulse_listener(0, print, edge="sideways")
@@ -0,0 +1,115 @@
+"""Tests for PulseBuffer and the PulseCounter window queries built on it."""
+
+import logging
+
+import pytest
+
+from pydoover.docker.platform import PulseBuffer, PulseCounter
+from pydoover.docker.platform.pulse_buffer import INITIAL_PULSE_STORAGE, pulse_capacity
+
+
+def make_counter(**kwargs) -> PulseCounter:
+    return PulseCounter(None, 0, auto_start=False, **kwargs)
+
+
+class TestPulseBuffer:
+    def test_append_and_read_like_a_list(self):
+        buf = PulseBuffer(4)
+        buf += [1.0, 2.0, 3.0]
+        assert len(buf) == 3
+        assert list(buf) == [1.0, 2.0, 3.0]
+        assert buf[0] == 1.0 and buf[-1] == 3.0
+        with pytest.raises(IndexError):
+            buf[3]
+
+    def test_overwrites_oldest_when_full(self):
+        buf = PulseBuffer(3)
+        buf.extend([1.0, 2.0, 3.0, 4.0, 5.0])
+        assert list(buf) == [3.0, 4.0, 5.0]
+        assert buf.overflowed == 2
+        assert buf.nbytes == 24
+
+    @pytest.mark.parametrize("extra", range(6))
+    def test_window_queries_across_wraparound(self, extra):
+        buf = PulseBuffer(5)
+        buf.extend(float(t) for t in range(5 + extra))
+        stored = list(buf)
+        for cutoff in [-1, *stored, 3.5, 100]:
+            expected = [t for t in stored if t > cutoff]
+            assert buf.after(cutoff) == expected
+            assert buf.count_after(cutoff) == len(expected)
+
+    def test_discard_before(self):
+        buf = PulseBuffer(4)
+        buf.extend([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        assert buf.discard_before(5.0) == 2
+        assert list(buf) == [5.0, 6.0]
+        buf.append(7.0)
+        assert list(buf) == [5.0, 6.0, 7.0]
+        assert buf.discard_before(100) == 3
+        assert not buf
+
+    def test_storage_grows_as_pulses_arrive(self):
+        buf = PulseBuffer(5000)
+        assert buf.nbytes == 8 * INITIAL_PULSE_STORAGE
+        assert buf.max_nbytes == 8 * 5000
+        buf.extend(float(t) for t in range(4000))
+        assert buf.nbytes == 8 * 4096
+        # a ring that has wrapped keeps its order when it grows again
+        buf.discard_before(100.0)
+        buf.extend(float(t) for t in range(4000, 5200))
+        assert buf.nbytes == 8 * 5000 and buf.overflowed == 100
+        assert list(buf) == [float(t) for t in range(200, 5200)]
+        assert buf.count_after(5100.0) == 99
+
+    def test_append_returns_the_overwritten_timestamp(self):
+        buf = PulseBuffer(2)
+        assert buf.append(1.0) is None
+        assert buf.append(2.0) is None
+        assert buf.append(3.0) == 1.0
+
+    def test_keeps_timestamps_non_decreasing(self):
+        buf = PulseBuffer(4)
+        buf.extend([10.0, 9.0, 11.0])
+        assert list(buf) == [10.0, 10.0, 11.0]
+
+
+class TestPulseCounterWindow:
+    def test_window_is_relative_to_latest_pulse(self):
+        counter = make_counter(rate_window_secs=10)
+        counter.add_existing_events([100.0, 105.0, 111.0, 112.0, 120.0])
+        assert counter.get_pulses_in_window() == [111.0, 112.0, 120.0]
+        assert counter.count_pulses_in_window() == 3
+        assert counter.get_pulses_per_minute() == 18
+        assert counter.count == 5
+
+    def test_cap_keeps_count_and_reports_drops(self):
+        counter = make_counter(max_pulses=3)
+        counter.add_existing_events([1.0, 2.0, 3.0, 4.0])
+        assert counter.count == 4
+        assert counter.dropped_pulses == 1
+        assert list(counter.pulse_timestamps) == [2.0, 3.0, 4.0]
+
+    def test_default_capacity_covers_the_window_at_10khz(self):
+        counter = make_counter(rate_window_secs=60)
+        assert counter.pulse_timestamps.capacity == 600_000
+        assert counter.pulse_timestamps.nbytes == 8 * INITIAL_PULSE_STORAGE
+        counter.set_rate_window(120)
+        assert counter.pulse_timestamps.capacity == pulse_capacity(120)
+        assert make_counter(max_pulses=10).pulse_timestamps.capacity == 10
+
+    def test_warns_once_when_the_window_overflows(self, caplog):
+        caplog.set_level(logging.WARNING, logger="pydoover.docker.platform.platform")
+        counter = make_counter(rate_window_secs=10, max_pulses=3)
+        # evicting pulses older than the window is expected and silent
+        counter.add_existing_events([1.0, 2.0, 3.0, 20.0])
+        assert counter.dropped_pulses == 1 and not caplog.records
+
+        counter.add_existing_events([21.0, 22.0, 23.0, 24.0])
+        warnings = [r for r in caplog.records if "under-reported" in r.getMessage()]
+        assert len(warnings) == 1
+
+    def test_empty_counter(self):
+        counter = make_counter()
+        assert counter.get_pulses_in_window() == []
+        assert counter.get_pulses_per_minute() == 0
@@ -0,0 +1,130 @@
+"""Tests for IoSnapshot: batched, per-tick IO reads through PlatformInterface."""
+
+import asyncio
+import contextlib
+
+import grpc
+import pytest
+
+from pydoover.docker.platform import PlatformInterface
+from pydoover.models.generated.platform import (
+    platform_iface_pb2,
+    platform_iface_pb2_grpc,
+)
+
+
+def _ok():
+    return platform_iface_pb2.ResponseHeader(success=True)
+
+
+class IoServicer(platform_iface_pb2_grpc.platformIfaceServicer):
+    """A 16 channel board: DI n is high for odd n, AI n reads n * 1.5."""
+
+    def __init__(self):
+        self.requests = []
+        self.do = [False] * 16
+
+    async def getDI(self, request, context):
+        self.requests.append(("getDI", list(request.di)))
+        return platform_iface_pb2.getDIResponse(
+            response_header=_ok(), di=[bool(p % 2) for p in request.di]
+        )
+
+    async def getAI(self, request, context):
+        self.requests.append(("getAI", list(request.ai)))
+        return platform_iface_pb2.getAIResponse(
+            response_header=_ok(), ai=[p * 1.5 for p in request.ai]
+        )
+
+    async def getDO(self, request, context):
+        self.requests.append(("getDO", list(request.do)))
+        return platform_iface_pb2.getDOResponse(
+            response_header=_ok(), do=[self.do[p] for p in request.do]
+        )
+
+    async def setDO(self, request, context):
+        self.requests.append(("setDO", list(request.do)))
+        for pin, value in zip(request.do, request.value):
+            self.do[pin] = value
+        return platform_iface_pb2.setDOResponse(
+            response_header=_ok(), do=[True] * len(request.do)
+        )
+
+
+@contextlib.asynccontextmanager
+async def platform():
+    servicer = IoServicer()
+    server = grpc.aio.server()
+    platform_iface_pb2_grpc.add_platformIfaceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+
+    plt = PlatformInterface("test_app", f"127.0.0.1:{port}")
+    try:
+        yield plt, servicer
+    finally:
+        await plt.close()
+        await server.stop(grace=None)
+
+
+@pytest.mark.asyncio
+async def test_reads_are_batched_per_kind_and_tick():
+    async with platform() as (plt, servicer):
+        snapshot = plt.enable_io_snapshot(pins={"di": range(8), "ai": range(4)})
+
+        assert await plt.fetch_di(3) is True
+        assert await plt.fetch_di(0, 1) == [False, True]
+        assert await plt.fetch_ai(2) == pytest.approx(3.0)
+        assert await plt.fetch_ai(1, 3) == pytest.approx([1.5, 4.5])
+        assert servicer.requests == [
+            ("getDI", list(range(8))),
+            ("getAI", list(range(4))),
+        ]
+
+        snapshot.new_tick()
+        await asyncio.gather(plt.fetch_di(1), plt.fetch_di(2), plt.fetch_di(5))
+        assert servicer.requests[2:] == [("getDI", list(range(8)))]
+        assert snapshot.requests_made == 3
+
+
+@pytest.mark.asyncio
+async def test_new_pins_are_learned_and_set_do_invalidates():
+    async with platform() as (plt, servicer):
+        plt.enable_io_snapshot()
+
+        assert await plt.fetch_do(1) is False
+        assert await plt.fetch_do(2) is False  # not seen before: refetch with it
+        assert await plt.set_do(2, True) is True
+        assert await plt.fetch_do(2) is True
+        assert await plt.fetch_do(1) is False  # served from the refreshed snapshot
+
+        assert servicer.requests == [
+            ("getDO", [1]),
+            ("getDO", [1, 2]),
+            ("setDO", [2]),
+            ("getDO", [1, 2]),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_max_age_outlives_ticks():
+    async with platform() as (plt, servicer):
+        snapshot = plt.enable_io_snapshot(max_age=60)
+        await plt.fetch_di(1)
+        snapshot.new_tick()
+        await plt.fetch_di(1)
+        assert len(servicer.requests) == 1
+
+        snapshot.max_age = 0
+        await plt.fetch_di(1)
+        assert len(servicer.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_snapshot_hits_the_server_every_time():
+    async with platform() as (plt, servicer):
+        plt.enable_io_snapshot()
+        plt.disable_io_snapshot()
+        await plt.fetch_di(1)
+        await plt.fetch_di(1)
+        assert servicer.requests == [("getDI", [1]), ("getDI", [1])]
@@ -0,0 +1,208 @@
+"""Tests for on-demand application profiling."""
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from pydoover.docker.profiler import (
+    MIN_SAMPLE_INTERVAL,
+    PROFILE_CHANNEL,
+    AppProfiler,
+    StackSampler,
+    profile,
+)
+from pydoover.rpc import RPCError
+
+
+def _busy_for(secs):
+    end = time.perf_counter() + secs
+    while time.perf_counter() < end:
+        pass
+
+
+class FakeApp:
+    app_key = "test_app"
+    name = "FakeApp"
+
+    def __init__(self):
+        self.messages = []
+
+    async def create_message(self, channel_name, data, files=None):
+        self.messages.append((channel_name, data, files))
+        return 42
+
+
+class FakeContext:
+    def __init__(self):
+        self.acknowledged = False
+
+    async def acknowledge(self):
+        self.acknowledged = True
+
+
+def test_stack_sampler_collapses_stacks():
+    switch_interval = sys.getswitchinterval()
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    try:
+        _busy_for(0.1)
+    finally:
+        sampler.stop()
+
+    assert sys.getswitchinterval() == switch_interval
+    assert sampler.samples > 10
+    lines = sampler.collapsed().splitlines()
+    top_stack, top_count = lines[0].rsplit(" ", 1)
+    assert "_busy_for" in top_stack.split(";")[-1]
+    assert int(top_count) == max(sampler.stacks.values())
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sampler.samples
+
+
+def test_stack_sampler_interval_has_a_floor():
+    switch_interval = sys.getswitchinterval()
+    sampler = StackSampler(interval=1e-9)
+    assert sampler.interval == MIN_SAMPLE_INTERVAL
+    sampler.start()
+    try:
+        assert sys.getswitchinterval() == pytest.approx(MIN_SAMPLE_INTERVAL / 10)
+    finally:
+        sampler.stop()
+    assert sys.getswitchinterval() == switch_interval
+
+
+@pytest.mark.asyncio
+async def test_sample_profile_sees_event_loop_work():
+    async def work():
+        for _ in range(20):
+            _busy_for(0.005)
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(work())
+    result = await profile(0.15, interval=0.001)
+    await task
+
+    assert result.mode == "sample"
+    assert result.samples > 0
+    assert "_busy_for" in result.report
+    file = result.to_file("p")
+    assert file.filename == "p.collapsed"
+    assert file.size == len(result.report.encode())
+
+
+@pytest.mark.asyncio
+async def test_cprofile_profile_reports_calls():
+    async def work():
+        _busy_for(0.01)
+
+    task = asyncio.create_task(work())
+    result = await profile(0.05, mode="cprofile")
+    await task
+
+    assert result.samples > 0
+    assert "_busy_for" in result.report
+    assert result.to_file().filename == "profile.txt"
+
+
+@pytest.mark.asyncio
+async def test_profile_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        await profile(0.01, mode="perf")
+
+
+@pytest.mark.asyncio
+async def test_app_profiler_uploads_one_profile_at_a_time():
+    app = FakeApp()
+    profiler = AppProfiler(app)
+
+    with pytest.raises(ValueError):
+        await profiler.run(0)
+
+    running = asyncio.create_task(profiler.run(0.05))
+    await asyncio.sleep(0)
+    assert profiler.is_running
+    with pytest.raises(RuntimeError):
+        await profiler.run(0.01)
+
+    result, message_id = await running
+    assert message_id == 42
+    [(channel, data, files)] = app.messages
+    assert channel == PROFILE_CHANNEL
+    assert data["type"] == "profile"
+    assert data["samples"] == result.samples
+    assert files[0].filename.startswith("test_app-")
+    assert files[0].data == result.report.encode()
+
+
+def _make_app(app_cls=None, **attrs):
+    pytest.importorskip("pydoover.docker.application")
+    from tests.test_tags import (
+        AsyncStartupApp,
+        FakeRuntimeDeviceAgent,
+        FakeRuntimeModbusInterface,
+        FakeRuntimePlatformInterface,
+    )
+
+    app_cls = type("ProfiledApp", (app_cls or AsyncStartupApp,), attrs)
+    return app_cls(
+        app_key="test_app",
+        device_agent=FakeRuntimeDeviceAgent(),
+        platform_iface=FakeRuntimePlatformInterface(is_async=True),
+        modbus_iface=FakeRuntimeModbusInterface(is_async=True),
+        test_mode=True,
+        healthcheck_port=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_profiling_alone_does_not_subscribe_to_rpc():
+    app = _make_app()
+    await app._setup()
+
+    assert "dv-rpc" not in app.device_agent.subscriptions
+    with pytest.raises(KeyError):
+        app.rpc._get_handler("dv-rpc", "dv-profile")
+
+
+@pytest.mark.asyncio
+async def test_profile_handler_shares_an_existing_rpc_subscription():
+    from pydoover.rpc import handler
+
+    @handler("ping", channel="dv-rpc")
+    async def ping(self, ctx, payload):
+        return {}
+
+    app = _make_app(ping=ping)
+    await app._setup()
+
+    assert "dv-rpc" in app.device_agent.subscriptions
+    _, profile_handler = app.rpc._get_handler("dv-rpc", "dv-profile")
+    assert profile_handler == app._on_profile_request
+
+
+@pytest.mark.asyncio
+async def test_application_handles_profile_rpc(monkeypatch):
+    app = _make_app(remote_profiling=True)
+    await app._setup()
+    assert "dv-rpc" in app.device_agent.subscriptions
+    _, handler = app.rpc._get_handler("dv-rpc", "dv-profile")
+
+    uploaded = []
+
+    async def create_message(channel_name, data, files=None, timestamp=None):
+        uploaded.append((channel_name, files))
+        return 7
+
+    monkeypatch.setattr(app, "create_message", create_message)
+
+    ctx = FakeContext()
+    response = await handler(ctx, {"duration": 0.02})
+    assert ctx.acknowledged
+    assert response["message_id"] == 7
+    assert response["mode"] == "sample"
+    assert uploaded[0][0] == PROFILE_CHANNEL
+
+    with pytest.raises(RPCError) as exc:
+        await handler(FakeContext(), {"duration": 0.02, "mode": "perf"})
+    assert exc.value.code == "INVALID_PARAMS"
@@ -0,0 +1,293 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from aiohttp import web
+
+from pydoover.api import AsyncDataClient, DataClient, NotFoundError
+from pydoover.api.data import ResponseCache
+from pydoover.models.data import BatchMutationItem
+from pydoover.utils.clock import use_clock
+
+AGENT = 123
+
+
+class StubChannelServer:
+    """Channels and aggregates served from memory, each GET taking ``delay`` seconds."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.aggregates = {"tag_values": {"n": 1}, "ui_state": {"state": "on"}}
+        self.requests: list[tuple[str, str]] = []
+        self.url = None
+
+    def gets(self, path: str = "") -> int:
+        return sum(1 for m, p in self.requests if m == "GET" and p.endswith(path))
+
+    def _channel(self, name: str) -> dict:
+        return {
+            "name": name,
+            "owner_id": AGENT,
+            "is_private": False,
+            "aggregate": {"data": self.aggregates[name], "attachments": []},
+        }
+
+    async def _get(self, request: web.Request):
+        self.requests.append(("GET", request.path))
+        await asyncio.sleep(self.delay)
+        channel = request.match_info.get("channel")
+        if channel is None:
+            return web.json_response([self._channel(c) for c in self.aggregates])
+        if channel not in self.aggregates:
+            raise web.HTTPNotFound(text="no such channel")
+        if request.path.endswith("/aggregate"):
+            return web.json_response(self._channel(channel)["aggregate"])
+        return web.json_response(self._channel(channel))
+
+    async def _patch_aggregate(self, request: web.Request):
+        self.requests.append(("PATCH", request.path))
+        self.aggregates[request.match_info["channel"]].update(await request.json())
+        return web.json_response(
+            self._channel(request.match_info["channel"])["aggregate"]
+        )
+
+    async def _batch(self, request: web.Request):
+        self.requests.append((request.method, request.path))
+        items = (await request.json())["items"]
+        for item in items:
+            self.aggregates[item["channel_name"]].update(item["data"])
+        results = [
+            {
+                "agent_id": item["agent_id"],
+                "channel_name": item["channel_name"],
+                "success": True,
+            }
+            for item in items
+        ]
+        return web.json_response(
+            {
+                "items": results,
+                "count": len(items),
+                "succeeded": len(items),
+                "failed": 0,
+            }
+        )
+
+    def routes(self) -> list[web.RouteDef]:
+        base = "/agents/{agent}/channels"
+        return [
+            web.get(base, self._get),
+            web.get(base + "/{channel}", self._get),
+            web.get(base + "/{channel}/aggregate", self._get),
+            web.patch(base + "/{channel}/aggregate", self._patch_aggregate),
+            web.patch("/agents/aggregates", self._batch),
+        ]
+
+
+@pytest.fixture
+def server(serve_routes):
+    stub = StubChannelServer()
+    stub.url = serve_routes(stub.routes())
+    return stub
+
+
+class SteppedClock:
+    def __init__(self):
+        self.at = 1000.0
+
+    def time(self) -> float:
+        return self.at
+
+    def monotonic(self) -> float:
+        return self.at
+
+
+def _client(server, responses: ResponseCache) -> DataClient:
+    return DataClient(base_url=server.url, token="test-token", response_cache=responses)
+
+
+def _async_client(server, responses: ResponseCache) -> AsyncDataClient:
+    return AsyncDataClient(
+        base_url=server.url, token="test-token", response_cache=responses
+    )
+
+
+class TestSyncClient:
+    def test_repeat_reads_within_the_ttl_are_cached(self, server):
+        responses = ResponseCache(ttl=5)
+        clock = SteppedClock()
+        with _client(server, responses) as client, use_clock(clock):
+            first = client.fetch_channel_aggregate(AGENT, "tag_values")
+            second = client.fetch_channel_aggregate(AGENT, "tag_values")
+            clock.at += 6
+            third = client.fetch_channel_aggregate(AGENT, "tag_values")
+
+        assert first.data == second.data == third.data == {"n": 1}
+        assert server.gets("/aggregate") == 2
+        stats = responses.stats
+        assert (stats.hits, stats.misses, stats.coalesced) == (1, 2, 0)
+        assert stats.hit_rate == pytest.approx(1 / 3)
+
+    def test_callers_get_their_own_copy(self, server):
+        with _client(server, ResponseCache()) as client:
+            first = client.fetch_channel_aggregate(AGENT, "tag_values")
+            first.data["n"] = 99
+            second = client.fetch_channel_aggregate(AGENT, "tag_values")
+        assert second.data == {"n": 1}
+
+    def test_concurrent_reads_share_one_request(self, server):
+        responses = ResponseCache(ttl=0)
+        with _client(server, responses) as client:
+            with ThreadPoolExecutor(8) as pool:
+                channels = list(
+                    pool.map(
+                        lambda _: client.fetch_channel(AGENT, "ui_state"), range(8)
+                    )
+                )
+
+        assert {c.name for c in channels} == {"ui_state"}
+        assert server.gets("/ui_state") < 8
+        stats = responses.stats
+        assert stats.misses == server.gets("/ui_state")
+        assert stats.coalesced == 8 - stats.misses
+        assert len(responses) == 0  # ttl=0 only shares requests in flight
+
+    def test_different_arguments_are_cached_apart(self, server):
+        with _client(server, ResponseCache()) as client:
+            client.fetch_channel(AGENT, "ui_state", include_aggregate=True)
+            client.fetch_channel(AGENT, "ui_state", include_aggregate=False)
+            client.fetch_channel(AGENT, "ui_state", organisation_id=7)
+        assert server.gets("/ui_state") == 3
+
+    def test_writes_invalidate_the_resource(self, server):
+        responses = ResponseCache()
+        with _client(server, responses) as client:
+            client.list_channels(AGENT)
+            client.fetch_channel_aggregate(AGENT, "tag_values")
+            client.fetch_channel_aggregate(AGENT, "ui_state")
+            client.update_channel_aggregate(AGENT, "tag_values", {"n": 2})
+
+            assert client.fetch_channel_aggregate(AGENT, "tag_values").data == {"n": 2}
+            tag_values = next(
+                c for c in client.list_channels(AGENT) if c.name == "tag_values"
+            )
+            assert tag_values.aggregate.data == {"n": 2}
+            client.fetch_channel_aggregate(AGENT, "ui_state")
+
+        # the other channel's aggregate was left cached
+        assert server.gets("/ui_state/aggregate") == 1
+        assert server.gets("/tag_values/aggregate") == 2
+        assert server.gets("/channels") == 2
+        assert responses.invalidations == 1
+
+    def test_batch_writes_invalidate_each_channel_they_name(self, server):
+        with _client(server, ResponseCache()) as client:
+            client.fetch_channel_aggregate(AGENT, "tag_values")
+            client.fetch_channel_aggregate(AGENT, "ui_state")
+            client.batch_update_aggregates(
+                [BatchMutationItem(AGENT, "ui_state", {"state": "off"})]
+            )
+            client.fetch_channel_aggregate(AGENT, "tag_values")
+            aggregate = client.fetch_channel_aggregate(AGENT, "ui_state")
+
+        assert aggregate.data == {"state": "off"}
+        assert server.gets("/tag_values/aggregate") == 1
+        assert server.gets("/ui_state/aggregate") == 2
+
+    def test_per_endpoint_ttls_and_stats(self, server):
+        responses = ResponseCache(ttl=5, ttls={"/agents/*/channels/*/aggregate": 0})
+        with _client(server, responses) as client:
+            for _ in range(3):
+                client.fetch_channel_aggregate(AGENT, "tag_values")
+                client.fetch_channel(AGENT, "tag_values")
+
+        assert server.gets("/aggregate") == 3
+        assert server.gets("/tag_values") == 1
+        stats = responses.endpoint_stats()
+        assert stats["/agents/*/channels/*/aggregate"].hit_rate == 0
+        assert (stats["*"].hits, stats["*"].misses) == (2, 1)
+
+    def test_errors_are_not_cached(self, server):
+        responses = ResponseCache()
+        with _client(server, responses) as client:
+            for _ in range(2):
+                with pytest.raises(NotFoundError):
+                    client.fetch_channel(AGENT, "missing")
+        assert server.gets("/missing") == 2 and len(responses) == 0
+
+    def test_oldest_entries_are_evicted(self, server):
+        responses = ResponseCache(max_entries=2)
+        with _client(server, responses) as client:
+            client.fetch_channel_aggregate(AGENT, "tag_values")
+            client.fetch_channel_aggregate(AGENT, "ui_state")
+            client.list_channels(AGENT)
+            client.fetch_channel_aggregate(AGENT, "tag_values")
+        assert len(responses) == 2
+        assert server.gets("/tag_values/aggregate") == 2
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            ResponseCache(ttl=-1)
+        with pytest.raises(ValueError):
+            ResponseCache(ttls={"/agents/*": -1})
+        with pytest.raises(ValueError):
+            ResponseCache(max_entries=0)
+
+
+@pytest.mark.asyncio
+async def test_async_concurrent_reads_share_one_request(server):
+    responses = ResponseCache()
+    client = _async_client(server, responses)
+    await client.setup()
+    try:
+        aggregates = await asyncio.gather(
+            *(client.fetch_channel_aggregate(AGENT, "tag_values") for _ in range(10))
+        )
+        again = await client.fetch_channel_aggregate(AGENT, "tag_values")
+    finally:
+        await client.close()
+
+    assert all(a.data == {"n": 1} for a in aggregates) and again.data == {"n": 1}
+    assert server.gets("/aggregate") == 1
+    stats = responses.stats
+    assert (stats.misses, stats.coalesced, stats.hits) == (1, 9, 1)
+
+
+@pytest.mark.asyncio
+async def test_async_cancelled_caller_does_not_fail_the_others(server):
+    responses = ResponseCache()
+    client = _async_client(server, responses)
+    await client.setup()
+    try:
+        first = asyncio.ensure_future(client.fetch_channel(AGENT, "ui_state"))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(client.fetch_channel(AGENT, "ui_state"))
+        await asyncio.sleep(0)
+        first.cancel()
+        channel = await second
+    finally:
+        await client.close()
+
+    assert channel.name == "ui_state"
+    assert server.gets("/ui_state") == 1 and len(responses) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_write_during_a_read_is_not_undone(server):
+    responses = ResponseCache()
+    client = _async_client(server, responses)
+    await client.setup()
+    try:
+        read = asyncio.ensure_future(
+            client.fetch_channel_aggregate(AGENT, "tag_values")
+        )
+        await asyncio.sleep(0.01)
+        await client.update_channel_aggregate(AGENT, "tag_values", {"n": 3})
+        await read
+        latest = await client.fetch_channel_aggregate(AGENT, "tag_values")
+    finally:
+        await client.close()
+
+    # the read in flight across the write wasn't cached
+    assert latest.data == {"n": 3}
+    assert server.gets("/aggregate") == 2
@@ -0,0 +1,246 @@
+"""Tests for running docker applications on a virtual clock."""
+
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from pydoover.docker import (
+    Application,
+    MockModbusInterface,
+    MockPlatformInterface,
+    periodic,
+)
+from pydoover.docker.simulation import (
+    DEFAULT_START,
+    Simulation,
+    VirtualClock,
+    VirtualEventLoop,
+)
+from pydoover.tags import Boolean, Number, Tags
+from pydoover.utils import clock
+from pydoover.utils.alarm import Alarm
+
+
+class PumpTags(Tags):
+    level = Number(default=0)
+    pump_on = Boolean(default=False)
+
+
+class PumpApp(Application):
+    tags_cls = PumpTags
+
+    async def setup(self):
+        self.loops = 0
+        self.samples = 0
+        self.alarms = []
+        self.high_level = Alarm(
+            lambda level: level > 90,
+            callback=lambda: self.alarms.append(clock.now()),
+            grace_period=600,
+            min_inter_alarm=3600,
+        )
+
+    @periodic(10)
+    async def sample(self):
+        self.samples += 1
+
+    async def main_loop(self):
+        self.loops += 1
+        level = await self.platform_iface.fetch_ai(0)
+        await self.high_level.check_value(level, self.high_level.threshold_met)
+        await self.tags.level.set(level)
+        on = level < 20
+        await self.platform_iface.set_do(1, on)
+        await self.tags.pump_on.set(on)
+
+
+class BrokenApp(Application):
+    async def setup(self):
+        raise RuntimeError("no sensor")
+
+
+class TestVirtualEventLoop:
+    def test_sleep_takes_no_real_time(self):
+        loop = VirtualEventLoop()
+        try:
+            start = time.perf_counter()
+            loop.run_until_complete(asyncio.sleep(3600))
+            assert time.perf_counter() - start < 1
+            assert loop.clock.elapsed == pytest.approx(3600)
+            assert loop.clock.time() == pytest.approx(DEFAULT_START.timestamp() + 3600)
+        finally:
+            loop.close()
+
+    def test_timers_fire_in_order(self):
+        loop = VirtualEventLoop()
+        fired = []
+
+        async def waiter(secs):
+            await asyncio.sleep(secs)
+            fired.append((secs, loop.time()))
+
+        async def main():
+            await asyncio.gather(
+                waiter(30), waiter(5), asyncio.wait_for(waiter(10), 60)
+            )
+
+        try:
+            loop.run_until_complete(main())
+        finally:
+            loop.close()
+        assert [secs for secs, _ in fired] == [5, 10, 30]
+        assert [at for _, at in fired] == pytest.approx([5, 10, 30])
+
+    def test_executor_runs_inline(self):
+        loop = VirtualEventLoop()
+        try:
+            assert loop.run_until_complete(loop.run_in_executor(None, sum, [1, 2])) == 3
+            with pytest.raises(ZeroDivisionError):
+                loop.run_until_complete(loop.run_in_executor(None, divmod, 1, 0))
+        finally:
+            loop.close()
+
+    def test_clock_cannot_go_backwards(self):
+        with pytest.raises(ValueError):
+            VirtualClock().advance(-1)
+
+
+class TestSimulation:
+    def test_hours_of_operation(self):
+        start = time.perf_counter()
+        with Simulation(PumpApp) as sim:
+            sim.platform_iface.ai[0] = 10.0
+            sim.call_later(3600, sim.platform_iface.ai.__setitem__, 0, 80.0)
+            sim.run_for(1800)
+            assert sim.platform_iface.do[1] is True
+
+            sim.run_for(timedelta(hours=6))
+            assert sim.platform_iface.do[1] is False
+            assert sim.now == DEFAULT_START + timedelta(hours=6, minutes=30)
+
+            app = sim.app
+            # one loop per simulated second, and one sample per 10
+            assert app.loops == 23_400
+            assert app.samples == 2_341
+            assert app.tags.level.value == 80.0
+
+            logged = sim.messages("tag_values")
+            assert [m.data[sim.app.app_key]["pump_on"] for m in logged] == [True, False]
+            assert logged[1].timestamp - DEFAULT_START < timedelta(hours=2)
+        assert time.perf_counter() - start < 30
+
+    def test_alarm_grace_period_and_repeat(self):
+        with Simulation(PumpApp, start=DEFAULT_START) as sim:
+            sim.platform_iface.ai[0] = 95.0
+            sim.run_until(DEFAULT_START + timedelta(hours=3))
+            alarms = [at - DEFAULT_START for at in sim.app.alarms]
+
+        # the first after the 10 minute grace period, then once an hour
+        assert len(alarms) == 3
+        assert timedelta(minutes=10) < alarms[0] < timedelta(minutes=11)
+        assert alarms[1] - alarms[0] == pytest.approx(
+            timedelta(hours=1), abs=timedelta(seconds=2)
+        )
+
+    def test_scripted_channel_events(self):
+        received = []
+
+        async def on_level(key, value):
+            received.append((sim.elapsed, value))
+
+        with Simulation(PumpApp, app_key="pump") as sim:
+            sim.start()
+            sim.app.subscribe_to_tag("level", on_level, app_key="other")
+            sim.call_later(
+                100,
+                sim.device_agent.simulate_aggregate_update,
+                "tag_values",
+                {"other": {"level": 42}},
+            )
+            sim.run_for(200)
+
+        assert len(received) == 1
+        assert received[0][0] == pytest.approx(100)
+        assert received[0][1] == 42
+
+    def test_config_and_pulses(self):
+        counts = []
+
+        class CounterApp(Application):
+            async def setup(self):
+                self.counter = self.platform_iface.get_new_pulse_counter(
+                    2, callback=lambda *args: counts.append(args[3])
+                )
+
+        with Simulation(CounterApp, config={"threshold": 5}) as sim:
+            sim.run_for(1)
+            assert sim.device_agent._aggregates["deployment_config"].data == {
+                "applications": {"sim_app": {"threshold": 5}}
+            }
+            for i in range(1, 6):
+                sim.call_later(i * 10, sim.platform_iface.pulse, 2)
+            sim.run_for(60)
+            assert sim.app.counter.count == 5
+
+        assert counts == [1, 2, 3, 4, 5]
+
+    def test_modbus_subscription_polls(self):
+        reads = []
+
+        class ModbusApp(Application):
+            async def setup(self):
+                self.modbus_iface.add_read_register_subscription(
+                    start_address=10,
+                    num_registers=2,
+                    poll_secs=5,
+                    callback=lambda values: reads.append((sim.elapsed, values)),
+                )
+
+        with Simulation(ModbusApp) as sim:
+            sim.modbus_iface.set_registers(10, [1, 2])
+            sim.call_later(12, sim.modbus_iface.set_registers, 10, [3, 4])
+            sim.run_for(30)
+
+        assert 5 <= len(reads) <= 7
+        assert reads[0][1] == [1, 2]
+        assert reads[-1][1] == [3, 4]
+
+    def test_setup_failure_raises(self):
+        with Simulation(BrokenApp) as sim:
+            with pytest.raises(RuntimeError):
+                sim.run_for(60)
+
+    def test_clock_restored_on_close(self):
+        before = clock.get_clock()
+        sim = Simulation(PumpApp)
+        sim.platform_iface.ai[0] = 50.0
+        sim.run_for(5)
+        assert clock.get_clock() is sim.clock
+        assert clock.now() == sim.now
+        sim.close()
+        assert clock.get_clock() is before
+        assert abs(clock.time() - time.time()) < 1
+
+
+class TestMockPlatformInterface:
+    @pytest.mark.asyncio
+    async def test_unsupported_requests_raise_attribute_error(self):
+        iface = MockPlatformInterface(app_key="test")
+        iface.ai[0] = 4.5
+        assert await iface.fetch_ai(0) == 4.5
+        with pytest.raises(AttributeError, match="getLocation"):
+            await iface.fetch_location()
+
+
+class TestMockModbusInterface:
+    @pytest.mark.asyncio
+    async def test_unsupported_requests_raise_attribute_error(self):
+        iface = MockModbusInterface(app_key="test")
+        await iface.write_registers(start_address=3, values=[7, 8], register_type=3)
+        assert await iface.read_registers(
+            start_address=3, num_registers=2, register_type=3
+        ) == [7, 8]
+        with pytest.raises(AttributeError, match="createServer"):
+            await iface.create_server(port=5020)
@@ -719,6 +719,31 @@ class TestTagsManagerDocker:
 
         assert updates == [("voltage", 13.2)]
 
+    @pytest.mark.asyncio
+    async def test_change_listeners_see_local_and_remote_changes(self):
+        client = FakeTagClient()
+        manager = TagsManagerDocker(client=client, app_key="test_app")
+        first, second = [], []
+        manager.add_change_listener(first.append)
+        manager.add_change_listener(second.append)
+
+        await manager.set_tag("voltage", 12.0, app_key="test_app")
+        await manager.set_tag("voltage", 12.0, app_key="test_app")  # unchanged
+        await manager._on_tag_update(
+            types.SimpleNamespace(
+                aggregate=types.SimpleNamespace(data={"test_app": {"current": 1.5}})
+            )
+        )
+        manager.remove_change_listener(second.append)
+        await manager.set_tag("voltage", 13.0, app_key="test_app")
+
+        assert first == [
+            {"test_app": {"voltage": 12.0}},
+            {"test_app": {"current": 1.5}},
+            {"test_app": {"voltage": 13.0}},
+        ]
+        assert second == first[:2]
+
 
 class TestUiSubPresence:
     @staticmethod
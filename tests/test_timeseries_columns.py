@@ -0,0 +1,287 @@
+import math
+from array import array
+from datetime import timedelta
+
+import pytest
+
+from pydoover.api import AsyncDataClient, DataClient
+from pydoover.api.data import _columns
+from pydoover.api.data._columns import ColumnBuilder
+from pydoover.models.data import TimeseriesColumns
+from pydoover.processor.data_client import ProcessorDataClient
+from pydoover.utils.snowflake import DOOVER_EPOCH
+
+PATH = "/agents/123/channels/tag_values/messages/timeseries"
+
+
+def _id(ms: int) -> int:
+    """A message id from milliseconds after the Doover epoch."""
+    return ms << 22
+
+
+def _server(points: list[dict], page_size: int):
+    """A fake ``_request`` serving ``points`` (newest first) a page at a time."""
+    calls = []
+
+    def request(method, path, params=None, **kwargs):
+        calls.append((method, path, params, kwargs))
+        before = params["before"]
+        remaining = [
+            p for p in points if before is None or int(p["message_id"]) < before
+        ]
+        page = remaining[:page_size]
+        more = len(remaining) > page_size
+        return {
+            "count": len(page),
+            "results": page,
+            "next": page[-1]["message_id"] if more else None,
+        }
+
+    return request, calls
+
+
+@pytest.fixture(autouse=True)
+def without_numpy(monkeypatch):
+    # the array backend unless a test opts into NumPy
+    monkeypatch.setattr(_columns, "_NUMPY", False)
+
+
+def _points(n: int):
+    return [
+        {"message_id": str(_id(ms)), "value": float(ms)}
+        for ms in range(n * 1000, 0, -1000)
+    ]
+
+
+class TestColumnBuilder:
+    def test_single_field_is_oldest_first(self):
+        builder = ColumnBuilder(["temperature"])
+        builder.add_page({"results": _points(3), "next": None}, None)
+        result = builder.finish()
+
+        column = result["temperature"]
+        assert isinstance(column.values, array) and column.values.typecode == "d"
+        assert list(column.values) == [1000.0, 2000.0, 3000.0]
+        assert list(column.timestamps) == [
+            DOOVER_EPOCH + 1000,
+            DOOVER_EPOCH + 2000,
+            DOOVER_EPOCH + 3000,
+        ]
+        assert list(column.message_ids) == [_id(1000), _id(2000), _id(3000)]
+        assert list(column.mask) == [0, 0, 0]
+        assert result.count == 3 and result.pages == 1
+        assert result.interval is None and result.aggregate is None
+
+    def test_out_of_order_points_are_sorted(self):
+        builder = ColumnBuilder(["a"])
+        order = [2, 5, 1, 4, 3]
+        builder.add_page(
+            {"results": [{"message_id": _id(ms), "value": ms} for ms in order]}, None
+        )
+        column = builder.finish()["a"]
+        assert list(column.values) == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert list(column.message_ids) == [_id(ms) for ms in range(1, 6)]
+
+    def test_nulls_are_masked(self):
+        builder = ColumnBuilder(["temperature"])
+        builder.add_page(
+            {
+                "results": [
+                    {"message_id": _id(2), "value": None},
+                    {"message_id": _id(1), "value": 4},
+                ]
+            },
+            None,
+        )
+        column = builder.finish()["temperature"]
+        assert list(column.mask) == [0, 1]
+        assert column.values[0] == 4.0 and math.isnan(column.values[1])
+
+    def test_dict_values_split_into_requested_fields(self):
+        builder = ColumnBuilder(["a", "b"])
+        builder.add_page(
+            {
+                "results": [
+                    {"message_id": _id(2), "value": {"a": 1, "b": True}},
+                    {"message_id": _id(1), "value": {"a": 2}},
+                ]
+            },
+            None,
+        )
+        result = builder.finish()
+        assert list(result) == ["a", "b"]
+        assert list(result["a"].values) == [2.0, 1.0]
+        assert list(result["b"].mask) == [1, 0]
+        assert result["b"].values[1] == 1.0
+
+    def test_named_points_and_discovered_fields(self):
+        builder = ColumnBuilder()
+        builder.add_page(
+            {
+                "results": [
+                    {"message_id": _id(3), "field_name": "x", "value": 1},
+                    {"message_id": _id(2), "value": {"y": 2, "z": 3}},
+                    {"message_id": _id(1), "field_name": "x", "value": 4},
+                ]
+            },
+            None,
+        )
+        result = builder.finish()
+        assert sorted(result) == ["x", "y", "z"]
+        assert list(result["x"].values) == [4.0, 1.0]
+        assert len(result["y"]) == 1
+
+    def test_non_numeric_values_fall_back_to_objects(self):
+        builder = ColumnBuilder(["state"])
+        builder.add_page(
+            {
+                "results": [
+                    {"message_id": _id(3), "value": "running"},
+                    {"message_id": _id(2), "value": None},
+                    {"message_id": _id(1), "value": 1},
+                ]
+            },
+            None,
+        )
+        column = builder.finish()["state"]
+        assert column.values == [1, None, "running"]
+        assert list(column.mask) == [0, 1, 0]
+
+    def test_ambiguous_scalar_raises(self):
+        builder = ColumnBuilder(["a", "b"])
+        with pytest.raises(ValueError, match="one field at a time"):
+            builder.add_page({"results": [{"message_id": 1, "value": 3}]}, None)
+
+    def test_cursor(self):
+        builder = ColumnBuilder(["a"])
+        point = {"message_id": 5, "value": 1}
+        assert builder.add_page({"results": [point], "next": "4"}, None) == 4
+        # a cursor that doesn't move, an empty page, or no next all stop the fetch
+        assert builder.add_page({"results": [point], "next": 4}, 4) is None
+        assert builder.add_page({"results": [], "next": 3}, 4) is None
+        assert builder.add_page({"results": [point], "next": None}, 4) is None
+
+    @pytest.mark.parametrize(
+        "aggregate, expected",
+        [
+            ("mean", [1.5, 12.0]),
+            ("min", [1.0, 11.0]),
+            ("max", [2.0, 13.0]),
+            ("first", [1.0, 12.0]),
+            ("last", [2.0, 13.0]),
+        ],
+    )
+    def test_downsample(self, aggregate, expected):
+        builder = ColumnBuilder(
+            ["a"], downsample=timedelta(seconds=1), aggregate=aggregate
+        )
+        points = [(2500, 13), (2400, 11), (2100, 12), (800, 2), (200, 1)]
+        page = {"results": [{"message_id": _id(ms), "value": v} for ms, v in points]}
+        builder.add_page(page, None)
+        result = builder.finish()
+
+        column = result["a"]
+        assert list(column.values) == expected
+        assert list(column.timestamps) == [DOOVER_EPOCH, DOOVER_EPOCH + 2000]
+        assert column.message_ids is None
+        assert result.count == 5
+        assert result.interval == 1000 and result.aggregate == aggregate
+
+    def test_downsample_masks_empty_buckets_and_keeps_first_last_objects(self):
+        builder = ColumnBuilder(["a"], downsample=1, aggregate="last")
+        page = {
+            "results": [
+                {"message_id": _id(1500), "value": "on"},
+                {"message_id": _id(500), "value": None},
+            ]
+        }
+        builder.add_page(page, None)
+        column = builder.finish()["a"]
+        assert column.values == [None, "on"]
+        assert list(column.mask) == [1, 0]
+
+        builder = ColumnBuilder(["a"], downsample=1, aggregate="mean")
+        builder.add_page(page, None)
+        column = builder.finish()["a"]
+        assert list(column.mask) == [1, 1]
+
+    def test_bad_arguments(self):
+        with pytest.raises(ValueError, match="aggregate"):
+            ColumnBuilder(["a"], aggregate="median")
+        with pytest.raises(ValueError, match="downsample"):
+            ColumnBuilder(["a"], downsample=0)
+
+    def test_numpy_arrays(self, monkeypatch):
+        np = pytest.importorskip("numpy")
+        monkeypatch.setattr(_columns, "_NUMPY", None)
+
+        builder = ColumnBuilder(["a", "b"])
+        builder.add_page(
+            {
+                "results": [
+                    {"message_id": _id(2), "value": {"a": 1.5, "b": "x"}},
+                    {"message_id": _id(1), "value": {"a": None, "b": "y"}},
+                ]
+            },
+            None,
+        )
+        result = builder.finish()
+        a = result["a"]
+        assert a.values.dtype == np.float64 and a.timestamps.dtype == np.int64
+        assert a.mask.dtype == np.bool_ and a.mask.tolist() == [True, False]
+        assert np.ma.array(a.values, mask=a.mask).sum() == 1.5
+        assert result["b"].values.dtype == object
+
+
+def test_sync_client_follows_pages():
+    client = DataClient(base_url="https://data.example", token="test-token")
+    client._request, calls = _server(_points(7), page_size=3)
+    try:
+        result = client.fetch_timeseries_columns(
+            123, "tag_values", ["temperature"], page_size=3, organisation_id=9
+        )
+    finally:
+        client.close()
+
+    assert isinstance(result, TimeseriesColumns)
+    assert list(result["temperature"].values) == [float(i * 1000) for i in range(1, 8)]
+    assert result.pages == 3 and result.count == 7
+    assert [c[2]["before"] for c in calls] == [None, _id(5000), _id(2000)]
+    assert all(c[1] == PATH and c[2]["limit"] == 3 for c in calls)
+    assert calls[0][2]["field_name"] == ["temperature"]
+    assert calls[0][3] == {"organisation_id": 9}
+
+
+@pytest.mark.asyncio
+async def test_async_client_downsamples_across_pages():
+    client = AsyncDataClient(base_url="https://data.example", token="test-token")
+    sync_request, calls = _server(_points(6), page_size=4)
+
+    async def request(method, path, **kwargs):
+        return sync_request(method, path, **kwargs)
+
+    client._request = request
+    result = await client.fetch_timeseries_columns(
+        123, "tag_values", ["temperature"], downsample=2, aggregate="max", page_size=4
+    )
+    await client.close()
+
+    assert list(result["temperature"].values) == [1000.0, 3000.0, 5000.0, 6000.0]
+    assert result.pages == 2 and result.count == 6
+
+
+@pytest.mark.asyncio
+async def test_processor_client_resolves_agent():
+    client = ProcessorDataClient("https://data.example")
+    client.agent_id = 123
+    sync_request, calls = _server(_points(2), page_size=10)
+
+    async def request(method, path, **kwargs):
+        return sync_request(method, path, **kwargs)
+
+    client._request = request
+    result = await client.fetch_timeseries_columns("tag_values", ["temperature"])
+    await client.close()
+
+    assert calls[0][1] == PATH
+    assert len(result["temperature"]) == 2